@@ -5,7 +5,7 @@ import { Descriptions, Table, Form, Button, Input, Modal, Tooltip, Spin, Alert,
 import { SearchOutlined, FilterOutlined, PlusOutlined, SettingOutlined } from "@ant-design/icons";
 import { useDispatch, useSelector } from "react-redux";
 import { Resizable } from 'react-resizable';
-import { getAllTables, updateTable, addTable } from "../slices/dataSlice";
+import { refreshTables, updateTable, addTable } from "../slices/dataSlice";
 import DownloadTSVButton from "./TableDownload";
 import ErrorBoundary from "./ErrorBoundary";
 import schemas from "../schemas/v1.7schemas.json";
@@ -183,7 +183,7 @@ const GregorParticipants = () => {
       <Col xs={24} sm={12} md={6} lg={6} xl={3}>
         <Tooltip title="Fetch or refresh the table data">
           <Button
-            onClick={() => dispatch(getAllTables())}
+            onClick={() => dispatch(refreshTables())}
             type="primary"
           >
             Fetch/Refresh data
@@ -4,7 +4,7 @@ import React, { useState, useMemo, useEffect, useCallback } from "react";
 import { Table, Form, Button, Input, Modal, Tooltip, Spin, Alert, Typography, Dropdown, Checkbox, Switch, Row, Col } from "antd";
 import { SearchOutlined, FilterOutlined, PlusOutlined, SettingOutlined } from "@ant-design/icons";
 import { useDispatch, useSelector } from "react-redux";
-import { getAllTables, updateTable, addTable } from "../slices/dataSlice";
+import { refreshTables, updateTable, addTable } from "../slices/dataSlice";
 import DownloadTSVButton from "./TableDownload";
 import ErrorBoundary from "./ErrorBoundary";
 import TableSelector from "./TableSelector";
@@ -151,7 +151,7 @@ const GregorTables = () => {
       <Col xs={24} sm={12} md={6} lg={6} xl={3}>
         <Tooltip title="Fetch or refresh the table data">
           <Button
-            onClick={() => dispatch(getAllTables())}
+            onClick={() => dispatch(refreshTables())}
             type="primary"
           >
             Fetch/Refresh data
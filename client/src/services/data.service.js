@@ -27,6 +27,14 @@ const getAllTables = async () => {
   return response;
 };
 
+const getChanges = async (since) => {
+  const response = await axios.get(`${APIDB}api/search/changes/`, {
+    headers: getAuthHeaders(),
+    params: { since },
+  });
+  return response;
+};
+
 const updateParticipant = async (data, token) => {
   const response = await axios.post(APIDB + "api/metadata/participant/update/", [
     data
@@ -288,7 +296,8 @@ const dataService = {
   createParticipant,
   createPhenotype,
   createRnaShortRead,
-  getAllTables
+  getAllTables,
+  getChanges
 }
 
   export default dataService;
\ No newline at end of file
@@ -26,9 +26,30 @@ const initialState = {
   aligned_nanopore: [],
   aligned_pac_bio: [],
   aligned_rna_short_read: [],
+  sequence: null,
   status: "idle"
 };
 
+// Primary key field of each table collection, used to merge changes/ results
+const collectionKeys = {
+  participants: "participant_id",
+  families: "family_id",
+  genetic_findings: "genetic_findings_id",
+  analytes: "analyte_id",
+  biobank_entries: "biobank_id",
+  phenotypes: "phenotype_id",
+  experiments: "experiment_id",
+  experiment_dna_short_read: "experiment_dna_short_read_id",
+  experiment_rna_short_read: "experiment_rna_short_read_id",
+  experiment_pac_bio: "experiment_pac_bio_id",
+  experiment_nanopore: "experiment_nanopore_id",
+  aligned: "aligned_id",
+  aligned_dna_short_read: "aligned_dna_short_read_id",
+  aligned_nanopore: "aligned_nanopore_id",
+  aligned_pac_bio: "aligned_pac_bio_id",
+  aligned_rna_short_read: "aligned_rna_short_read_id",
+};
+
 export const dataSlice = createSlice({
   name: 'data',
   initialState,
@@ -40,6 +61,27 @@ export const dataSlice = createSlice({
       state.tableView = action.payload.schema;
       state.tableID = action.payload.identifier;
       state.tableName = action.payload.name;
+    },
+    applyChanges: (state, action) => {
+      const { upserted, deleted, sequence } = action.payload;
+      // Drop deleted rows, then replace or append the upserted ones
+      Object.entries(deleted).forEach(([collectionName, ids]) => {
+        const key = collectionKeys[collectionName];
+        const removed = new Set(ids.map(String));
+        state[collectionName] = state[collectionName].filter(item => !removed.has(String(item[key])));
+      });
+      Object.entries(upserted).forEach(([collectionName, records]) => {
+        const key = collectionKeys[collectionName];
+        records.forEach(record => {
+          const index = state[collectionName].findIndex(item => item[key] === record[key]);
+          if (index === -1) {
+            state[collectionName].push(record);
+          } else {
+            state[collectionName][index] = record;
+          }
+        });
+      });
+      state.sequence = sequence;
     }
   },
   extraReducers: (builder) => {
@@ -52,13 +94,22 @@ export const dataSlice = createSlice({
       })
       .addCase(getAllTables.fulfilled, (state, action) => {
         const {
-          participants, families, genetic_findings, analytes, biobank_entries, phenotypes, experiments, experiment_stages, experiment_dna_short_read, experiment_rna_short_read, experiment_pac_bio, experiment_nanopore,  aligned, aligned_dna_short_read, aligned_nanopore, aligned_pac_bio, aligned_rna_short_read
+          participants, families, genetic_findings, analytes, biobank_entries, phenotypes, experiments, experiment_stages, experiment_dna_short_read, experiment_rna_short_read, experiment_pac_bio, experiment_nanopore,  aligned, aligned_dna_short_read, aligned_nanopore, aligned_pac_bio, aligned_rna_short_read, sequence
         } = action.payload;
 
         Object.assign(state, {
-          participants, families, genetic_findings, analytes, biobank_entries, phenotypes, experiments, experiment_stages, experiment_dna_short_read, experiment_rna_short_read, experiment_pac_bio, experiment_nanopore, aligned, aligned_dna_short_read, aligned_nanopore, aligned_pac_bio, aligned_rna_short_read, status: "fulfilled"
+          participants, families, genetic_findings, analytes, biobank_entries, phenotypes, experiments, experiment_stages, experiment_dna_short_read, experiment_rna_short_read, experiment_pac_bio, experiment_nanopore, aligned, aligned_dna_short_read, aligned_nanopore, aligned_pac_bio, aligned_rna_short_read, sequence, status: "fulfilled"
         });
       })
+      .addCase(getChanges.pending, (state, action) => {
+        state.status = "loading";
+      })
+      .addCase(getChanges.rejected, (state, action) => {
+        state.status = "rejected";
+      })
+      .addCase(getChanges.fulfilled, (state, action) => {
+        state.status = "fulfilled";
+      })
       .addCase(updateTable.fulfilled, (state, action) => {
         state.status = "fulfilled";
         const { table, response, noChanges } = action.payload;
@@ -172,6 +223,32 @@ export const getAllTables = createAsyncThunk(
   }
 )
 
+export const getChanges = createAsyncThunk(
+  "getChanges",
+  async (since, thunkAPI) => {
+    try {
+      // Apply each page of the change log until the server has nothing more
+      let more = true;
+      while (more) {
+        const response = await dataService.getChanges(since);
+        thunkAPI.dispatch(dataSlice.actions.applyChanges(response.data));
+        since = response.data.sequence;
+        more = response.data.more;
+      }
+      return since;
+    } catch(error) {
+      console.log("ERROR! ",error)
+      return thunkAPI.rejectWithValue();
+    }
+  }
+)
+
+// Full download on first load, changes since the last sync afterwards
+export const refreshTables = () => (dispatch, getState) => {
+  const { sequence } = getState().data;
+  return dispatch(sequence === null || sequence === undefined ? getAllTables() : getChanges(sequence));
+}
+
 export const addTable = createAsyncThunk(
   "addTable",
   async ({table, data}, thunkAPI) => {
@@ -372,6 +449,7 @@ export const updateTable = createAsyncThunk(
 
 export const {
   setJsonData,
-  setTableView
+  setTableView,
+  applyChanges
 } = dataSlice.actions;
 export const dataReducer = dataSlice.reducer;
\ No newline at end of file
@@ -14,7 +14,7 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.serializers import (
     TokenRefreshSerializer,
     TokenVerifySerializer,
@@ -29,7 +29,11 @@ from authentication.services import (
     ChangePasswordSerializer,
     CustomTokenObtainPairSerializer,
     ActivateUserSerializer,
+    BlacklistCachedRefreshToken,
+    BlacklistCachedTokenRefreshSerializer,
     IsSuperUser,
+    blacklist_token,
+    request_user,
 )
 
 
@@ -79,7 +83,7 @@ class TokenViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=["post"], url_path="refresh")
     def refresh(self, request):
-        serializer = TokenRefreshSerializer(data=request.data)
+        serializer = BlacklistCachedTokenRefreshSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
@@ -109,8 +113,10 @@ class TokenViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            blacklist_token(BlacklistCachedRefreshToken(refresh_token))
+            # The JWT access token used for this request is revoked as well
+            if isinstance(request.auth, (str, AccessToken)):
+                blacklist_token(AccessToken(str(request.auth)))
             return Response({"message": "Token successfully blacklisted."}, status=200)
 
         except Exception as e:
@@ -373,7 +379,7 @@ class PasswordViewSet(viewsets.ViewSet):
             data=request.data, context={"request": request}
         )
         if serializer.is_valid():
-            serializer.update(request.user, serializer.validated_data)
+            serializer.update(request_user(request), serializer.validated_data)
             return Response({"detail": "Password changed successfully"}, status=200)
 
         return Response(serializer.errors, status=400)
@@ -1,2 +1,12 @@
 #!/usr/bin/env python
-# authentication/apps.py
\ No newline at end of file
+# authentication/apps.py
+
+from django.apps import AppConfig
+
+
+class Authentication(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "authentication"
+
+    def ready(self):
+        import authentication.signals  # noqa: F401
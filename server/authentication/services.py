@@ -1,17 +1,37 @@
 #!/usr/bin/env python
 # authentication/services.py
 
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import User, update_last_login
 from django.conf import settings
+from django.core.cache import caches
 from django.urls import reverse
 from django.core.mail import send_mail
+from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import BasePermission
-from rest_framework_simplejwt.tokens import AccessToken
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.utils import datetime_from_epoch
 
 
 class IsSuperUser(BasePermission):
@@ -55,7 +75,7 @@ class ChangePasswordSerializer(serializers.Serializer):
     confirm_new_password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        user = self.context["request"].user
+        user = request_user(self.context["request"])
 
         if not check_password(data["old_password"], user.password):
             raise serializers.ValidationError({"old_password": "Incorrect password"})
@@ -191,6 +211,11 @@ class CustomAuthentication(BaseAuthentication):
             decoded_token = AccessToken(token)  # Decode and validate the token
         except Exception as e:
             raise AuthenticationFailed(f"Invalid or expired token: {str(e)}")
+        check_token_blacklist(decoded_token)
+
+        if settings.STATELESS_JWT_AUTH:
+            # Resolve the user from the token claims and the user cache
+            return token_user(decoded_token), token
 
         # Retrieve the user associated with the token
         try:
@@ -201,3 +226,224 @@ class CustomAuthentication(BaseAuthentication):
 
         # Return the user and the token
         return user, token
+
+
+def get_cached_user(user_id):
+    """
+    Return the User with `user_id` from the "users" cache, loading it from
+    the database on a miss. Returns None if the user does not exist.
+
+    With the default in-process cache, the User signals only drop the entry
+    in the process that saved the User; other workers keep the old row until
+    it expires after USER_CACHE_TIMEOUT seconds. Set USER_CACHE_BACKEND and
+    USER_CACHE_LOCATION to a shared cache to make changes visible at once.
+    """
+    cache = caches["users"]
+    key = f"user:{user_id}"
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        cache.set(key, user)
+    return user
+
+
+def invalidate_cached_user(user_id) -> None:
+    """Drop a user from the "users" cache after it was updated or deleted."""
+    caches["users"].delete(f"user:{user_id}")
+
+
+def request_user(request):
+    """Return the full User behind a request, for either kind of principal."""
+    return getattr(request.user, "user", request.user)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request principal built from the access token and the cached User.
+
+    Only `username` is read from the token claims that
+    CustomTokenObtainPairSerializer.get_token sets, falling back to the
+    User for older tokens. `is_staff` and `is_superuser` are always read
+    from the cached User, as `is_active` is by token_user, so a demotion
+    takes effect as soon as the cache entry is dropped rather than when the
+    token expires. The User is also available as `user` for code that needs
+    the model instance.
+    """
+
+    @cached_property
+    def user(self):
+        return get_cached_user(self.id)
+
+    @cached_property
+    def username(self) -> str:
+        if "username" in self.token:
+            return self.token["username"]
+        return self.user.username
+
+    @cached_property
+    def is_staff(self) -> bool:
+        return self.user.is_staff
+
+    @cached_property
+    def is_superuser(self) -> bool:
+        return self.user.is_superuser
+
+
+def token_user(validated_token):
+    """
+    Return the request principal for a validated access token without
+    querying the user table.
+
+    The user is checked against the short-lived in-process user cache, so a
+    deleted or deactivated user is rejected once the cache entry is dropped
+    by the User signals or expires.
+    """
+    principal = ClaimsUser(validated_token)
+    try:
+        user = principal.user
+    except KeyError:
+        raise AuthenticationFailed("Token contained no recognizable user identification.")
+    if user is None or not user.is_active:
+        raise AuthenticationFailed("User not found or inactive.", code="user_inactive")
+    return principal
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication building the user from the token claims. Set
+    STATELESS_JWT_AUTH to False to load the User from the database on every
+    request instead.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        check_token_blacklist(validated_token)
+        return validated_token
+
+    def get_user(self, validated_token):
+        if not settings.STATELESS_JWT_AUTH:
+            return super().get_user(validated_token)
+        return token_user(validated_token)
+
+
+async def authenticate_async(request):
+    """
+    Return the principal of a request to one of the async views, which run
+    outside DRF: the bearer token's user, as StatelessJWTAuthentication
+    authenticates it, or the session user. Returns None when neither is
+    valid.
+    """
+    try:
+        result = await sync_to_async(StatelessJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    if result is not None:
+        return result[0]
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+class TokenBlacklistSet:
+    """
+    Per-process set of blacklisted token JTIs.
+
+    The set is loaded from the blacklist table on first use and then
+    refreshed at most every TOKEN_BLACKLIST_POLL_INTERVAL seconds by reading
+    the rows blacklisted since the previous poll, less an overlap of
+    TOKEN_BLACKLIST_POLL_OVERLAP seconds. Ids and timestamps are assigned
+    before a row commits, so a row can become visible after newer ones; the
+    overlap re-reads recent rows so one committed within it is not missed.
+    Tokens blacklisted in this process are added immediately. Rows removed
+    by `flushexpired` belong to expired tokens and are only dropped from the
+    set when the process restarts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all JTIs so the next check reloads the set."""
+        with self._lock:
+            self._jtis = set()
+            self._since = None
+            self._polled_at = None
+
+    def refresh(self, force: bool = False) -> None:
+        """Add the JTIs blacklisted since the last poll."""
+        now = time.monotonic()
+        if (
+            not force
+            and self._polled_at is not None
+            and now - self._polled_at < settings.TOKEN_BLACKLIST_POLL_INTERVAL
+        ):
+            return
+        with self._lock:
+            started = timezone.now()
+            rows = BlacklistedToken.objects.all()
+            if self._since is not None:
+                rows = rows.filter(blacklisted_at__gte=self._since)
+            self._jtis.update(rows.values_list("token__jti", flat=True))
+            self._since = started - timedelta(seconds=settings.TOKEN_BLACKLIST_POLL_OVERLAP)
+            self._polled_at = now
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            self._jtis.add(jti)
+
+    def __contains__(self, jti) -> bool:
+        self.refresh()
+        return jti in self._jtis
+
+
+token_blacklist = TokenBlacklistSet()
+
+
+def check_token_blacklist(validated_token) -> None:
+    """Reject a token whose JTI is in the in-memory blacklist."""
+    if validated_token.get(api_settings.JTI_CLAIM) in token_blacklist:
+        raise AuthenticationFailed("Token is blacklisted.", code="token_blacklisted")
+
+
+def blacklist_token(token):
+    """
+    Add any simplejwt token, access or refresh, to the outstanding and
+    blacklisted token tables and to the in-memory blacklist.
+
+    Returns:
+        BlacklistedToken: The blacklist row for the token.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    outstanding, created = OutstandingToken.objects.get_or_create(
+        jti=jti,
+        defaults={
+            "token": str(token),
+            "expires_at": datetime_from_epoch(token["exp"]),
+        },
+    )
+    blacklisted, created = BlacklistedToken.objects.get_or_create(token=outstanding)
+    token_blacklist.add(jti)
+    return blacklisted
+
+
+class BlacklistCachedRefreshToken(RefreshToken):
+    """
+    Refresh token that only queries the blacklist table when the in-memory
+    blacklist already holds its JTI.
+    """
+
+    def check_blacklist(self) -> None:
+        if self.payload[api_settings.JTI_CLAIM] in token_blacklist:
+            super().check_blacklist()
+
+
+class BlacklistCachedTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = BlacklistCachedRefreshToken
+
+    def validate(self, attrs):
+        try:
+            return super().validate(attrs)
+        except TokenError as error:
+            raise InvalidToken(error.args[0])
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# authentication/signals.py
+
+"""Authentication Signals
+
+Drop cached users when the stored user changes, so updates and
+deactivations are seen on the next request in this process.
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authentication.services import invalidate_cached_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# config/benchmarks.py
+
+"""API Benchmarks
+
+Scenario benchmarks run against a synthetic dataset from
+`utilities/synthetic_data.py`. Each scenario exercises the API the way a
+client does and records its wall time and SQL query count:
+
+    bulk_create      create every table, in dependency order
+    noop_reupload    re-submit every record unchanged to the update APIs
+    bulk_update      submit every record with one field changed
+    list_by_ids      read every record back through the list APIs
+    get_all_tables   the dashboard's full table load, cold and cached
+    anvil_export     build the AnVIL TSV zip
+
+Results are a JSON document that can be saved per commit and compared with
+`compare_results`. Run with `python manage.py benchmark`.
+
+`validator_throughput` times schema validation alone, jsonschema against the
+compiled validators of `config/schema_compiler.py`, without a database. Run
+with `python manage.py benchmark_validators`.
+"""
+
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from rest_framework.test import APIClient
+
+from config.query_budget import query_budget
+from config.schema_compiler import schema_errors
+from search.selectors import get_anvil_tables
+from search.services import TRACKED_TABLES
+from utilities.synthetic_data import TABLE_KEYS, TABLE_ORDER, SyntheticDataset
+
+EXPERIMENT_TABLES = {table_name for table_name in TABLE_ORDER if table_name.startswith(("experiment_", "aligned_"))}
+
+# Free text field changed by the bulk_update scenario
+UPDATE_FIELDS = {
+    "family": "family_history_detail",
+    "participant": "ancestry_detail",
+    "phenotype": "additional_details",
+    "analyte": "analyte_processing_details",
+    "biobank": "comments",
+    "genetic_findings": "notes",
+    "experiment_dna_short_read": "sequencing_event_details",
+    "aligned_dna_short_read": "analysis_details",
+    "experiment_rna_short_read": "within_site_batch_name",
+    "aligned_rna_short_read": "alignment_postprocessing",
+    "experiment_nanopore": "fragmentation_method",
+    "aligned_nanopore": "analysis_details",
+    "experiment_pac_bio": "size_selection_method",
+    "aligned_pac_bio": "analysis_details",
+}
+
+
+class BenchmarkError(Exception):
+    """Raised when a scenario request does not succeed."""
+
+
+def table_url(table_name: str, action: str = "") -> str:
+    app = "experiments" if table_name in EXPERIMENT_TABLES else "metadata"
+    return f"/api/{app}/{table_name}/{action + '/' if action else ''}"
+
+
+def environment() -> dict:
+    """Describe where the benchmark ran, for comparing results."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "machine": platform.machine(),
+    }
+
+
+def model_rules() -> tuple:
+    """
+    Return the `choices` and `required` arguments of SyntheticDataset, so
+    generated records also satisfy the models where they are stricter than
+    the schemas: enumerations limited to each field's choices, and fields
+    the serializers require filled.
+    """
+    choices, required = {}, {}
+    for table_name in TABLE_ORDER:
+        for field in TRACKED_TABLES[table_name]._meta.concrete_fields:
+            field_choices = field.choices or getattr(getattr(field, "base_field", None), "choices", None)
+            if field_choices:
+                choices.setdefault(table_name, {})[field.name] = {value for value, _ in field_choices}
+            if not (field.blank or field.null or field.has_default()):
+                required.setdefault(table_name, set()).add(field.name)
+    return choices, required
+
+
+def _batches(records: list, batch_size: int):
+    for start in range(0, len(records), batch_size):
+        yield records[start:start + batch_size]
+
+
+class BenchmarkRunner:
+    """
+    Load a synthetic dataset through the APIs and time each scenario.
+
+    Runs against the current database, which should be empty; the
+    `benchmark` management command provides a throwaway test database.
+
+    Args:
+        families (int): Number of synthetic families.
+        seed (int, optional): Random seed for the dataset.
+        repeat (int, optional): Timed runs of each repeatable scenario.
+        batch_size (int, optional): Records submitted per request.
+    """
+
+    def __init__(self, families: int, seed: int = 0, repeat: int = 3, batch_size: int = 100):
+        self.families = families
+        self.seed = seed
+        self.repeat = repeat
+        self.batch_size = batch_size
+        choices, required = model_rules()
+        self.tables = SyntheticDataset(families=families, seed=seed, choices=choices, required=required).generate()
+        self.client = APIClient()
+        user, _ = User.objects.get_or_create(username="benchmark")
+        self.client.force_authenticate(user=user)
+        self.results = {}
+
+    def run(self) -> dict:
+        """Run every scenario and return the results document."""
+        self.measure("bulk_create", self.bulk_create, runs=1)
+        self.stored = self.stored_tables()
+        self.measure("noop_reupload", self.noop_reupload)
+        self.measure("bulk_update", self.bulk_update)
+        self.measure("list_by_ids", self.list_by_ids)
+        self.measure("get_all_tables", self.get_all_tables)
+        self.measure("get_all_tables_cached", self.get_all_tables, clear_cache=False)
+        self.measure("anvil_export", self.anvil_export)
+        return {
+            "environment": environment(),
+            "dataset": {
+                "families": self.families,
+                "seed": self.seed,
+                "batch_size": self.batch_size,
+                "records": {table_name: len(records) for table_name, records in self.tables.items()},
+                "skipped": [table_name for table_name in TABLE_ORDER if table_name not in self.stored],
+            },
+            "scenarios": self.results,
+        }
+
+    def measure(self, name: str, scenario, runs: int = None, clear_cache: bool = True):
+        """Time `scenario` and record its runs, median and query count."""
+        timings, queries, records = [], 0, 0
+        if not clear_cache:
+            scenario(0)
+        for run in range(runs or self.repeat):
+            if clear_cache:
+                caches["responses"].clear()
+            with query_budget(raise_on_exceed=False) as budget:
+                start = time.perf_counter()
+                records = scenario(run)
+                timings.append(time.perf_counter() - start)
+            queries = len(budget.queries)
+        median = statistics.median(timings)
+        self.results[name] = {
+            "runs": [round(timing, 4) for timing in timings],
+            "median_s": round(median, 4),
+            "min_s": round(min(timings), 4),
+            "queries": queries,
+            "records": records,
+            "records_per_s": round(records / median, 1) if median and records else None,
+        }
+
+    def _check(self, response, expected=(200,)):
+        if response.status_code not in expected:
+            detail = response.data
+            if isinstance(detail, list):
+                detail = [item for item in detail if item.get("status_code", 0) >= 400][:3]
+            raise BenchmarkError(f"{response.request['PATH_INFO']} returned {response.status_code}: {detail}")
+        return response
+
+    def stored_tables(self) -> list:
+        """
+        Tables whose records the create APIs stored. The update and read
+        scenarios use only these; the others are listed as skipped.
+        """
+        stored = []
+        for table_name in TABLE_ORDER:
+            ids = [record[TABLE_KEYS[table_name]] for record in self.tables[table_name]]
+            if TRACKED_TABLES[table_name].objects.filter(pk__in=ids).count() == len(ids):
+                stored.append(table_name)
+        return stored
+
+    def _submit(self, action: str, change=None) -> int:
+        count = 0
+        for table_name in TABLE_ORDER if action == "create" else self.stored:
+            records = self.tables[table_name]
+            if action == "update" and table_name in EXPERIMENT_TABLES:
+                # The experiment update APIs do not drop "NA" like create does
+                records = [{key: value for key, value in record.items() if value != "NA"} for record in records]
+            if change:
+                records = [change(table_name, record) for record in records]
+            for batch in _batches(records, self.batch_size):
+                self._check(self.client.post(table_url(table_name, action), batch, format="json"))
+            count += len(records)
+        return count
+
+    # Scenarios; each returns the number of records it handled
+
+    def bulk_create(self, run: int) -> int:
+        return self._submit("create")
+
+    def noop_reupload(self, run: int) -> int:
+        return self._submit("update")
+
+    def bulk_update(self, run: int) -> int:
+        def change(table_name, record):
+            return {**record, UPDATE_FIELDS[table_name]: f"benchmark update {run + 1}"}
+
+        return self._submit("update", change)
+
+    def list_by_ids(self, run: int) -> int:
+        count = 0
+        for table_name in self.stored:
+            ids = [record[TABLE_KEYS[table_name]] for record in self.tables[table_name]]
+            for batch in _batches(ids, self.batch_size):
+                self._check(self.client.get(table_url(table_name), {"ids": ",".join(batch)}))
+            count += len(ids)
+        return count
+
+    def get_all_tables(self, run: int) -> int:
+        self._check(self.client.get("/api/search/get_all_tables/"))
+        return sum(len(records) for records in self.tables.values())
+
+    def anvil_export(self, run: int) -> int:
+        get_anvil_tables()
+        return sum(len(records) for records in self.tables.values())
+
+
+def validator_throughput(tables: dict, repeat: int = 3) -> dict:
+    """
+    Time validating every record of `tables` with jsonschema and with the
+    compiled validators.
+
+    Args:
+        tables (dict): Records by table name, as SyntheticDataset generates.
+        repeat (int, optional): Timed runs of each validator.
+
+    Returns:
+        dict: Per validator, the runs, median and records per second, and
+        the speedup of the compiled validators.
+
+    Raises:
+        BenchmarkError: If the two validators disagree on any record.
+    """
+    rows = [(record, table_name) for table_name, records in tables.items() for record in records]
+    results, errors = {}, {}
+    for name, compiled in (("jsonschema", False), ("compiled", True)):
+        # Load and compile the schemas outside the timed runs
+        for table_name in tables:
+            schema_errors({}, table_name, compiled=compiled)
+        timings = []
+        for run in range(repeat):
+            start = time.perf_counter()
+            errors[name] = [schema_errors(record, table_name, compiled=compiled) for record, table_name in rows]
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        results[name] = {
+            "runs": [round(timing, 4) for timing in timings],
+            "median_s": round(median, 4),
+            "records": len(rows),
+            "records_per_s": round(len(rows) / median, 1) if median and rows else None,
+        }
+    if errors["jsonschema"] != errors["compiled"]:
+        raise BenchmarkError("The compiled validators and jsonschema returned different errors.")
+    compiled_median = results["compiled"]["median_s"]
+    results["speedup"] = round(results["jsonschema"]["median_s"] / compiled_median, 1) if compiled_median else None
+    return results
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 1.2) -> list:
+    """
+    Compare the median time of each scenario in two results documents.
+
+    Returns one row per scenario present in both, as
+    `(name, baseline_median, current_median, ratio, regressed)`, where
+    `regressed` is True when the ratio exceeds `threshold`.
+    """
+    rows = []
+    for name, result in current["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            continue
+        before = baseline["scenarios"][name]["median_s"]
+        after = result["median_s"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, round(ratio, 3), ratio > threshold))
+    return rows
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# config/bucket_paths.py
+
+"""Bucket Path Validation
+
+Precompiled validation of the file path columns the JSON schemas mark with
+`x-is_bucket_path`: gs:// and s3:// object paths and http(s) URLs. A valid
+value costs one regular expression match; messages are only built for
+values that fail.
+
+The rule is the schemas' own `^(https?|gs|s3)://.+$`, plus the bucket or
+host that `validate_url` required: a path such as "gs:///file.bam" or one
+with a line break is rejected. Bucket and host names are not checked
+further.
+"""
+
+import functools
+import json
+import os
+import re
+
+from django.conf import settings
+
+BUCKET_PATH_SCHEMES = ("gs", "s3", "http", "https")
+
+BUCKET_PATH_RE = re.compile(r"(?:https?|gs|s3)://[^/?#\s][^\r\n]*")
+_SCHEME_RE = re.compile(r"([A-Za-z][A-Za-z0-9+.-]*)://")
+
+
+def bucket_path_error(value):
+    """
+    Return why a value is not a valid bucket path or URL, or None if it is.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return "Invalid URL: URL must be a non-empty string."
+    if BUCKET_PATH_RE.fullmatch(value):
+        return None
+    scheme = _SCHEME_RE.match(value)
+    if scheme is None:
+        return f"'{value}' is not a valid URL."
+    if scheme.group(1) not in BUCKET_PATH_SCHEMES:
+        return f"'{value}' is not a valid URL. Scheme must be one of {', '.join(BUCKET_PATH_SCHEMES)}."
+    if "\r" in value or "\n" in value:
+        return f"'{value}' is not a valid URL. Remove the line break."
+    if scheme.group(1) in ("gs", "s3"):
+        return f"'{value}' is not a valid URL. Missing {scheme.group(1)} bucket name."
+    return f"'{value}' is not a valid URL. Missing host."
+
+
+def validate_many(paths) -> list:
+    """
+    Validate many bucket paths or URLs at once.
+
+    Args:
+        paths: Iterable of values.
+
+    Returns:
+        list: For each value, in order, None if it is valid or the error
+        message bucket_path_error gives.
+    """
+    match = BUCKET_PATH_RE.fullmatch
+    return [None if isinstance(path, str) and match(path) else bucket_path_error(path) for path in paths]
+
+
+@functools.lru_cache(maxsize=None)
+def bucket_path_columns(table_name: str) -> tuple:
+    """Return the columns of a table's JSON schema marked `x-is_bucket_path`."""
+    schema_path = os.path.join(
+        settings.BASE_DIR, f"utilities/json_schemas/{settings.SCHEMA_VERSION}/{table_name}.json"
+    )
+    try:
+        with open(schema_path, "r") as schema_file:
+            properties = json.load(schema_file).get("properties", {})
+    except FileNotFoundError:
+        return ()
+    return tuple(
+        column for column, definition in properties.items()
+        if isinstance(definition, dict) and definition.get("x-is_bucket_path")
+    )
+
+
+def bucket_path_errors(table_name: str, rows) -> dict:
+    """
+    Validate the bucket path columns of a batch of submitted rows, one
+    column at a time with validate_many. Missing, null, empty and NA
+    values are left to the schema's required rules.
+
+    Args:
+        table_name (str): Name of the table the rows are submitted to.
+        rows (list): Submitted rows as dictionaries.
+
+    Returns:
+        dict: For each row index with an invalid path, a list of
+        {"field", "error"} dictionaries in the shape of
+        TableValidator.get_validation_results errors.
+    """
+    errors = {}
+    if not isinstance(rows, list):
+        return errors
+    for column in bucket_path_columns(table_name):
+        indexes, values = [], []
+        for index, row in enumerate(rows):
+            value = row.get(column) if isinstance(row, dict) else None
+            if value not in (None, "", "NA"):
+                indexes.append(index)
+                values.append(value)
+        for index, error in zip(indexes, validate_many(values)):
+            if error is not None:
+                errors.setdefault(index, []).append({"field": column.title(), "error": error})
+    return errors
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# config/database.py
+
+"""Database Connections
+
+Per-connection setup for the database profiles configured in
+config/settings.py. SQLite connections get the SQLITE_PRAGMAS as they are
+opened; the receiver is connected when the search app is ready.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to each new SQLite connection."""
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    read_only = "mode=ro" in str(connection.settings_dict["NAME"])
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            if read_only and pragma == "journal_mode":
+                # Set by the read-write connections; a read-only one cannot
+                continue
+            cursor.execute(f"PRAGMA {pragma} = {value}")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# config/ingest_profile.py
+
+"""Ingest Profiling
+
+Splits the time spent creating and updating records into stages:
+
+    lookup      resolving the analyte or experiment a record refers to
+    normalize   casting and splitting values and dropping "NA" ones
+                (config/normalizer.py)
+    schema      JSON schema validation
+    diff        comparing the submitted record with the stored one
+    serializer  serializer validation
+    write       database writes
+    response    building the per-record response
+
+The service functions mark where each stage starts with `ingest_stage`;
+a stage ends when the next one starts or when the service function,
+decorated with `ingest_record`, returns. Marks cost nothing unless an
+IngestProfile is active.
+
+Profiles are taken with `--profile` on `utilities/data_converter.py`, or on
+the API through the INGEST_PROFILE setting (see IngestProfileMiddleware).
+"""
+
+import cProfile
+import functools
+import time
+from collections import Counter, defaultdict
+
+from asgiref.local import Local
+
+STAGES = ("lookup", "normalize", "schema", "diff", "serializer", "write", "response")
+
+_current = Local()
+
+
+def ingest_stage(name: str) -> None:
+    """Start stage `name` of the current record, ending the previous one."""
+    profile = getattr(_current, "profile", None)
+    if profile is not None:
+        profile.start_stage(name)
+
+
+def ingest_record_done() -> None:
+    """End the current record."""
+    profile = getattr(_current, "profile", None)
+    if profile is not None:
+        profile.end_record()
+
+
+def ingest_record(func):
+    """Decorate a service function that creates or updates one record."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            ingest_record_done()
+
+    return wrapper
+
+
+class IngestProfile:
+    """
+    Collect per-stage timings, and optionally a cProfile dump, for the
+    records processed inside the block.
+
+    Args:
+        label (str, optional): Name shown in the summary, e.g. the table.
+        pstats_path (str, optional): Where to write the cProfile stats.
+
+    Example:
+        with IngestProfile("participant", pstats_path="participant.pstats") as profile:
+            converter.process_table(table_file)
+        print(profile.table())
+    """
+
+    def __init__(self, label: str = None, pstats_path: str = None):
+        self.label = label
+        self.pstats_path = pstats_path
+        self.totals = defaultdict(float)
+        self.calls = Counter()
+        self.records = 0
+        self.elapsed = 0.0
+        self._stage = None
+        self._stage_started = 0.0
+        self._profiler = None
+
+    def start_stage(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.totals[self._stage] += now - self._stage_started
+        self._stage = name
+        self._stage_started = now
+        self.calls[name] += 1
+
+    def end_record(self) -> None:
+        if self._stage is not None:
+            self.totals[self._stage] += time.perf_counter() - self._stage_started
+            self._stage = None
+        self.records += 1
+
+    def __enter__(self):
+        self._previous = getattr(_current, "profile", None)
+        _current.profile = self
+        if self.pstats_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.elapsed = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.pstats_path)
+        if self._stage is not None:
+            self.totals[self._stage] += time.perf_counter() - self._stage_started
+            self._stage = None
+        _current.profile = self._previous
+        return False
+
+    def summary(self) -> dict:
+        """
+        Return the totals per stage, with time outside any stage reported
+        as `other`.
+        """
+        names = [name for name in STAGES if name in self.totals]
+        names += sorted(name for name in self.totals if name not in STAGES)
+        staged = sum(self.totals.values())
+        stages = {name: (self.totals[name], self.calls[name]) for name in names}
+        stages["other"] = (max(self.elapsed - staged, 0.0), 0)
+        return {
+            "label": self.label,
+            "records": self.records,
+            "total_ms": round(self.elapsed * 1000, 2),
+            "stages": {
+                name: {
+                    "ms": round(seconds * 1000, 2),
+                    "per_record_ms": round(seconds * 1000 / self.records, 3) if self.records else None,
+                    "percent": round(100 * seconds / self.elapsed, 1) if self.elapsed else 0.0,
+                    "calls": calls,
+                }
+                for name, (seconds, calls) in stages.items()
+            },
+        }
+
+    def table(self) -> str:
+        """Format the summary as a text table, slowest stage first."""
+        summary = self.summary()
+        rows = sorted(summary["stages"].items(), key=lambda item: -item[1]["ms"])
+        lines = [
+            f"Ingest profile{f' for {self.label}' if self.label else ''}: "
+            f"{summary['records']} records in {summary['total_ms']} ms",
+            f"{'stage':<12}{'total ms':>12}{'ms/record':>12}{'%':>8}",
+        ]
+        for name, stage in rows:
+            per_record = "" if stage["per_record_ms"] is None else stage["per_record_ms"]
+            lines.append(f"{name:<12}{stage['ms']:>12}{per_record:>12}{stage['percent']:>8}")
+        return "\n".join(lines)
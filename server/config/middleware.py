@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# config/middleware.py
+
+"""Request Instrumentation
+
+Middleware recording, per request, the number of SQL queries, total database
+time, the slowest statements, serializer time and total wall time. The
+figures are returned in a `Server-Timing` header and written as one JSON log
+line on the `request_timing` logger. Serializer time covers the code run
+inside `serializer_timing`, which `serialize_queryset` uses for the read
+APIs.
+
+Queries are recorded with execute wrappers on the database connections of
+the thread that runs the request's sync code. Under ASGI that is not the
+event loop thread, so the wrappers are installed through `sync_to_async`,
+which sends them to the same thread as the view and its ORM calls.
+
+Controlled by the REQUEST_TIMING_ENABLED, REQUEST_TIMING_SAMPLE_RATE and
+REQUEST_TIMING_SLOW_QUERIES settings.
+
+IngestProfileMiddleware profiles create and update requests to the metadata
+and experiments APIs by ingest stage (see config/ingest_profile.py), when
+the INGEST_PROFILE setting asks for it.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.local import Local
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from config.ingest_profile import IngestProfile
+
+logger = logging.getLogger("request_timing")
+ingest_logger = logging.getLogger("ingest_profile")
+
+# Thread-local under WSGI; under ASGI it follows the request into the
+# threads its sync code runs in
+_current = Local()
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduce a statement to its shape: literals and placeholders become `?` and
+    IN lists of any length collapse to `(...)`, so statements that differ
+    only in their parameters compare equal.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return " ".join(sql.split())
+
+
+class RequestMetrics:
+    """Query and timing figures collected for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper timing each statement."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.queries.append((duration, sql))
+
+    def slowest(self, count: int) -> list:
+        return [
+            {"sql": normalize_sql(sql), "ms": round(duration * 1000, 2)}
+            for duration, sql in sorted(self.queries, key=lambda query: -query[0])[:count]
+        ]
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.1f};desc="{len(self.queries)} queries"',
+                f"serializer;dur={self.serializer_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+
+def _add_server_timing(response, value: str) -> None:
+    """Append `value` to the response's Server-Timing header."""
+    if response.has_header("Server-Timing"):
+        value = f"{response['Server-Timing']}, {value}"
+    response["Server-Timing"] = value
+
+
+@contextmanager
+def serializer_timing():
+    """Add the run time of the block to the current request's serializer time."""
+    metrics = getattr(_current, "metrics", None)
+    if metrics is None or metrics._serializer_depth:
+        yield
+        return
+    metrics._serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics._serializer_depth -= 1
+
+
+def _install_wrappers(metrics: RequestMetrics) -> ExitStack:
+    """Add `metrics` to the execute wrappers of this thread's connections."""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(metrics))
+    return stack
+
+
+@contextmanager
+def _recording(metrics: RequestMetrics):
+    _current.metrics = metrics
+    try:
+        with _install_wrappers(metrics):
+            yield
+    finally:
+        _current.metrics = None
+
+
+class RequestTimingMiddleware:
+    """Record and report SQL and timing figures for a sample of requests."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _sampled() -> bool:
+        return settings.REQUEST_TIMING_ENABLED and random.random() < settings.REQUEST_TIMING_SAMPLE_RATE
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        with _recording(metrics):
+            response = self.get_response(request)
+        return self._report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        _current.metrics = metrics
+        # Install and remove the wrappers in the thread the sync view and
+        # the async ORM run their queries in, not on the event loop
+        stack = await sync_to_async(_install_wrappers)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.metrics = None
+        return self._report(request, response, metrics)
+
+    def _report(self, request, response, metrics: RequestMetrics):
+        total = time.perf_counter() - metrics.started
+        _add_server_timing(response, metrics.server_timing(total))
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": len(metrics.queries),
+                    "db_ms": round(metrics.db_time * 1000, 2),
+                    "serializer_ms": round(metrics.serializer_time * 1000, 2),
+                    "total_ms": round(total * 1000, 2),
+                    "slowest": metrics.slowest(settings.REQUEST_TIMING_SLOW_QUERIES),
+                }
+            )
+        )
+        return response
+
+
+class IngestProfileMiddleware:
+    """
+    Profile metadata and experiment create and update requests by ingest
+    stage. INGEST_PROFILE is "off", "header" to profile requests sent with
+    an X-Ingest-Profile header, or "always".
+    """
+
+    PATH_PREFIXES = ("/api/metadata/", "/api/experiments/")
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _profiled(self, request) -> bool:
+        if request.method != "POST" or not request.path.startswith(self.PATH_PREFIXES):
+            return False
+        if settings.INGEST_PROFILE == "always":
+            return True
+        return settings.INGEST_PROFILE == "header" and "X-Ingest-Profile" in request.headers
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._profiled(request):
+            return self.get_response(request)
+
+        pstats_path = None
+        if settings.INGEST_PROFILE_DIR:
+            name = request.path.strip("/").replace("/", "_")
+            pstats_path = os.path.join(settings.INGEST_PROFILE_DIR, f"{name}_{time.time_ns()}.pstats")
+        with IngestProfile(label=f"{request.method} {request.path}", pstats_path=pstats_path) as profile:
+            response = self.get_response(request)
+        return self._report(response, profile)
+
+    async def __acall__(self, request):
+        if not self._profiled(request):
+            return await self.get_response(request)
+
+        # No cProfile dump: it would only see the event loop thread, not the
+        # thread the sync view runs in
+        with IngestProfile(label=f"{request.method} {request.path}") as profile:
+            response = await self.get_response(request)
+        return self._report(response, profile)
+
+    def _report(self, response, profile: IngestProfile):
+        summary = profile.summary()
+        _add_server_timing(
+            response,
+            ", ".join(
+                f"ingest-{name};dur={stage['ms']:.1f}"
+                for name, stage in summary["stages"].items()
+            ),
+        )
+        ingest_logger.info(json.dumps({**summary, "status": response.status_code, "pstats": profile.pstats_path}))
+        return response
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# config/normalizer.py
+
+"""Row Normalization
+
+Turns a submitted row into the shape its table's JSON schema expects,
+driven by the schema instead of a hand-written parser per table:
+
+    array      multi-value columns, split on the data model's
+               `multi_value_delimiter` ("|")
+    integer    cast from a string
+    number     cast from a string, to an int when written without a
+               decimal point
+    boolean    "TRUE"/"true" and "FALSE"/"false"
+    string     surrounding whitespace removed
+
+"NA", empty and null values are dropped. Values that cannot be cast are
+left as submitted for schema validation to report.
+
+The converters of a table are looked up once per process; normalizing a
+row is then a single pass over its columns. `normalize_columns` applies
+the same conversions to a batch held as columns.
+"""
+
+import functools
+import math
+
+from config.schema_compiler import load_schema
+
+MULTI_VALUE_DELIMITER = "|"
+
+# Values dropped from a row: these, alone or as the only item of a list,
+# and None
+_NA_STRINGS = frozenset(("NA", ""))
+_NA_ITEMS = ("NA", "", None)
+
+# Submitted values that mean "not reported" for a column, by table
+NA_ALIASES = {
+    "participant": {
+        "reported_race": ("Unknown", "More than one race"),
+        "reported_ethnicity": ("Unknown",),
+    },
+}
+
+
+def _split(text: str) -> list:
+    return [item.strip() for item in text.split(MULTI_VALUE_DELIMITER)]
+
+
+def _float(text: str):
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _to_integer(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        number = _float(text)
+        return int(number) if number is not None and number.is_integer() else text
+
+
+def _to_number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        number = _float(text)
+        return text if number is None else number
+
+
+_BOOLEANS = {"TRUE": True, "true": True, "FALSE": False, "false": False}
+
+
+def _to_boolean(text: str):
+    return _BOOLEANS.get(text, text)
+
+
+# Converters of submitted strings, by schema type; strings are only stripped
+CONVERTERS = {
+    "array": _split,
+    "integer": _to_integer,
+    "number": _to_number,
+    "boolean": _to_boolean,
+}
+
+
+def _with_aliases(convert, aliases: tuple):
+    def convert_or_drop(text):
+        if text in aliases:
+            return None
+        return text if convert is None else convert(text)
+
+    return convert_or_drop
+
+
+def _normalize(value, convert):
+    """Normalize one value; None when it is dropped."""
+    if isinstance(value, str):
+        value = value.strip()
+        if value in _NA_STRINGS:
+            return None
+        return value if convert is None else convert(value)
+    if isinstance(value, list) and len(value) == 1 and value[0] in _NA_ITEMS:
+        return None
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def column_converters(table_name: str) -> dict:
+    """
+    Return the converters of a table's schema columns.
+
+    Args:
+        table_name (str): Name of the table.
+
+    Returns:
+        dict: Column name to a function converting a stripped, non-NA
+        submitted string, for the columns that need more than stripping.
+        Empty for a table without a schema.
+    """
+    try:
+        properties = load_schema(table_name).get("properties", {})
+    except FileNotFoundError:
+        return {}
+    aliases = NA_ALIASES.get(table_name, {})
+    converters = {}
+    for column, definition in properties.items():
+        convert = CONVERTERS.get(definition.get("type")) if isinstance(definition, dict) else None
+        if column in aliases:
+            convert = _with_aliases(convert, aliases[column])
+        if convert is not None:
+            converters[column] = convert
+    return converters
+
+
+def normalize_row(table_name: str, datum: dict) -> dict:
+    """
+    Normalize one submitted row of a table.
+
+    Args:
+        table_name (str): Name of the table the row is submitted to.
+        datum (dict): The submitted row; it is not modified.
+
+    Returns:
+        dict: The row with its values converted and NA values dropped.
+        Columns not in the schema are kept, less their NA values.
+    """
+    converters = column_converters(table_name)
+    normalized = {}
+    for column, value in datum.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if value in _NA_STRINGS:
+                continue
+            convert = converters.get(column)
+            if convert is not None:
+                value = convert(value)
+                if value is None:
+                    continue
+        elif value is None or (isinstance(value, list) and len(value) == 1 and value[0] in _NA_ITEMS):
+            continue
+        normalized[column] = value
+    return normalized
+
+
+
+def normalize_columns(table_name: str, columns: dict) -> dict:
+    """
+    Normalize a batch of rows held as columns, e.g. a sheet being loaded.
+
+    Args:
+        table_name (str): Name of the table the rows are submitted to.
+        columns (dict): Column name to the list of its values, one per row.
+
+    Returns:
+        dict: The columns with their values converted. NA values become None,
+        since a column keeps one value per row.
+    """
+    converters = column_converters(table_name)
+    normalized = {}
+    for column, values in columns.items():
+        convert = converters.get(column)
+        normalized[column] = [_normalize(value, convert) for value in values]
+    return normalized
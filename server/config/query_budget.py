@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# config/query_budget.py
+
+"""Query Budgets
+
+A context manager and decorator that records the SQL run inside it and
+checks it against a declared budget: the total number of queries, and how
+often one statement may repeat with different parameters. Repeats are the
+signature of N+1 patterns, e.g. one lookup per submitted row.
+
+When the budget is exceeded a QueryBudgetExceeded error is raised if the
+QUERY_BUDGET_RAISE setting is on, as it is by default with DEBUG, and a
+warning is logged on the `query_budget` logger otherwise.
+"""
+
+import copy
+import logging
+from collections import Counter
+from contextlib import ContextDecorator, ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from config.middleware import normalize_sql
+
+logger = logging.getLogger("query_budget")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when the queries run inside a query_budget exceed it."""
+
+
+class query_budget(ContextDecorator):
+    """
+    Record the queries run in a block or function and enforce a budget.
+
+    Args:
+        max_queries (int, optional): Maximum number of queries.
+        max_repeats (int, optional): Maximum number of times one normalized
+            statement may run.
+        label (str, optional): Name used in the error or log message.
+        raise_on_exceed (bool, optional): Overrides the QUERY_BUDGET_RAISE
+            setting.
+
+    Example:
+        with query_budget(max_queries=10, max_repeats=2):
+            response = client.post(url, data)
+
+        @query_budget(max_queries=1)
+        def bulk_retrieve(...):
+    """
+
+    def __init__(self, max_queries=None, max_repeats=None, label=None, raise_on_exceed=None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.label = label
+        self.raise_on_exceed = raise_on_exceed
+        self.queries = []
+
+    def _recreate_cm(self):
+        # Each decorated call records into its own copy
+        return copy.copy(self)
+
+    def __call__(self, func):
+        if self.label is None:
+            self.label = func.__qualname__
+        return super().__call__(func)
+
+    def _record(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._stack.close()
+        if exc_type is None:
+            self.check()
+        return False
+
+    def repeated(self) -> list:
+        """
+        Return `(normalized_sql, count)` for each statement that ran more
+        than once, most repeated first.
+        """
+        counts = Counter(normalize_sql(sql) for sql in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count > 1]
+
+    def violations(self) -> list:
+        """Return a description of each way the budget was exceeded."""
+        problems = []
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            problems.append(f"{len(self.queries)} queries (budget {self.max_queries})")
+        if self.max_repeats is not None:
+            for sql, count in self.repeated():
+                if count <= self.max_repeats:
+                    break
+                problems.append(f"{count}x (budget {self.max_repeats}): {sql}")
+        return problems
+
+    def check(self) -> None:
+        problems = self.violations()
+        if not problems:
+            return
+        message = f"Query budget exceeded{f' in {self.label}' if self.label else ''}:\n  " + "\n  ".join(problems)
+        raise_on_exceed = self.raise_on_exceed
+        if raise_on_exceed is None:
+            raise_on_exceed = settings.QUERY_BUDGET_RAISE
+        if raise_on_exceed:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
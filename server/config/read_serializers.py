@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# config/read_serializers.py
+
+"""Compiled Read Serializers
+
+Bulk reads (get_all_tables, the changes feed and the AnVIL export) serialize
+every row of a table through a DRF ModelSerializer, which instantiates each
+model, resolves every field through `get_attribute` and queries each
+many-to-many relation per row.
+
+`compile_serializer` reads a serializer's fields once and generates, per
+serializer, a plain function turning a `values_list()` row and the
+prefetched many-to-many maps into the same dict, key for key and value for
+value: the columns are the sources of the serializer's readable fields, in
+its field order, and each value goes through the conversion its DRF field
+applies. A many-to-many relation is read with one query on its through
+table for the whole queryset.
+
+Serializers the compiler does not understand (method fields, nested
+serializers, dotted sources, custom `to_representation`) fall back to DRF in
+`serialize_queryset`. Key renames declared through RenameFieldsMixin are
+compiled.
+"""
+
+import functools
+from collections import defaultdict
+
+from rest_framework import relations, serializers
+
+from config.middleware import serializer_timing
+
+# DRF field classes whose to_representation is a plain type conversion
+_INLINE_CONVERSIONS = {
+    serializers.CharField: "str",
+    serializers.IntegerField: "int",
+    serializers.FloatField: "float",
+}
+
+
+class NotCompilable(Exception):
+    """Raised for a serializer that compile_serializer cannot reproduce."""
+
+
+class RenameFieldsMixin:
+    """
+    Serializer mixin renaming fields between the model and the API using
+    `Meta.rename_fields`, a mapping of field name to API key.
+
+    A renamed key is popped and reinserted in the output, so it moves to the
+    end. Input under the API key is read back into the field.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for field_name, key in self.Meta.rename_fields.items():
+            if field_name in data:
+                data[key] = data.pop(field_name)
+        return data
+
+    def to_internal_value(self, data):
+        for field_name, key in self.Meta.rename_fields.items():
+            if key in data:
+                data[field_name] = data.pop(key)
+        return super().to_internal_value(data)
+
+
+class CompiledSerializer:
+    """
+    Serializes querysets of one model with the output of `serializer_class`.
+
+    Args:
+        serializer_class: A ModelSerializer subclass.
+
+    Raises:
+        NotCompilable: If the serializer has fields or behaviour the compiler
+            cannot reproduce exactly.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        self.serializer_class = serializer_class
+        self.model = serializer.Meta.model
+        meta = self.model._meta
+        concrete = {field.name for field in meta.concrete_fields}
+        many_to_many = {field.name: field for field in meta.many_to_many}
+
+        renames = {}
+        if serializer_class.to_representation is RenameFieldsMixin.to_representation:
+            renames = serializer.Meta.rename_fields
+        elif serializer_class.to_representation is not serializers.Serializer.to_representation:
+            raise NotCompilable(f"{serializer_class.__name__} overrides to_representation")
+
+        self.columns = [meta.pk.name]
+        self.relations = []
+        # (output key, expression) in output order
+        entries = []
+        constants = {}
+        for field in serializer._readable_fields:
+            source = field.source
+            if isinstance(field, relations.ManyRelatedField):
+                if source not in many_to_many:
+                    raise NotCompilable(f"{serializer_class.__name__}.{field.field_name}")
+                self.relations.append(self._relation(many_to_many[source], field.child_relation))
+                index = len(self.relations) - 1
+                entries.append((field.field_name, f"(m2m[{index}].get(row[0]) or [])"))
+                continue
+            if source not in concrete:
+                raise NotCompilable(f"{serializer_class.__name__}.{field.field_name}")
+            if source in self.columns:
+                column = self.columns.index(source)
+            else:
+                self.columns.append(source)
+                column = len(self.columns) - 1
+            value = f"row[{column}]"
+            if isinstance(field, relations.PrimaryKeyRelatedField):
+                if field.pk_field is not None:
+                    raise NotCompilable(f"{serializer_class.__name__}.{field.field_name}")
+                expression = value
+            elif type(field) in _INLINE_CONVERSIONS:
+                expression = f"{_INLINE_CONVERSIONS[type(field)]}({value})"
+            elif isinstance(field, serializers.RelatedField):
+                raise NotCompilable(f"{serializer_class.__name__}.{field.field_name}")
+            else:
+                name = f"to_representation_{len(constants)}"
+                constants[name] = field.to_representation
+                expression = f"{name}({value})"
+            if expression != value:
+                # DRF returns None without converting it
+                expression = f"(None if {value} is None else {expression})"
+            entries.append((field.field_name, expression))
+
+        # A renamed key is popped and reinserted, so it moves to the end
+        entries = [(renames.get(key, key), expression) for key, expression in entries]
+        entries.sort(key=lambda entry: entry[0] in renames.values())
+
+        body = ", ".join(f"{key!r}: {expression}" for key, expression in entries)
+        source_code = f"def serialize_row(row, m2m):\n    return {{{body}}}\n"
+        namespace = dict(constants)
+        exec(compile(source_code, f"<compiled {serializer_class.__name__}>", "exec"), namespace)
+        self.serialize_row = namespace["serialize_row"]
+        self.source_code = source_code
+
+    @staticmethod
+    def _relation(model_field, child) -> tuple:
+        """Describe how to read one many-to-many relation from its through table."""
+        through = model_field.remote_field.through
+        source = through._meta.get_field(model_field.m2m_field_name())
+        target = through._meta.get_field(model_field.m2m_reverse_field_name())
+        if isinstance(child, relations.PrimaryKeyRelatedField) and child.pk_field is None:
+            value = target.attname
+        elif type(child) is relations.SlugRelatedField:
+            value = f"{target.name}__{child.slug_field}"
+        else:
+            raise NotCompilable(f"{model_field.model.__name__}.{model_field.name}")
+        # The order the related manager returns: the related model's
+        # ordering, otherwise the through table's (source, target) index
+        related_ordering = model_field.related_model._meta.ordering or []
+        ordering = [
+            f"-{target.name}__{field[1:]}" if field.startswith("-") else f"{target.name}__{field}"
+            for field in related_ordering
+        ]
+        return through, source, value, [source.attname] + ordering + [target.attname]
+
+    def serialize(self, queryset) -> list:
+        """Serialize every row of `queryset`, a queryset of the serializer's model."""
+        pks = queryset.values("pk")
+        m2m = []
+        for through, source, value, ordering in self.relations:
+            related = defaultdict(list)
+            pairs = (
+                through.objects.filter(**{f"{source.name}__in": pks})
+                .order_by(*ordering)
+                .values_list(source.attname, value)
+            )
+            for owner, related_value in pairs:
+                related[owner].append(related_value)
+            m2m.append(related)
+        serialize_row = self.serialize_row
+        return [serialize_row(row, m2m) for row in queryset.values_list(*self.columns)]
+
+
+@functools.cache
+def compile_serializer(serializer_class):
+    """Return the CompiledSerializer of `serializer_class`, or None if it cannot be compiled."""
+    try:
+        return CompiledSerializer(serializer_class)
+    except NotCompilable:
+        return None
+
+
+def serialize_queryset(serializer_class, queryset) -> list:
+    """
+    Serialize `queryset` as `serializer_class(queryset, many=True).data`
+    would, through the compiled serializer when there is one.
+    """
+    compiled = compile_serializer(serializer_class)
+    with serializer_timing():
+        if compiled is None:
+            return serializer_class(queryset, many=True).data
+        return compiled.serialize(queryset)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# config/routers.py
+
+"""Read Replica Routing
+
+Reads made inside `read_from_replica()` go to the DATABASE_REPLICA alias, a
+PostgreSQL replica or a read-only (`mode=ro`) SQLite connection; every
+other query, and every write, uses the default database. Without a replica
+configured the router leaves all routing to Django.
+
+The search read views and the AnVIL export run on the replica through
+`replica_reads`. A user who has just written is pinned to the primary for
+REPLICA_PIN_SECONDS, so they read their own writes even while the replica
+is behind: PrimaryPinMiddleware records the write in the "pins" cache under
+the user authenticated from the token, and `replica_reads` checks it. The
+"pins" cache is shared by the server processes, since a user's next read
+can be served by any of them.
+"""
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+_target = ContextVar("read_database", default=None)
+
+
+@contextmanager
+def read_from_replica():
+    """Route the reads made inside the block to the replica, unless pinned."""
+    token = _target.set(_target.get() or REPLICA)
+    try:
+        yield
+    finally:
+        _target.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Route the reads made inside the block to the primary."""
+    token = _target.set(PRIMARY)
+    try:
+        yield
+    finally:
+        _target.reset(token)
+
+
+def _pin_key(user) -> str:
+    return f"primary_pin:{user.pk}"
+
+
+def _user(request):
+    user = getattr(request, "user", None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def pin_to_primary(request) -> None:
+    """Pin the user who made `request` to the primary for a while."""
+    user = _user(request)
+    if user is not None:
+        caches["pins"].set(_pin_key(user), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(request) -> bool:
+    """Whether the user who made `request` wrote recently."""
+    user = _user(request)
+    return user is not None and bool(caches["pins"].get(_pin_key(user)))
+
+
+def request_reads(request):
+    """Context manager routing reads for `request` to the replica unless pinned."""
+    return read_from_primary() if is_pinned(request) else read_from_replica()
+
+
+def replica_reads(view_method):
+    """
+    View method decorator running the view's reads on the replica, or on
+    the primary when the user is pinned.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        with request_reads(request):
+            return view_method(self, request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """Send replica-marked reads to DATABASE_REPLICA; everything else to default."""
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICA and _target.get() == REPLICA:
+            return settings.DATABASE_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.DATABASE_REPLICA:
+            return False
+        return None
+
+
+class PrimaryPinMiddleware:
+    """Pin users to the primary after a successful write request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self._pin(request, response)
+        return response
+
+    @staticmethod
+    def _pin(request, response) -> None:
+        if settings.DATABASE_REPLICA and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            pin_to_primary(request)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# config/schema_compiler.py
+
+"""Compiled Schema Validators
+
+Generates a specialized Python function for each table's JSON schema, so a
+row is checked with straight-line code instead of walking the schema tree
+the way `jsonschema.Draft7Validator.iter_errors` does for every row. A
+compiled function returns the same `"[path]: message"` strings, in the same
+order, as TableValidator built from the Draft 7 validator.
+
+Only the keywords the table schemas use are compiled: type, enum, pattern,
+required, properties and items. A schema using any other validating keyword
+raises NotCompilable and is validated with jsonschema instead, as is every
+schema when the COMPILED_SCHEMA_VALIDATORS setting is off.
+"""
+
+import functools
+import numbers
+import os
+import re
+
+import jsonref
+import jsonschema
+from django.conf import settings
+
+# Keywords Draft7Validator does not assert, and `x-` extensions
+ANNOTATION_KEYWORDS = {
+    "$schema", "$id", "$comment", "title", "version", "description", "examples", "default", "definitions", "format",
+}
+
+_TYPE_CHECKS = {
+    "string": "isinstance({value}, str)",
+    "number": "({value}.__class__ in _NUMBERS or _is_number({value}))",
+    "integer": "({value}.__class__ is int or _is_integer({value}))",
+    "boolean": "isinstance({value}, bool)",
+    "array": "isinstance({value}, list)",
+    "object": "isinstance({value}, dict)",
+    "null": "{value} is None",
+}
+
+
+class NotCompilable(Exception):
+    """Raised when a schema uses a keyword the compiler does not support."""
+
+
+def _is_number(value) -> bool:
+    return not isinstance(value, bool) and isinstance(value, numbers.Number)
+
+
+def _is_integer(value) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, int)
+
+
+def _prefix(path: tuple) -> str:
+    return f"{list(path)}: "
+
+
+class _Compiler:
+    """Writes the source of one validation function."""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            "_NUMBERS": frozenset((int, float)),
+            "_is_number": _is_number,
+            "_is_integer": _is_integer,
+            "_prefix": _prefix,
+        }
+        self.depth = 0
+
+    def constant(self, value) -> str:
+        name = f"_K{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def node(self, schema, value: str, path: tuple, indent: int):
+        """Emit the checks of `schema` on the variable named `value`."""
+        if not isinstance(schema, dict):
+            raise NotCompilable(f"Boolean schema at {list(path)}")
+        if "$ref" in schema:
+            raise NotCompilable(f"$ref at {list(path)}")
+        if any(isinstance(part, tuple) for part in path):
+            parts = ", ".join(part[0] if isinstance(part, tuple) else repr(part) for part in path)
+            prefix = f"_prefix(({parts},))"
+        else:
+            prefix = repr(_prefix(path))
+
+        # Errors follow the order of the keywords in the schema, as in jsonschema
+        for keyword, argument in schema.items():
+            if keyword in ANNOTATION_KEYWORDS or keyword.startswith("x-"):
+                continue
+            handler = getattr(self, f"keyword_{keyword}", None)
+            if handler is None:
+                raise NotCompilable(f"Unsupported keyword {keyword!r} at {list(path)}")
+            handler(argument, value, path, prefix, indent)
+
+    def keyword_type(self, types, value, path, prefix, indent):
+        types = [types] if isinstance(types, str) else list(types)
+        if not types or any(type_name not in _TYPE_CHECKS for type_name in types):
+            raise NotCompilable(f"Unsupported type {types!r} at {list(path)}")
+        check = " or ".join(_TYPE_CHECKS[type_name].format(value=value) for type_name in types)
+        message = " is not of type " + ", ".join(repr(type_name) for type_name in types)
+        self.emit(indent, f"if not ({check}):")
+        self.emit(indent + 1, f"append({prefix} + repr({value}) + {message!r})")
+
+    def keyword_enum(self, enums, value, path, prefix, indent):
+        # jsonschema compares strings with ==, so a string-only enum is a set lookup
+        if not isinstance(enums, list) or not all(isinstance(each, str) for each in enums):
+            raise NotCompilable(f"Non-string enum at {list(path)}")
+        allowed = self.constant(frozenset(enums))
+        message = f" is not one of {enums!r}"
+        self.emit(indent, f"if not (isinstance({value}, str) and {value} in {allowed}):")
+        self.emit(indent + 1, f"append({prefix} + repr({value}) + {message!r})")
+
+    def keyword_pattern(self, pattern, value, path, prefix, indent):
+        search = self.constant(re.compile(pattern).search)
+        message = f" does not match {pattern!r}"
+        self.emit(indent, f"if isinstance({value}, str) and {search}({value}) is None:")
+        self.emit(indent + 1, f"append({prefix} + repr({value}) + {message!r})")
+
+    def keyword_required(self, required, value, path, prefix, indent):
+        if not required:
+            return
+        self.emit(indent, f"if isinstance({value}, dict):")
+        for field in required:
+            self.emit(indent + 1, f"if {field!r} not in {value}:")
+            message = f"{field!r} is a required property"
+            self.emit(indent + 2, f"append({prefix} + {message!r})")
+
+    def keyword_properties(self, properties, value, path, prefix, indent):
+        if not properties:
+            return
+        self.emit(indent, f"if isinstance({value}, dict):")
+        self.depth += 1
+        child = f"v{self.depth}"
+        for field, subschema in properties.items():
+            self.emit(indent + 1, f"if {field!r} in {value}:")
+            self.emit(indent + 2, f"{child} = {value}[{field!r}]")
+            start = len(self.lines)
+            self.node(subschema, child, path + (field,), indent + 2)
+            if len(self.lines) == start:
+                # Nothing to check: drop the lookup
+                self.lines[-1] = "    " * (indent + 2) + "pass"
+        self.depth -= 1
+
+    def keyword_items(self, items, value, path, prefix, indent):
+        if not isinstance(items, dict):
+            raise NotCompilable(f"Tuple or boolean items at {list(path)}")
+        self.depth += 1
+        child, index = f"v{self.depth}", f"i{self.depth}"
+        self.emit(indent, f"if isinstance({value}, list):")
+        self.emit(indent + 1, f"for {index}, {child} in enumerate({value}):")
+        start = len(self.lines)
+        self.node(items, child, path + ((index,),), indent + 2)
+        if len(self.lines) == start:
+            self.emit(indent + 2, "pass")
+        self.depth -= 1
+
+
+def compile_schema(schema: dict, name: str = "validate"):
+    """
+    Compile a Draft 7 JSON schema into a validation function.
+
+    Args:
+        schema (dict): The JSON schema.
+        name (str, optional): Name of the generated function.
+
+    Returns:
+        function: Takes an instance and returns its errors as a list of
+        `"[path]: message"` strings, empty when it is valid. The generated
+        code is on its `source` attribute.
+
+    Raises:
+        NotCompilable: If the schema uses an unsupported keyword.
+    """
+    compiler = _Compiler()
+    compiler.emit(0, f"def {name}(v0):")
+    compiler.emit(1, "errors = []")
+    compiler.emit(1, "append = errors.append")
+    compiler.node(schema, "v0", (), 1)
+    compiler.emit(1, "return errors")
+    source = "\n".join(compiler.lines) + "\n"
+    exec(compile(source, f"<schema {name}>", "exec"), compiler.namespace)
+    function = compiler.namespace[name]
+    function.source = source
+    return function
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema(table_name: str) -> dict:
+    """Load a table's JSON schema, once per process."""
+    schema_path = os.path.join(
+        settings.BASE_DIR, f"utilities/json_schemas/{settings.SCHEMA_VERSION}/{table_name}.json"
+    )
+    with open(schema_path, "r") as schema_file:
+        return jsonref.load(schema_file)
+
+
+@functools.lru_cache(maxsize=None)
+def draft7_validator(table_name: str) -> jsonschema.Draft7Validator:
+    """Return the jsonschema Draft 7 validator of a table's schema."""
+    return jsonschema.Draft7Validator(load_schema(table_name))
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_validator(table_name: str):
+    """Return the compiled validator of a table's schema, or None if it cannot be compiled."""
+    try:
+        return compile_schema(load_schema(table_name), name=f"validate_{table_name}")
+    except NotCompilable:
+        return None
+
+
+def schema_errors(json_object, table_name: str, compiled: bool = None) -> list:
+    """
+    Validate a JSON object against a table's schema.
+
+    Args:
+        json_object: The object to validate.
+        table_name (str): Name of the table whose schema applies.
+        compiled (bool, optional): Use the compiled validator; defaults to
+            the COMPILED_SCHEMA_VALIDATORS setting.
+
+    Returns:
+        list: Errors as `"[path]: message"` strings, empty when valid.
+
+    Raises:
+        FileNotFoundError: If the table has no schema.
+    """
+    if compiled is None:
+        compiled = settings.COMPILED_SCHEMA_VALIDATORS
+    validator = compiled_validator(table_name) if compiled else None
+    if validator is not None:
+        return validator(json_object)
+    return [
+        f"{list(error.path)}: {error.message}"
+        for error in draft7_validator(table_name).iter_errors(json_object)
+    ]
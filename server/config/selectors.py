@@ -2,16 +2,16 @@
 # config/selectors.py
 
 import csv
-import os
 from io import StringIO, BytesIO
 import zipfile
-import jsonref
 import jsonschema
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from rest_framework import status
-from requests.models import PreparedRequest
 from django.conf import settings
+from config.bucket_paths import bucket_path_error, bucket_path_errors
+from config.query_budget import query_budget
+from config.schema_compiler import schema_errors
 
 """DB Level Services
 
@@ -20,7 +20,6 @@ from django.conf import settings
     API data conversion, and constructing standardized response objects.
 """
 
-SCHEMA_VERSION = settings.SCHEMA_VERSION
 
 class TableValidator:
     """
@@ -36,8 +35,7 @@ class TableValidator:
     """
 
     def __init__(self):
-        """Initializes the TableValidator with the path to JSON schemas."""
-        self.base_path = os.path.join(settings.BASE_DIR, f"utilities/json_schemas/{SCHEMA_VERSION}")
+        """Initializes the TableValidator with no results."""
         self.valid = False
         self.errors = []
 
@@ -49,6 +47,9 @@ class TableValidator:
         to the specified table name. It updates the instance's `valid` and `errors` attributes
         based on the validation results.
 
+        Schemas are loaded and compiled once per process by `load_schema`, so
+        edits to a schema file take effect after a server restart.
+
         Args:
             json_object (dict): The JSON object to be validated.
             table_name (str): The name of the table which corresponds to the schema file.
@@ -56,16 +57,8 @@ class TableValidator:
         Returns:
             None
         """
-        schema_path = os.path.join(self.base_path, f"{table_name}.json")
         try:
-            with open(schema_path, "r") as schema_file:
-                schema = jsonref.load(schema_file)
-
-            validator = jsonschema.Draft7Validator(schema)
-            self.errors = [
-                f"{list(error.path)}: {error.message}"
-                for error in validator.iter_errors(json_object)
-            ]
+            self.errors = schema_errors(json_object, table_name)
             self.valid = len(self.errors) == 0
 
         except jsonschema.exceptions.ValidationError as e:
@@ -104,50 +97,6 @@ class TableValidator:
         return {"valid": self.valid, "errors": error_data}
 
 
-def remove_na(datum: dict) -> dict:
-    """
-    Remove 'NA' values from submissions.
-
-    This function iterates through a list of submissions and removes any entries
-    that have a value of 'NA'.
-
-    Args:
-        submissions (list): A list of submissions to process.
-
-    Returns:
-        list: The list of submissions with 'NA' values removed.
-    """
-
-    parsed_datum = {k: v for k, v in datum.items() if v not in ("NA", "", ["NA"], [""], None, [None])}
-
-    return parsed_datum
-
-
-def multi_value_split(datum: dict) -> dict:
-    """Multi valu split
-    """
-    split_datum = {}
-
-    for k, v in datum.items():
-        if type(v) is str:
-            if '|' in v:
-                try:
-                    split_datum[k] = [item.strip() for item in v.split('|')]
-                except TypeError:
-                    split_datum[k] = v
-                except AttributeError:
-                    pass
-                except Exception as oops:
-                    error = oops
-                    print(error, k, v)
-            else:
-                split_datum[k] = v.strip()
-        else:
-                split_datum[k] = v
-
-    return split_datum
-
-
 def response_status(accepted_requests: bool, rejected_requests: bool) -> status:
     """Determine Response Status
 
@@ -222,13 +171,37 @@ def response_constructor(
     return response_object
 
 
-from requests.models import PreparedRequest
-from django.core.exceptions import ValidationError
-from urllib.parse import urlparse
+def bucket_path_rejections(table_name: str, rows, identifier_field: str) -> dict:
+    """
+    Check the bucket path columns of a batch of submitted rows at once.
+
+    Used by the create and update APIs and by TableConverter before rows
+    are ingested one at a time.
+
+    Args:
+        table_name (str): Name of the table the rows are submitted to.
+        rows (list): Submitted rows as dictionaries.
+        identifier_field (str): Column holding each row's identifier.
+
+    Returns:
+        dict: For each row index with an invalid path, its BAD REQUEST
+        response listing the invalid fields.
+    """
+    return {
+        index: response_constructor(
+            identifier=rows[index].get(identifier_field),
+            request_status="BAD REQUEST",
+            code=400,
+            data=errors,
+        )
+        for index, errors in bucket_path_errors(table_name, rows).items()
+    }
+
 
 def validate_url(url):
     """
-    Validates that a given URL is correctly formatted according to standard URL structure.
+    Validates that a given URL is a well formed gs://, s3:// or http(s) path,
+    as the schemas' `x-is_bucket_path` rule requires.
 
     Parameters:
     - url (str): The URL to be validated.
@@ -240,21 +213,9 @@ def validate_url(url):
     - ValidationError: If the URL is invalid.
     """
 
-    if not isinstance(url, str) or not url.strip():
-        raise ValidationError("Invalid URL: URL must be a non-empty string.")
-
-    parsed_url = urlparse(url)
-
-    if not parsed_url.scheme or not parsed_url.netloc:
-        raise ValidationError(f"'{url}' is not a valid URL.")
-
-    prepared_request = PreparedRequest()
-
-    try:
-        prepared_request.prepare_url(url, None)
-    except Exception as exc:
-        raise ValidationError(f"'{url}' is not a valid URL. Error: {str(exc)}")
-
+    error = bucket_path_error(url)
+    if error is not None:
+        raise ValidationError(error)
     return True
 
 
@@ -364,9 +325,11 @@ def bulk_model_retrieve(request_data: list, model_class, id: str) -> dict:
     return model_dict
 
 
+@query_budget(max_queries=1)
 def bulk_retrieve(model_class, id_list: list, id_field: str = "id") -> dict:
     """
     Retrieve multiple instances of a Django model class based on a list of IDs.
+    The IDs come from a query string, so they are fetched in one query.
 
     Args:
         model_class (models.Model): The Django model class to query.
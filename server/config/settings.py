@@ -5,8 +5,10 @@ Generated by 'django-admin startproject' using Django 5.0.1.
 """
 
 import os
+import sys
 import configparser
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -68,12 +70,74 @@ SHOW_ACTIVATION_LINKS = DEBUG
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": secrets.get("SERVER", "DATABASE", fallback=os.path.join(BASE_DIR, "db.sqlite3")),
+# The optional [DATABASE] section selects the engine. "sqlite" (default)
+# uses the file named by SERVER.DATABASE; "postgresql" a database server,
+# with persistent, health-checked connections. SQLite connections are tuned
+# with the SQLITE_PRAGMAS below by config.database.configure_sqlite.
+DATABASE_ENGINE = secrets.get("DATABASE", "ENGINE", fallback="sqlite")
+if DATABASE_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": secrets.get("DATABASE", "NAME", fallback="gregor"),
+            "USER": secrets.get("DATABASE", "USER", fallback=""),
+            "PASSWORD": secrets.get("DATABASE", "PASSWORD", fallback=""),
+            "HOST": secrets.get("DATABASE", "HOST", fallback="localhost"),
+            "PORT": secrets.get("DATABASE", "PORT", fallback="5432"),
+            "CONN_MAX_AGE": int(secrets.get("DATABASE", "CONN_MAX_AGE", fallback="60")),
+            "CONN_HEALTH_CHECKS": secrets.getboolean("DATABASE", "CONN_HEALTH_CHECKS", fallback=True),
+        }
+    }
+elif DATABASE_ENGINE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": secrets.get("SERVER", "DATABASE", fallback=os.path.join(BASE_DIR, "db.sqlite3")),
+            "CONN_MAX_AGE": int(secrets.get("DATABASE", "CONN_MAX_AGE", fallback="0")),
+            "CONN_HEALTH_CHECKS": secrets.getboolean("DATABASE", "CONN_HEALTH_CHECKS", fallback=False),
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"DATABASE.ENGINE must be sqlite or postgresql, not {DATABASE_ENGINE!r}")
+
+# Optional replica for the search reads and exports (config/routers.py): a
+# PostgreSQL server at DATABASE.REPLICA_HOST, or a read-only connection to
+# the SQLite file. Tests use the default database for both aliases.
+DATABASE_REPLICA = None
+if DATABASE_ENGINE == "postgresql" and secrets.get("DATABASE", "REPLICA_HOST", fallback=None):
+    DATABASE_REPLICA = "replica"
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": secrets.get("DATABASE", "REPLICA_HOST"),
+        "PORT": secrets.get("DATABASE", "REPLICA_PORT", fallback=DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
     }
+elif DATABASE_ENGINE == "sqlite" and secrets.getboolean("DATABASE", "SQLITE_READ_ONLY_REPLICA", fallback=False):
+    DATABASE_REPLICA = "replica"
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": f"file:{DATABASES['default']['NAME']}?mode=ro",
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+# Seconds a client reads from the primary after a write
+REPLICA_PIN_SECONDS = int(secrets.get("DATABASE", "REPLICA_PIN_SECONDS", fallback="10"))
+
+# Opt-in SQLite tuning. WAL lets readers continue while a worker writes;
+# synchronous=NORMAL is durable in WAL mode except on power loss. cache_size
+# is negative KiB.
+SQLITE_TUNED_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(secrets.get("DATABASE", "SQLITE_BUSY_TIMEOUT", fallback="5000")),
+    "cache_size": -int(secrets.get("DATABASE", "SQLITE_CACHE_SIZE_KB", fallback="65536")),
+    "mmap_size": int(secrets.get("DATABASE", "SQLITE_MMAP_SIZE", fallback=str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
 }
+if secrets.getboolean("DATABASE", "SQLITE_TUNED", fallback=False):
+    SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
+else:
+    SQLITE_PRAGMAS = {}
 
 # Application definition
 
@@ -91,13 +155,16 @@ INSTALLED_APPS = [
     "rest_framework.authtoken",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
-    "authentication",
+    "authentication.apps.Authentication",
     "metadata.apps.Metadata",
     "experiments.apps.Experiment",
+    "search.apps.Search",
     "submodels"
 ]
 
 MIDDLEWARE = [
+    "config.middleware.RequestTimingMiddleware",
+    "config.middleware.IngestProfileMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -105,6 +172,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.routers.PrimaryPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -171,18 +239,133 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Per-request SQL and timing instrumentation (config/middleware.py). A
+# sampled request gets a Server-Timing header and a JSON line on the
+# "request_timing" logger.
+REQUEST_TIMING_ENABLED = secrets.getboolean("SERVER", "REQUEST_TIMING_ENABLED", fallback=False)
+REQUEST_TIMING_SAMPLE_RATE = float(secrets.get("SERVER", "REQUEST_TIMING_SAMPLE_RATE", fallback="1.0"))
+REQUEST_TIMING_SLOW_QUERIES = int(secrets.get("SERVER", "REQUEST_TIMING_SLOW_QUERIES", fallback="5"))
+
+# Raise QueryBudgetExceeded when a query_budget (config/query_budget.py) is
+# exceeded; log a warning instead when off
+QUERY_BUDGET_RAISE = secrets.getboolean("SERVER", "QUERY_BUDGET_RAISE", fallback=DEBUG)
+
+# Validate rows with schemas compiled to Python functions
+# (config/schema_compiler.py); jsonschema's Draft 7 validator when off
+COMPILED_SCHEMA_VALIDATORS = secrets.getboolean("SERVER", "COMPILED_SCHEMA_VALIDATORS", fallback=True)
+
+# Per-stage profiling of metadata and experiment writes (config/ingest_profile.py):
+# "off", "header" (requests sent with X-Ingest-Profile) or "always"
+INGEST_PROFILE = secrets.get("SERVER", "INGEST_PROFILE", fallback="off")
+INGEST_PROFILE_DIR = secrets.get("SERVER", "INGEST_PROFILE_DIR", fallback=None)
+
+# `manage.py test` drops the request_timing lines; tests capture them with
+# assertLogs
+TESTING = sys.argv[1:2] == ["test"]
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "null": {"class": "logging.NullHandler"},
+    },
+    "loggers": {
+        "request_timing": {
+            "handlers": ["null"] if TESTING else ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "query_budget": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+        "ingest_profile": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The "responses" cache holds serialized read responses keyed by table
+# generation. With the local-memory backend, a CULL_FREQUENCY equal to
+# MAX_ENTRIES evicts only the least recently used entry when full.
+RESPONSE_CACHE_ENABLED = secrets.getboolean("CACHE", "RESPONSE_CACHE_ENABLED", fallback=True)
+RESPONSE_CACHE_MAX_ENTRIES = int(secrets.get("CACHE", "RESPONSE_CACHE_MAX_ENTRIES", fallback="500"))
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Cache of User rows for the stateless JWT authentication. In-process by
+    # default, where a change to a User reaches other workers only when their
+    # entry expires; use a shared backend to make it visible at once
+    "users": {
+        "BACKEND": secrets.get(
+            "CACHE", "USER_CACHE_BACKEND",
+            fallback="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": secrets.get("CACHE", "USER_CACHE_LOCATION", fallback="users"),
+        "TIMEOUT": int(secrets.get("CACHE", "USER_CACHE_TIMEOUT", fallback="60")),
+    },
+    # Clients pinned to the primary after a write (config/routers.py). With a
+    # replica this must be shared by every server process
+    "pins": {
+        "BACKEND": secrets.get(
+            "CACHE", "PIN_CACHE_BACKEND",
+            fallback="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": secrets.get("CACHE", "PIN_CACHE_LOCATION", fallback="pins"),
+    },
+    "responses": {
+        "BACKEND": secrets.get(
+            "CACHE", "RESPONSE_CACHE_BACKEND",
+            fallback="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": secrets.get("CACHE", "RESPONSE_CACHE_LOCATION", fallback="responses"),
+        "TIMEOUT": int(secrets.get("CACHE", "RESPONSE_CACHE_TIMEOUT", fallback="3600")),
+        "OPTIONS": {
+            "MAX_ENTRIES": RESPONSE_CACHE_MAX_ENTRIES,
+            "CULL_FREQUENCY": RESPONSE_CACHE_MAX_ENTRIES,
+        },
+    },
+}
+
+# A pin written by one process must be seen by the others
+if DATABASE_REPLICA and CACHES["pins"]["BACKEND"] in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+):
+    raise ImproperlyConfigured(
+        "A database replica needs a shared CACHE.PIN_CACHE_BACKEND, not "
+        f"{CACHES['pins']['BACKEND']!r}"
+    )
+
 # https://styria-digital.github.io/django-rest-framework-jwt/
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "authentication.services.CustomAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
         "rest_framework.authentication.TokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ),
 }
 
+# Build the request user from the access token claims instead of loading it
+# from the database on every request
+STATELESS_JWT_AUTH = secrets.getboolean("SERVER", "STATELESS_JWT_AUTH", fallback=True)
+
+# Seconds between polls of the token blacklist table for JTIs blacklisted by
+# other server processes
+TOKEN_BLACKLIST_POLL_INTERVAL = int(secrets.get("SERVER", "TOKEN_BLACKLIST_POLL_INTERVAL", fallback="5"))
+
+# Seconds of blacklist rows re-read on every poll, so a row whose transaction
+# committed after the previous poll, with an earlier timestamp, is still seen
+TOKEN_BLACKLIST_POLL_OVERLAP = int(secrets.get("SERVER", "TOKEN_BLACKLIST_POLL_OVERLAP", fallback="60"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1), #seconds=1000),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 # experiments/apis.py
 
-from config.selectors import TableValidator, response_constructor, response_status
+from config.selectors import TableValidator, bucket_path_rejections, response_constructor, response_status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from authentication.services import StatelessJWTAuthentication
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -46,10 +46,12 @@ from experiments.services import (
     create_or_update_alignment
 )
 from experiments.selectors import get_experiment
+from search.selectors import cached_table_response, conditional_table_get
+from search.services import summary_batch
 
 
 class ExperimentRNAShortReadViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -58,13 +60,18 @@ class ExperimentRNAShortReadViewSet(viewsets.ViewSet):
         tags=["ExperimentRNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_experiment_rna_short_read(self, request):
         experiment_rna_short_read = bulk_model_retrieve(request.data, ExperimentRNAShortRead, "experiment_rna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_rna_short_read", request.data, "experiment_rna_short_read_id")
+        for index, datum in enumerate(request.data):
             experiment_rna_short_read_id = datum.get("experiment_rna_short_read_id")
-            if experiment_rna_short_read_id and experiment_rna_short_read_id in experiment_rna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_rna_short_read_id and experiment_rna_short_read_id in experiment_rna_short_read:
                 response_data.append(response_constructor(
                     identifier=experiment_rna_short_read_id,
                     request_status="BAD REQUEST",
@@ -90,6 +97,8 @@ class ExperimentRNAShortReadViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["ExperimentRNAShortRead"]
     )
+    @conditional_table_get("experiment_rna_short_read")
+    @cached_table_response("experiment_rna_short_read")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         experiment_rna_short_read = bulk_retrieve(ExperimentRNAShortRead, ids, "experiment_rna_short_read_id")
@@ -121,13 +130,18 @@ class ExperimentRNAShortReadViewSet(viewsets.ViewSet):
         tags=["ExperimentRNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_experiment_rna_short_read(self, request):
         experiment_rna_short_read = bulk_model_retrieve(request.data, ExperimentRNAShortRead, "experiment_rna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_rna_short_read", request.data, "experiment_rna_short_read_id")
+        for index, datum in enumerate(request.data):
             experiment_rna_short_read_id = datum.get("experiment_rna_short_read_id")
-            if experiment_rna_short_read_id not in experiment_rna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_rna_short_read_id not in experiment_rna_short_read:
                 response_data.append(response_constructor(
                     identifier=experiment_rna_short_read_id,
                     request_status="BAD REQUEST",
@@ -193,7 +207,7 @@ class ExperimentRNAShortReadViewSet(viewsets.ViewSet):
 
 
 class AlignedRNAShortReadViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -202,13 +216,18 @@ class AlignedRNAShortReadViewSet(viewsets.ViewSet):
         tags=["AlignedRNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_aligned_rna_short_read(self, request):
         aligned_rna_short_read = bulk_model_retrieve(request.data, AlignedRNAShortRead, "aligned_rna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_rna_short_read", request.data, "aligned_rna_short_read_id")
+        for index, datum in enumerate(request.data):
             aligned_rna_short_read_id = datum.get("aligned_rna_short_read_id")
-            if aligned_rna_short_read_id and aligned_rna_short_read_id in aligned_rna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_rna_short_read_id and aligned_rna_short_read_id in aligned_rna_short_read:
                 response_data.append(response_constructor(
                     identifier=aligned_rna_short_read_id,
                     request_status="BAD REQUEST",
@@ -234,6 +253,8 @@ class AlignedRNAShortReadViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["AlignedRNAShortRead"]
     )
+    @conditional_table_get("aligned_rna_short_read")
+    @cached_table_response("aligned_rna_short_read")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         aligned_rna_short_read = bulk_retrieve(AlignedRNAShortRead, ids, "aligned_rna_short_read_id")
@@ -265,13 +286,18 @@ class AlignedRNAShortReadViewSet(viewsets.ViewSet):
         tags=["AlignedRNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_aligned_rna_short_read(self, request):
         aligned_rna_short_read = bulk_model_retrieve(request.data, AlignedRNAShortRead, "aligned_rna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_rna_short_read", request.data, "aligned_rna_short_read_id")
+        for index, datum in enumerate(request.data):
             aligned_rna_short_read_id = datum.get("aligned_rna_short_read_id")
-            if aligned_rna_short_read_id not in aligned_rna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_rna_short_read_id not in aligned_rna_short_read:
                 response_data.append(response_constructor(
                     identifier=aligned_rna_short_read_id,
                     request_status="BAD REQUEST",
@@ -337,7 +363,7 @@ class AlignedRNAShortReadViewSet(viewsets.ViewSet):
 
 
 class ExperimentDNAShortReadViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -346,13 +372,18 @@ class ExperimentDNAShortReadViewSet(viewsets.ViewSet):
         tags=["ExperimentDNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_experiment_dna_short_read(self, request):
         experiment_dna_short_read = bulk_model_retrieve(request.data, ExperimentDNAShortRead, "experiment_dna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_dna_short_read", request.data, "experiment_dna_short_read_id")
+        for index, datum in enumerate(request.data):
             experiment_dna_short_read_id = datum.get("experiment_dna_short_read_id")
-            if experiment_dna_short_read_id and experiment_dna_short_read_id in experiment_dna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_dna_short_read_id and experiment_dna_short_read_id in experiment_dna_short_read:
                 response_data.append(response_constructor(
                     identifier=experiment_dna_short_read_id,
                     request_status="BAD REQUEST",
@@ -378,6 +409,8 @@ class ExperimentDNAShortReadViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["ExperimentDNAShortRead"]
     )
+    @conditional_table_get("experiment_dna_short_read")
+    @cached_table_response("experiment_dna_short_read")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         experiment_dna_short_read = bulk_retrieve(ExperimentDNAShortRead, ids, "experiment_dna_short_read_id")
@@ -409,13 +442,18 @@ class ExperimentDNAShortReadViewSet(viewsets.ViewSet):
         tags=["ExperimentDNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_experiment_dna_short_read(self, request):
         experiment_dna_short_read = bulk_model_retrieve(request.data, ExperimentDNAShortRead, "experiment_dna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_dna_short_read", request.data, "experiment_dna_short_read_id")
+        for index, datum in enumerate(request.data):
             experiment_dna_short_read_id = datum.get("experiment_dna_short_read_id")
-            if experiment_dna_short_read_id not in experiment_dna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_dna_short_read_id not in experiment_dna_short_read:
                 response_data.append(response_constructor(
                     identifier=experiment_dna_short_read_id,
                     request_status="BAD REQUEST",
@@ -481,7 +519,7 @@ class ExperimentDNAShortReadViewSet(viewsets.ViewSet):
 
 
 class AlignedDNAShortReadViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -490,13 +528,18 @@ class AlignedDNAShortReadViewSet(viewsets.ViewSet):
         tags=["AlignedDNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_aligned_dna_short_read(self, request):
         aligned_dna_short_read = bulk_model_retrieve(request.data, AlignedDNAShortRead, "aligned_dna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_dna_short_read", request.data, "aligned_dna_short_read_id")
+        for index, datum in enumerate(request.data):
             aligned_dna_short_read_id = datum.get("aligned_dna_short_read_id")
-            if aligned_dna_short_read_id and aligned_dna_short_read_id in aligned_dna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_dna_short_read_id and aligned_dna_short_read_id in aligned_dna_short_read:
                 response_data.append(response_constructor(
                     identifier=aligned_dna_short_read_id,
                     request_status="BAD REQUEST",
@@ -522,6 +565,8 @@ class AlignedDNAShortReadViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["AlignedDNAShortRead"]
     )
+    @conditional_table_get("aligned_dna_short_read")
+    @cached_table_response("aligned_dna_short_read")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         aligned_dna_short_read = bulk_retrieve(AlignedDNAShortRead, ids, "aligned_dna_short_read_id")
@@ -553,13 +598,18 @@ class AlignedDNAShortReadViewSet(viewsets.ViewSet):
         tags=["AlignedDNAShortRead"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_aligned_dna_short_read(self, request):
         aligned_dna_short_read = bulk_model_retrieve(request.data, AlignedDNAShortRead, "aligned_dna_short_read_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_dna_short_read", request.data, "aligned_dna_short_read_id")
+        for index, datum in enumerate(request.data):
             aligned_dna_short_read_id = datum.get("aligned_dna_short_read_id")
-            if aligned_dna_short_read_id not in aligned_dna_short_read:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_dna_short_read_id not in aligned_dna_short_read:
                 response_data.append(response_constructor(
                     identifier=aligned_dna_short_read_id,
                     request_status="BAD REQUEST",
@@ -625,7 +675,7 @@ class AlignedDNAShortReadViewSet(viewsets.ViewSet):
 
 
 class ExperimentPacBioViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -634,13 +684,18 @@ class ExperimentPacBioViewSet(viewsets.ViewSet):
         tags=["ExperimentPacBio"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_experiment_pac_bio(self, request):
         experiment_pac_bio = bulk_model_retrieve(request.data, ExperimentPacBio, "experiment_pac_bio_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_pac_bio", request.data, "experiment_pac_bio_id")
+        for index, datum in enumerate(request.data):
             experiment_pac_bio_id = datum.get("experiment_pac_bio_id")
-            if experiment_pac_bio_id and experiment_pac_bio_id in experiment_pac_bio:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_pac_bio_id and experiment_pac_bio_id in experiment_pac_bio:
                 response_data.append(response_constructor(
                     identifier=experiment_pac_bio_id,
                     request_status="BAD REQUEST",
@@ -666,6 +721,8 @@ class ExperimentPacBioViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["ExperimentPacBio"]
     )
+    @conditional_table_get("experiment_pac_bio")
+    @cached_table_response("experiment_pac_bio")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         experiment_pac_bio = bulk_retrieve(ExperimentPacBio, ids, "experiment_pac_bio_id")
@@ -697,13 +754,18 @@ class ExperimentPacBioViewSet(viewsets.ViewSet):
         tags=["ExperimentPacBio"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_experiment_pac_bio(self, request):
         experiment_pac_bio = bulk_model_retrieve(request.data, ExperimentPacBio, "experiment_pac_bio_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_pac_bio", request.data, "experiment_pac_bio_id")
+        for index, datum in enumerate(request.data):
             experiment_pac_bio_id = datum.get("experiment_pac_bio_id")
-            if experiment_pac_bio_id not in experiment_pac_bio:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_pac_bio_id not in experiment_pac_bio:
                 response_data.append(response_constructor(
                     identifier=experiment_pac_bio_id,
                     request_status="BAD REQUEST",
@@ -769,7 +831,7 @@ class ExperimentPacBioViewSet(viewsets.ViewSet):
 
 
 class AlignedPacBioViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -778,13 +840,18 @@ class AlignedPacBioViewSet(viewsets.ViewSet):
         tags=["AlignedPacBio"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_aligned_pac_bio(self, request):
         aligned_pac_bio = bulk_model_retrieve(request.data, AlignedPacBio, "aligned_pac_bio_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_pac_bio", request.data, "aligned_pac_bio_id")
+        for index, datum in enumerate(request.data):
             aligned_pac_bio_id = datum.get("aligned_pac_bio_id")
-            if aligned_pac_bio_id and aligned_pac_bio_id in aligned_pac_bio:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_pac_bio_id and aligned_pac_bio_id in aligned_pac_bio:
                 response_data.append(response_constructor(
                     identifier=aligned_pac_bio_id,
                     request_status="BAD REQUEST",
@@ -810,6 +877,8 @@ class AlignedPacBioViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["AlignedPacBio"]
     )
+    @conditional_table_get("aligned_pac_bio")
+    @cached_table_response("aligned_pac_bio")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         aligned_pac_bio = bulk_retrieve(AlignedPacBio, ids, "aligned_pac_bio_id")
@@ -841,13 +910,18 @@ class AlignedPacBioViewSet(viewsets.ViewSet):
         tags=["AlignedPacBio"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_aligned_pac_bio(self, request):
         aligned_pac_bio = bulk_model_retrieve(request.data, AlignedPacBio, "aligned_pac_bio_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_pac_bio", request.data, "aligned_pac_bio_id")
+        for index, datum in enumerate(request.data):
             aligned_pac_bio_id = datum.get("aligned_pac_bio_id")
-            if aligned_pac_bio_id not in aligned_pac_bio:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_pac_bio_id not in aligned_pac_bio:
                 response_data.append(response_constructor(
                     identifier=aligned_pac_bio_id,
                     request_status="BAD REQUEST",
@@ -913,7 +987,7 @@ class AlignedPacBioViewSet(viewsets.ViewSet):
 
 
 class ExperimentNanoporeViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -922,13 +996,18 @@ class ExperimentNanoporeViewSet(viewsets.ViewSet):
         tags=["ExperimentNanopore"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_experiment_nanopore(self, request):
         experiment_nanopore = bulk_model_retrieve(request.data, ExperimentNanopore, "experiment_nanopore_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_nanopore", request.data, "experiment_nanopore_id")
+        for index, datum in enumerate(request.data):
             experiment_nanopore_id = datum.get("experiment_nanopore_id")
-            if experiment_nanopore_id and experiment_nanopore_id in experiment_nanopore:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_nanopore_id and experiment_nanopore_id in experiment_nanopore:
                 response_data.append(response_constructor(
                     identifier=experiment_nanopore_id,
                     request_status="BAD REQUEST",
@@ -954,6 +1033,8 @@ class ExperimentNanoporeViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["ExperimentNanopore"]
     )
+    @conditional_table_get("experiment_nanopore")
+    @cached_table_response("experiment_nanopore")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         experiment_nanopore = bulk_retrieve(ExperimentNanopore, ids, "experiment_nanopore_id")
@@ -985,13 +1066,18 @@ class ExperimentNanoporeViewSet(viewsets.ViewSet):
         tags=["ExperimentNanopore"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_experiment_nanopore(self, request):
         experiment_nanopore = bulk_model_retrieve(request.data, ExperimentNanopore, "experiment_nanopore_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("experiment_nanopore", request.data, "experiment_nanopore_id")
+        for index, datum in enumerate(request.data):
             experiment_nanopore_id = datum.get("experiment_nanopore_id")
-            if experiment_nanopore_id not in experiment_nanopore:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif experiment_nanopore_id not in experiment_nanopore:
                 response_data.append(response_constructor(
                     identifier=experiment_nanopore_id,
                     request_status="BAD REQUEST",
@@ -1057,7 +1143,7 @@ class ExperimentNanoporeViewSet(viewsets.ViewSet):
 
 
 class AlignedNanoporeViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -1066,13 +1152,18 @@ class AlignedNanoporeViewSet(viewsets.ViewSet):
         tags=["AlignedNanopore"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_aligned_nanopore(self, request):
         aligned_nanopore = bulk_model_retrieve(request.data, AlignedNanopore, "aligned_nanopore_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_nanopore", request.data, "aligned_nanopore_id")
+        for index, datum in enumerate(request.data):
             aligned_nanopore_id = datum.get("aligned_nanopore_id")
-            if aligned_nanopore_id and aligned_nanopore_id in aligned_nanopore:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_nanopore_id and aligned_nanopore_id in aligned_nanopore:
                 response_data.append(response_constructor(
                     identifier=aligned_nanopore_id,
                     request_status="BAD REQUEST",
@@ -1098,6 +1189,8 @@ class AlignedNanoporeViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["AlignedNanopore"]
     )
+    @conditional_table_get("aligned_nanopore")
+    @cached_table_response("aligned_nanopore")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         aligned_nanopore = bulk_retrieve(AlignedNanopore, ids, "aligned_nanopore_id")
@@ -1129,13 +1222,18 @@ class AlignedNanoporeViewSet(viewsets.ViewSet):
         tags=["AlignedNanopore"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_aligned_nanopore(self, request):
         aligned_nanopore = bulk_model_retrieve(request.data, AlignedNanopore, "aligned_nanopore_id")
         response_data, accepted, rejected = [], False, False
 
-        for datum in request.data:
+        path_rejections = bucket_path_rejections("aligned_nanopore", request.data, "aligned_nanopore_id")
+        for index, datum in enumerate(request.data):
             aligned_nanopore_id = datum.get("aligned_nanopore_id")
-            if aligned_nanopore_id not in aligned_nanopore:
+            if index in path_rejections:
+                response_data.append(path_rejections[index])
+                rejected = True
+            elif aligned_nanopore_id not in aligned_nanopore:
                 response_data.append(response_constructor(
                     identifier=aligned_nanopore_id,
                     request_status="BAD REQUEST",
@@ -16,287 +16,6 @@ from experiments.models import (
     ExperimentRNAShortRead,
 )
 
-from metadata.models import Analyte, Participant
-
-
-def parse_short_read_aligned(short_read_aligned: dict) -> dict:
-    """
-    Parses and processes the short_read_aligned dictionary to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - short_read_aligned (dict): A dictionary containing short_read data.
-
-    Returns:
-    - dict: A dictionary with the processed participant data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-
-    """
-
-    if (
-        "mean_coverage" in short_read_aligned
-        and short_read_aligned["mean_coverage"] != "NA"
-    ):
-        try:
-            short_read_aligned["mean_coverage"] = int(
-                short_read_aligned["mean_coverage"]
-            )
-        except ValueError:
-            short_read_aligned["mean_coverage"] = "NA"
-
-    return short_read_aligned
-
-
-def parse_short_read(short_read: dict) -> dict:
-    """
-    Parses and processes the short_read dictionary to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - short_read (dict): A dictionary containing short_read data.
-
-    Returns:
-    - dict: A dictionary with the processed participant data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-
-    """
-
-    if "read_length" in short_read and short_read["read_length"] != "NA":
-        try:
-            short_read["read_length"] = int(short_read["read_length"])
-        except ValueError:
-            short_read["read_length"] = "NA"
-
-    if "target_insert_size" in short_read and short_read["target_insert_size"] != "NA":
-        try:
-            short_read["target_insert_size"] = int(short_read["read_length"])
-        except ValueError:
-            short_read["target_insert_size"] = "NA"
-
-    return short_read
-
-
-def parse_pac_bio_aligned(pac_bio_aligned: dict) -> dict:
-    """
-    Parses and processes the parse_pac_bio_aligned dictionary to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - pac_bio_aligned (dict): A dictionary containing pac_bio data.
-
-    Returns:
-    - dict: A dictionary with the processed pac_bio data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-
-    """
-
-    if (
-        "methylation_called" in pac_bio_aligned
-        and pac_bio_aligned["methylation_called"] != "NA"
-    ):
-        if pac_bio_aligned["methylation_called"] == "TRUE" or \
-            pac_bio_aligned["methylation_called"] == "true":
-            try:
-                pac_bio_aligned["methylation_called"] = True
-            except ValueError:
-                pac_bio_aligned["methylation_called"] = "NA"
-
-        if pac_bio_aligned["methylation_called"] == "FALSE" or \
-            pac_bio_aligned["methylation_called"] == "false":
-            try:
-                pac_bio_aligned["methylation_called"] = False
-            except ValueError:
-                pac_bio_aligned["methylation_called"] = "NA"
-
-    return pac_bio_aligned
-
-
-def parse_pac_bio(pac_bio_datum: dict) -> dict:
-    """
-    Parses and processes the pac_bio to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - pac_bio (dict): A dictionary containing pac_bio data.
-
-    Returns:
-    - dict: A dictionary with the processed participant data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-    """
-
-    if "was_barcoded" in pac_bio_datum and pac_bio_datum["was_barcoded"] != "NA":
-        
-        if pac_bio_datum["was_barcoded"] == "TRUE" \
-            or pac_bio_datum["was_barcoded"] == 'true':
-            try:
-                pac_bio_datum["was_barcoded"] = True
-            except ValueError:
-                pac_bio_datum["was_barcoded"] = "NA"
-
-        if pac_bio_datum["was_barcoded"] == "FALSE" \
-            or pac_bio_datum["was_barcoded"] == 'false':
-            try:
-                pac_bio_datum["was_barcoded"] = False
-            except ValueError:
-                pac_bio_datum["was_barcoded"] = "NA"
-
-    return pac_bio_datum
-
-
-def parse_nanopore_aligned(nanopore_aligned: dict) -> dict:
-    """
-    Parses and processes the nanopore_aligned dictionary to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - nanopore_aligned (dict): A dictionary containing nanopore data.
-
-    Returns:
-    - dict: A dictionary with the processed nanopore data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-
-    """
-
-    if (
-        "methylation_called" in nanopore_aligned
-        and nanopore_aligned["methylation_called"] != "NA"
-    ):
-        if nanopore_aligned["methylation_called"] == "TRUE" or \
-            nanopore_aligned["methylation_called"] == "true":
-            try:
-                nanopore_aligned["methylation_called"] = True
-            except ValueError:
-                nanopore_aligned["methylation_called"] = "NA"
-
-        if nanopore_aligned["methylation_called"] == "FALSE" or \
-            nanopore_aligned["methylation_called"] == "false":
-            try:
-                nanopore_aligned["methylation_called"] = False
-            except ValueError:
-                nanopore_aligned["methylation_called"] = "NA"
-
-    return nanopore_aligned
-
-
-def parse_nanopore(nanopore: dict) -> dict:
-    """
-    Parses and processes the nanopore dict to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - pac_bio (dict): A dictionary containing nanopore data.
-
-    Returns:
-    - dict: A dictionary with the processed participant data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-    """
-
-    if "was_barcoded" in nanopore and nanopore["was_barcoded"] != "NA":
-        if nanopore["was_barcoded"] == "TRUE" or nanopore["was_barcoded"] == 'true':
-            try:
-                nanopore["was_barcoded"] = True
-            except ValueError:
-                nanopore["was_barcoded"] = "NA"
-
-        if nanopore["was_barcoded"] == "FALSE" or nanopore["was_barcoded"] == 'false':
-            try:
-                nanopore["was_barcoded"] = False
-            except ValueError:
-                nanopore["was_barcoded"] = "NA"
-
-    return nanopore
-
-
-def parse_rna_aligned(rna_aligned: dict) -> dict:
-    """
-    Parses and processes the rna_aligned dictionary to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - nanopore_aligned (dict): A dictionary containing nanopore data.
-
-    Returns:
-    - dict: A dictionary with the processed nanopore data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-
-    """
-
-    identifier = rna_aligned.get("aligned_rna_short_read_id")
-    experiment_rna_short_read_id = rna_aligned.get("experiment_rna_short_read_id")
-    try:
-        # Fetch the Experiment RNA along with the related Analyte and Participant in a single query
-        experiment_rna = ExperimentRNAShortRead.objects.select_related(
-            "analyte_id__participant_id"
-        ).get(experiment_rna_short_read_id=experiment_rna_short_read_id)
-        participant_id = experiment_rna.analyte_id.participant_id.participant_id
-
-    except ExperimentRNAShortRead.DoesNotExist:
-        participant_id = "NA"
-    except Analyte.DoesNotExist:
-        participant_id = "NA"
-    except Participant.DoesNotExist:
-        participant_id = "NA"
-
-    aligned_data = {
-        "aligned_id": "aligned_rna_short_read" + "." + identifier,
-        "table_name": "aligned_rna_short_read",
-        "id_in_table": identifier,
-        "participant_id": participant_id,
-        "aligned_file": rna_aligned["aligned_rna_short_read_file"],
-        "aligned_index_file": rna_aligned["aligned_rna_short_read_index_file"],
-    }
-
-    return rna_aligned
-
-
-def parse_rna(rna_datum: dict) -> dict:
-    """
-    Parses and processes the rna record to format and clean specific fields.
-
-    The function handles specific fields that may contain delimiters or need conversion to different data types.
-    It removes or transforms values based on their content to ensure consistent data handling downstream.
-
-    Parameters:
-    - rna_datum (dict): A dictionary containing rna data.
-
-    Returns:
-    - dict: A dictionary with the processed participant data. Fields with 'NA' values are excluded, and lists or numeric
-      fields are properly formatted.
-    """
-    
-    for key, value in rna_datum.items():
-        if value is None:
-            continue
-        if isinstance(value, str) and "|" in value:
-            rna_datum[key] = value.split("|")
-        if key == "5prime3prime_bias":
-            try:
-                rna_datum[key] = float(rna_datum[key])
-            except ValueError:
-                print("oops!")
-                rna_datum[key] = "NA"
-        if key in ["read_length", "RIN", "total_reads"]:
-            try:
-                rna_datum[key] = int(rna_datum[key])
-            except ValueError:
-                rna_datum[key] = "NA"
-
-    return rna_datum
-
 
 def swap_experiment_aligned(text: str) -> str:
     """
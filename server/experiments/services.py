@@ -3,8 +3,10 @@
 
 from django.db import transaction
 from rest_framework import serializers
+from config.ingest_profile import ingest_record, ingest_stage
+from config.normalizer import normalize_row
+from config.read_serializers import RenameFieldsMixin
 from config.selectors import (
-    remove_na,
     response_constructor,
     compare_data,
     TableValidator
@@ -24,17 +26,7 @@ from experiments.models import (
     LibraryPrepType,
     ExperimentType,
 )
-from experiments.selectors import (
-    parse_nanopore,
-    parse_nanopore_aligned,
-    parse_short_read,
-    parse_short_read_aligned,
-    parse_rna,
-    parse_rna_aligned,
-    parse_pac_bio,
-    parse_pac_bio_aligned,
-    swap_experiment_aligned
-)
+from experiments.selectors import swap_experiment_aligned
 
 from metadata.selectors import get_analyte
 
@@ -54,7 +46,7 @@ class ExperimentTypeSerializer(serializers.ModelSerializer):
         fields = ["name"]
 
 
-class ExperimentRNAInputSerializer(serializers.ModelSerializer):
+class ExperimentRNAInputSerializer(RenameFieldsMixin, serializers.ModelSerializer):
     library_prep_type = serializers.SlugRelatedField(
         many=True, slug_field="name", queryset=LibraryPrepType.objects.all()
     )
@@ -72,24 +64,10 @@ class ExperimentRNAInputSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             "five_prime_three_prime_bias": {"read_only": True}  # Prevents duplication issues
         }
-        rename_fields = {  # Custom rename logic
+        rename_fields = {  # Applied by RenameFieldsMixin, in and out
             "five_prime_three_prime_bias": "5prime3prime_bias"
         }
 
-
-    def to_representation(self, instance):
-        """ Rename `five_prime_three_prime_bias` to `5prime3prime_bias` in response """
-        data = super().to_representation(instance)
-        if "five_prime_three_prime_bias" in data:
-            data["5prime3prime_bias"] = data.pop("five_prime_three_prime_bias")
-        return data
-
-    def to_internal_value(self, data):
-        """ Allow `5prime3prime_bias` as input while mapping it to `five_prime_three_prime_bias` """
-        if "5prime3prime_bias" in data:
-            data["five_prime_three_prime_bias"] = data.pop("5prime3prime_bias")
-        return super().to_internal_value(data)
-
     def create(self, validated_data):
         """Create a new ExperimentRNAShortRead instance using the validated data and set the many-to-many relationships"""
 
@@ -120,7 +98,7 @@ class ExperimentRNAInputSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ExperimentRNAOutputSerializer(serializers.ModelSerializer):
+class ExperimentRNAOutputSerializer(RenameFieldsMixin, serializers.ModelSerializer):
     library_prep_type = serializers.SlugRelatedField(
         many=True, slug_field="name", read_only=True
     )
@@ -131,13 +109,9 @@ class ExperimentRNAOutputSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExperimentRNAShortRead
         fields = "__all__"
-
-    def to_representation(self, instance):
-        """ Rename `five_prime_three_prime_bias` to `5prime3prime_bias` in response """
-        data = super().to_representation(instance)
-        if "five_prime_three_prime_bias" in data:
-            data["5prime3prime_bias"] = data.pop("five_prime_three_prime_bias")
-        return data
+        rename_fields = {
+            "five_prime_three_prime_bias": "5prime3prime_bias"
+        }
 
 
 class ExperimentDNAInputSerializer(serializers.ModelSerializer):
@@ -463,6 +437,7 @@ class AlignedService:
         return validator.get_validation_results()
 
 
+@ingest_record
 def create_experiment(table_name: str, identifier: str, datum: dict):
     """
     Create a new experiment instance based on the provided data.
@@ -480,30 +455,27 @@ def create_experiment(table_name: str, identifier: str, datum: dict):
         "experiment_dna_short_read": {
             "model": ExperimentDNAShortRead,
             "input_serializer": ExperimentShortReadSerializer,
-            "output_serializer": ExperimentShortReadSerializer,
-            "parsed_data": lambda datum: parse_short_read(short_read=datum)
+            "output_serializer": ExperimentShortReadSerializer
         },
         "experiment_nanopore": {
             "model": ExperimentNanopore,
             "input_serializer": ExperimentNanoporeSerializer,
-            "output_serializer": ExperimentNanoporeSerializer,
-            "parsed_data": lambda datum: parse_nanopore(nanopore=datum)
+            "output_serializer": ExperimentNanoporeSerializer
         },
         "experiment_pac_bio": {
             "model": ExperimentPacBio,
             "input_serializer": ExperimentPacBioSerializer,
-            "output_serializer": ExperimentPacBioSerializer,
-            "parsed_data": lambda datum: parse_pac_bio(pac_bio_datum=datum)
+            "output_serializer": ExperimentPacBioSerializer
         },
         "experiment_rna_short_read": {
             "model": ExperimentRNAShortRead,
             "input_serializer": ExperimentRNAInputSerializer,
-            "output_serializer": ExperimentRNAOutputSerializer,
-            "parsed_data": lambda datum: parse_rna(rna_datum=datum)
+            "output_serializer": ExperimentRNAOutputSerializer
         }
     }
     table_validator = TableValidator()
 
+    ingest_stage("lookup")
     if get_analyte(datum["analyte_id"]) is not None:
         participant_id = get_analyte(datum["analyte_id"]).participant_id.participant_id
     else:
@@ -522,20 +494,24 @@ def create_experiment(table_name: str, identifier: str, datum: dict):
         "participant_id": participant_id,
     }
 
+    ingest_stage("schema")
     experiment_results = ExperimentService.validate_experiment(experiment_data, table_validator)
 
-    if "parsed_data" in table_serializers[table_name]:
-        datum = remove_na(table_serializers[table_name]["parsed_data"](datum))
-    else:
-        datum = remove_na(datum=datum)
+    ingest_stage("normalize")
+    datum = normalize_row(table_name, datum)
+    ingest_stage("schema")
     table_validator.validate_json(json_object=datum, table_name=table_name)
     results = table_validator.get_validation_results()
 
     if results["valid"] and experiment_results['valid']:
-        serializer = table_serializers[table_name]["input_serializer"](data=datum)
+        ingest_stage("write")
         experiment_serializer = ExperimentService.create_or_update_experiment(experiment_data)
+        ingest_stage("serializer")
+        serializer = table_serializers[table_name]["input_serializer"](data=datum)
         if serializer.is_valid() and experiment_serializer.is_valid():
+            ingest_stage("write")
             new_instance = serializer.save()
+            ingest_stage("response")
             return response_constructor(
                 identifier=identifier,
                 request_status="CREATED",
@@ -565,6 +541,7 @@ def create_experiment(table_name: str, identifier: str, datum: dict):
             data=results["errors"] + experiment_results["errors"],
         ), "rejected_request"
 
+@ingest_record
 def update_experiment(table_name: str, identifier: str, model_instance, datum: dict):
     """
     Update an existing experiment instance based on the provided data.
@@ -582,36 +559,36 @@ def update_experiment(table_name: str, identifier: str, model_instance, datum: d
         "experiment_dna_short_read": {
             "model": ExperimentDNAShortRead,
             "input_serializer": ExperimentShortReadSerializer,
-            "output_serializer": ExperimentShortReadSerializer,
-            "parsed_data": lambda datum: parse_short_read(short_read=datum)
+            "output_serializer": ExperimentShortReadSerializer
         },
         "experiment_nanopore": {
             "model": ExperimentNanopore,
             "input_serializer": ExperimentNanoporeSerializer,
-            "output_serializer": ExperimentNanoporeSerializer,
-            "parsed_data": lambda datum: parse_nanopore(nanopore=datum)
+            "output_serializer": ExperimentNanoporeSerializer
         },
         "experiment_pac_bio": {
             "model": ExperimentPacBio,
             "input_serializer": ExperimentPacBioSerializer,
-            "output_serializer": ExperimentPacBioSerializer,
-            "parsed_data": lambda datum: parse_pac_bio(pac_bio_datum=datum)
+            "output_serializer": ExperimentPacBioSerializer
         },
         "experiment_rna_short_read": {
             "model": ExperimentRNAShortRead,
             "input_serializer": ExperimentRNAInputSerializer,
-            "output_serializer": ExperimentRNAOutputSerializer,
-            "parsed_data": lambda datum: parse_rna(rna_datum=datum)
+            "output_serializer": ExperimentRNAOutputSerializer
         }
     }
 
+    ingest_stage("serializer")
     serializer = table_serializers[table_name]["input_serializer"](model_instance, data=datum)
     if serializer.is_valid():
+        ingest_stage("write")
         updated_instance = serializer.save()
+        ingest_stage("diff")
         changes = compare_data(
             old_data=table_serializers[table_name]["output_serializer"](model_instance).data,
             new_data=datum
         )
+        ingest_stage("response")
         return response_constructor(
             identifier=identifier,
             request_status="UPDATED",
@@ -695,6 +672,7 @@ def delete_experiment(table_name: str, identifier: str, id_field: str = "id"):
         ), "rejected_request"
 
 
+@ingest_record
 def create_aligned(table_name: str, identifier: str, datum: dict):
     """
     Create a new alignment instance based on the provided data.
@@ -711,31 +689,28 @@ def create_aligned(table_name: str, identifier: str, datum: dict):
         "aligned_dna_short_read": {
             "model": AlignedDNAShortRead,
             "input_serializer": AlignedDNAShortReadSerializer,
-            "output_serializer": AlignedDNAShortReadSerializer,
-            "parsed_data": lambda datum: parse_short_read_aligned(short_read_aligned=datum)
+            "output_serializer": AlignedDNAShortReadSerializer
         },
         "aligned_nanopore": {
             "model": AlignedNanopore,
             "input_serializer": AlignedNanoporeSerializer,
-            "output_serializer": AlignedNanoporeSerializer,
-            "parsed_data": lambda datum: parse_nanopore_aligned(nanopore_aligned=datum)
+            "output_serializer": AlignedNanoporeSerializer
         },
         "aligned_pac_bio": {
             "model": AlignedPacBio,
             "input_serializer": AlignedPacBioSerializer,
-            "output_serializer": AlignedPacBioSerializer,
-            "parsed_data": lambda datum: parse_pac_bio_aligned(pac_bio_aligned=datum)
+            "output_serializer": AlignedPacBioSerializer
         },
         "aligned_rna_short_read": {
             "model": AlignedRNAShortRead,
             "input_serializer": AlignedRNASerializer,
-            "output_serializer": AlignedRNASerializer,
-            "parsed_data": lambda datum: parse_rna_aligned(rna_aligned=datum)
+            "output_serializer": AlignedRNASerializer
         }
     }
     table_validator = TableValidator()
     experiment_name = swap_experiment_aligned(table_name)
 
+    ingest_stage("lookup")
     try:
         experiment_object = Experiment.objects.get(id_in_table=datum[experiment_name + "_id"])
         participant_id = experiment_object.participant_id.participant_id
@@ -756,12 +731,15 @@ def create_aligned(table_name: str, identifier: str, datum: dict):
         "aligned_index_file": datum[f"{table_name}_index_file"]
     }
 
+    ingest_stage("schema")
     aligned_results = AlignedService.validate_aligned(aligned_data, table_validator)
 
     if aligned_results['valid']:
+        ingest_stage("write")
         alignment_serializer = AlignedService.create_or_update_aligned(aligned_data)
         if alignment_serializer.is_valid():
             alignment_instance = alignment_serializer.save()
+            ingest_stage("response")
             return response_constructor(
                 identifier=identifier,
                 request_status="CREATED",
@@ -788,6 +766,7 @@ def create_aligned(table_name: str, identifier: str, datum: dict):
         ), "rejected_request"
 
 
+@ingest_record
 def update_aligned(table_name: str, identifier: str, model_instance, datum: dict):
     """
     Update an existing alignment instance based on the provided data.
@@ -823,13 +802,17 @@ def update_aligned(table_name: str, identifier: str, model_instance, datum: dict
             "output_serializer": AlignedRNASerializer
         }
     }
+    ingest_stage("serializer")
     serializer = table_serializers[table_name]["input_serializer"](model_instance, data=datum)
     if serializer.is_valid():
+        ingest_stage("write")
         updated_instance = serializer.save()
+        ingest_stage("diff")
         changes = compare_data(
             old_data=table_serializers[table_name]["output_serializer"](model_instance).data,
             new_data=datum
         )
+        ingest_stage("response")
         return response_constructor(
             identifier=identifier,
             request_status="UPDATED",
@@ -913,6 +896,7 @@ def delete_aligned(table_name: str, identifier: str, id_field: str = "id"):
         ), "rejected_request"
 
 
+@ingest_record
 def create_or_update_experiment(table_name: str, identifier: str, model_instance, datum: dict):
     """
     Create or update a model instance based on the provided data.
@@ -933,30 +917,27 @@ def create_or_update_experiment(table_name: str, identifier: str, model_instance
         "experiment_dna_short_read": {
             "model": ExperimentDNAShortRead,
             "input_serializer": ExperimentShortReadSerializer,
-            "output_serializer": ExperimentShortReadSerializer,
-            "parsed_data": lambda datum: parse_short_read(short_read=datum)
+            "output_serializer": ExperimentShortReadSerializer
         },
         "experiment_nanopore": {
             "model": ExperimentNanopore,
             "input_serializer": ExperimentNanoporeSerializer,
-            "output_serializer": ExperimentNanoporeSerializer,
-            "parsed_data": lambda datum: parse_nanopore(nanopore=datum)
+            "output_serializer": ExperimentNanoporeSerializer
         },
         "experiment_pac_bio": {
             "model": ExperimentPacBio,
             "input_serializer": ExperimentPacBioSerializer,
-            "output_serializer": ExperimentPacBioSerializer,
-            "parsed_data": lambda datum: parse_pac_bio(pac_bio_datum=datum)
+            "output_serializer": ExperimentPacBioSerializer
         },
         "experiment_rna_short_read": {
             "model": ExperimentRNAShortRead,
             "input_serializer": ExperimentRNAInputSerializer,
-            "output_serializer": ExperimentRNAOutputSerializer,
-            "parsed_data": lambda datum: parse_rna(rna_datum=datum)
+            "output_serializer": ExperimentRNAOutputSerializer
         }
     }
     table_validator = TableValidator()
 
+    ingest_stage("lookup")
     if get_analyte(datum["analyte_id"]) is not None:
         participant_id = get_analyte(datum["analyte_id"]).participant_id.participant_id
     else:
@@ -974,28 +955,33 @@ def create_or_update_experiment(table_name: str, identifier: str, model_instance
         "id_in_table": identifier,
         "participant_id": participant_id,
     }
+    ingest_stage("schema")
     experiment_results = ExperimentService.validate_experiment(experiment_data, table_validator)
 
     model_input_serializer = table_serializers[table_name]["input_serializer"]
     model_output_serializer = table_serializers[table_name]["output_serializer"]
 
-    if "parsed_data" in table_serializers[table_name]:
-        datum = remove_na(table_serializers[table_name]["parsed_data"](datum))
-    else:
-        datum = remove_na(datum=datum)
+    ingest_stage("normalize")
+    datum = normalize_row(table_name, datum)
+    ingest_stage("schema")
 
     table_validator.validate_json(json_object=datum, table_name=table_name)
     results = table_validator.get_validation_results()
     if results["valid"] and experiment_results['valid']:
+        ingest_stage("diff")
         changes = compare_data(
             old_data=model_output_serializer(model_instance).data,
             new_data=datum
         ) if model_instance else {identifier:"CREATED"}
 
-        serializer = model_input_serializer(model_instance, data=datum)
+        ingest_stage("write")
         experiment_serializer = ExperimentService.create_or_update_experiment(experiment_data)
+        ingest_stage("serializer")
+        serializer = model_input_serializer(model_instance, data=datum)
         if serializer.is_valid() and experiment_serializer.is_valid():
+            ingest_stage("write")
             updated_instance = serializer.save()
+            ingest_stage("response")
             if not changes:
                 return response_constructor(
                     identifier=identifier,
@@ -1047,6 +1033,7 @@ def create_or_update_experiment(table_name: str, identifier: str, model_instance
         ), "rejected_request"
 
 
+@ingest_record
 def create_or_update_alignment(table_name: str, identifier: str, model_instance, datum: dict):
     """
     Create or update a model instance based on the provided data.
@@ -1067,31 +1054,28 @@ def create_or_update_alignment(table_name: str, identifier: str, model_instance,
         "aligned_dna_short_read": {
             "model": AlignedDNAShortRead,
             "input_serializer": AlignedDNAShortReadSerializer,
-            "output_serializer": AlignedDNAShortReadSerializer,
-            "parsed_data": lambda datum: parse_short_read_aligned(short_read_aligned=datum)
+            "output_serializer": AlignedDNAShortReadSerializer
         },
         "aligned_nanopore": {
             "model": AlignedNanopore,
             "input_serializer": AlignedNanoporeSerializer,
-            "output_serializer": AlignedNanoporeSerializer,
-            "parsed_data": lambda datum: parse_nanopore_aligned(nanopore_aligned=datum)
+            "output_serializer": AlignedNanoporeSerializer
         },
         "aligned_pac_bio": {
             "model": AlignedPacBio,
             "input_serializer": AlignedPacBioSerializer,
-            "output_serializer": AlignedPacBioSerializer,
-            "parsed_data": lambda datum: parse_pac_bio_aligned(pac_bio_aligned=datum)
+            "output_serializer": AlignedPacBioSerializer
         },
         "aligned_rna_short_read": {
             "model": AlignedRNAShortRead,
             "input_serializer": AlignedRNASerializer,
-            "output_serializer": AlignedRNASerializer,
-            "parsed_data": lambda datum: parse_rna_aligned(rna_aligned=datum)
+            "output_serializer": AlignedRNASerializer
         }
     }
     table_validator = TableValidator()
     experiment_name = swap_experiment_aligned(table_name)
 
+    ingest_stage("lookup")
     try:
         experiment_object = Experiment.objects.get(id_in_table=datum[experiment_name+"_id"])
         participant_id = experiment_object.participant_id.participant_id
@@ -1112,29 +1096,34 @@ def create_or_update_alignment(table_name: str, identifier: str, model_instance,
         "aligned_index_file": datum[f"{table_name}_index_file"]
     }
 
+    ingest_stage("schema")
     aligned_results = AlignedService.validate_aligned(aligned_data, table_validator)
 
     model_input_serializer = table_serializers[table_name]["input_serializer"]
     model_output_serializer = table_serializers[table_name]["output_serializer"]
     model_class = table_serializers[table_name]["model"]
 
-    if "parsed_data" in table_serializers[table_name]:
-        datum = remove_na(table_serializers[table_name]["parsed_data"](datum))
-    else:
-        datum = remove_na(datum=datum)
+    ingest_stage("normalize")
+    datum = normalize_row(table_name, datum)
+    ingest_stage("schema")
     table_validator.validate_json(json_object=datum, table_name=table_name)
     results = table_validator.get_validation_results()
 
     if results["valid"] and aligned_results['valid']:
+        ingest_stage("diff")
         changes = compare_data(
             old_data=model_output_serializer(model_instance).data,
             new_data=datum
         ) if model_instance else {identifier:"CREATED"}
 
-        serializer = model_input_serializer(model_instance, data=datum)
+        ingest_stage("write")
         alignment_serializer = AlignedService.create_or_update_aligned(aligned_data)
+        ingest_stage("serializer")
+        serializer = model_input_serializer(model_instance, data=datum)
         if serializer.is_valid() and alignment_serializer.is_valid:
+            ingest_stage("write")
             updated_instance = serializer.save()
+            ingest_stage("response")
             if not changes:
                 return response_constructor(
                     identifier=identifier,
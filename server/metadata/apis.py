@@ -6,7 +6,7 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from authentication.services import StatelessJWTAuthentication
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from config.selectors import (
@@ -36,10 +36,12 @@ from metadata.services import (
     update_metadata,
     delete_metadata
 )
+from search.selectors import cached_table_response, conditional_table_get
+from search.services import summary_batch
 
 
 class ParticipantViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -48,6 +50,7 @@ class ParticipantViewSet(viewsets.ViewSet):
         tags=["Participant"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_participant(self, request):
         participant = bulk_model_retrieve(request.data, Participant, "participant_id")
         response_data, accepted, rejected = [], False, False
@@ -80,6 +83,8 @@ class ParticipantViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["Participant"]
     )
+    @conditional_table_get("participant")
+    @cached_table_response("participant")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         participant = bulk_retrieve(Participant, ids, "participant_id")
@@ -111,6 +116,7 @@ class ParticipantViewSet(viewsets.ViewSet):
         tags=["Participant"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_participant(self, request):
         participant = bulk_model_retrieve(request.data, Participant, "participant_id")
         response_data, accepted, rejected = [], False, False
@@ -183,7 +189,7 @@ class ParticipantViewSet(viewsets.ViewSet):
 
 
 class FamilyViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -192,6 +198,7 @@ class FamilyViewSet(viewsets.ViewSet):
         tags=["Family"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_family(self, request):
         family = bulk_model_retrieve(request.data, Family, "family_id")
         response_data, accepted, rejected = [], False, False
@@ -224,6 +231,8 @@ class FamilyViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["Family"]
     )
+    @conditional_table_get("family")
+    @cached_table_response("family")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         family = bulk_retrieve(Family, ids, "family_id")
@@ -255,6 +264,7 @@ class FamilyViewSet(viewsets.ViewSet):
         tags=["Family"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_family(self, request):
         family = bulk_model_retrieve(request.data, Family, "family_id")
         response_data, accepted, rejected = [], False, False
@@ -327,7 +337,7 @@ class FamilyViewSet(viewsets.ViewSet):
 
 
 class AnalyteViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -336,6 +346,7 @@ class AnalyteViewSet(viewsets.ViewSet):
         tags=["Analyte"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_analyte(self, request):
         analyte = bulk_model_retrieve(request.data, Analyte, "analyte_id")
         response_data, accepted, rejected = [], False, False
@@ -368,6 +379,8 @@ class AnalyteViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["Analyte"]
     )
+    @conditional_table_get("analyte")
+    @cached_table_response("analyte")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         analyte = bulk_retrieve(Analyte, ids, "analyte_id")
@@ -399,6 +412,7 @@ class AnalyteViewSet(viewsets.ViewSet):
         tags=["Analyte"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_analyte(self, request):
         analyte = bulk_model_retrieve(request.data, Analyte, "analyte_id")
         response_data, accepted, rejected = [], False, False
@@ -471,7 +485,7 @@ class AnalyteViewSet(viewsets.ViewSet):
 
 
 class PhenotypeViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -480,6 +494,7 @@ class PhenotypeViewSet(viewsets.ViewSet):
         tags=["Phenotype"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_phenotype(self, request):
         phenotype = bulk_model_retrieve(request.data, Phenotype, "phenotype_id")
         response_data, accepted, rejected = [], False, False
@@ -512,6 +527,8 @@ class PhenotypeViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["Phenotype"]
     )
+    @conditional_table_get("phenotype")
+    @cached_table_response("phenotype")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         phenotype = bulk_retrieve(Phenotype, ids, "phenotype_id")
@@ -543,6 +560,7 @@ class PhenotypeViewSet(viewsets.ViewSet):
         tags=["Phenotype"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_phenotype(self, request):
         phenotype = bulk_model_retrieve(request.data, Phenotype, "phenotype_id")
         response_data, accepted, rejected = [], False, False
@@ -615,7 +633,7 @@ class PhenotypeViewSet(viewsets.ViewSet):
 
 
 class GeneticFindingsViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -624,6 +642,7 @@ class GeneticFindingsViewSet(viewsets.ViewSet):
         tags=["GeneticFindings"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_genetic_findings(self, request):
         genetic_findings = bulk_model_retrieve(request.data, GeneticFindings, "genetic_findings_id")
         response_data, accepted, rejected = [], False, False
@@ -656,6 +675,8 @@ class GeneticFindingsViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["GeneticFindings"]
     )
+    @conditional_table_get("genetic_findings")
+    @cached_table_response("genetic_findings")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         genetic_findings = bulk_retrieve(GeneticFindings, ids, "genetic_findings_id")
@@ -687,6 +708,7 @@ class GeneticFindingsViewSet(viewsets.ViewSet):
         tags=["GeneticFindings"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_genetic_findings(self, request):
         genetic_findings = bulk_model_retrieve(request.data, GeneticFindings, "genetic_findings_id")
         response_data, accepted, rejected = [], False, False
@@ -759,7 +781,7 @@ class GeneticFindingsViewSet(viewsets.ViewSet):
 
 
 class BiobankViewSet(viewsets.ViewSet):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -768,6 +790,7 @@ class BiobankViewSet(viewsets.ViewSet):
         tags=["Biobank"]
     )
     @action(detail=False, methods=["post"], url_path="create")
+    @summary_batch()
     def create_biobank(self, request):
         biobank = bulk_model_retrieve(request.data, Biobank, "biobank_id")
         response_data, accepted, rejected = [], False, False
@@ -800,6 +823,8 @@ class BiobankViewSet(viewsets.ViewSet):
         responses={200: "All success", 207: "Partial success", 400: "Bad request"},
         tags=["Biobank"]
     )
+    @conditional_table_get("biobank")
+    @cached_table_response("biobank")
     def list(self, request):
         ids = request.GET.get("ids", "").split(",")
         biobank = bulk_retrieve(Biobank, ids, "biobank_id")
@@ -831,6 +856,7 @@ class BiobankViewSet(viewsets.ViewSet):
         tags=["Biobank"]
     )
     @action(detail=False, methods=["post"], url_path="update")
+    @summary_batch()
     def update_biobank(self, request):
         biobank = bulk_model_retrieve(request.data, Biobank, "biobank_id")
         response_data, accepted, rejected = [], False, False
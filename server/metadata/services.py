@@ -3,8 +3,9 @@
 
 from django.db import transaction, IntegrityError
 from rest_framework import serializers
+from config.ingest_profile import ingest_record, ingest_stage
+from config.normalizer import normalize_row
 from config.selectors import (
-    remove_na,
     response_constructor,
     compare_data,
     TableValidator,
@@ -23,12 +24,6 @@ from metadata.models import (
     AlignedId,
 )
 
-from metadata.selectors import (
-    participant_parser,
-    genetic_findings_parser,
-    biobank_parser,
-)
-
 from submodels.models import ReportedRace
 
 
@@ -190,7 +185,7 @@ class PhenotypeSerializer(serializers.ModelSerializer):
         """Update each attribute of the instance with validated data"""
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-            instance.save()
+        instance.save()
         return instance
 
 
@@ -367,6 +362,7 @@ def get_or_create_sub_models(datum: dict) -> dict:
     return datum
 
 
+@ingest_record
 def create_or_update_metadata(
     table_name: str, identifier: str, model_instance, datum: dict
 ):
@@ -388,7 +384,6 @@ def create_or_update_metadata(
         "participant": {
             "input_serializer": ParticipantInputSerializer,
             "output_serializer": ParticipantOutputSerializer,
-            "parsed_data": lambda datum: participant_parser(participant=datum),
         },
         "family": {
             "input_serializer": FamilySerializer,
@@ -397,9 +392,6 @@ def create_or_update_metadata(
         "genetic_findings": {
             "input_serializer": GeneticFindingsSerializer,
             "output_serializer": GeneticFindingsSerializer,
-            "parsed_data": lambda datum: genetic_findings_parser(
-                genetic_findings=datum
-            ),
         },
         "analyte": {
             "input_serializer": AnalyteSerializer,
@@ -412,22 +404,22 @@ def create_or_update_metadata(
         "biobank": {
             "input_serializer": BiobankSerializer,
             "output_serializer": BiobankSerializer,
-            "parsed_data": lambda datum: biobank_parser(biobank=datum),
         }
     }
 
     model_input_serializer = table_serializers[table_name]["input_serializer"]
     model_output_serializer = table_serializers[table_name]["output_serializer"]
 
-    if "parsed_data" in table_serializers[table_name]:
-        datum = remove_na(table_serializers[table_name]["parsed_data"](datum))
-    else:
-        datum = remove_na(datum=datum)
+    ingest_stage("normalize")
+    datum = normalize_row(table_name, datum)
+
+    ingest_stage("schema")
     table_validator = TableValidator()
     table_validator.validate_json(json_object=datum, table_name=table_name)
     results = table_validator.get_validation_results()
 
     if results["valid"]:
+        ingest_stage("diff")
         changes = (
             compare_data(
                 old_data=model_output_serializer(model_instance).data, new_data=datum
@@ -437,11 +429,15 @@ def create_or_update_metadata(
         )
         # create needed submodules before serialization
         if table_name == "participant":
+            ingest_stage("write")
             datum = get_or_create_sub_models(datum=datum)
+        ingest_stage("serializer")
         serializer = model_input_serializer(model_instance, data=datum)
 
         if serializer.is_valid():
+            ingest_stage("write")
             updated_instance = serializer.save()
+            ingest_stage("response")
             if not changes:
                 return (
                     response_constructor(
@@ -499,6 +495,7 @@ def create_or_update_metadata(
         )
 
 
+@ingest_record
 def create_metadata(table_name: str, identifier: str, datum: dict):
     """
     Create a new model instance based on the provided data.
@@ -515,7 +512,6 @@ def create_metadata(table_name: str, identifier: str, datum: dict):
         "participant": {
             "input_serializer": ParticipantInputSerializer,
             "output_serializer": ParticipantOutputSerializer,
-            "parsed_data": lambda datum: participant_parser(participant=datum),
         },
         "family": {
             "input_serializer": FamilySerializer,
@@ -524,9 +520,6 @@ def create_metadata(table_name: str, identifier: str, datum: dict):
         "genetic_findings": {
             "input_serializer": GeneticFindingsSerializer,
             "output_serializer": GeneticFindingsSerializer,
-            "parsed_data": lambda datum: genetic_findings_parser(
-                genetic_findings=datum
-            ),
         },
         "analyte": {
             "input_serializer": AnalyteSerializer,
@@ -539,26 +532,27 @@ def create_metadata(table_name: str, identifier: str, datum: dict):
         "biobank": {
             "input_serializer": BiobankSerializer,
             "output_serializer": BiobankSerializer,
-            "parsed_data": lambda datum: biobank_parser(biobank=datum),
         }
     }
 
     model_input_serializer = table_serializers[table_name]["input_serializer"]
     model_output_serializer = table_serializers[table_name]["output_serializer"]
 
-    if "parsed_data" in table_serializers[table_name]:
-        datum = remove_na(table_serializers[table_name]["parsed_data"](datum))
-    else:
-        datum = remove_na(datum=datum)
+    ingest_stage("normalize")
+    datum = normalize_row(table_name, datum)
 
+    ingest_stage("schema")
     table_validator = TableValidator()
     table_validator.validate_json(json_object=datum, table_name=table_name)
     results = table_validator.get_validation_results()
 
     if results["valid"]:
+        ingest_stage("serializer")
         serializer = model_input_serializer(data=datum)
         if serializer.is_valid():
+            ingest_stage("write")
             new_instance = serializer.save()
+            ingest_stage("response")
             return (
                 response_constructor(
                     identifier=identifier,
@@ -592,6 +586,7 @@ def create_metadata(table_name: str, identifier: str, datum: dict):
         )
 
 
+@ingest_record
 def update_metadata(table_name: str, identifier: str, model_instance, datum: dict):
     """
     Update an existing model instance based on the provided data.
@@ -609,7 +604,6 @@ def update_metadata(table_name: str, identifier: str, model_instance, datum: dic
         "participant": {
             "input_serializer": ParticipantInputSerializer,
             "output_serializer": ParticipantOutputSerializer,
-            "parsed_data": lambda datum: participant_parser(participant=datum),
         },
         "family": {
             "input_serializer": FamilySerializer,
@@ -618,9 +612,6 @@ def update_metadata(table_name: str, identifier: str, model_instance, datum: dic
         "genetic_findings": {
             "input_serializer": GeneticFindingsSerializer,
             "output_serializer": GeneticFindingsSerializer,
-            "parsed_data": lambda datum: genetic_findings_parser(
-                genetic_findings=datum
-            ),
         },
         "analyte": {
             "input_serializer": AnalyteSerializer,
@@ -633,31 +624,33 @@ def update_metadata(table_name: str, identifier: str, model_instance, datum: dic
         "biobank": {
             "input_serializer": BiobankSerializer,
             "output_serializer": BiobankSerializer,
-            "parsed_data": lambda datum: biobank_parser(biobank=datum),
         }
     }
 
     model_input_serializer = table_serializers[table_name]["input_serializer"]
     model_output_serializer = table_serializers[table_name]["output_serializer"]
 
-    if "parsed_data" in table_serializers[table_name]:
-        datum = remove_na(table_serializers[table_name]["parsed_data"](datum))
-    else:
-        datum = remove_na(datum=datum)
+    ingest_stage("normalize")
+    datum = normalize_row(table_name, datum)
 
+    ingest_stage("schema")
     table_validator = TableValidator()
     table_validator.validate_json(json_object=datum, table_name=table_name)
     results = table_validator.get_validation_results()
 
     if results["valid"]:
         with transaction.atomic():
+            ingest_stage("serializer")
             serializer = model_input_serializer(model_instance, data=datum)
             if serializer.is_valid():
+                ingest_stage("write")
                 updated_instance = serializer.save()
+                ingest_stage("diff")
                 changes = compare_data(
                     old_data=model_output_serializer(model_instance).data,
                     new_data=datum,
                 )
+                ingest_stage("response")
                 return (
                     response_constructor(
                         identifier=identifier,
@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 # search/apis.py
 
+import json
+
 from django.apps import apps
 from django.db.models import Q
 from django.contrib.auth.models import User
-from django.http import HttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from itertools import chain
@@ -13,8 +17,45 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from search.selectors import get_anvil_tables
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from search.selectors import (
+    aget_participant_aggregate,
+    aget_summary_counts,
+    atable_rows,
+    cached_table_response,
+    conditional_table_get,
+    find_duplicate_files,
+    find_files,
+    find_findings_by_value,
+    find_nearest_findings,
+    find_overlapping_findings,
+    get_anvil_tables,
+    get_changes,
+    get_family_graph,
+    get_finding_facets,
+    get_lineage,
+    get_relatives,
+    get_sample_lineage,
+    get_trios,
+    get_summary_counts,
+    latest_change_sequence,
+    parse_bed,
+    parse_manifest,
+    parse_region,
+    reconcile_manifest,
+    resolve_file_owners,
+    response_cache_stats,
+    text_search,
+)
+from search.services import (
+    FILE_REGISTRY_FIELDS,
+    FINDING_VALUE_FIELDS,
+    LINEAGE_TABLES,
+    TEXT_INDEX_FIELDS,
+    TRACKED_TABLES,
+)
+from config.read_serializers import serialize_queryset
+from config.routers import replica_reads, request_reads
+from authentication.services import StatelessJWTAuthentication, authenticate_async
 from metadata.models import (
     Participant,
     Family,
@@ -62,7 +103,7 @@ from experiments.services import (
 
 class GetAllTablesAPI(APIView):
     """"""
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -73,61 +114,59 @@ class GetAllTablesAPI(APIView):
         },
         tags=["Search"],
     )
-
+    @replica_reads
+    @conditional_table_get(*TRACKED_TABLES, change_feed=True)
+    @cached_table_response(*TRACKED_TABLES, change_feed=True)
     def get(self, request):
         response_data = []
         try:
+            # Read before the tables so changes made while serializing are
+            # picked up again by the next changes/ call
+            sequence = latest_change_sequence()
+
             # Metadata Models
-            serialized_participants = ParticipantOutputSerializer(Participant.objects.all(), many=True)
-            serialized_families = FamilySerializer(Family.objects.all(), many=True)
-            serialized_analytes = AnalyteSerializer(Analyte.objects.all(), many=True)
-            serialized_phenotypes = PhenotypeSerializer(Phenotype.objects.all(), many=True)
-            serialized_genetic_findings = GeneticFindingsSerializer(GeneticFindings.objects.all(), many=True)
-            serialized_biobank_entries = BiobankSerializer(Biobank.objects.all(), many=True)
+            serialized_participants = serialize_queryset(ParticipantOutputSerializer, Participant.objects.all())
+            serialized_families = serialize_queryset(FamilySerializer, Family.objects.all())
+            serialized_analytes = serialize_queryset(AnalyteSerializer, Analyte.objects.all())
+            serialized_phenotypes = serialize_queryset(PhenotypeSerializer, Phenotype.objects.all())
+            serialized_genetic_findings = serialize_queryset(GeneticFindingsSerializer, GeneticFindings.objects.all())
+            serialized_biobank_entries = serialize_queryset(BiobankSerializer, Biobank.objects.all())
 
             # Experiment Models
-            serialized_aligned_experiments = AlignedSerializer(
-                Aligned.objects.all(), many=True
-            )
-            serialized_aligned_dna = AlignedDNAShortReadSerializer(
-                AlignedDNAShortRead.objects.all(), many=True
-            )
-            serialized_aligned_nanopore = AlignedNanoporeSerializer(
-                AlignedNanopore.objects.all(), many=True
-            )
-            serialized_aligned_pacbio = AlignedPacBioSerializer(
-                AlignedPacBio.objects.all(), many=True
-            )
-            serialized_aligned_rna = AlignedRNASerializer(
-                AlignedRNAShortRead.objects.all(), many=True
-            )
-            serialized_experiments = ExperimentSerializer(Experiment.objects.all(), many=True)
-            serialized_dna = ExperimentShortReadSerializer(ExperimentDNAShortRead.objects.all(), many=True)
-            serialized_nanopore = ExperimentNanoporeSerializer(ExperimentNanopore.objects.all(), many=True)
-            serialized_pacbio = ExperimentPacBioSerializer(ExperimentPacBio.objects.all(), many=True)
-            serialized_rna = ExperimentRNAOutputSerializer(ExperimentRNAShortRead.objects.all(), many=True)
+            serialized_aligned_experiments = serialize_queryset(AlignedSerializer, Aligned.objects.all())
+            serialized_aligned_dna = serialize_queryset(AlignedDNAShortReadSerializer, AlignedDNAShortRead.objects.all())
+            serialized_aligned_nanopore = serialize_queryset(AlignedNanoporeSerializer, AlignedNanopore.objects.all())
+            serialized_aligned_pacbio = serialize_queryset(AlignedPacBioSerializer, AlignedPacBio.objects.all())
+            serialized_aligned_rna = serialize_queryset(AlignedRNASerializer, AlignedRNAShortRead.objects.all())
+            serialized_experiments = serialize_queryset(ExperimentSerializer, Experiment.objects.all())
+            serialized_dna = serialize_queryset(ExperimentShortReadSerializer, ExperimentDNAShortRead.objects.all())
+            serialized_nanopore = serialize_queryset(ExperimentNanoporeSerializer, ExperimentNanopore.objects.all())
+            serialized_pacbio = serialize_queryset(ExperimentPacBioSerializer, ExperimentPacBio.objects.all())
+            serialized_rna = serialize_queryset(ExperimentRNAOutputSerializer, ExperimentRNAShortRead.objects.all())
 
 
             serilized_return_data = {
                 # Metadata Tables
-                'participants': serialized_participants.data,
-                'families': serialized_families.data,
-                'genetic_findings': serialized_genetic_findings.data,
-                'analytes': serialized_analytes.data,
-                'phenotypes': serialized_phenotypes.data,
-                'biobank_entries': serialized_biobank_entries.data,
+                'participants': serialized_participants,
+                'families': serialized_families,
+                'genetic_findings': serialized_genetic_findings,
+                'analytes': serialized_analytes,
+                'phenotypes': serialized_phenotypes,
+                'biobank_entries': serialized_biobank_entries,
                 # Experiment Tables
-                'experiments': serialized_experiments.data,
-                'experiment_dna_short_read' : serialized_dna.data,
-                'experiment_nanopore': serialized_nanopore.data,
-                'experiment_pac_bio': serialized_pacbio.data,
-                'experiment_rna_short_read': serialized_rna.data,
+                'experiments': serialized_experiments,
+                'experiment_dna_short_read' : serialized_dna,
+                'experiment_nanopore': serialized_nanopore,
+                'experiment_pac_bio': serialized_pacbio,
+                'experiment_rna_short_read': serialized_rna,
                 # Aligned tables
-                'aligned': serialized_aligned_experiments.data,
-                'aligned_dna_short_read': serialized_aligned_dna.data,
-                'aligned_nanopore': serialized_aligned_nanopore.data,
-                'aligned_pac_bio': serialized_aligned_pacbio.data,
-                'aligned_rna_short_read': serialized_aligned_rna.data
+                'aligned': serialized_aligned_experiments,
+                'aligned_dna_short_read': serialized_aligned_dna,
+                'aligned_nanopore': serialized_aligned_nanopore,
+                'aligned_pac_bio': serialized_aligned_pacbio,
+                'aligned_rna_short_read': serialized_aligned_rna,
+                # Change log position for changes/?since=
+                'sequence': sequence
             }
             # time.sleep(5)
             return Response(status=status.HTTP_200_OK, data=serilized_return_data)
@@ -148,6 +187,7 @@ class DounlaodTablesAPI(APIView):
         },
         tags=["Search"],
     )
+    @replica_reads
     def get(self, request):
         zip_buffer = get_anvil_tables()
 
@@ -180,6 +220,7 @@ class SearchTablesAPI(APIView):
         responses={200: "JSON response of model data"},
         auto_schema=None
     )
+    @replica_reads
     def get(self, request, model_name):
         try:
             model = apps.get_model("metadata", model_name)
@@ -195,3 +236,757 @@ class SearchTablesAPI(APIView):
         data = chain(queryset.values())
 
         return Response(data)
+
+
+class TextSearchAPI(APIView):
+    """Full-text search over phenotype, genetic findings and family free text."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="search_text",
+        manual_parameters=[
+            openapi.Parameter(
+                "q", openapi.IN_QUERY, description="Search terms, e.g. an HPO ID or gene symbol",
+                type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                "table", openapi.IN_QUERY, description="Restrict hits to one table",
+                type=openapi.TYPE_STRING, enum=list(TEXT_INDEX_FIELDS.keys())
+            ),
+            openapi.Parameter(
+                "limit", openapi.IN_QUERY, description="Maximum number of hits (default 50)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
+        responses={
+            200: "Ranked list of hits with table, pk and snippet",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get(*TEXT_INDEX_FIELDS, "text_index")
+    @cached_table_response(*TEXT_INDEX_FIELDS, "text_index")
+    def get(self, request):
+        query = request.GET.get("q", "").strip()
+        table_name = request.GET.get("table") or None
+        if not query:
+            return Response(
+                {"error": "Query parameter 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if table_name and table_name not in TEXT_INDEX_FIELDS:
+            return Response(
+                {"error": f"Invalid table name: {table_name}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(int(request.GET.get("limit", 50)), 1000)
+        except ValueError:
+            return Response(
+                {"error": "Query parameter 'limit' must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            text_search(query, table_name=table_name, limit=limit),
+            status=status.HTTP_200_OK,
+        )
+
+
+class SummaryCountsAPI(APIView):
+    """Precomputed dashboard counts per center, consent code, affected status and table."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    filter_fields = ("table_name", "gregor_center", "consent_code", "affected_status")
+
+    @swagger_auto_schema(
+        operation_id="get_summary_counts",
+        manual_parameters=[
+            openapi.Parameter(
+                field, openapi.IN_QUERY, description=f"Only return rows with this {field}",
+                type=openapi.TYPE_STRING
+            )
+            for field in filter_fields
+        ],
+        responses={200: "List of summary count rows"},
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("participant", "analyte", "experiment", "aligned", "summary")
+    @cached_table_response("participant", "analyte", "experiment", "aligned", "summary")
+    def get(self, request):
+        filters = {
+            field: request.GET[field] for field in self.filter_fields if field in request.GET
+        }
+        return Response(get_summary_counts(**filters), status=status.HTTP_200_OK)
+
+
+class ChangesAPI(APIView):
+    """Records upserted and deleted since a change log sequence number."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_changes",
+        manual_parameters=[
+            openapi.Parameter(
+                "since", openapi.IN_QUERY,
+                description="Sequence number returned by get_all_tables or the previous changes call",
+                type=openapi.TYPE_INTEGER, required=True
+            ),
+            openapi.Parameter(
+                "limit", openapi.IN_QUERY,
+                description="Maximum number of change log entries to read (default 5000)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
+        responses={
+            200: "New sequence number with upserted records and deleted primary keys",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get(*TRACKED_TABLES, change_feed=True)
+    @cached_table_response(*TRACKED_TABLES, change_feed=True)
+    def get(self, request):
+        try:
+            since = int(request.GET["since"])
+            limit = min(int(request.GET.get("limit", 5000)), 50000)
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "Query parameters 'since' and 'limit' must be integers and 'since' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if limit < 1:
+            return Response(
+                {"error": "Query parameter 'limit' must be positive."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(get_changes(since, limit=limit), status=status.HTTP_200_OK)
+
+
+class RegionSearchAPI(APIView):
+    """Genetic findings overlapping one or more genomic regions."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_regions = 10000
+
+    @swagger_auto_schema(
+        operation_id="search_region",
+        manual_parameters=[
+            openapi.Parameter(
+                "region", openapi.IN_QUERY,
+                description="Region as chrom:start-end, 1-based inclusive, e.g. chr2:6800000-6900000. May be repeated.",
+                type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING),
+                collection_format="multi", required=True
+            ),
+        ],
+        responses={
+            200: "Per region, the overlapping genetic findings",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("genetic_findings")
+    @cached_table_response("genetic_findings")
+    def get(self, request):
+        try:
+            regions = [(*parse_region(region), None) for region in request.GET.getlist("region")]
+        except ValueError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return self.search(regions)
+
+    @swagger_auto_schema(
+        operation_id="search_regions",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "regions": openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING),
+                    description="Regions as chrom:start-end, 1-based inclusive",
+                ),
+            },
+            description="A JSON list of regions, or a BED file sent as text/plain or as the `file` form field",
+        ),
+        responses={
+            200: "Per region, the overlapping genetic findings",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    def post(self, request):
+        try:
+            if request.content_type.startswith("text/"):
+                regions = parse_bed(request.body.decode())
+            elif "file" in request.FILES:
+                regions = parse_bed(request.FILES["file"].read().decode())
+            else:
+                region_list = request.data.get("regions") if isinstance(request.data, dict) else None
+                if not isinstance(region_list, list):
+                    raise ValueError("Expected a JSON object with a 'regions' list or a BED file.")
+                regions = [(*parse_region(str(region)), None) for region in region_list]
+        except (UnicodeDecodeError, ValueError) as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return self.search(regions)
+
+    def search(self, regions: list) -> Response:
+        if not regions:
+            return Response(
+                {"error": "At least one region is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(regions) > self.max_regions:
+            return Response(
+                {"error": f"At most {self.max_regions} regions can be searched at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(find_overlapping_findings(regions), status=status.HTTP_200_OK)
+
+
+class NearestFindingsAPI(APIView):
+    """Genetic findings closest to a genomic position."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="search_nearest",
+        manual_parameters=[
+            openapi.Parameter(
+                "position", openapi.IN_QUERY,
+                description="Position as chrom:pos, 1-based, e.g. chr2:6850000",
+                type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter(
+                "count", openapi.IN_QUERY,
+                description="Number of findings to return (default 10)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
+        responses={
+            200: "Closest genetic findings with their distance in bases",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("genetic_findings")
+    @cached_table_response("genetic_findings")
+    def get(self, request):
+        try:
+            chrom, start, end = parse_region(request.GET.get("position", ""))
+            count = min(int(request.GET.get("count", 10)), 1000)
+        except ValueError:
+            return Response(
+                {"error": "Query parameter 'position' must be chrom:pos and 'count' an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end - start != 1 or count < 1:
+            return Response(
+                {"error": "Query parameter 'position' must be a single base and 'count' positive."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(find_nearest_findings(chrom, start, count=count), status=status.HTTP_200_OK)
+
+
+def finding_value_filters(request) -> dict:
+    """Read the FINDING_VALUE_FIELDS query parameters, each a comma separated list of values."""
+    filters = {}
+    for field in FINDING_VALUE_FIELDS:
+        values = [
+            value.strip()
+            for param in request.GET.getlist(field)
+            for value in param.split(",")
+            if value.strip()
+        ]
+        if values:
+            filters[field] = values
+    return filters
+
+
+finding_value_parameters = [
+    openapi.Parameter(
+        field, openapi.IN_QUERY,
+        description=f"Comma separated {field} values; a finding matches if it has any of them",
+        type=openapi.TYPE_STRING
+    )
+    for field in FINDING_VALUE_FIELDS
+]
+
+
+class FindingsByValueAPI(APIView):
+    """Genetic findings by gene, variant type, inheritance, discovery method or condition."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="search_findings_by_value",
+        manual_parameters=finding_value_parameters,
+        responses={
+            200: "Genetic findings matching every given field",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("genetic_findings")
+    @cached_table_response("genetic_findings")
+    def get(self, request):
+        filters = finding_value_filters(request)
+        if not filters:
+            return Response(
+                {"error": f"At least one of {', '.join(FINDING_VALUE_FIELDS)} is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(find_findings_by_value(filters), status=status.HTTP_200_OK)
+
+
+class FindingFacetsAPI(APIView):
+    """Number of genetic findings per gene, variant type, inheritance, discovery method and condition."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_finding_facets",
+        manual_parameters=[
+            openapi.Parameter(
+                "field", openapi.IN_QUERY, description="Only count the values of this field",
+                type=openapi.TYPE_STRING, enum=FINDING_VALUE_FIELDS
+            ),
+            *finding_value_parameters,
+        ],
+        responses={
+            200: "Field, value and number of findings",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("genetic_findings")
+    @cached_table_response("genetic_findings")
+    def get(self, request):
+        field = request.GET.get("field") or None
+        if field and field not in FINDING_VALUE_FIELDS:
+            return Response(
+                {"error": f"Invalid field: {field}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            get_finding_facets(field=field, filters=finding_value_filters(request)),
+            status=status.HTTP_200_OK,
+        )
+
+
+class PedigreeRelativesAPI(APIView):
+    """Parents, siblings and twins of a participant, with trio and quad flags."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_pedigree_relatives",
+        responses={
+            200: "Participant, father, mother, siblings and twins",
+            404: "Participant not found",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("participant")
+    @cached_table_response("participant")
+    def get(self, request, participant_id):
+        relatives = get_relatives(participant_id)
+        if relatives is None:
+            return Response(
+                {"error": f"Participant {participant_id} not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(relatives, status=status.HTTP_200_OK)
+
+
+class PedigreeLineageAPI(APIView):
+    """Ancestors or descendants of a participant through father and mother links."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_pedigree_lineage",
+        manual_parameters=[
+            openapi.Parameter(
+                "max_depth", openapi.IN_QUERY, description="Generations to walk (default 10, at most 50)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
+        responses={
+            200: "Relatives with the generation depth at which they were reached",
+            400: "Bad request",
+            404: "Participant not found",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("participant")
+    @cached_table_response("participant")
+    def get(self, request, participant_id, direction):
+        try:
+            max_depth = min(int(request.GET.get("max_depth", 10)), 50)
+        except ValueError:
+            max_depth = 0
+        if max_depth < 1:
+            return Response(
+                {"error": "Query parameter 'max_depth' must be a positive integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not Participant.objects.filter(pk=participant_id).exists():
+            return Response(
+                {"error": f"Participant {participant_id} not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(get_lineage(participant_id, direction, max_depth=max_depth), status=status.HTTP_200_OK)
+
+
+class PedigreeTriosAPI(APIView):
+    """Participants whose father and mother are both participants."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_pedigree_trios",
+        manual_parameters=[
+            openapi.Parameter(
+                "family_id", openapi.IN_QUERY, description="Only return trios of this family",
+                type=openapi.TYPE_STRING
+            ),
+        ],
+        responses={200: "Child, father, mother and full siblings of each trio"},
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("participant")
+    @cached_table_response("participant")
+    def get(self, request):
+        return Response(get_trios(request.GET.get("family_id") or None), status=status.HTTP_200_OK)
+
+
+class FamilyPedigreeAPI(APIView):
+    """Pedigree graph of a family."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_family_pedigree",
+        responses={
+            200: "Nodes and parent and twin edges of the family",
+            404: "Family not found",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    @conditional_table_get("participant")
+    @cached_table_response("participant")
+    def get(self, request, family_id):
+        graph = get_family_graph(family_id)
+        if graph is None:
+            return Response(
+                {"error": f"Family {family_id} has no participants."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(graph, status=status.HTTP_200_OK)
+
+
+class SampleLineageAPI(APIView):
+    """Ancestors or descendants of a biobank, analyte, experiment or alignment record."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_sample_lineage",
+        manual_parameters=[
+            openapi.Parameter(
+                "type", openapi.IN_QUERY, description="Only return records of this table, e.g. aligned_dna_short_read",
+                type=openapi.TYPE_STRING
+            ),
+        ],
+        responses={
+            200: "Related records with their table name, ID and depth in hops",
+            400: "Bad request",
+            404: "Record not found",
+        },
+        tags=["Search"],
+    )
+    # Not response cached: the ATAC tables have no change generations, and
+    # the closure lookup is a single indexed query
+    @replica_reads
+    def get(self, request, table_name, record_id, direction):
+        node_type = request.GET.get("type")
+        for name in [table_name, node_type]:
+            if name is not None and name not in LINEAGE_TABLES:
+                return Response(
+                    {"error": f"Unknown lineage table '{name}'. Use one of: {', '.join(LINEAGE_TABLES)}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if not LINEAGE_TABLES[table_name].objects.filter(pk=record_id).exists():
+            return Response(
+                {"error": f"{table_name} {record_id} not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(
+            get_sample_lineage(table_name, record_id, direction, node_type=node_type),
+            status=status.HTTP_200_OK,
+        )
+
+
+class FileLookupAPI(APIView):
+    """Records referencing a file path or md5 checksum, across every table."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="search_files",
+        manual_parameters=[
+            openapi.Parameter(
+                "path", openapi.IN_QUERY, description="File path, e.g. gs://bucket/sample.cram. May be repeated.",
+                type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING), collection_format="multi"
+            ),
+            openapi.Parameter(
+                "md5sum", openapi.IN_QUERY, description="md5 checksum. May be repeated.",
+                type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING), collection_format="multi"
+            ),
+        ],
+        responses={
+            200: "Path, md5 checksum and owning table, record and column of each matching file",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    def get(self, request):
+        paths, md5sums = request.GET.getlist("path"), request.GET.getlist("md5sum")
+        if not paths and not md5sums:
+            return Response(
+                {"error": "Query parameter 'path' or 'md5sum' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(find_files(paths, md5sums), status=status.HTTP_200_OK)
+
+
+class FileOwnersAPI(APIView):
+    """Resolve a batch of file paths to the records that reference them."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_paths = 100000
+
+    @swagger_auto_schema(
+        operation_id="resolve_file_owners",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "paths": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING)),
+            },
+            description="A JSON list of paths, or one path per line sent as text/plain",
+        ),
+        responses={
+            200: "Owners of each referenced path and the paths nothing references",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    def post(self, request):
+        if request.content_type.startswith("text/"):
+            try:
+                paths = request.body.decode().splitlines()
+            except UnicodeDecodeError as error:
+                return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            paths = request.data.get("paths") if isinstance(request.data, dict) else None
+            if not isinstance(paths, list):
+                return Response(
+                    {"error": "Expected a JSON object with a 'paths' list or one path per line."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if len(paths) > self.max_paths:
+            return Response(
+                {"error": f"At most {self.max_paths} paths can be resolved at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(resolve_file_owners(paths), status=status.HTTP_200_OK)
+
+
+class FileDuplicatesAPI(APIView):
+    """File paths or md5 checksums referenced by more than one record."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_duplicate_files",
+        manual_parameters=[
+            openapi.Parameter(
+                "by", openapi.IN_QUERY, description="Compare files by 'path' (default) or 'md5sum'",
+                type=openapi.TYPE_STRING
+            ),
+        ],
+        responses={
+            200: "Each duplicated path or checksum with the records referencing it",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    def get(self, request):
+        by = request.GET.get("by", "path")
+        if by not in ("path", "md5sum"):
+            return Response(
+                {"error": "Query parameter 'by' must be 'path' or 'md5sum'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(find_duplicate_files(by), status=status.HTTP_200_OK)
+
+
+class ManifestReconcileAPI(APIView):
+    """Compare a bucket listing with the files the database references."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="reconcile_manifest",
+        manual_parameters=[
+            openapi.Parameter(
+                "table", openapi.IN_QUERY, description="Only check files referenced by this table. May be repeated.",
+                type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING), collection_format="multi"
+            ),
+            openapi.Parameter(
+                "prefix", openapi.IN_QUERY, description="Only check paths under this prefix, e.g. gs://bucket/. May be repeated.",
+                type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_STRING), collection_format="multi"
+            ),
+        ],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="`gsutil ls -L` output or `path size md5` lines, sent as text/plain or as the `file` form field",
+        ),
+        responses={
+            200: "Missing, orphaned and checksum-mismatched files",
+            400: "Bad request",
+        },
+        tags=["Search"],
+    )
+    @replica_reads
+    def post(self, request):
+        tables = request.GET.getlist("table")
+        unknown = [table for table in tables if table not in FILE_REGISTRY_FIELDS]
+        if unknown:
+            return Response(
+                {"error": f"Unknown table(s): {', '.join(unknown)}. Use any of: {', '.join(FILE_REGISTRY_FIELDS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.content_type.startswith("text/"):
+            lines = request.body.splitlines()
+        elif "file" in request.FILES:
+            lines = request.FILES["file"]
+        else:
+            return Response(
+                {"error": "Expected a manifest sent as text/plain or as the 'file' form field."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            report = reconcile_manifest(parse_manifest(lines), tables=tables, prefixes=request.GET.getlist("prefix"))
+        except (UnicodeDecodeError, ValueError) as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class ResponseCacheStatsAPI(APIView):
+    """Hit and miss counters of the read response cache in this server process."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="get_response_cache_stats",
+        responses={200: "Response cache hits, misses and hit ratio"},
+        tags=["Search"],
+    )
+    def get(self, request):
+        return Response(response_cache_stats(), status=status.HTTP_200_OK)
+
+
+class AsyncReadAPI(View):
+    """
+    Base of the async read views. These are plain Django views using the
+    async ORM, so under an ASGI server a slow client or a long streamed
+    response does not hold a worker thread. Requests are authenticated as
+    for the DRF views, and reads go to the replica unless the client is
+    pinned to the primary.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await authenticate_async(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class TablePageAPI(AsyncReadAPI):
+    """
+    One page of a table in primary key order, streamed as JSON:
+    `{"table": ..., "rows": [...], "next": ...}`. Pass `next` as `after`
+    to read the following page; it is null on the last page.
+    """
+
+    default_limit = 1000
+    max_limit = 10000
+
+    async def get(self, request, table_name):
+        model = TRACKED_TABLES.get(table_name)
+        if model is None:
+            return JsonResponse({"error": f"Unknown table {table_name}."}, status=404)
+        try:
+            limit = min(int(request.GET.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            return JsonResponse({"error": "Query parameter 'limit' must be an integer."}, status=400)
+        if limit < 1:
+            return JsonResponse({"error": "Query parameter 'limit' must be positive."}, status=400)
+
+        return StreamingHttpResponse(
+            self.stream(request, table_name, model, limit, request.GET.get("after")),
+            content_type="application/json",
+        )
+
+    async def stream(self, request, table_name, model, limit, after):
+        pk_name = model._meta.pk.name
+        count, last = 0, None
+        with request_reads(request):
+            yield f'{{"table": {json.dumps(table_name)}, "rows": ['
+            async for row in atable_rows(model, limit=limit, after=after):
+                yield ("," if count else "") + json.dumps(row, cls=DjangoJSONEncoder)
+                count += 1
+                last = row[pk_name]
+        yield f'], "next": {json.dumps(last if count == limit else None, cls=DjangoJSONEncoder)}}}'
+
+
+class ParticipantAggregateAPI(AsyncReadAPI):
+    """A participant with its family and its rows in every related table."""
+
+    async def get(self, request, participant_id):
+        with request_reads(request):
+            aggregate = await aget_participant_aggregate(participant_id)
+        if aggregate is None:
+            return JsonResponse({"error": f"Participant {participant_id} not found."}, status=404)
+        return JsonResponse(aggregate, encoder=DjangoJSONEncoder)
+
+
+class AsyncSummaryCountsAPI(AsyncReadAPI):
+    """Async version of SummaryCountsAPI."""
+
+    async def get(self, request):
+        filters = {
+            field: request.GET[field] for field in SummaryCountsAPI.filter_fields if field in request.GET
+        }
+        with request_reads(request):
+            rows = await aget_summary_counts(**filters)
+        return JsonResponse(rows, safe=False)
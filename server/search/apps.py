@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+# search/apps.py
+
+from django.apps import AppConfig
+
+
+class Search(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "search"
+
+    def ready(self):
+        """Connect the index maintenance and database connection receivers."""
+        import config.database  # noqa: F401
+        import search.signals  # noqa: F401
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# search/management/commands/benchmark.py
+
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from config.benchmarks import BenchmarkError, BenchmarkRunner, compare_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a synthetic dataset into a throwaway test database through the APIs "
+        "and time the create, update, re-upload, read and export scenarios."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--families", type=int, default=100, help="Number of synthetic families.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the dataset.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs of each repeatable scenario.")
+        parser.add_argument("--batch-size", type=int, default=100, help="Records submitted per request.")
+        parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+        parser.add_argument("--compare", help="JSON results of an earlier run to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.2,
+            help="Slowdown ratio over --compare reported as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            # Lookup tables the experiment APIs resolve names against
+            call_command("loaddata", "config/fixtures/initial.json", verbosity=0)
+            results = BenchmarkRunner(
+                families=options["families"],
+                seed=options["seed"],
+                repeat=options["repeat"],
+                batch_size=options["batch_size"],
+            ).run()
+        except BenchmarkError as error:
+            raise CommandError(str(error))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        document = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                output_file.write(document + "\n")
+        else:
+            self.stdout.write(document)
+
+        if options["compare"]:
+            with open(options["compare"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            rows = compare_results(baseline, results, options["threshold"])
+            regressions = [row[0] for row in rows if row[4]]
+            for name, before, after, ratio, regressed in rows:
+                line = f"{name}: {before}s -> {after}s ({ratio}x)"
+                self.stderr.write(self.style.ERROR(line) if regressed else line)
+            if regressions:
+                raise CommandError(f"Slower than {options['threshold']}x the baseline: {', '.join(regressions)}")
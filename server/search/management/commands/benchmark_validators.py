@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# search/management/commands/benchmark_validators.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.benchmarks import BenchmarkError, model_rules, validator_throughput
+from utilities.synthetic_data import SyntheticDataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Validate a synthetic dataset against the table schemas with jsonschema "
+        "and with the compiled validators, and report the throughput of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--families", type=int, default=100, help="Number of synthetic families.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the dataset.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs of each validator.")
+        parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        choices, required = model_rules()
+        tables = SyntheticDataset(
+            families=options["families"], seed=options["seed"], choices=choices, required=required
+        ).generate()
+        try:
+            results = validator_throughput(tables, repeat=options["repeat"])
+        except BenchmarkError as error:
+            raise CommandError(str(error))
+
+        document = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                output_file.write(document + "\n")
+        else:
+            self.stdout.write(document)
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"{results['compiled']['records']} records: "
+                f"{results['jsonschema']['records_per_s']}/s with jsonschema, "
+                f"{results['compiled']['records_per_s']}/s compiled ({results['speedup']}x)"
+            )
+        )
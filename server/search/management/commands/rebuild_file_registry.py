@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_file_registry.py
+
+from django.core.management.base import BaseCommand
+
+from search.services import rebuild_file_registry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the file path and md5 registry from every table referencing files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of records read and files written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_file_registry(batch_size=options["batch_size"])
+        for table_name, count in counts.items():
+            self.stdout.write(f"{table_name}: {count} files registered")
+        self.stdout.write(self.style.SUCCESS("File registry rebuilt."))
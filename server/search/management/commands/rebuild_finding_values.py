@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_finding_values.py
+
+from django.core.management.base import BaseCommand
+
+from search.services import rebuild_finding_values
+
+
+class Command(BaseCommand):
+    help = "Rebuild the gene, variant type, inheritance and condition value index of the genetic findings table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of findings indexed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_finding_values(batch_size=options["batch_size"])
+        self.stdout.write(f"genetic_findings: {count} records indexed")
+        self.stdout.write(self.style.SUCCESS("Finding value index rebuilt."))
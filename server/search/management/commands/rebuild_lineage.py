@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_lineage.py
+
+from django.core.management.base import BaseCommand
+
+from search.services import rebuild_lineage
+
+
+class Command(BaseCommand):
+    help = "Rebuild the biobank to alignment lineage closure table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of closure rows written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_lineage(batch_size=options["batch_size"])
+        self.stdout.write(f"lineage: {count} ancestor and descendant pairs indexed")
+        self.stdout.write(self.style.SUCCESS("Lineage rebuilt."))
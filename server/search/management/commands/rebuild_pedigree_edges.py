@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_pedigree_edges.py
+
+from django.core.management.base import BaseCommand
+
+from search.services import rebuild_pedigree_edges
+
+
+class Command(BaseCommand):
+    help = "Rebuild the pedigree parent and twin edges from the participant table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of participants read and edges written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_pedigree_edges(batch_size=options["batch_size"])
+        self.stdout.write(f"participant: {count} edges indexed")
+        self.stdout.write(self.style.SUCCESS("Pedigree edges rebuilt."))
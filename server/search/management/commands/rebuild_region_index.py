@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_region_index.py
+
+from django.core.management.base import BaseCommand
+
+from search.services import rebuild_region_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the genomic region index from the genetic findings table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of findings indexed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_region_index(batch_size=options["batch_size"])
+        self.stdout.write(f"genetic_findings: {count} records indexed")
+        self.stdout.write(self.style.SUCCESS("Region index rebuilt."))
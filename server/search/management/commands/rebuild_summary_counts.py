@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_summary_counts.py
+
+from django.core.management.base import BaseCommand
+
+from search.services import rebuild_summary_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard summary counts from the participant, analyte, experiment and aligned tables."
+
+    def handle(self, *args, **options):
+        rows = rebuild_summary_counts()
+        self.stdout.write(self.style.SUCCESS(f"{rows} summary rows written."))
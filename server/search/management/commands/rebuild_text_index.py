@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# search/management/commands/rebuild_text_index.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.services import rebuild_text_index, text_index_available
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from the phenotype, genetic findings and family tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of records indexed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        if not text_index_available():
+            raise CommandError("The full-text index requires an SQLite database.")
+
+        counts = rebuild_text_index(batch_size=options["batch_size"])
+        for table_name, count in counts.items():
+            self.stdout.write(f"{table_name}: {count} records indexed")
+        self.stdout.write(self.style.SUCCESS("Full-text index rebuilt."))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# search/management/commands/reconcile_manifest.py
+
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.selectors import parse_manifest, reconcile_manifest
+from search.services import FILE_REGISTRY_FIELDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare a bucket listing (`gsutil ls -L` output or `path size md5` lines) "
+        "with the files the database references and report missing, orphaned and "
+        "checksum-mismatched files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("manifest", help="Listing file, or - to read standard input.")
+        parser.add_argument(
+            "--table",
+            action="append",
+            choices=list(FILE_REGISTRY_FIELDS),
+            help="Only check files referenced by this table. May be repeated.",
+        )
+        parser.add_argument(
+            "--prefix",
+            action="append",
+            help="Only check paths under this prefix, e.g. gs://bucket/. May be repeated.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        try:
+            if options["manifest"] == "-":
+                report = self.reconcile(sys.stdin, options)
+            else:
+                with open(options["manifest"], "rb") as manifest_file:
+                    report = self.reconcile(manifest_file, options)
+        except (OSError, UnicodeDecodeError, ValueError) as error:
+            raise CommandError(str(error))
+
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                json.dump(report, output_file, indent=2)
+                output_file.write("\n")
+        self.stdout.write(f"listed: {report['listed']} files")
+        self.stdout.write(f"referenced: {report['referenced']} files")
+        for key in ["missing", "orphaned", "mismatched"]:
+            self.stdout.write(f"{key}: {len(report[key])} files")
+        if not options["output"]:
+            for entry in report["missing"]:
+                self.stdout.write(f"missing\t{entry['path']}")
+            for path in report["orphaned"]:
+                self.stdout.write(f"orphaned\t{path}")
+            for entry in report["mismatched"]:
+                self.stdout.write(
+                    f"mismatched\t{entry['path']}\t{entry['md5sum']}\t{entry['manifest_md5sum']}"
+                )
+        if report["missing"] or report["mismatched"]:
+            self.stdout.write(self.style.WARNING("Manifest does not match the database."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Manifest matches the database."))
+
+    def reconcile(self, lines, options):
+        return reconcile_manifest(parse_manifest(lines), tables=options["table"], prefixes=options["prefix"])
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# search/management/commands/verify_staged_md5.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.services import FILE_REGISTRY_FIELDS, verify_staged_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Hash the locally staged copies of registered files in parallel and compare "
+        "them to the md5sum columns. Results are cached by path, size and modification "
+        "time, so reruns only hash changed files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--map",
+            action="append",
+            default=[],
+            metavar="PREFIX=DIRECTORY",
+            help="Local directory staging the files under a registered prefix, e.g. "
+            "gs://bucket/=/staging/bucket. May be repeated.",
+        )
+        parser.add_argument(
+            "--table",
+            action="append",
+            choices=list(FILE_REGISTRY_FIELDS),
+            help="Only verify files of this table. May be repeated.",
+        )
+        parser.add_argument("--workers", type=int, help="Hashing processes (default: CPU count).")
+        parser.add_argument("--buffer-mb", type=int, default=8, help="MiB read per call.")
+        parser.add_argument("--force", action="store_true", help="Hash every file again, ignoring the cache.")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        prefix_map = {}
+        for mapping in options["map"]:
+            prefix, separator, directory = mapping.partition("=")
+            if not separator or not prefix or not directory:
+                raise CommandError(f"Invalid --map '{mapping}', expected PREFIX=DIRECTORY.")
+            prefix_map[prefix] = directory
+        if options["buffer_mb"] < 1:
+            raise CommandError("--buffer-mb must be at least 1.")
+
+        report = verify_staged_files(
+            prefix_map,
+            tables=options["table"],
+            workers=options["workers"],
+            buffer_size=options["buffer_mb"] * 1024 * 1024,
+            force=options["force"],
+        )
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                json.dump(report, output_file, indent=2)
+                output_file.write("\n")
+        for key in ["verified", "hashed", "cached", "not_staged"]:
+            self.stdout.write(f"{key}: {report[key]} files")
+        for entry in report["mismatched"]:
+            self.stdout.write(f"mismatched\t{entry['path']}\t{entry['md5sum']}\t{entry['local_md5sum']}")
+        if report["mismatched"]:
+            self.stdout.write(self.style.WARNING(f"{len(report['mismatched'])} staged files do not match."))
+        else:
+            self.stdout.write(self.style.SUCCESS("All staged files match."))
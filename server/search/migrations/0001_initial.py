@@ -0,0 +1,63 @@
+# Generated by Django 5.0.1 on 2026-10-19 11:54
+
+from django.db import migrations, models
+
+
+def create_text_index(apps, schema_editor):
+    """Create the FTS5 virtual table backing TextIndexEntry (SQLite only)."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_text_index USING fts5(body)"
+    )
+
+
+def drop_text_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS search_text_index")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="TextIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "table_name",
+                    models.CharField(
+                        help_text="The table the indexed record belongs to",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "record_id",
+                    models.CharField(
+                        help_text="Primary key of the indexed record in its table",
+                        max_length=255,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="textindexentry",
+            constraint=models.UniqueConstraint(
+                fields=("table_name", "record_id"), name="unique_text_index_record"
+            ),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-19 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SummaryCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "table_name",
+                    models.CharField(
+                        help_text="participant, analyte or one of the experiment_*/aligned_* tables",
+                        max_length=50,
+                    ),
+                ),
+                ("gregor_center", models.CharField(blank=True, max_length=255)),
+                ("consent_code", models.CharField(blank=True, max_length=255)),
+                ("affected_status", models.TextField(blank=True)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="summarycount",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "table_name",
+                    "gregor_center",
+                    "consent_code",
+                    "affected_status",
+                ),
+                name="unique_summary_group",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0002_summarycount"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableGeneration",
+            fields=[
+                (
+                    "table_name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("generation", models.BigIntegerField(default=0)),
+                ("last_modified", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
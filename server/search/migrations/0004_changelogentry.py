@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0003_tablegeneration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogEntry",
+            fields=[
+                ("sequence", models.BigAutoField(primary_key=True, serialize=False)),
+                ("table_name", models.CharField(max_length=50)),
+                (
+                    "record_id",
+                    models.CharField(
+                        help_text="Primary key of the changed record in its table",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "operation",
+                    models.CharField(
+                        choices=[("upsert", "Upsert"), ("delete", "Delete")],
+                        max_length=10,
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:02
+
+from django.db import migrations, models
+
+
+def index_existing_findings(apps, schema_editor):
+    from search.services import REGION_FIELDS, region_bin, region_intervals
+
+    GeneticFindings = apps.get_model("metadata", "GeneticFindings")
+    RegionIndexEntry = apps.get_model("search", "RegionIndexEntry")
+    RegionIndexEntry.objects.bulk_create(
+        [
+            RegionIndexEntry(
+                record_id=str(row[0]), chrom=chrom, bin=region_bin(start, end), start=start, end=end
+            )
+            for row in GeneticFindings.objects.values_list("pk", *REGION_FIELDS)
+            for chrom, start, end in region_intervals(*row[1:])
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0004_changelogentry"),
+        ("metadata", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegionIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "record_id",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Primary key of the genetic finding",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "chrom",
+                    models.CharField(
+                        help_text="Chromosome without the chr prefix, upper case",
+                        max_length=10,
+                    ),
+                ),
+                ("bin", models.IntegerField()),
+                ("start", models.BigIntegerField()),
+                ("end", models.BigIntegerField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["chrom", "bin", "start"], name="region_bin_idx"
+                    ),
+                    models.Index(fields=["chrom", "start"], name="region_start_idx"),
+                    models.Index(fields=["chrom", "end"], name="region_end_idx"),
+                ],
+            },
+        ),
+        migrations.RunPython(index_existing_findings, migrations.RunPython.noop),
+    ]
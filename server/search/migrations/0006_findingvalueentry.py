@@ -0,0 +1,73 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+def index_existing_findings(apps, schema_editor):
+    from search.services import FINDING_VALUE_FIELDS, finding_value_rows
+
+    GeneticFindings = apps.get_model("metadata", "GeneticFindings")
+    FindingValueEntry = apps.get_model("search", "FindingValueEntry")
+    FindingValueEntry.objects.bulk_create(
+        [
+            FindingValueEntry(record_id=str(row[0]), field=field, value=value, key=key)
+            for row in GeneticFindings.objects.values_list("pk", *FINDING_VALUE_FIELDS)
+            for field, value, key in finding_value_rows(*row[1:])
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0005_regionindexentry"),
+        ("metadata", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FindingValueEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "record_id",
+                    models.CharField(
+                        help_text="Primary key of the genetic finding", max_length=255
+                    ),
+                ),
+                (
+                    "field",
+                    models.CharField(
+                        help_text="Genetic findings column the value comes from",
+                        max_length=50,
+                    ),
+                ),
+                ("value", models.CharField(max_length=255)),
+                ("key", models.CharField(max_length=255)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["field", "key", "record_id"],
+                        name="finding_value_key_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="findingvalueentry",
+            constraint=models.UniqueConstraint(
+                fields=("record_id", "field", "key"), name="unique_finding_value"
+            ),
+        ),
+        migrations.RunPython(index_existing_findings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+def index_existing_participants(apps, schema_editor):
+    from search.services import parent_edge_rows, twin_edge_rows
+
+    Participant = apps.get_model("metadata", "Participant")
+    PedigreeEdge = apps.get_model("search", "PedigreeEdge")
+    rows = [
+        row
+        for values in Participant.objects.values_list("pk", "paternal_id", "maternal_id")
+        for row in parent_edge_rows(*values)
+    ]
+    rows += [
+        row
+        for participant_id, twin_id in Participant.twin_id.through.objects.values_list(
+            "participant_id", "twinid_id"
+        )
+        for row in twin_edge_rows(participant_id, [twin_id])
+    ]
+    PedigreeEdge.objects.bulk_create(
+        [PedigreeEdge(source=source, target=target, relation=relation) for source, target, relation in rows],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0006_findingvalueentry"),
+        ("metadata", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PedigreeEdge",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        help_text="Parent participant_id, or the participant declaring the twin",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "target",
+                    models.CharField(
+                        help_text="Child participant_id, or the twin", max_length=255
+                    ),
+                ),
+                (
+                    "relation",
+                    models.CharField(
+                        choices=[
+                            ("father", "Father"),
+                            ("mother", "Mother"),
+                            ("twin", "Twin"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["source", "relation"], name="pedigree_source_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pedigreeedge",
+            constraint=models.UniqueConstraint(
+                fields=("target", "relation", "source"), name="unique_pedigree_edge"
+            ),
+        ),
+        migrations.RunPython(index_existing_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+def index_existing_lineage(apps, schema_editor):
+    from search.services import lineage_closure, lineage_edges
+
+    LineageEntry = apps.get_model("search", "LineageEntry")
+    LineageEntry.objects.bulk_create(
+        [
+            LineageEntry(
+                ancestor_type=ancestor_type,
+                ancestor_id=ancestor_id,
+                descendant_type=descendant_type,
+                descendant_id=descendant_id,
+                depth=depth,
+            )
+            for ancestor_type, ancestor_id, descendant_type, descendant_id, depth in lineage_closure(
+                lineage_edges(apps.get_model)
+            )
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0001_initial"),
+        ("metadata", "0001_initial"),
+        ("search", "0007_pedigreeedge"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LineageEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ancestor_type", models.CharField(max_length=50)),
+                ("ancestor_id", models.CharField(max_length=255)),
+                ("descendant_type", models.CharField(max_length=50)),
+                ("descendant_id", models.CharField(max_length=255)),
+                (
+                    "depth",
+                    models.IntegerField(
+                        help_text="Number of hops from the ancestor to the descendant"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["descendant_type", "descendant_id", "ancestor_type"],
+                        name="lineage_descendant_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="lineageentry",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "ancestor_type",
+                    "ancestor_id",
+                    "descendant_type",
+                    "descendant_id",
+                ),
+                name="unique_lineage_pair",
+            ),
+        ),
+        migrations.RunPython(index_existing_lineage, migrations.RunPython.noop),
+    ]
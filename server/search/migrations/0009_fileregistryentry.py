@@ -0,0 +1,70 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:28
+
+from django.db import migrations, models
+
+
+def register_existing_files(apps, schema_editor):
+    from search.services import FILE_REGISTRY_FIELDS, file_registry_columns, file_registry_rows
+
+    FileRegistryEntry = apps.get_model("search", "FileRegistryEntry")
+    entries = []
+    for table_name, (model, columns) in FILE_REGISTRY_FIELDS.items():
+        model = apps.get_model(model._meta.app_label, model._meta.object_name)
+        for record_id, *values in model.objects.values_list("pk", *file_registry_columns(table_name)):
+            entries += [
+                FileRegistryEntry(
+                    path=path, md5sum=md5sum, table_name=table_name, record_id=str(record_id), field=field
+                )
+                for field, path, md5sum in file_registry_rows(table_name, *values)
+            ]
+    FileRegistryEntry.objects.bulk_create(entries, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0001_initial"),
+        ("metadata", "0001_initial"),
+        ("search", "0008_lineageentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileRegistryEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=1024)),
+                ("md5sum", models.CharField(blank=True, max_length=32)),
+                ("table_name", models.CharField(max_length=50)),
+                ("record_id", models.CharField(max_length=255)),
+                (
+                    "field",
+                    models.CharField(
+                        help_text="Column the path comes from", max_length=100
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["path"], name="file_registry_path_idx"),
+                    models.Index(fields=["md5sum"], name="file_registry_md5_idx"),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="fileregistryentry",
+            constraint=models.UniqueConstraint(
+                fields=("table_name", "record_id", "field"),
+                name="unique_file_reference",
+            ),
+        ),
+        migrations.RunPython(register_existing_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0009_fileregistryentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StagedFileChecksum",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("local_path", models.CharField(max_length=1024, unique=True)),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="Registered path the local file stages",
+                        max_length=1024,
+                    ),
+                ),
+                ("size", models.BigIntegerField()),
+                (
+                    "mtime_ns",
+                    models.BigIntegerField(
+                        help_text="Modification time of the hashed file, in nanoseconds"
+                    ),
+                ),
+                ("md5sum", models.CharField(max_length=32)),
+                (
+                    "expected_md5sum",
+                    models.CharField(
+                        help_text="md5sum recorded in the database", max_length=32
+                    ),
+                ),
+                ("matches", models.BooleanField()),
+                ("checked_at", models.DateTimeField()),
+            ],
+        ),
+    ]
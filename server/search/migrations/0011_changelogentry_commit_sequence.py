@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def number_existing_entries(apps, schema_editor):
+    # Entries written before this migration are committed
+    ChangeLogEntry = apps.get_model("search", "ChangeLogEntry")
+    ChangeLogEntry.objects.using(schema_editor.connection.alias).update(commit_sequence=F("sequence"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0010_stagedfilechecksum"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="changelogentry",
+            name="commit_sequence",
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.RunPython(number_existing_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# search/models.py
+
+"""Search Models
+
+Side tables maintained from the metadata and experiment tables so the search
+APIs can answer without scanning the source rows.
+"""
+
+from django.db import models
+
+
+class TextIndexEntry(models.Model):
+    """
+    One row per indexed record. The primary key of this table is used as the
+    rowid of the `search_text_index` FTS5 virtual table, which holds the
+    searchable text for the record.
+    """
+
+    table_name = models.CharField(
+        max_length=50,
+        help_text="The table the indexed record belongs to",
+    )
+    record_id = models.CharField(
+        max_length=255,
+        help_text="Primary key of the indexed record in its table",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["table_name", "record_id"], name="unique_text_index_record"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.table_name}.{self.record_id}"
+
+
+class SummaryCount(models.Model):
+    """
+    Precomputed dashboard counts. Each row holds the number of records in
+    `table_name` whose participant falls in one gregor_center, consent_code and
+    affected_status group.
+    """
+
+    table_name = models.CharField(
+        max_length=50,
+        help_text="participant, analyte or one of the experiment_*/aligned_* tables",
+    )
+    gregor_center = models.CharField(max_length=255, blank=True)
+    consent_code = models.CharField(max_length=255, blank=True)
+    affected_status = models.TextField(blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["table_name", "gregor_center", "consent_code", "affected_status"],
+                name="unique_summary_group",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.table_name} {self.gregor_center}/{self.consent_code}/{self.affected_status}: {self.count}"
+
+
+class TableGeneration(models.Model):
+    """
+    Write counter per table. The generation is bumped on every save, delete or
+    many-to-many change of a record in the table, and is used to build
+    ETag/Last-Modified headers for the read endpoints.
+    """
+
+    table_name = models.CharField(max_length=50, primary_key=True)
+    generation = models.BigIntegerField(default=0)
+    last_modified = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.table_name}: {self.generation}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only log of writes to the tracked tables.
+
+    `sequence` is allocated when an entry is inserted, before its transaction
+    commits, so entries can become visible out of sequence order.
+    `commit_sequence` is given to entries once they are committed, in the
+    order they are found (see `search.services.number_changes`), so a client
+    that has synced up to commit sequence N only needs the entries after N to
+    bring its copy up to date.
+    """
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+    OPERATION_CHOICES = [(UPSERT, "Upsert"), (DELETE, "Delete")]
+
+    sequence = models.BigAutoField(primary_key=True)
+    table_name = models.CharField(max_length=50)
+    record_id = models.CharField(
+        max_length=255,
+        help_text="Primary key of the changed record in its table",
+    )
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    commit_sequence = models.BigIntegerField(null=True, blank=True, unique=True)
+
+    def __str__(self):
+        return f"{self.sequence} {self.operation} {self.table_name}.{self.record_id}"
+
+
+class RegionIndexEntry(models.Model):
+    """
+    Genomic interval of a genetic finding, in 0-based half-open coordinates.
+    `bin` is the UCSC bin of the interval, so an overlap query only reads the
+    few bins that can hold an overlapping interval. A finding whose end lies
+    on another chromosome (chrom_end) has one row per breakpoint.
+    """
+
+    record_id = models.CharField(
+        max_length=255,
+        db_index=True,
+        help_text="Primary key of the genetic finding",
+    )
+    chrom = models.CharField(
+        max_length=10,
+        help_text="Chromosome without the chr prefix, upper case",
+    )
+    bin = models.IntegerField()
+    start = models.BigIntegerField()
+    end = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["chrom", "bin", "start"], name="region_bin_idx"),
+            models.Index(fields=["chrom", "start"], name="region_start_idx"),
+            models.Index(fields=["chrom", "end"], name="region_end_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.record_id} {self.chrom}:{self.start}-{self.end}"
+
+
+class FindingValueEntry(models.Model):
+    """
+    One row per value of a multi-valued genetic findings column, such as each
+    gene in `gene_of_interest`, so findings can be looked up and counted by
+    value without decoding the JSON of every row. `key` is the case-folded
+    value used for lookups.
+    """
+
+    record_id = models.CharField(
+        max_length=255,
+        help_text="Primary key of the genetic finding",
+    )
+    field = models.CharField(
+        max_length=50,
+        help_text="Genetic findings column the value comes from",
+    )
+    value = models.CharField(max_length=255)
+    key = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["record_id", "field", "key"], name="unique_finding_value"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["field", "key", "record_id"], name="finding_value_key_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.record_id} {self.field}={self.value}"
+
+
+class PedigreeEdge(models.Model):
+    """
+    Pedigree relationship between two participant IDs: a `father` or
+    `mother` edge from parent to child, from the child's paternal_id and
+    maternal_id, or a `twin` edge from a participant to an ID in its twin_id.
+    Parents need not be participants themselves.
+    """
+
+    FATHER = "father"
+    MOTHER = "mother"
+    TWIN = "twin"
+    RELATION_CHOICES = [(FATHER, "Father"), (MOTHER, "Mother"), (TWIN, "Twin")]
+    PARENT_RELATIONS = (FATHER, MOTHER)
+
+    source = models.CharField(
+        max_length=255,
+        help_text="Parent participant_id, or the participant declaring the twin",
+    )
+    target = models.CharField(
+        max_length=255,
+        help_text="Child participant_id, or the twin",
+    )
+    relation = models.CharField(max_length=10, choices=RELATION_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target", "relation", "source"], name="unique_pedigree_edge"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["source", "relation"], name="pedigree_source_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.source} -{self.relation}-> {self.target}"
+
+
+class LineageEntry(models.Model):
+    """
+    Closure of the sample provenance chain biobank -> analyte -> experiment
+    -> alignment: one row for every ancestor and descendant pair, with the
+    number of hops between them, so the whole lineage of a record in either
+    direction is one indexed query. Nodes are identified by their table name
+    and primary key.
+    """
+
+    ancestor_type = models.CharField(max_length=50)
+    ancestor_id = models.CharField(max_length=255)
+    descendant_type = models.CharField(max_length=50)
+    descendant_id = models.CharField(max_length=255)
+    depth = models.IntegerField(help_text="Number of hops from the ancestor to the descendant")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor_type", "ancestor_id", "descendant_type", "descendant_id"],
+                name="unique_lineage_pair",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["descendant_type", "descendant_id", "ancestor_type"], name="lineage_descendant_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_type}.{self.ancestor_id} -{self.depth}-> {self.descendant_type}.{self.descendant_id}"
+
+
+class FileRegistryEntry(models.Model):
+    """
+    A file referenced by a metadata or experiment record: its path, the md5
+    checksum recorded with it (empty if the table keeps none for that
+    column) and the table, primary key and column that reference it, so a
+    path or checksum is one indexed lookup across every table.
+    """
+
+    path = models.CharField(max_length=1024)
+    md5sum = models.CharField(max_length=32, blank=True)
+    table_name = models.CharField(max_length=50)
+    record_id = models.CharField(max_length=255)
+    field = models.CharField(max_length=100, help_text="Column the path comes from")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["table_name", "record_id", "field"], name="unique_file_reference"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["path"], name="file_registry_path_idx"),
+            models.Index(fields=["md5sum"], name="file_registry_md5_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.path} ({self.table_name}.{self.field} {self.record_id})"
+
+
+class StagedFileChecksum(models.Model):
+    """
+    md5 checksum of a locally staged copy of a registered file, cached by
+    the local file's size and modification time so unchanged files are not
+    hashed again, with the result of comparing it to the database checksum.
+    """
+
+    local_path = models.CharField(max_length=1024, unique=True)
+    path = models.CharField(max_length=1024, help_text="Registered path the local file stages")
+    size = models.BigIntegerField()
+    mtime_ns = models.BigIntegerField(help_text="Modification time of the hashed file, in nanoseconds")
+    md5sum = models.CharField(max_length=32)
+    expected_md5sum = models.CharField(max_length=32, help_text="md5sum recorded in the database")
+    matches = models.BooleanField()
+    checked_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.local_path} {self.md5sum}"
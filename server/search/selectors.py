@@ -1,13 +1,72 @@
 #!/usr/bin/env python
 # search/selectors.py
 
+import base64
+import binascii
+import functools
+import hashlib
 import importlib
+import threading
+from collections import Counter, defaultdict
 from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, router
+from django.db.models import Count, Max, Min, Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.response import Response
 
+from config.read_serializers import serialize_queryset
+from config.routers import read_from_replica
 from config.selectors import (
     generate_tsv,
     generate_zip,
 )
+from experiments.services import (
+    AlignedDNAShortReadSerializer,
+    AlignedNanoporeSerializer,
+    AlignedPacBioSerializer,
+    AlignedRNASerializer,
+    AlignedSerializer,
+    ExperimentNanoporeSerializer,
+    ExperimentPacBioSerializer,
+    ExperimentRNAOutputSerializer,
+    ExperimentSerializer,
+    ExperimentShortReadSerializer,
+)
+from metadata.services import (
+    AnalyteSerializer,
+    BiobankSerializer,
+    FamilySerializer,
+    GeneticFindingsSerializer,
+    ParticipantOutputSerializer,
+    PhenotypeSerializer,
+)
+from metadata.models import GeneticFindings, Participant
+from search.models import (
+    ChangeLogEntry,
+    FileRegistryEntry,
+    FindingValueEntry,
+    LineageEntry,
+    PedigreeEdge,
+    RegionIndexEntry,
+    SummaryCount,
+    TableGeneration,
+    TextIndexEntry,
+)
+from search.services import (
+    BIN_MAX_END,
+    FILE_REGISTRY_MIRROR_TABLES,
+    FINDING_VALUE_FIELDS,
+    TEXT_INDEX_TABLE,
+    TRACKED_TABLES,
+    finding_value_key,
+    normalize_chrom,
+    number_changes,
+    overlapping_bin_ranges,
+    text_index_available,
+)
 
 serializer_mapping ={
     "alignedpacbio": "AlignedPacBioSerializer",
@@ -15,8 +74,8 @@ serializer_mapping ={
     "aligned": "AlignedSerializer",
     "experimentdnashortread": "ExperimentShortReadSerializer",
     "aligneddnashortread": "AlignedDNAShortReadSerializer",
-    "experimentrnashortread": "ExperimentRnaOPutputSerializer",
-    "alignedrnashortread": "AlignedRnaSerializer",
+    "experimentrnashortread": "ExperimentRNAOutputSerializer",
+    "alignedrnashortread": "AlignedRNASerializer",
     "experimentnanopore":"ExperimentNanoporeSerializer",
     "alignednanopore":"AlignedNanoporeSerializer",
     "experimentpacbio" : "ExperimentPacBioSerializer",
@@ -29,6 +88,7 @@ serializer_mapping ={
     'experimentstage': "ExperimentStageSerializer",
 }
 
+@read_from_replica()
 def get_anvil_tables():
     files = {}
     metadata_list = ['family', 'participant', 'phenotype', 'geneticfindings', 'analyte', 'biobankentry', 'experimentstage']
@@ -42,8 +102,7 @@ def get_anvil_tables():
             try:
                 SerializerClass = getattr(experiments_serializer_module, serializer_mapping[key], None)
                 queryset = experiments_models[key].objects.all()
-                serializer = SerializerClass(queryset, many=True)
-                serialized_data = serializer.data
+                serialized_data = serialize_queryset(SerializerClass, queryset)
                 tsv_content = generate_tsv(serialized_data)
                 files[f"{key.lower()}.tsv"]  = tsv_content
             except KeyError as error:
@@ -53,8 +112,7 @@ def get_anvil_tables():
             try:
                 SerializerClass = getattr(metadata_serializer_module, serializer_mapping[key], None)
                 queryset = metadata_models[key].objects.all()
-                serializer = SerializerClass(queryset, many=True)
-                serialized_data = serializer.data
+                serialized_data = serialize_queryset(SerializerClass, queryset)
                 tsv_content = generate_tsv(serialized_data)
                 files[f"{key.lower()}.tsv"]  = tsv_content
             except KeyError as error:
@@ -64,3 +122,1052 @@ def get_anvil_tables():
 
     return zip_buffer
 
+
+def fts_query(query: str) -> str:
+    """
+    Convert free text into an FTS5 MATCH expression.
+
+    Each whitespace separated term is quoted so characters such as the colon in
+    `HP:0001250` are matched literally instead of being parsed as FTS5 syntax.
+    A trailing `*` on a term is kept as a prefix search.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms)
+
+
+def text_search(query: str, table_name: str = None, limit: int = 50) -> list:
+    """
+    Search the full-text index and return ranked hits.
+
+    Args:
+        query (str): Free text to search for, e.g. an HPO ID or gene symbol.
+        table_name (str, optional): Restrict hits to one indexed table.
+        limit (int): Maximum number of hits to return.
+
+    Returns:
+        list: Dictionaries with `table`, `pk`, `snippet` and `rank` keys, best
+        match first.
+    """
+    match = fts_query(query)
+    if not match or not text_index_available():
+        return []
+
+    sql = (
+        f"SELECT entry.table_name, entry.record_id, "
+        f"snippet({TEXT_INDEX_TABLE}, 0, '[', ']', '...', 16), "
+        f"bm25({TEXT_INDEX_TABLE}) AS rank "
+        f"FROM {TEXT_INDEX_TABLE} "
+        f"JOIN search_textindexentry AS entry ON entry.id = {TEXT_INDEX_TABLE}.rowid "
+        f"WHERE {TEXT_INDEX_TABLE} MATCH %s"
+    )
+    params = [match]
+    if table_name:
+        sql += " AND entry.table_name = %s"
+        params.append(table_name)
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+
+    with connections[router.db_for_read(TextIndexEntry)].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {"table": table, "pk": pk, "snippet": snippet, "rank": rank}
+        for table, pk, snippet, rank in rows
+    ]
+
+
+def get_summary_counts(**filters) -> list:
+    """
+    Return the non-zero dashboard summary rows, optionally filtered by any of
+    table_name, gregor_center, consent_code or affected_status.
+    """
+    return list(
+        SummaryCount.objects.filter(count__gt=0, **filters)
+        .order_by("table_name", "gregor_center", "consent_code", "affected_status")
+        .values("table_name", "gregor_center", "consent_code", "affected_status", "count")
+    )
+
+
+def table_generations(table_names) -> dict:
+    """
+    Return the current write generation and last modification time of each
+    table as `{table_name: (generation, last_modified)}`. Tables that have
+    never been written report generation 0.
+    """
+    stored = {
+        table_name: (generation, last_modified)
+        for table_name, generation, last_modified in TableGeneration.objects.filter(
+            table_name__in=table_names
+        ).values_list("table_name", "generation", "last_modified")
+    }
+    return {
+        table_name: stored.get(table_name, (0, None)) for table_name in table_names
+    }
+
+
+def _request_generations(request, table_names) -> dict:
+    """
+    Read the generations once per request, shared by the condition callbacks
+    and the response cache.
+    """
+    if not hasattr(request, "_table_generations"):
+        request._table_generations = {}
+    key = tuple(table_names)
+    if key not in request._table_generations:
+        request._table_generations[key] = table_generations(table_names)
+    return request._table_generations[key]
+
+
+def _request_change_sequence(request) -> int:
+    """
+    Number the committed change log entries and read the latest commit
+    sequence once per request, shared by the condition callbacks and the
+    response cache.
+    """
+    if not hasattr(request, "_change_sequence"):
+        request._change_sequence = latest_change_sequence()
+    return request._change_sequence
+
+
+def conditional_table_get(*table_names, change_feed: bool = False):
+    """
+    Method decorator adding ETag and Last-Modified headers to a read view.
+
+    Both validators are derived from the generations of `table_names` and the
+    request path, so a matching If-None-Match or If-Modified-Since is answered
+    with 304 Not Modified after a single query on the generation table.
+
+    With `change_feed`, for views reporting change log entries, the ETag
+    also covers the latest commit sequence read, which a replica can show
+    after the writes themselves, and no Last-Modified is sent.
+    """
+
+    def etag_func(request, *args, **kwargs):
+        generations = _request_generations(request, table_names)
+        state = ";".join(
+            f"{table_name}:{generations[table_name][0]}" for table_name in table_names
+        )
+        if change_feed:
+            state += f";changes:{_request_change_sequence(request)}"
+        return hashlib.sha1(
+            f"{request.get_full_path()}|{state}".encode()
+        ).hexdigest()
+
+    def last_modified_func(request, *args, **kwargs):
+        if change_feed:
+            return None
+        generations = _request_generations(request, table_names)
+        stamps = [stamp for generation, stamp in generations.values() if stamp]
+        return max(stamps) if stamps else None
+
+    return method_decorator(
+        condition(etag_func=etag_func, last_modified_func=last_modified_func)
+    )
+
+
+_response_cache_stats = Counter()
+_response_cache_lock = threading.Lock()
+
+
+def response_cache_key(request, table_names, change_feed: bool = False) -> str:
+    """
+    Cache key for a read response: the endpoint, its query parameters and the
+    generation and modification time of every table it reads, and with
+    `change_feed` the latest change log commit sequence. Any
+    write to one of the tables moves to a new key, so stale entries are never
+    served and simply age out of the cache.
+    """
+    generations = _request_generations(request, table_names)
+    params = "&".join(
+        f"{name}={','.join(request.GET.getlist(name))}" for name in sorted(request.GET)
+    )
+    state = ";".join(
+        f"{table_name}:{generation}:{stamp.timestamp() if stamp else ''}"
+        for table_name, (generation, stamp) in generations.items()
+    )
+    if change_feed:
+        state += f";changes:{_request_change_sequence(request)}"
+    digest = hashlib.sha1(f"{request.path}?{params}|{state}".encode()).hexdigest()
+    return f"response:{digest}"
+
+
+def response_cache_stats() -> dict:
+    """Return the hit and miss counters of the response cache for this process."""
+    with _response_cache_lock:
+        hits = _response_cache_stats["hits"]
+        misses = _response_cache_stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def _count_response_cache(outcome: str) -> None:
+    with _response_cache_lock:
+        _response_cache_stats[outcome] += 1
+
+
+def cached_table_response(*table_names, change_feed: bool = False):
+    """
+    Method decorator caching the serialized data of a successful read
+    response in the "responses" cache, keyed by `response_cache_key`.
+
+    Responses with an error status are not cached. Caching is skipped when
+    the RESPONSE_CACHE_ENABLED setting is off. `change_feed` is passed on to
+    `response_cache_key`.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return view_method(self, request, *args, **kwargs)
+
+            cache = caches["responses"]
+            key = response_cache_key(request, table_names, change_feed)
+            cached = cache.get(key)
+            if cached is not None:
+                _count_response_cache("hits")
+                status_code, data = cached
+                response = Response(data, status=status_code)
+                response["X-Cache"] = "HIT"
+                return response
+
+            _count_response_cache("misses")
+            response = view_method(self, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code < 400:
+                cache.set(key, (response.status_code, response.data))
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# Tracked table name -> (response key used by get_all_tables, serializer)
+CHANGE_FEED_TABLES = {
+    "participant": ("participants", ParticipantOutputSerializer),
+    "family": ("families", FamilySerializer),
+    "genetic_findings": ("genetic_findings", GeneticFindingsSerializer),
+    "analyte": ("analytes", AnalyteSerializer),
+    "phenotype": ("phenotypes", PhenotypeSerializer),
+    "biobank": ("biobank_entries", BiobankSerializer),
+    "experiment": ("experiments", ExperimentSerializer),
+    "experiment_dna_short_read": ("experiment_dna_short_read", ExperimentShortReadSerializer),
+    "experiment_nanopore": ("experiment_nanopore", ExperimentNanoporeSerializer),
+    "experiment_pac_bio": ("experiment_pac_bio", ExperimentPacBioSerializer),
+    "experiment_rna_short_read": ("experiment_rna_short_read", ExperimentRNAOutputSerializer),
+    "aligned": ("aligned", AlignedSerializer),
+    "aligned_dna_short_read": ("aligned_dna_short_read", AlignedDNAShortReadSerializer),
+    "aligned_nanopore": ("aligned_nanopore", AlignedNanoporeSerializer),
+    "aligned_pac_bio": ("aligned_pac_bio", AlignedPacBioSerializer),
+    "aligned_rna_short_read": ("aligned_rna_short_read", AlignedRNASerializer),
+}
+
+
+def latest_change_sequence() -> int:
+    """
+    Number the committed change log entries, then return the latest commit
+    sequence, or 0.
+    """
+    number_changes()
+    latest = ChangeLogEntry.objects.aggregate(latest=Max("commit_sequence"))["latest"]
+    return latest or 0
+
+
+def get_changes(since: int, limit: int = 5000) -> dict:
+    """
+    Collect the records changed after a change log commit sequence.
+
+    Committed entries are numbered first (see `search.services.number_changes`).
+    Commit sequences follow the order entries become visible, so the returned
+    sequence never passes an entry whose transaction has yet to commit.
+    Several entries for the same record collapse into its final state: records
+    that still exist are returned serialized as in get_all_tables, the rest are
+    returned as deleted primary keys.
+
+    Args:
+        since (int): Last commit sequence the client has applied.
+        limit (int): Maximum number of change log entries to read.
+
+    Returns:
+        dict: `sequence` to pass as `since` on the next call, `more` when
+        entries were left unread, and `upserted`/`deleted` keyed by the
+        get_all_tables response keys.
+    """
+    number_changes()
+    entries = list(
+        ChangeLogEntry.objects.filter(commit_sequence__gt=since)
+        .order_by("commit_sequence")
+        .values_list("commit_sequence", "table_name", "record_id", "operation")[: limit + 1]
+    )
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    final_state = {}
+    for sequence, table_name, record_id, operation in entries:
+        final_state[(table_name, record_id)] = operation
+
+    upserted, deleted = {}, {}
+    changed_ids = {}
+    for (table_name, record_id), operation in final_state.items():
+        if operation == ChangeLogEntry.DELETE:
+            deleted.setdefault(table_name, set()).add(record_id)
+        else:
+            changed_ids.setdefault(table_name, set()).add(record_id)
+
+    for table_name, record_ids in changed_ids.items():
+        response_key, serializer_class = CHANGE_FEED_TABLES[table_name]
+        model = TRACKED_TABLES[table_name]
+        records = serialize_queryset(serializer_class, model.objects.filter(pk__in=record_ids))
+        upserted[response_key] = records
+        found = {str(record[model._meta.pk.name]) for record in records}
+        if record_ids - found:
+            deleted.setdefault(table_name, set()).update(record_ids - found)
+
+    return {
+        "sequence": entries[-1][0] if entries else max(since, 0),
+        "more": more,
+        "upserted": upserted,
+        "deleted": {
+            CHANGE_FEED_TABLES[table_name][0]: sorted(record_ids)
+            for table_name, record_ids in deleted.items()
+        },
+    }
+
+
+def parse_region(region: str) -> tuple:
+    """
+    Parse a `chrom:start-end` region, 1-based and inclusive as shown by genome
+    browsers, into a 0-based half-open (chrom, start, end) interval.
+    `chrom:pos` is a single base and a bare `chrom` the whole chromosome;
+    commas in positions are ignored.
+
+    Raises:
+        ValueError: If the region cannot be parsed.
+    """
+    chrom, _, span = region.strip().partition(":")
+    chrom = normalize_chrom(chrom)
+    if not chrom:
+        raise ValueError(f"Invalid region: {region}")
+    if not span:
+        return chrom, 0, BIN_MAX_END
+    first, _, last = span.replace(",", "").partition("-")
+    try:
+        start = int(first)
+        end = int(last) if last else start
+    except ValueError:
+        raise ValueError(f"Invalid region: {region}") from None
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid region: {region}")
+    return chrom, start - 1, end
+
+
+def parse_bed(text: str) -> list:
+    """
+    Parse BED lines (chrom, 0-based start, end and an optional name) into
+    (chrom, start, end, name) tuples. Comment, track and browser lines are
+    skipped.
+
+    Raises:
+        ValueError: If a line cannot be parsed.
+    """
+    regions = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip() or line.startswith(("#", "track", "browser")):
+            continue
+        columns = line.split("\t") if "\t" in line else line.split()
+        try:
+            chrom, start, end = normalize_chrom(columns[0]), int(columns[1]), int(columns[2])
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid BED line {number}: {line}") from None
+        if not chrom or start < 0 or end < start:
+            raise ValueError(f"Invalid BED line {number}: {line}")
+        name = columns[3].strip() if len(columns) > 3 and columns[3].strip() else None
+        regions.append((chrom, start, end, name))
+    return regions
+
+
+def format_region(chrom: str, start: int, end: int) -> str:
+    """Format a 0-based half-open interval as a 1-based inclusive `chrom:start-end`."""
+    return f"{chrom}:{start + 1}-{max(end, start + 1)}"
+
+
+def overlapping_finding_ids(chrom: str, start: int, end: int) -> list:
+    """
+    Return the primary keys of the genetic findings overlapping the 0-based
+    half-open interval, by start position. An empty interval, such as a BED
+    insertion point, is read as the base after `start`.
+    """
+    end = max(end, start + 1)
+    bins = Q()
+    for first, last in overlapping_bin_ranges(start, end):
+        bins |= Q(bin__range=(first, last))
+    record_ids = (
+        RegionIndexEntry.objects.filter(bins, chrom=chrom, start__lt=end, end__gt=start)
+        .order_by("start", "record_id")
+        .values_list("record_id", flat=True)
+    )
+    return list(dict.fromkeys(record_ids))
+
+
+def _serialized_findings(record_ids) -> dict:
+    """Serialize genetic findings as in get_all_tables, keyed by primary key."""
+    record_ids = list(dict.fromkeys(record_ids))
+    serialized = {}
+    # Keep each IN list well under the SQLite variable limit
+    for index in range(0, len(record_ids), 500):
+        queryset = GeneticFindings.objects.filter(pk__in=record_ids[index:index + 500])
+        for row in serialize_queryset(GeneticFindingsSerializer, queryset):
+            serialized[row["genetic_findings_id"]] = row
+    return serialized
+
+
+def find_overlapping_findings(regions: list) -> list:
+    """
+    Look up the genetic findings overlapping each region.
+
+    Args:
+        regions (list): (chrom, start, end, name) tuples in 0-based half-open
+            coordinates, as returned by parse_region plus a name or None.
+
+    Returns:
+        list: One dictionary per region, in order, with the `region` as
+        `chrom:start-end` (1-based), its `name` when given, and the
+        overlapping `genetic_findings` serialized as in get_all_tables.
+    """
+    hits = [overlapping_finding_ids(chrom, start, end) for chrom, start, end, name in regions]
+    serialized = _serialized_findings(record_id for record_ids in hits for record_id in record_ids)
+    results = []
+    for (chrom, start, end, name), record_ids in zip(regions, hits):
+        result = {"region": format_region(chrom, start, end)}
+        if name is not None:
+            result["name"] = name
+        result["genetic_findings"] = [serialized[record_id] for record_id in record_ids if record_id in serialized]
+        results.append(result)
+    return results
+
+
+def find_nearest_findings(chrom: str, position: int, count: int = 10) -> list:
+    """
+    Return the `count` genetic findings closest to a 0-based position on a
+    chromosome, closest first.
+
+    Returns:
+        list: Dictionaries with the `distance` in bases, 0 for a finding
+        overlapping the position, and the serialized `genetic_findings` row.
+    """
+    entries = RegionIndexEntry.objects.filter(chrom=chrom)
+    bins = Q()
+    for first, last in overlapping_bin_ranges(position, position + 1):
+        bins |= Q(bin__range=(first, last))
+    candidates = [
+        (0, record_id)
+        for record_id in entries.filter(bins, start__lte=position, end__gt=position)
+        .values_list("record_id", flat=True)[:count]
+    ]
+    candidates += [
+        (position - end + 1, record_id)
+        for record_id, end in entries.filter(end__lte=position)
+        .order_by("-end")
+        .values_list("record_id", "end")[:count]
+    ]
+    candidates += [
+        (start - position, record_id)
+        for record_id, start in entries.filter(start__gt=position)
+        .order_by("start")
+        .values_list("record_id", "start")[:count]
+    ]
+
+    distances = {}
+    for distance, record_id in candidates:
+        distances[record_id] = min(distance, distances.get(record_id, distance))
+    nearest = sorted(distances.items(), key=lambda item: (item[1], item[0]))[:count]
+    serialized = _serialized_findings(record_id for record_id, distance in nearest)
+    return [
+        {"distance": distance, "genetic_findings": serialized[record_id]}
+        for record_id, distance in nearest
+        if record_id in serialized
+    ]
+
+
+def _matching_finding_ids(filters: dict):
+    """
+    Return a query of the primary keys of the genetic findings matching every
+    field in `filters`, a FINDING_VALUE_FIELDS name -> list of values mapping.
+    A finding matches a field if it has any of its values, ignoring case.
+    """
+    matching = None
+    for field, values in filters.items():
+        entries = FindingValueEntry.objects.filter(
+            field=field, key__in=[finding_value_key(value) for value in values]
+        )
+        if matching is not None:
+            entries = entries.filter(record_id__in=matching)
+        matching = entries.values("record_id")
+    return matching
+
+
+def find_findings_by_value(filters: dict) -> list:
+    """
+    Return the genetic findings with any of the given values in each field,
+    e.g. {"gene_of_interest": ["ZSWIM8"]}, serialized as in get_all_tables and
+    ordered by primary key.
+    """
+    record_ids = sorted(set(_matching_finding_ids(filters).values_list("record_id", flat=True)))
+    serialized = _serialized_findings(record_ids)
+    return [serialized[record_id] for record_id in record_ids if record_id in serialized]
+
+
+def get_finding_facets(field: str = None, filters: dict = None) -> list:
+    """
+    Count the genetic findings per value of each FINDING_VALUE_FIELDS column.
+    Values differing only in case are counted together.
+
+    Args:
+        field (str, optional): Only count the values of this column.
+        filters (dict, optional): Only count the findings matching these
+            values, as in find_findings_by_value.
+
+    Returns:
+        list: Dictionaries with `field`, `value` and `count`, in
+        FINDING_VALUE_FIELDS order and most frequent value first.
+    """
+    entries = FindingValueEntry.objects.all()
+    if field:
+        entries = entries.filter(field=field)
+    if filters:
+        entries = entries.filter(record_id__in=_matching_finding_ids(filters))
+    facets = (
+        entries.values("field", "key")
+        .annotate(value=Min("value"), count=Count("record_id"))
+        .order_by("-count", "key")
+    )
+    order = {name: index for index, name in enumerate(FINDING_VALUE_FIELDS)}
+    return sorted(
+        (
+            {"field": facet["field"], "value": facet["value"], "count": facet["count"]}
+            for facet in facets
+        ),
+        key=lambda facet: order[facet["field"]],
+    )
+
+
+# Participant columns returned for each pedigree node
+PEDIGREE_NODE_FIELDS = ("participant_id", "family_id", "sex", "affected_status", "proband_relationship")
+
+
+def _pedigree_nodes(participant_ids) -> dict:
+    """Return the PEDIGREE_NODE_FIELDS of the participants among `participant_ids`, keyed by ID."""
+    rows = Participant.objects.filter(pk__in=list(participant_ids)).values_list(*PEDIGREE_NODE_FIELDS)
+    return {row[0]: dict(zip(PEDIGREE_NODE_FIELDS, row)) for row in rows}
+
+
+def get_relatives(participant_id: str):
+    """
+    Return the parents, siblings and twins of a participant, in four queries.
+
+    Returns:
+        dict: `participant`, `father` and `mother` nodes (a parent who is not
+        a participant has only its participant_id and `in_study` false),
+        `full_siblings`, `half_siblings` and `twins` nodes, and `trio` and
+        `quad` flags: both parents are participants, plus at least one full
+        sibling for a quad. None if the participant does not exist.
+    """
+    parents = dict(
+        PedigreeEdge.objects.filter(
+            target=participant_id, relation__in=PedigreeEdge.PARENT_RELATIONS
+        ).values_list("relation", "source")
+    )
+    children = defaultdict(set)
+    for source, target in PedigreeEdge.objects.filter(
+        source__in=list(parents.values()), relation__in=PedigreeEdge.PARENT_RELATIONS
+    ).values_list("source", "target"):
+        if target != participant_id:
+            children[source].add(target)
+    twins = set()
+    for source, target in PedigreeEdge.objects.filter(
+        Q(source=participant_id) | Q(target=participant_id), relation=PedigreeEdge.TWIN
+    ).values_list("source", "target"):
+        twins.add(target if source == participant_id else source)
+
+    father, mother = parents.get(PedigreeEdge.FATHER), parents.get(PedigreeEdge.MOTHER)
+    full_siblings = children[father] & children[mother] if father and mother else set()
+    half_siblings = (children[father] | children[mother]) - full_siblings
+    nodes = _pedigree_nodes({participant_id, *parents.values(), *full_siblings, *half_siblings, *twins})
+    if participant_id not in nodes:
+        return None
+
+    def node(node_id):
+        if node_id is None:
+            return None
+        if node_id in nodes:
+            return {**nodes[node_id], "in_study": True}
+        return {"participant_id": node_id, "in_study": False}
+
+    trio = bool(father in nodes and mother in nodes)
+    return {
+        "participant": node(participant_id),
+        "father": node(father),
+        "mother": node(mother),
+        "full_siblings": [node(node_id) for node_id in sorted(full_siblings)],
+        "half_siblings": [node(node_id) for node_id in sorted(half_siblings)],
+        "twins": [node(node_id) for node_id in sorted(twins)],
+        "trio": trio,
+        "quad": trio and any(node_id in nodes for node_id in full_siblings),
+    }
+
+
+def get_trios(family_id: str = None) -> list:
+    """
+    Return each participant whose father and mother are both participants,
+    in two queries, three for one family.
+
+    Args:
+        family_id (str, optional): Only return children in this family.
+
+    Returns:
+        list: Dictionaries with the `family_id`, `child`, `father` and
+        `mother` participant IDs and the `full_siblings` who are also
+        participants, ordered by family and child.
+    """
+    participants = Participant.objects.all()
+    if family_id:
+        participants = participants.filter(family_id=family_id)
+    families = dict(participants.values_list("pk", "family_id"))
+    edges = PedigreeEdge.objects.filter(relation__in=PedigreeEdge.PARENT_RELATIONS)
+    if family_id:
+        edges = edges.filter(target__in=list(families))
+    parents = defaultdict(dict)
+    for source, target, relation in edges.values_list("source", "target", "relation"):
+        parents[target][relation] = source
+
+    known = set(families)
+    if family_id:
+        # Parents of the family's children may be participants of another family
+        known.update(_pedigree_nodes({parent for pair in parents.values() for parent in pair.values()}))
+    trios = defaultdict(list)
+    for child, pair in parents.items():
+        father, mother = pair.get(PedigreeEdge.FATHER), pair.get(PedigreeEdge.MOTHER)
+        if child in families and father in known and mother in known:
+            trios[(father, mother)].append(child)
+
+    results = []
+    for (father, mother), children in trios.items():
+        for child in children:
+            results.append({
+                "family_id": families[child],
+                "child": child,
+                "father": father,
+                "mother": mother,
+                "full_siblings": sorted(sibling for sibling in children if sibling != child),
+            })
+    return sorted(results, key=lambda trio: (trio["family_id"] or "", trio["child"]))
+
+
+def get_lineage(participant_id: str, direction: str, max_depth: int = 10) -> list:
+    """
+    Walk father and mother edges up (ancestors) or down (descendants) from a
+    participant with one recursive query.
+
+    Args:
+        participant_id (str): Participant to start from.
+        direction (str): "ancestors" or "descendants".
+        max_depth (int): Number of generations to walk.
+
+    Returns:
+        list: Dictionaries with the relative's `participant_id`, the
+        `relation` (father or mother) of the edge that reached it, the
+        participant it is the parent or child `of`, the `depth` in
+        generations and `in_study`, nearest generation first.
+    """
+    table = PedigreeEdge._meta.db_table
+    near, far = ("target", "source") if direction == "ancestors" else ("source", "target")
+    sql = (
+        f"WITH RECURSIVE lineage(participant_id, relation, relative_id, depth) AS ("
+        f" SELECT {far}, relation, {near}, 1 FROM {table}"
+        f" WHERE {near} = %s AND relation IN (%s, %s)"
+        f" UNION"
+        f" SELECT edge.{far}, edge.relation, edge.{near}, lineage.depth + 1"
+        f" FROM {table} AS edge JOIN lineage ON edge.{near} = lineage.participant_id"
+        f" WHERE edge.relation IN (%s, %s) AND lineage.depth < %s"
+        f") SELECT lineage.participant_id, lineage.relation, lineage.relative_id, MIN(lineage.depth),"
+        f" participant.participant_id IS NOT NULL"
+        f" FROM lineage LEFT JOIN {Participant._meta.db_table} AS participant"
+        f" ON participant.participant_id = lineage.participant_id"
+        f" GROUP BY lineage.participant_id, lineage.relation, lineage.relative_id, participant.participant_id"
+        f" ORDER BY 4, 1, 3"
+    )
+    params = [participant_id, *PedigreeEdge.PARENT_RELATIONS, *PedigreeEdge.PARENT_RELATIONS, max_depth]
+    with connections[router.db_for_read(PedigreeEdge)].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {"participant_id": relative, "relation": relation, "of": of, "depth": depth, "in_study": bool(in_study)}
+        for relative, relation, of, depth, in_study in rows
+    ]
+
+
+def get_family_graph(family_id: str):
+    """
+    Return the pedigree of a family as nodes and edges, in three queries.
+
+    Returns:
+        dict: `family_id`, `nodes` for its participants plus the parents and
+        twins they name from outside the family, with `in_study` false for
+        those who are not participants, and `edges`
+        with `source`, `target` and `relation`. None if the family has no
+        participants.
+    """
+    nodes = {
+        row[0]: {**dict(zip(PEDIGREE_NODE_FIELDS, row)), "in_study": True}
+        for row in Participant.objects.filter(family_id=family_id).values_list(*PEDIGREE_NODE_FIELDS)
+    }
+    if not nodes:
+        return None
+    members = list(nodes)
+    edges = sorted(
+        PedigreeEdge.objects.filter(Q(target__in=members) | Q(source__in=members, relation=PedigreeEdge.TWIN))
+        .values_list("source", "target", "relation")
+        .distinct()
+    )
+    outside = {node_id for edge in edges for node_id in edge[:2] if node_id not in nodes}
+    # Relatives outside the family may be participants of another family
+    others = _pedigree_nodes(outside)
+    for node_id in outside:
+        if node_id in others:
+            nodes[node_id] = {**others[node_id], "in_study": True}
+        else:
+            nodes[node_id] = {"participant_id": node_id, "in_study": False}
+    return {
+        "family_id": family_id,
+        "nodes": sorted(nodes.values(), key=lambda node: node["participant_id"]),
+        "edges": [{"source": source, "target": target, "relation": relation} for source, target, relation in edges],
+    }
+
+
+def get_sample_lineage(table_name: str, record_id: str, direction: str, node_type: str = None) -> list:
+    """
+    Return the ancestors or descendants of a biobank, analyte, experiment or
+    alignment record from the lineage closure table, in one indexed query.
+
+    Args:
+        table_name (str): Table of the record, e.g. "aligned_dna_short_read".
+        record_id (str): Primary key of the record.
+        direction (str): "ancestors" or "descendants".
+        node_type (str): Only return records of this table.
+
+    Returns:
+        list: Dictionaries with the `type` (table name), `id` and `depth` in
+        hops of each related record, nearest first.
+    """
+    if direction == "ancestors":
+        entries = LineageEntry.objects.filter(descendant_type=table_name, descendant_id=str(record_id))
+        far = "ancestor"
+    else:
+        entries = LineageEntry.objects.filter(ancestor_type=table_name, ancestor_id=str(record_id))
+        far = "descendant"
+    if node_type:
+        entries = entries.filter(**{f"{far}_type": node_type})
+    rows = entries.order_by("depth", f"{far}_type", f"{far}_id").values_list(f"{far}_type", f"{far}_id", "depth")
+    return [{"type": type_name, "id": node_id, "depth": depth} for type_name, node_id, depth in rows]
+
+
+FILE_REGISTRY_COLUMNS = ("path", "md5sum", "table_name", "record_id", "field")
+
+
+def find_files(paths=(), md5sums=()) -> list:
+    """
+    Look up files by path or md5 checksum across every table in the file
+    registry, in one indexed query.
+
+    Returns:
+        list: Dictionaries with the `path`, `md5sum`, owning `table_name`,
+        `record_id` and `field` of each matching reference.
+    """
+    md5sums = [md5sum.strip().lower() for md5sum in md5sums if md5sum.strip()]
+    entries = FileRegistryEntry.objects.filter(Q(path__in=list(paths)) | Q(md5sum__in=md5sums))
+    return list(entries.order_by("path", "table_name", "record_id").values(*FILE_REGISTRY_COLUMNS))
+
+
+def resolve_file_owners(paths) -> dict:
+    """
+    Resolve a large batch of paths to the records that reference them.
+
+    Returns:
+        dict: `owners`, mapping each referenced path to its references as
+        in find_files, and `missing`, the paths nothing references, in the
+        order given.
+    """
+    paths = list(dict.fromkeys(str(path).strip() for path in paths if str(path).strip()))
+    owners = defaultdict(list)
+    # Keep each IN list well under the SQLite variable limit
+    for index in range(0, len(paths), 500):
+        entries = FileRegistryEntry.objects.filter(path__in=paths[index:index + 500])
+        for entry in entries.order_by("table_name", "record_id").values(*FILE_REGISTRY_COLUMNS):
+            owners[entry["path"]].append(entry)
+    return {
+        "owners": {path: owners[path] for path in paths if path in owners},
+        "missing": [path for path in paths if path not in owners],
+    }
+
+
+def find_duplicate_files(by: str = "path") -> list:
+    """
+    Return the files whose path or md5 checksum is referenced by more than
+    one record, in one query. The tables in FILE_REGISTRY_MIRROR_TABLES
+    repeat the paths of other tables by design and are left out.
+
+    Args:
+        by (str): "path" or "md5sum".
+
+    Returns:
+        list: One dictionary per duplicated value with the `path` or
+        `md5sum` and its `references` as in find_files.
+    """
+    entries = FileRegistryEntry.objects.exclude(table_name__in=FILE_REGISTRY_MIRROR_TABLES).exclude(**{by: ""})
+    duplicated = entries.values(by).annotate(references=Count("id")).filter(references__gt=1).values(by)
+    duplicates = defaultdict(list)
+    rows = entries.filter(**{f"{by}__in": duplicated}).order_by(by, "table_name", "record_id")
+    for entry in rows.values(*FILE_REGISTRY_COLUMNS):
+        duplicates[entry[by]].append(entry)
+    return [{by: value, "references": references} for value, references in duplicates.items()]
+
+
+def manifest_md5(value: str) -> str:
+    """
+    Normalize a manifest checksum to lowercase hex. gsutil reports md5
+    hashes base64 encoded, other listings in hex.
+
+    Raises:
+        ValueError: If the value is neither.
+    """
+    value = value.strip()
+    if len(value) == 32:
+        try:
+            int(value, 16)
+            return value.lower()
+        except ValueError:
+            pass
+    try:
+        digest = base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        digest = b""
+    if len(digest) != 16:
+        raise ValueError(f"Invalid md5 checksum '{value}'")
+    return digest.hex()
+
+
+def parse_manifest(lines):
+    """
+    Parse a bucket listing into (path, size, md5sum) tuples, lazily, so
+    listings of millions of objects can be streamed. Two formats are read:
+    `gsutil ls -L` output, one block per object with `Content-Length` and
+    `Hash (md5)` lines, and tab, comma or space separated `path size md5`
+    lines. Sizes and checksums may be missing; they are None and "".
+
+    Args:
+        lines: Iterable of str or bytes lines.
+
+    Raises:
+        ValueError: If a line cannot be parsed.
+    """
+    path = size = None
+    md5sum = ""
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode()
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or stripped.startswith(("#", "TOTAL:")):
+            continue
+        if line[0].isspace():
+            # Attribute of the `gsutil ls -L` object block being read
+            if path is None:
+                continue
+            key, _, value = stripped.partition(":")
+            try:
+                if key == "Content-Length":
+                    size = int(value)
+                elif key == "Hash (md5)":
+                    md5sum = manifest_md5(value)
+            except ValueError:
+                raise ValueError(f"Invalid manifest line {number}: {stripped}") from None
+            continue
+        if path is not None:
+            yield path, size, md5sum
+            path = None
+        if stripped.endswith(":") and "://" in stripped:
+            path, size, md5sum = stripped[:-1], None, ""
+            continue
+        columns = stripped.split("\t") if "\t" in stripped else stripped.replace(",", " ").split()
+        columns = [column.strip() for column in columns]
+        if columns[0].lower() == "path":
+            continue
+        try:
+            row_size = int(columns[1]) if len(columns) > 1 and columns[1] else None
+            row_md5 = manifest_md5(columns[2]) if len(columns) > 2 and columns[2] else ""
+        except ValueError:
+            raise ValueError(f"Invalid manifest line {number}: {stripped}") from None
+        yield columns[0], row_size, row_md5
+    if path is not None:
+        yield path, size, md5sum
+
+
+def reconcile_manifest(manifest, tables=None, prefixes=None) -> dict:
+    """
+    Compare a bucket listing with the files the database references, using
+    set operations over the listing held as a path -> md5 dictionary and
+    the file registry read in one streamed query.
+
+    Args:
+        manifest: (path, size, md5sum) tuples, as yielded by parse_manifest.
+        tables (list): Only check references from these file registry tables.
+        prefixes (list): Only check references and listed objects under these
+            path prefixes, e.g. one bucket.
+
+    Returns:
+        dict: Counts of listed and referenced files, then `missing`
+        (referenced but not listed, with their references), `orphaned`
+        (listed but not referenced) and `mismatched` (md5 in the database
+        differs from the listing, with both checksums and the references).
+    """
+    prefixes = tuple(prefixes or ())
+    listed = {}
+    for path, size, md5sum in manifest:
+        if not prefixes or path.startswith(prefixes):
+            listed[path] = md5sum
+
+    entries = FileRegistryEntry.objects.all()
+    if tables:
+        entries = entries.filter(table_name__in=tables)
+    if prefixes:
+        prefix_filter = Q()
+        for prefix in prefixes:
+            prefix_filter |= Q(path__startswith=prefix)
+        entries = entries.filter(prefix_filter)
+    references = defaultdict(list)
+    checksums = {}
+    rows = entries.order_by("path", "table_name", "record_id").values_list(*FILE_REGISTRY_COLUMNS)
+    for path, md5sum, table_name, record_id, field in rows.iterator(chunk_size=5000):
+        references[path].append({"table_name": table_name, "record_id": record_id, "field": field})
+        if md5sum:
+            checksums[path] = md5sum
+
+    referenced = references.keys()
+    mismatched = [
+        {"path": path, "md5sum": checksums[path], "manifest_md5sum": listed[path], "references": references[path]}
+        for path in sorted(checksums.keys() & listed.keys())
+        if listed[path] and listed[path] != checksums[path]
+    ]
+    return {
+        "listed": len(listed),
+        "referenced": len(referenced),
+        "missing": [{"path": path, "references": references[path]} for path in sorted(referenced - listed.keys())],
+        "orphaned": sorted(listed.keys() - referenced),
+        "mismatched": mismatched,
+    }
+
+
+# Participant aggregate: table name -> lookup from its rows to the participant
+PARTICIPANT_TABLES = {
+    "phenotype": "participant_id",
+    "analyte": "participant_id",
+    "biobank": "participant_id",
+    "genetic_findings": "participant_id",
+    "experiment": "participant_id",
+    "aligned": "participant_id",
+}
+
+
+async def atable_rows(model, limit: int = None, after: str = None, chunk_size: int = 500, **filters):
+    """
+    Yield the rows of `model` as dicts of column values, in primary key
+    order, reading them with the async ORM. Many-to-many fields are lists of
+    the related primary keys, read once per chunk of rows.
+
+    Args:
+        model: The model to read.
+        limit (int, optional): Maximum number of rows.
+        after (str, optional): Only rows with a primary key greater than this.
+        chunk_size (int, optional): Rows fetched from the database at a time.
+        **filters: Passed to `filter()`.
+    """
+    fields = [field.name for field in model._meta.concrete_fields]
+    queryset = model.objects.filter(**filters).order_by("pk").values(*fields)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    if limit is not None:
+        queryset = queryset[:limit]
+
+    chunk = []
+    async for row in queryset.aiterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            for record in await _with_many_to_many(model, chunk):
+                yield record
+            chunk = []
+    for row in await _with_many_to_many(model, chunk):
+        yield row
+
+
+async def _with_many_to_many(model, rows: list) -> list:
+    if not rows or not model._meta.many_to_many:
+        return rows
+    pk_name = model._meta.pk.name
+    pks = [row[pk_name] for row in rows]
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        related = defaultdict(list)
+        # values() rather than values_list(): the latter's aiterator() runs
+        # the query in the event loop on Django 5.0
+        pairs = through.objects.filter(**{f"{source}__in": pks}).values(source, target)
+        async for pair in pairs.aiterator():
+            related[pair[source]].append(pair[target])
+        for row in rows:
+            row[field.name] = related.get(row[pk_name], [])
+    return rows
+
+
+async def aget_participant_aggregate(participant_id: str):
+    """
+    Return a participant, its family and its rows in every table that refers
+    to it, keyed by table name, or None if the participant does not exist.
+    """
+    participant = None
+    async for row in atable_rows(TRACKED_TABLES["participant"], pk=participant_id):
+        participant = row
+    if participant is None:
+        return None
+
+    family = TRACKED_TABLES["family"]
+    family_fields = [field.name for field in family._meta.concrete_fields]
+    aggregate = {
+        "participant": participant,
+        "family": await family.objects.filter(pk=participant["family_id"]).values(*family_fields).afirst(),
+    }
+    for table_name, lookup in PARTICIPANT_TABLES.items():
+        aggregate[table_name] = [
+            row async for row in atable_rows(TRACKED_TABLES[table_name], **{lookup: participant_id})
+        ]
+    return aggregate
+
+
+async def aget_summary_counts(**filters) -> list:
+    """Async version of get_summary_counts."""
+    queryset = (
+        SummaryCount.objects.filter(count__gt=0, **filters)
+        .order_by("table_name", "gregor_center", "consent_code", "affected_status")
+        .values("table_name", "gregor_center", "consent_code", "affected_status", "count")
+    )
+    return [row async for row in queryset.aiterator()]
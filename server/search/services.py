@@ -0,0 +1,1350 @@
+#!/usr/bin/env python3
+# search/services.py
+
+"""Search Services
+
+Write-side maintenance of the search side tables. These functions are called
+from the model signal receivers in `search.signals` and from the rebuild
+management commands.
+"""
+
+import hashlib
+import os
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import connection, router, transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from experiments.models import (
+    Aligned,
+    AlignedATACShortRead,
+    AlignedDNAShortRead,
+    AlignedNanopore,
+    AlignedPacBio,
+    AlignedRNAShortRead,
+    AlleleSpecificATACShortRead,
+    CalledPeaksATACShortRead,
+    CalledVariantsDNAShortRead,
+    CalledVariantsNanopore,
+    CalledVariantsPacBio,
+    Experiment,
+    ExperimentATACShortRead,
+    ExperimentDNAShortRead,
+    ExperimentNanopore,
+    ExperimentPacBio,
+    ExperimentRNAShortRead,
+)
+from metadata.models import (
+    Analyte,
+    Biobank,
+    Family,
+    GeneticFindings,
+    Participant,
+    Phenotype,
+)
+from search.models import (
+    ChangeLogEntry,
+    FileRegistryEntry,
+    FindingValueEntry,
+    LineageEntry,
+    PedigreeEdge,
+    RegionIndexEntry,
+    StagedFileChecksum,
+    SummaryCount,
+    TableGeneration,
+    TextIndexEntry,
+)
+
+# Tables whose writes are tracked, keyed by the table names used by the
+# create/update services
+TRACKED_TABLES = {
+    "participant": Participant,
+    "family": Family,
+    "genetic_findings": GeneticFindings,
+    "analyte": Analyte,
+    "phenotype": Phenotype,
+    "biobank": Biobank,
+    "experiment": Experiment,
+    "experiment_dna_short_read": ExperimentDNAShortRead,
+    "experiment_nanopore": ExperimentNanopore,
+    "experiment_pac_bio": ExperimentPacBio,
+    "experiment_rna_short_read": ExperimentRNAShortRead,
+    "aligned": Aligned,
+    "aligned_dna_short_read": AlignedDNAShortRead,
+    "aligned_nanopore": AlignedNanopore,
+    "aligned_pac_bio": AlignedPacBio,
+    "aligned_rna_short_read": AlignedRNAShortRead,
+}
+
+TRACKED_TABLE_NAMES = {model: table_name for table_name, model in TRACKED_TABLES.items()}
+
+TEXT_INDEX_TABLE = "search_text_index"
+
+# Tables and free text columns covered by the full-text index
+TEXT_INDEX_FIELDS = {
+    "phenotype": (
+        Phenotype,
+        ["term_id", "additional_details", "additional_modifiers"],
+    ),
+    "genetic_findings": (
+        GeneticFindings,
+        [
+            "gene_of_interest",
+            "known_condition_name",
+            "condition_id",
+            "condition_inheritance",
+        ],
+    ),
+    "family": (Family, ["family_history_detail"]),
+}
+
+
+def text_index_available() -> bool:
+    """The FTS5 index only exists on SQLite databases."""
+    return connection.vendor == "sqlite"
+
+
+def text_index_table_name(model_class) -> str:
+    """Return the text index table name for a model class, or None."""
+    for table_name, (model, fields) in TEXT_INDEX_FIELDS.items():
+        if model is model_class:
+            return table_name
+    return None
+
+
+def text_index_body(values: list) -> str:
+    """
+    Flatten the indexed column values of one record into a single string.
+
+    JSON list columns are joined with spaces so each item is tokenized on its
+    own; empty values are skipped.
+    """
+    parts = []
+    for value in values:
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value if item)
+        else:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+def index_text_record(table_name: str, instance) -> None:
+    """Insert or replace the text index row for one model instance."""
+    if not text_index_available():
+        return
+    model, fields = TEXT_INDEX_FIELDS[table_name]
+    body = text_index_body([getattr(instance, field) for field in fields])
+    entry, created = TextIndexEntry.objects.get_or_create(
+        table_name=table_name, record_id=str(instance.pk)
+    )
+    with connection.cursor() as cursor:
+        if not created:
+            cursor.execute(
+                f"DELETE FROM {TEXT_INDEX_TABLE} WHERE rowid = %s", [entry.pk]
+            )
+        cursor.execute(
+            f"INSERT INTO {TEXT_INDEX_TABLE} (rowid, body) VALUES (%s, %s)",
+            [entry.pk, body],
+        )
+
+
+def remove_text_record(table_name: str, record_id: str) -> None:
+    """Drop the text index row for one record, if it was indexed."""
+    if not text_index_available():
+        return
+    entry = TextIndexEntry.objects.filter(
+        table_name=table_name, record_id=str(record_id)
+    ).first()
+    if entry is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TEXT_INDEX_TABLE} WHERE rowid = %s", [entry.pk])
+    entry.delete()
+
+
+def rebuild_text_index(batch_size: int = 2000) -> dict:
+    """
+    Rebuild the full-text index from the source tables.
+
+    Args:
+        batch_size (int): Number of records read and inserted per batch.
+
+    Returns:
+        dict: Number of records indexed, keyed by table name.
+    """
+    if not text_index_available():
+        return {}
+
+    counts = {}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TEXT_INDEX_TABLE}")
+        TextIndexEntry.objects.all().delete()
+
+        for table_name, (model, fields) in TEXT_INDEX_FIELDS.items():
+            counts[table_name] = 0
+            rows = model.objects.values_list("pk", *fields).iterator(
+                chunk_size=batch_size
+            )
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    counts[table_name] += _index_text_batch(table_name, batch)
+                    batch = []
+            if batch:
+                counts[table_name] += _index_text_batch(table_name, batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {TEXT_INDEX_TABLE} ({TEXT_INDEX_TABLE}) VALUES ('optimize')"
+            )
+        bump_table_generation("text_index")
+
+    return counts
+
+
+def _index_text_batch(table_name: str, rows: list) -> int:
+    """Create the index entries and FTS rows for one batch of value rows."""
+    entries = TextIndexEntry.objects.bulk_create(
+        [TextIndexEntry(table_name=table_name, record_id=str(row[0])) for row in rows]
+    )
+    # bulk_create does not return primary keys on every backend
+    entry_ids = dict(
+        TextIndexEntry.objects.filter(
+            table_name=table_name, record_id__in=[entry.record_id for entry in entries]
+        ).values_list("record_id", "id")
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TEXT_INDEX_TABLE} (rowid, body) VALUES (%s, %s)",
+            [(entry_ids[str(row[0])], text_index_body(row[1:])) for row in rows],
+        )
+    return len(rows)
+
+
+# UCSC binning scheme: five levels of 128kb, 1Mb, 8Mb, 64Mb and 512Mb bins,
+# smallest first, covering positions below 512Mb
+BIN_OFFSETS = (512 + 64 + 8 + 1, 64 + 8 + 1, 8 + 1, 1, 0)
+BIN_FIRST_SHIFT = 17
+BIN_NEXT_SHIFT = 3
+BIN_MAX_END = 1 << (BIN_FIRST_SHIFT + BIN_NEXT_SHIFT * (len(BIN_OFFSETS) - 1))
+
+# Columns of GeneticFindings read to build its region index rows
+REGION_FIELDS = ["chrom", "pos", "pos_end", "chrom_end", "ref"]
+
+
+def normalize_chrom(chrom: str) -> str:
+    """Drop a `chr` prefix and upper-case a chromosome name, so chr2 and 2 match."""
+    chrom = (chrom or "").strip()
+    if chrom[:3].lower() == "chr":
+        chrom = chrom[3:]
+    return chrom.upper()
+
+
+def region_bin(start: int, end: int) -> int:
+    """Return the smallest UCSC bin holding the 0-based half-open interval [start, end)."""
+    if start < 0 or end > BIN_MAX_END:
+        raise ValueError(f"Interval {start}-{end} is outside the binned range")
+    start_bin = start >> BIN_FIRST_SHIFT
+    end_bin = (max(end, start + 1) - 1) >> BIN_FIRST_SHIFT
+    for offset in BIN_OFFSETS:
+        if start_bin == end_bin:
+            return offset + start_bin
+        start_bin >>= BIN_NEXT_SHIFT
+        end_bin >>= BIN_NEXT_SHIFT
+    raise ValueError(f"Interval {start}-{end} is outside the binned range")
+
+
+def overlapping_bin_ranges(start: int, end: int) -> list:
+    """Return the inclusive (first, last) bin ranges that can hold an interval overlapping [start, end)."""
+    start, end = max(start, 0), min(max(end, start + 1), BIN_MAX_END)
+    start_bin = start >> BIN_FIRST_SHIFT
+    end_bin = (end - 1) >> BIN_FIRST_SHIFT
+    ranges = []
+    for offset in BIN_OFFSETS:
+        ranges.append((offset + start_bin, offset + end_bin))
+        start_bin >>= BIN_NEXT_SHIFT
+        end_bin >>= BIN_NEXT_SHIFT
+    return ranges
+
+
+def region_intervals(chrom, pos, pos_end, chrom_end, ref) -> list:
+    """
+    Return the (chrom, start, end) intervals, 0-based half-open, to index for
+    one genetic finding.
+
+    `pos` and `pos_end` are 1-based. Without `pos_end` the variant spans its
+    reference allele. When `chrom_end` names another chromosome, each
+    breakpoint is indexed as a single base.
+    """
+    chrom = normalize_chrom(chrom)
+    if not chrom or pos is None or pos < 1:
+        return []
+    start = pos - 1
+    end_chrom = normalize_chrom(chrom_end) or chrom
+    if end_chrom != chrom:
+        intervals = [(chrom, start, pos)]
+        if pos_end:
+            intervals.append((end_chrom, pos_end - 1, pos_end))
+        return [interval for interval in intervals if interval[2] <= BIN_MAX_END]
+    end = pos_end if pos_end and pos_end >= pos else start + max(len(ref or ""), 1)
+    if end > BIN_MAX_END:
+        return []
+    return [(chrom, start, end)]
+
+
+def region_entries(record_id, *values) -> list:
+    """Build the unsaved RegionIndexEntry rows for one finding's REGION_FIELDS values."""
+    return [
+        RegionIndexEntry(
+            record_id=str(record_id), chrom=chrom, bin=region_bin(start, end), start=start, end=end
+        )
+        for chrom, start, end in region_intervals(*values)
+    ]
+
+
+def index_region_record(instance, created: bool = False) -> None:
+    """
+    Replace the region index rows of one genetic finding. A finding with one
+    interval, the usual case, is updated in place.
+    """
+    entries = region_entries(instance.pk, *[getattr(instance, field) for field in REGION_FIELDS])
+    intervals = [(entry.chrom, entry.start, entry.end) for entry in entries]
+    # Saving the same instance again without moving it leaves the rows as they are
+    if getattr(instance, "_indexed_intervals", None) == intervals:
+        return
+    instance._indexed_intervals = intervals
+    if not created:
+        existing = RegionIndexEntry.objects.filter(record_id=str(instance.pk))
+        if len(entries) == 1:
+            entry = entries[0]
+            if existing.update(chrom=entry.chrom, bin=entry.bin, start=entry.start, end=entry.end) == 1:
+                return
+        existing.delete()
+    if entries:
+        RegionIndexEntry.objects.bulk_create(entries)
+
+
+def remove_region_record(record_id: str) -> None:
+    """Drop the region index rows of one genetic finding."""
+    RegionIndexEntry.objects.filter(record_id=str(record_id)).delete()
+
+
+def rebuild_region_index(batch_size: int = 2000) -> int:
+    """
+    Rebuild the region index from the genetic findings table.
+
+    Args:
+        batch_size (int): Number of findings read per batch.
+
+    Returns:
+        int: Number of findings indexed.
+    """
+    count = 0
+    with transaction.atomic():
+        RegionIndexEntry.objects.all().delete()
+        batch = []
+        rows = GeneticFindings.objects.values_list("pk", *REGION_FIELDS).iterator(
+            chunk_size=batch_size
+        )
+        for row in rows:
+            batch.extend(region_entries(*row))
+            count += 1
+            if len(batch) >= batch_size:
+                RegionIndexEntry.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            RegionIndexEntry.objects.bulk_create(batch)
+    return count
+
+
+# Genetic findings columns flattened into FindingValueEntry rows: the JSON
+# list columns, and condition_id for condition lookups
+FINDING_VALUE_FIELDS = [
+    "gene_of_interest",
+    "variant_type",
+    "condition_inheritance",
+    "method_of_discovery",
+    "condition_id",
+]
+
+
+def finding_value_key(value) -> str:
+    """Return the lookup key of a value: stripped and case-folded."""
+    return str(value).strip().casefold()
+
+
+def finding_value_rows(*values) -> list:
+    """
+    Flatten one finding's FINDING_VALUE_FIELDS values into distinct
+    (field, value, key) tuples; empty values are skipped.
+    """
+    rows = {}
+    for field, column in zip(FINDING_VALUE_FIELDS, values):
+        if not isinstance(column, (list, tuple)):
+            column = [column]
+        for value in column:
+            key = finding_value_key(value) if value is not None else ""
+            if key and (field, key) not in rows:
+                rows[(field, key)] = (field, str(value).strip(), key)
+    return list(rows.values())
+
+
+def finding_values(record_id, *values) -> list:
+    """Build the unsaved FindingValueEntry rows for one finding's FINDING_VALUE_FIELDS values."""
+    return [
+        FindingValueEntry(record_id=str(record_id), field=field, value=value, key=key)
+        for field, value, key in finding_value_rows(*values)
+    ]
+
+
+def index_finding_values(instance, created: bool = False) -> None:
+    """Replace the FindingValueEntry rows of one genetic finding."""
+    rows = finding_value_rows(*[getattr(instance, field) for field in FINDING_VALUE_FIELDS])
+    # Saving the same instance again with the same values leaves the rows as they are
+    if getattr(instance, "_indexed_values", None) == rows:
+        return
+    instance._indexed_values = rows
+    if not created:
+        FindingValueEntry.objects.filter(record_id=str(instance.pk)).delete()
+    entries = [
+        FindingValueEntry(record_id=str(instance.pk), field=field, value=value, key=key)
+        for field, value, key in rows
+    ]
+    if entries:
+        FindingValueEntry.objects.bulk_create(entries)
+
+
+def remove_finding_values(record_id: str) -> None:
+    """Drop the FindingValueEntry rows of one genetic finding."""
+    FindingValueEntry.objects.filter(record_id=str(record_id)).delete()
+
+
+def rebuild_finding_values(batch_size: int = 2000) -> int:
+    """
+    Rebuild the FindingValueEntry table from the genetic findings table.
+
+    Args:
+        batch_size (int): Number of findings read per batch.
+
+    Returns:
+        int: Number of findings indexed.
+    """
+    count = 0
+    with transaction.atomic():
+        FindingValueEntry.objects.all().delete()
+        batch = []
+        rows = GeneticFindings.objects.values_list("pk", *FINDING_VALUE_FIELDS).iterator(
+            chunk_size=batch_size
+        )
+        for row in rows:
+            batch.extend(finding_values(*row))
+            count += 1
+            if len(batch) >= batch_size:
+                FindingValueEntry.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            FindingValueEntry.objects.bulk_create(batch)
+    return count
+
+
+# Placeholder used by paternal_id, maternal_id and twin_id for "no one"
+NO_PARTICIPANT = "0"
+
+
+def parent_edge_rows(participant_id, paternal_id, maternal_id) -> list:
+    """Return the (source, target, relation) parent edges of one participant."""
+    return [
+        (parent_id, str(participant_id), relation)
+        for parent_id, relation in ((paternal_id, PedigreeEdge.FATHER), (maternal_id, PedigreeEdge.MOTHER))
+        if parent_id and parent_id != NO_PARTICIPANT and parent_id != participant_id
+    ]
+
+
+def twin_edge_rows(participant_id, twin_ids) -> list:
+    """Return the (source, target, relation) twin edges one participant declares."""
+    return [
+        (str(participant_id), twin_id, PedigreeEdge.TWIN)
+        for twin_id in twin_ids
+        if twin_id and twin_id != NO_PARTICIPANT and twin_id != participant_id
+    ]
+
+
+def _create_edges(rows: list) -> None:
+    if rows:
+        PedigreeEdge.objects.bulk_create(
+            [PedigreeEdge(source=source, target=target, relation=relation) for source, target, relation in rows],
+            ignore_conflicts=True,
+        )
+
+
+def index_participant_parents(instance, created: bool = False) -> None:
+    """Bring the father and mother edges of one participant in line with its row."""
+    rows = parent_edge_rows(instance.pk, instance.paternal_id, instance.maternal_id)
+    if getattr(instance, "_indexed_parents", None) == rows:
+        return
+    instance._indexed_parents = rows
+    if not created:
+        existing = PedigreeEdge.objects.filter(
+            target=str(instance.pk), relation__in=PedigreeEdge.PARENT_RELATIONS
+        )
+        if sorted(existing.values_list("source", "target", "relation")) == sorted(rows):
+            return
+        existing.delete()
+    _create_edges(rows)
+
+
+def add_twin_edges(participant_ids, twin_ids) -> None:
+    """Record that each participant declares each twin ID."""
+    _create_edges(
+        [row for participant_id in participant_ids for row in twin_edge_rows(participant_id, twin_ids)]
+    )
+
+
+def remove_twin_edges(participant_ids=None, twin_ids=None) -> None:
+    """
+    Forget the twin IDs declared by the participants. Either argument left as
+    None matches any participant or twin ID.
+    """
+    edges = PedigreeEdge.objects.filter(relation=PedigreeEdge.TWIN)
+    if participant_ids is not None:
+        edges = edges.filter(source__in=[str(participant_id) for participant_id in participant_ids])
+    if twin_ids is not None:
+        edges = edges.filter(target__in=list(twin_ids))
+    edges.delete()
+
+
+def remove_participant_edges(participant_id: str) -> None:
+    """
+    Drop the edges a deleted participant's row defined: its parents and the
+    twins it declared. Edges to it as a parent stay, as its children still
+    name it.
+    """
+    participant_id = str(participant_id)
+    PedigreeEdge.objects.filter(
+        Q(target=participant_id, relation__in=PedigreeEdge.PARENT_RELATIONS)
+        | Q(source=participant_id, relation=PedigreeEdge.TWIN)
+    ).delete()
+
+
+def rebuild_pedigree_edges(batch_size: int = 2000) -> int:
+    """
+    Rebuild the pedigree edges from the participant table.
+
+    Args:
+        batch_size (int): Number of participants read per batch.
+
+    Returns:
+        int: Number of edges created.
+    """
+    twin_through = Participant.twin_id.through
+    with transaction.atomic():
+        PedigreeEdge.objects.all().delete()
+        rows = [
+            row
+            for participant_id, paternal_id, maternal_id in Participant.objects.values_list(
+                "pk", "paternal_id", "maternal_id"
+            ).iterator(chunk_size=batch_size)
+            for row in parent_edge_rows(participant_id, paternal_id, maternal_id)
+        ]
+        rows += [
+            row
+            for participant_id, twin_id in twin_through.objects.values_list(
+                "participant_id", "twinid_id"
+            ).iterator(chunk_size=batch_size)
+            for row in twin_edge_rows(participant_id, [twin_id])
+        ]
+        for index in range(0, len(rows), batch_size):
+            _create_edges(rows[index:index + batch_size])
+    return len(rows)
+
+
+# Provenance chain below the biobank: table name -> (model, foreign key to
+# the parent record, parent table name). Biobank entries list their
+# analytes in the child_analytes many-to-many field instead.
+LINEAGE_FOREIGN_KEYS = {
+    "experiment_dna_short_read": (ExperimentDNAShortRead, "analyte_id", "analyte"),
+    "experiment_rna_short_read": (ExperimentRNAShortRead, "analyte_id", "analyte"),
+    "experiment_nanopore": (ExperimentNanopore, "analyte_id", "analyte"),
+    "experiment_pac_bio": (ExperimentPacBio, "analyte_id", "analyte"),
+    "experiment_atac_short_read": (ExperimentATACShortRead, "analyte_id", "analyte"),
+    "aligned_dna_short_read": (AlignedDNAShortRead, "experiment_dna_short_read_id", "experiment_dna_short_read"),
+    "aligned_rna_short_read": (AlignedRNAShortRead, "experiment_rna_short_read_id", "experiment_rna_short_read"),
+    "aligned_nanopore": (AlignedNanopore, "experiment_nanopore_id", "experiment_nanopore"),
+    "aligned_pac_bio": (AlignedPacBio, "experiment_pac_bio_id", "experiment_pac_bio"),
+    "aligned_atac_short_read": (AlignedATACShortRead, "experiment_atac_short_read", "experiment_atac_short_read"),
+}
+
+LINEAGE_TABLES = {
+    "biobank": Biobank,
+    "analyte": Analyte,
+    **{table_name: model for table_name, (model, field, parent) in LINEAGE_FOREIGN_KEYS.items()},
+}
+
+LINEAGE_TABLE_NAMES = {model: table_name for table_name, model in LINEAGE_TABLES.items()}
+
+_LINEAGE = LineageEntry._meta.db_table
+
+# Every ancestor of the parent (and the parent) paired with every
+# descendant of the child (and the child)
+_ADD_LINEAGE_EDGE = (
+    f"INSERT INTO {_LINEAGE} (ancestor_type, ancestor_id, descendant_type, descendant_id, depth)"
+    f" SELECT up.node_type, up.node_id, down.node_type, down.node_id, up.depth + down.depth + 1"
+    f" FROM (SELECT ancestor_type AS node_type, ancestor_id AS node_id, depth FROM {_LINEAGE}"
+    f" WHERE descendant_type = %s AND descendant_id = %s"
+    f" UNION ALL SELECT CAST(%s AS VARCHAR(50)), CAST(%s AS VARCHAR(255)), 0) AS up"
+    f" CROSS JOIN (SELECT descendant_type AS node_type, descendant_id AS node_id, depth FROM {_LINEAGE}"
+    f" WHERE ancestor_type = %s AND ancestor_id = %s"
+    f" UNION ALL SELECT CAST(%s AS VARCHAR(50)), CAST(%s AS VARCHAR(255)), 0) AS down"
+    f" WHERE 1 = 1 ON CONFLICT DO NOTHING"
+)
+
+_REMOVE_LINEAGE_EDGE = (
+    f"DELETE FROM {_LINEAGE} WHERE"
+    f" ((ancestor_type = %s AND ancestor_id = %s) OR EXISTS ("
+    f"SELECT 1 FROM {_LINEAGE} AS up WHERE up.descendant_type = %s AND up.descendant_id = %s"
+    f" AND up.ancestor_type = {_LINEAGE}.ancestor_type AND up.ancestor_id = {_LINEAGE}.ancestor_id))"
+    f" AND ((descendant_type = %s AND descendant_id = %s) OR EXISTS ("
+    f"SELECT 1 FROM {_LINEAGE} AS down WHERE down.ancestor_type = %s AND down.ancestor_id = %s"
+    f" AND down.descendant_type = {_LINEAGE}.descendant_type AND down.descendant_id = {_LINEAGE}.descendant_id))"
+)
+
+
+def add_lineage_edge(parent: tuple, child: tuple) -> None:
+    """
+    Link two (table name, primary key) nodes, adding a closure row from each
+    ancestor of `parent` to each descendant of `child`, in one statement.
+    """
+    parent, child = (parent[0], str(parent[1])), (child[0], str(child[1]))
+    with connection.cursor() as cursor:
+        cursor.execute(_ADD_LINEAGE_EDGE, [*parent, *parent, *child, *child])
+
+
+def remove_lineage_edge(parent: tuple, child: tuple) -> None:
+    """Unlink two (table name, primary key) nodes, in one statement."""
+    parent, child = (parent[0], str(parent[1])), (child[0], str(child[1]))
+    with connection.cursor() as cursor:
+        cursor.execute(_REMOVE_LINEAGE_EDGE, [*parent, *parent, *child, *child])
+
+
+def remove_lineage_node(table_name: str, record_id: str) -> None:
+    """Drop every closure row of a deleted record."""
+    LineageEntry.objects.filter(
+        Q(ancestor_type=table_name, ancestor_id=str(record_id))
+        | Q(descendant_type=table_name, descendant_id=str(record_id))
+    ).delete()
+
+
+def add_biobank_analytes(biobank_ids, analyte_ids) -> None:
+    """Link every biobank entry to every analyte."""
+    for biobank_id in biobank_ids:
+        for analyte_id in analyte_ids:
+            add_lineage_edge(("biobank", biobank_id), ("analyte", analyte_id))
+
+
+def remove_biobank_analytes(biobank_ids=None, analyte_ids=None) -> None:
+    """
+    Unlink biobank entries from analytes. Either argument left as None
+    matches any biobank entry or analyte. Biobank entries are the roots of
+    the chain, so an analyte's descendants are reached from a biobank entry
+    only through that analyte and unlinking drops exactly those rows.
+    """
+    links = LineageEntry.objects.filter(ancestor_type="biobank", descendant_type="analyte", depth=1)
+    if biobank_ids is not None:
+        links = links.filter(ancestor_id__in=[str(biobank_id) for biobank_id in biobank_ids])
+    if analyte_ids is not None:
+        links = links.filter(descendant_id__in=[str(analyte_id) for analyte_id in analyte_ids])
+    for biobank_id, analyte_id in list(links.values_list("ancestor_id", "descendant_id")):
+        remove_lineage_edge(("biobank", biobank_id), ("analyte", analyte_id))
+
+
+def index_lineage_parent(table_name: str, instance, created: bool = False) -> None:
+    """Move an experiment or alignment record under the parent its foreign key names."""
+    model, field, parent_type = LINEAGE_FOREIGN_KEYS[table_name]
+    parent_id = getattr(instance, model._meta.get_field(field).attname)
+    parents = [(parent_type, str(parent_id))] if parent_id is not None else []
+    if getattr(instance, "_lineage_parents", None) == parents:
+        return
+    instance._lineage_parents = parents
+    node = (table_name, str(instance.pk))
+    if not created:
+        current = list(
+            LineageEntry.objects.filter(
+                descendant_type=table_name, descendant_id=node[1], depth=1
+            ).values_list("ancestor_type", "ancestor_id")
+        )
+        if current == parents:
+            return
+        for parent in current:
+            remove_lineage_edge(parent, node)
+    for parent in parents:
+        add_lineage_edge(parent, node)
+
+
+def lineage_edges(get_model) -> list:
+    """
+    Read every parent -> child link of the provenance chain as
+    ((table name, pk), (table name, pk)) pairs. `get_model(app_label,
+    model_name)` returns the model class, so migrations can pass their
+    historical models.
+    """
+    through = get_model("metadata", "Biobank").child_analytes.through
+    edges = [
+        (("biobank", str(biobank_id)), ("analyte", str(analyte_id)))
+        for biobank_id, analyte_id in through.objects.values_list("biobank_id", "analyte_id")
+    ]
+    for table_name, (model, field, parent_type) in LINEAGE_FOREIGN_KEYS.items():
+        model = get_model(model._meta.app_label, model._meta.object_name)
+        attname = model._meta.get_field(field).attname
+        edges += [
+            ((parent_type, str(parent_id)), (table_name, str(pk)))
+            for pk, parent_id in model.objects.exclude(**{attname: None}).values_list("pk", attname)
+        ]
+    return edges
+
+
+def lineage_closure(edges: list) -> list:
+    """
+    Return the (ancestor type, ancestor id, descendant type, descendant id,
+    depth) closure rows of parent -> child node pairs.
+    """
+    parents = defaultdict(list)
+    for parent, child in edges:
+        parents[child].append(parent)
+
+    ancestors = {}
+
+    def ancestors_of(node, path=()):
+        if node not in ancestors:
+            found = {}
+            for parent in parents.get(node, []):
+                if parent in path:
+                    continue
+                found.setdefault(parent, 1)
+                for ancestor, depth in ancestors_of(parent, path + (node,)).items():
+                    found.setdefault(ancestor, depth + 1)
+            ancestors[node] = found
+        return ancestors[node]
+
+    return [
+        (*ancestor, *node, depth)
+        for node in list(parents)
+        for ancestor, depth in ancestors_of(node).items()
+    ]
+
+
+def rebuild_lineage(batch_size: int = 2000) -> int:
+    """
+    Rebuild the lineage closure table from the biobank, analyte, experiment
+    and alignment tables.
+
+    Args:
+        batch_size (int): Number of closure rows inserted per batch.
+
+    Returns:
+        int: Number of closure rows created.
+    """
+    rows = lineage_closure(lineage_edges(apps.get_model))
+    with transaction.atomic():
+        LineageEntry.objects.all().delete()
+        LineageEntry.objects.bulk_create(
+            [
+                LineageEntry(
+                    ancestor_type=ancestor_type,
+                    ancestor_id=ancestor_id,
+                    descendant_type=descendant_type,
+                    descendant_id=descendant_id,
+                    depth=depth,
+                )
+                for ancestor_type, ancestor_id, descendant_type, descendant_id, depth in rows
+            ],
+            batch_size=batch_size,
+        )
+    return len(rows)
+
+
+# Tables referencing files: table name -> (model, (path column, md5
+# column or None) pairs)
+FILE_REGISTRY_FIELDS = {
+    "family": (Family, (("pedigree_file", None),)),
+    "aligned": (Aligned, (("aligned_file", None), ("aligned_index_file", None))),
+    "experiment_dna_short_read": (ExperimentDNAShortRead, (("targeted_region_bed_file", None),)),
+    "aligned_dna_short_read": (
+        AlignedDNAShortRead,
+        (("aligned_dna_short_read_file", "md5sum"), ("aligned_dna_short_read_index_file", None)),
+    ),
+    "called_variants_dna_short_read": (CalledVariantsDNAShortRead, (("called_variants_dna_file", "md5sum"),)),
+    "aligned_rna_short_read": (
+        AlignedRNAShortRead,
+        (
+            ("aligned_rna_short_read_file", "md5sum"),
+            ("aligned_rna_short_read_index_file", None),
+            ("alignment_log_file", None),
+        ),
+    ),
+    "experiment_nanopore": (ExperimentNanopore, (("targeted_region_bed_file", None),)),
+    "aligned_nanopore": (
+        AlignedNanopore,
+        (("aligned_nanopore_file", "md5sum"), ("aligned_nanopore_index_file", None)),
+    ),
+    "called_variants_nanopore": (CalledVariantsNanopore, (("called_variants_dna_file", "md5sum"),)),
+    "experiment_pac_bio": (ExperimentPacBio, (("targeted_region_bed_file", None),)),
+    "aligned_pac_bio": (
+        AlignedPacBio,
+        (("aligned_pac_bio_file", "md5sum"), ("aligned_pac_bio_index_file", None)),
+    ),
+    "called_variants_pac_bio": (CalledVariantsPacBio, (("called_variants_dna_file", "md5sum"),)),
+    "experiment_atac_short_read": (ExperimentATACShortRead, (("targeted_region_bed_file", None),)),
+    "aligned_atac_short_read": (
+        AlignedATACShortRead,
+        (
+            ("aligned_atac_short_read_file", "md5sum"),
+            ("aligned_atac_short_read_index_file", None),
+            ("alignment_log_file", None),
+        ),
+    ),
+    "called_peaks_atac_short_read": (CalledPeaksATACShortRead, (("called_peaks_file", "peaks_md5sum"),)),
+    "allele_specific_atac_short_read": (
+        AlleleSpecificATACShortRead,
+        (("asc_file", "asc_md5sum"), ("het_sites_file", "het_sites_md5sum")),
+    ),
+}
+
+FILE_REGISTRY_TABLE_NAMES = {model: table_name for table_name, (model, columns) in FILE_REGISTRY_FIELDS.items()}
+
+# Tables that repeat the paths of other tables: `aligned` summarizes the
+# per-platform alignment tables
+FILE_REGISTRY_MIRROR_TABLES = ("aligned",)
+
+
+def file_registry_columns(table_name: str) -> list:
+    """Return the path and md5 column names of a table, in the order file_registry_rows expects."""
+    return [column for pair in FILE_REGISTRY_FIELDS[table_name][1] for column in pair if column]
+
+
+def file_registry_rows(table_name: str, *values) -> list:
+    """
+    Pair one record's file_registry_columns values into (field, path, md5sum)
+    tuples; empty paths are skipped.
+    """
+    values = iter(values)
+    rows = []
+    for path_field, md5_field in FILE_REGISTRY_FIELDS[table_name][1]:
+        path = next(values)
+        md5sum = next(values) if md5_field else None
+        if path and str(path).strip():
+            rows.append((path_field, str(path).strip(), (md5sum or "").strip().lower()))
+    return rows
+
+
+def register_files(table_name: str, instance, created: bool = False) -> None:
+    """Replace the FileRegistryEntry rows of one record."""
+    rows = file_registry_rows(
+        table_name, *[getattr(instance, column) for column in file_registry_columns(table_name)]
+    )
+    # Saving the same instance again with the same paths leaves the rows as they are
+    if getattr(instance, "_registered_files", None) == rows:
+        return
+    instance._registered_files = rows
+    # Columns emptied by an update lose their row; the others are upserted
+    # in place
+    if not created and len(rows) < len(FILE_REGISTRY_FIELDS[table_name][1]):
+        FileRegistryEntry.objects.filter(table_name=table_name, record_id=str(instance.pk)).exclude(
+            field__in=[field for field, path, md5sum in rows]
+        ).delete()
+    if rows:
+        FileRegistryEntry.objects.bulk_create(
+            [
+                FileRegistryEntry(
+                    path=path, md5sum=md5sum, table_name=table_name, record_id=str(instance.pk), field=field
+                )
+                for field, path, md5sum in rows
+            ],
+            update_conflicts=not created,
+            unique_fields=["table_name", "record_id", "field"] if not created else None,
+            update_fields=["path", "md5sum"] if not created else None,
+        )
+
+
+def unregister_files(table_name: str, record_id: str) -> None:
+    """Drop the FileRegistryEntry rows of one record."""
+    FileRegistryEntry.objects.filter(table_name=table_name, record_id=str(record_id)).delete()
+
+
+def rebuild_file_registry(batch_size: int = 2000) -> dict:
+    """
+    Rebuild the FileRegistryEntry table from every table in
+    FILE_REGISTRY_FIELDS.
+
+    Args:
+        batch_size (int): Number of records read per batch.
+
+    Returns:
+        dict: Number of files registered per table name.
+    """
+    counts = {}
+    with transaction.atomic():
+        FileRegistryEntry.objects.all().delete()
+        for table_name, (model, columns) in FILE_REGISTRY_FIELDS.items():
+            batch = []
+            counts[table_name] = 0
+            records = model.objects.values_list("pk", *file_registry_columns(table_name)).iterator(
+                chunk_size=batch_size
+            )
+            for record_id, *values in records:
+                for field, path, md5sum in file_registry_rows(table_name, *values):
+                    batch.append(
+                        FileRegistryEntry(
+                            path=path, md5sum=md5sum, table_name=table_name, record_id=str(record_id), field=field
+                        )
+                    )
+                if len(batch) >= batch_size:
+                    FileRegistryEntry.objects.bulk_create(batch)
+                    counts[table_name] += len(batch)
+                    batch = []
+            if batch:
+                FileRegistryEntry.objects.bulk_create(batch)
+                counts[table_name] += len(batch)
+    return counts
+
+
+# Read size used when hashing staged files
+MD5_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def md5_file(local_path: str, buffer_size: int = MD5_BUFFER_SIZE) -> tuple:
+    """
+    Hash one file with large reads into a reused buffer.
+
+    Returns:
+        tuple: (local_path, hex md5 digest).
+    """
+    digest = hashlib.md5()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(local_path, "rb", buffering=0) as staged_file:
+        while True:
+            length = staged_file.readinto(buffer)
+            if not length:
+                break
+            digest.update(view[:length])
+    return local_path, digest.hexdigest()
+
+
+def hash_files(local_paths, workers: int = None, buffer_size: int = MD5_BUFFER_SIZE) -> dict:
+    """
+    Hash files across a process pool, several at a time, so the rate is
+    bound by the disks rather than by one interpreter.
+
+    Args:
+        local_paths: Paths of the files, largest first for the best balance.
+        workers (int): Number of processes; the CPU count by default. One
+            hashes in this process.
+        buffer_size (int): Bytes read per call.
+
+    Returns:
+        dict: Hex md5 digest by local path.
+    """
+    local_paths = list(local_paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(local_paths) < 2:
+        return dict(md5_file(local_path, buffer_size) for local_path in local_paths)
+    with ProcessPoolExecutor(max_workers=min(workers, len(local_paths))) as executor:
+        return dict(executor.map(md5_file, local_paths, [buffer_size] * len(local_paths)))
+
+
+def staged_path(path: str, prefix_map: dict):
+    """
+    Map a registered path to the local path of its staged copy with the
+    first matching `prefix -> local directory` entry. Paths that are
+    already local are kept. Returns None for other paths.
+    """
+    for prefix, local_prefix in prefix_map.items():
+        if path.startswith(prefix):
+            return os.path.join(local_prefix, path[len(prefix):].lstrip("/"))
+    return path if os.path.isabs(path) else None
+
+
+def verify_staged_files(
+    prefix_map: dict, tables=None, workers: int = None, buffer_size: int = MD5_BUFFER_SIZE, force: bool = False
+) -> dict:
+    """
+    Hash the local copies of registered files that have an md5sum and
+    compare them to the database. Checksums are cached in
+    StagedFileChecksum by local path, size and modification time, so
+    unchanged files are only hashed once; every result is recorded there.
+
+    Args:
+        prefix_map (dict): Registered path prefix -> local directory, e.g.
+            {"gs://bucket/": "/staging/bucket"}.
+        tables (list): Only verify files of these file registry tables.
+        workers (int): Hashing processes; the CPU count by default.
+        buffer_size (int): Bytes read per call.
+        force (bool): Hash every file again, ignoring the cache.
+
+    Returns:
+        dict: Counts of `verified`, `hashed` and `cached` files and of
+        `not_staged` ones without a local copy, and the `mismatched` files
+        with their paths, both checksums and owning records.
+    """
+    entries = FileRegistryEntry.objects.exclude(md5sum="")
+    if tables:
+        entries = entries.filter(table_name__in=tables)
+    expected = {}
+    references = defaultdict(list)
+    not_staged = set()
+    rows = entries.order_by("path").values_list("path", "md5sum", "table_name", "record_id")
+    for path, md5sum, table_name, record_id in rows.iterator(chunk_size=5000):
+        local_path = staged_path(path, prefix_map)
+        if local_path is None or not os.path.isfile(local_path):
+            not_staged.add(path)
+            continue
+        expected[local_path] = (path, md5sum)
+        references[local_path].append({"table_name": table_name, "record_id": record_id})
+
+    stats = {local_path: os.stat(local_path) for local_path in expected}
+    cached = {}
+    if not force:
+        local_paths = list(expected)
+        # Keep each IN list well under the SQLite variable limit
+        for index in range(0, len(local_paths), 500):
+            checksums = StagedFileChecksum.objects.filter(local_path__in=local_paths[index:index + 500])
+            for local_path, size, mtime_ns, md5sum in checksums.values_list(
+                "local_path", "size", "mtime_ns", "md5sum"
+            ):
+                stat = stats[local_path]
+                if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    cached[local_path] = md5sum
+
+    to_hash = sorted((path for path in expected if path not in cached), key=lambda path: -stats[path].st_size)
+    checksums = {**cached, **hash_files(to_hash, workers=workers, buffer_size=buffer_size)}
+
+    now = timezone.now()
+    StagedFileChecksum.objects.bulk_create(
+        [
+            StagedFileChecksum(
+                local_path=local_path,
+                path=path,
+                size=stats[local_path].st_size,
+                mtime_ns=stats[local_path].st_mtime_ns,
+                md5sum=checksums[local_path],
+                expected_md5sum=md5sum,
+                matches=checksums[local_path] == md5sum,
+                checked_at=now,
+            )
+            for local_path, (path, md5sum) in expected.items()
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["local_path"],
+        update_fields=["path", "size", "mtime_ns", "md5sum", "expected_md5sum", "matches", "checked_at"],
+    )
+    mismatched = [
+        {
+            "path": path,
+            "local_path": local_path,
+            "md5sum": md5sum,
+            "local_md5sum": checksums[local_path],
+            "references": references[local_path],
+        }
+        for local_path, (path, md5sum) in sorted(expected.items())
+        if checksums[local_path] != md5sum
+    ]
+    return {
+        "verified": len(expected),
+        "hashed": len(to_hash),
+        "cached": len(cached),
+        "not_staged": len(not_staged),
+        "mismatched": mismatched,
+    }
+
+
+# Participant columns that define a dashboard summary group
+SUMMARY_GROUP_FIELDS = ("gregor_center", "consent_code", "affected_status")
+
+# Counted models: (fixed table name or None to read the `table_name` column,
+# lookup prefix from the model to the participant columns)
+SUMMARY_SOURCES = {
+    Participant: ("participant", ""),
+    Analyte: ("analyte", "participant_id__"),
+    Experiment: (None, "participant_id__"),
+    Aligned: (None, "participant_id__"),
+}
+
+_summary_batch = threading.local()
+
+
+def _summary_source_fields(model_class) -> tuple:
+    table_name, prefix = SUMMARY_SOURCES[model_class]
+    if not prefix:
+        return SUMMARY_GROUP_FIELDS
+    return ("participant_id_id",) if table_name else ("table_name", "participant_id_id")
+
+
+def summary_source(instance) -> tuple:
+    """
+    The values of `instance` its summary key is derived from: the group
+    fields of a participant, or the participant ID, and the table name for
+    experiments and alignments, of any other record. Read without queries;
+    None if one of them is deferred.
+    """
+    values = instance.__dict__
+    fields = _summary_source_fields(type(instance))
+    if any(field not in values for field in fields):
+        return None
+    return tuple(values[field] for field in fields)
+
+
+def summary_source_from_db(model_class, pk) -> tuple:
+    """`summary_source` of one stored record; None if it does not exist."""
+    fields = [
+        "participant_id" if field == "participant_id_id" else field
+        for field in _summary_source_fields(model_class)
+    ]
+    return model_class.objects.filter(pk=pk).values_list(*fields).first()
+
+
+def summary_key_from_source(model_class, source: tuple) -> tuple:
+    """
+    Summary key, (table_name, gregor_center, consent_code, affected_status),
+    of a record with the given `summary_source`.
+    """
+    table_name, prefix = SUMMARY_SOURCES[model_class]
+    if not prefix:
+        return (table_name, *(value or "" for value in source))
+    if table_name is None:
+        table_name, participant_id = source
+    else:
+        (participant_id,) = source
+    return participant_summary_key(participant_id, table_name)
+
+
+def participant_summary_key(participant_id: str, table_name: str) -> tuple:
+    """Summary key for a record of `table_name` owned by `participant_id`."""
+    group = (
+        Participant.objects.filter(pk=participant_id)
+        .values_list(*SUMMARY_GROUP_FIELDS)
+        .first()
+    )
+    if group is None:
+        return None
+    return (table_name, *(value or "" for value in group))
+
+
+def summary_key_from_instance(instance) -> tuple:
+    """Summary key of an instance that may already be gone from the database."""
+    table_name, prefix = SUMMARY_SOURCES[type(instance)]
+    if isinstance(instance, Participant):
+        return (
+            table_name,
+            *(getattr(instance, field) or "" for field in SUMMARY_GROUP_FIELDS),
+        )
+    return participant_summary_key(
+        instance.participant_id_id, table_name or instance.table_name
+    )
+
+
+def _savepoint_depth() -> int:
+    """Number of open savepoints, each of which can be rolled back on its own."""
+    return sum(1 for sid in connection.savepoint_ids if sid)
+
+
+def adjust_summary(key: tuple, delta: int) -> None:
+    """
+    Add `delta` to the count of one summary group. Inside `summary_batch()`
+    the change is accumulated and written when the batch closes, unless it
+    is made under a savepoint opened within the batch: that savepoint can be
+    rolled back, so the change is written with it.
+    """
+    if key is None or delta == 0:
+        return
+    pending = getattr(_summary_batch, "pending", None)
+    if pending is not None and _savepoint_depth() == _summary_batch.depth:
+        pending[key] += delta
+        return
+    _apply_summary_delta(key, delta)
+
+
+def _apply_summary_delta(key: tuple, delta: int) -> None:
+    table_name, gregor_center, consent_code, affected_status = key
+    group = {
+        "table_name": table_name,
+        "gregor_center": gregor_center,
+        "consent_code": consent_code,
+        "affected_status": affected_status,
+    }
+    updated = SummaryCount.objects.filter(**group).update(count=F("count") + delta)
+    if not updated:
+        SummaryCount.objects.create(count=delta, **group)
+
+
+@contextmanager
+def summary_batch():
+    """
+    Accumulate summary count changes and write them once on exit. Used by the
+    create and update APIs and TableConverter, so a large upload touches each
+    summary row only once. Also usable as a view method decorator.
+    """
+    if getattr(_summary_batch, "pending", None) is not None:
+        yield
+        return
+    _summary_batch.pending = Counter()
+    _summary_batch.depth = _savepoint_depth()
+    try:
+        yield
+    finally:
+        pending, _summary_batch.pending = _summary_batch.pending, None
+        changed = [(key, delta) for key, delta in pending.items() if delta]
+        for key, delta in changed:
+            _apply_summary_delta(key, delta)
+        # The counts change after the source table writes were stamped
+        if changed:
+            bump_table_generation("summary")
+
+
+def move_participant_summary(participant_id: str, old_group: tuple, new_group: tuple) -> None:
+    """
+    Move the counts of everything a participant owns from one summary group to
+    another after the participant's gregor_center, consent_code or
+    affected_status changed.
+    """
+    moves = [
+        ("analyte", Analyte.objects.filter(participant_id=participant_id).count())
+    ]
+    for model_class in (Experiment, Aligned):
+        moves.extend(
+            model_class.objects.filter(participant_id=participant_id)
+            .values_list("table_name")
+            .annotate(total=Count("pk"))
+        )
+    for table_name, total in moves:
+        adjust_summary((table_name, *old_group), -total)
+        adjust_summary((table_name, *new_group), total)
+
+
+def rebuild_summary_counts() -> int:
+    """
+    Recompute every summary count from the source tables.
+
+    Returns:
+        int: Number of summary rows written.
+    """
+    totals = Counter()
+    group_fields = ["participant_id__" + field for field in SUMMARY_GROUP_FIELDS]
+    totals.update(
+        {
+            ("participant", *(value or "" for value in group)): total
+            for *group, total in Participant.objects.values_list(
+                *SUMMARY_GROUP_FIELDS
+            ).annotate(total=Count("pk"))
+        }
+    )
+    totals.update(
+        {
+            ("analyte", *(value or "" for value in group)): total
+            for *group, total in Analyte.objects.values_list(*group_fields).annotate(
+                total=Count("pk")
+            )
+        }
+    )
+    for model_class in (Experiment, Aligned):
+        totals.update(
+            {
+                (table_name, *(value or "" for value in group)): total
+                for table_name, *group, total in model_class.objects.values_list(
+                    "table_name", *group_fields
+                ).annotate(total=Count("pk"))
+            }
+        )
+
+    with transaction.atomic():
+        SummaryCount.objects.all().delete()
+        SummaryCount.objects.bulk_create(
+            [
+                SummaryCount(
+                    table_name=table_name,
+                    gregor_center=gregor_center,
+                    consent_code=consent_code,
+                    affected_status=affected_status,
+                    count=total,
+                )
+                for (table_name, gregor_center, consent_code, affected_status), total in totals.items()
+            ]
+        )
+        bump_table_generation("summary")
+    return len(totals)
+
+
+def bump_table_generation(table_name: str) -> None:
+    """Advance the write generation of a table and stamp its modification time."""
+    now = timezone.now()
+    updated = TableGeneration.objects.filter(table_name=table_name).update(
+        generation=F("generation") + 1, last_modified=now
+    )
+    if not updated:
+        generation, created = TableGeneration.objects.get_or_create(
+            table_name=table_name, defaults={"generation": 1, "last_modified": now}
+        )
+        if not created:
+            TableGeneration.objects.filter(table_name=table_name).update(
+                generation=F("generation") + 1, last_modified=now
+            )
+
+
+def record_change(table_name: str, record_ids, operation: str) -> None:
+    """
+    Append change log entries for records of a tracked table and advance the
+    table generation.
+
+    Args:
+        table_name (str): Tracked table name, a key of TRACKED_TABLES.
+        record_ids (iterable): Primary keys of the changed records.
+        operation (str): ChangeLogEntry.UPSERT or ChangeLogEntry.DELETE.
+    """
+    entries = [
+        ChangeLogEntry(table_name=table_name, record_id=str(record_id), operation=operation)
+        for record_id in record_ids
+    ]
+    if len(entries) == 1:
+        entries[0].save()
+    elif entries:
+        ChangeLogEntry.objects.bulk_create(entries)
+    bump_table_generation(table_name)
+
+
+# TableGeneration row locked while commit sequences are given out
+CHANGE_LOG_LOCK = "change_log"
+
+
+def number_changes() -> int:
+    """
+    Give the committed change log entries without a `commit_sequence` the
+    next ones, in `sequence` order, and return how many were numbered.
+
+    Only committed entries are visible here, and numbering holds a lock on
+    one TableGeneration row until it commits, so an entry committed after a
+    client read commit sequence N is numbered above N. Runs on the primary.
+    """
+    using = router.db_for_write(ChangeLogEntry)
+    entries = ChangeLogEntry.objects.using(using)
+    if not entries.filter(commit_sequence__isnull=True).exists():
+        return 0
+    with transaction.atomic(using=using):
+        lock = TableGeneration.objects.using(using).filter(table_name=CHANGE_LOG_LOCK)
+        if not lock.update(last_modified=timezone.now()):
+            TableGeneration.objects.using(using).get_or_create(table_name=CHANGE_LOG_LOCK)
+            lock.update(last_modified=timezone.now())
+        last = entries.aggregate(last=Max("commit_sequence"))["last"] or 0
+        pending = list(entries.filter(commit_sequence__isnull=True).order_by("sequence").only("sequence"))
+        for offset, entry in enumerate(pending, start=1):
+            entry.commit_sequence = last + offset
+        entries.bulk_update(pending, ["commit_sequence"], batch_size=500)
+    return len(pending)
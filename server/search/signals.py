@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# search/signals.py
+
+"""Search Signals
+
+Model signal receivers that keep the search side tables in step with writes
+to the metadata and experiment tables.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from experiments.models import Aligned, Experiment
+from metadata.models import Analyte, Biobank, Family, GeneticFindings, Participant, Phenotype
+from search.models import ChangeLogEntry
+from search.services import (
+    FILE_REGISTRY_TABLE_NAMES,
+    LINEAGE_FOREIGN_KEYS,
+    LINEAGE_TABLE_NAMES,
+    TRACKED_TABLES,
+    TRACKED_TABLE_NAMES,
+    add_biobank_analytes,
+    add_twin_edges,
+    adjust_summary,
+    index_finding_values,
+    index_lineage_parent,
+    index_participant_parents,
+    index_region_record,
+    index_text_record,
+    move_participant_summary,
+    record_change,
+    register_files,
+    remove_biobank_analytes,
+    remove_finding_values,
+    remove_lineage_node,
+    remove_participant_edges,
+    remove_region_record,
+    remove_text_record,
+    remove_twin_edges,
+    summary_key_from_instance,
+    summary_key_from_source,
+    summary_source,
+    summary_source_from_db,
+    text_index_table_name,
+    unregister_files,
+)
+
+
+@receiver(post_save, sender=Phenotype)
+@receiver(post_save, sender=GeneticFindings)
+@receiver(post_save, sender=Family)
+def update_text_index(sender, instance, **kwargs):
+    index_text_record(text_index_table_name(sender), instance)
+
+
+@receiver(post_delete, sender=Phenotype)
+@receiver(post_delete, sender=GeneticFindings)
+@receiver(post_delete, sender=Family)
+def delete_text_index(sender, instance, **kwargs):
+    remove_text_record(text_index_table_name(sender), instance.pk)
+
+
+@receiver(post_save, sender=GeneticFindings)
+def update_finding_indexes(sender, instance, created, raw=False, **kwargs):
+    # A fixture may replace a finding that is already indexed
+    index_region_record(instance, created=created and not raw)
+    index_finding_values(instance, created=created and not raw)
+
+
+@receiver(post_delete, sender=GeneticFindings)
+def delete_finding_indexes(sender, instance, **kwargs):
+    remove_region_record(instance.pk)
+    remove_finding_values(instance.pk)
+
+
+@receiver(post_save, sender=Participant)
+def update_pedigree_parents(sender, instance, created, raw=False, **kwargs):
+    index_participant_parents(instance, created=created and not raw)
+
+
+@receiver(post_delete, sender=Participant)
+def delete_pedigree_edges(sender, instance, **kwargs):
+    remove_participant_edges(instance.pk)
+
+
+@receiver(m2m_changed, sender=Participant.twin_id.through)
+def update_pedigree_twins(sender, instance, action, reverse, pk_set, **kwargs):
+    # Reversed, `instance` is a TwinId and `pk_set` holds participant IDs
+    if action == "post_add":
+        participant_ids, twin_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+        add_twin_edges(participant_ids, twin_ids)
+    elif action == "post_remove":
+        participant_ids, twin_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+        remove_twin_edges(participant_ids, twin_ids)
+    elif action == "post_clear":
+        if reverse:
+            remove_twin_edges(twin_ids=[instance.pk])
+        else:
+            remove_twin_edges([instance.pk])
+
+
+@receiver(m2m_changed, sender=Biobank.child_analytes.through)
+def update_biobank_lineage(sender, instance, action, reverse, pk_set, **kwargs):
+    # Reversed, `instance` is an Analyte and `pk_set` holds biobank IDs
+    if action == "post_add":
+        biobank_ids, analyte_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+        add_biobank_analytes(biobank_ids, analyte_ids)
+    elif action == "post_remove":
+        biobank_ids, analyte_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+        remove_biobank_analytes(biobank_ids, analyte_ids)
+    elif action == "post_clear":
+        if reverse:
+            remove_biobank_analytes(analyte_ids=[instance.pk])
+        else:
+            remove_biobank_analytes([instance.pk])
+
+
+def update_lineage_parent(sender, instance, created, raw=False, **kwargs):
+    index_lineage_parent(LINEAGE_TABLE_NAMES[sender], instance, created=created and not raw)
+
+
+def delete_lineage_node(sender, instance, **kwargs):
+    remove_lineage_node(LINEAGE_TABLE_NAMES[sender], instance.pk)
+
+
+for lineage_model, table_name in LINEAGE_TABLE_NAMES.items():
+    if table_name in LINEAGE_FOREIGN_KEYS:
+        post_save.connect(update_lineage_parent, sender=lineage_model)
+    post_delete.connect(delete_lineage_node, sender=lineage_model)
+
+
+def update_file_registry(sender, instance, created, raw=False, **kwargs):
+    register_files(FILE_REGISTRY_TABLE_NAMES[sender], instance, created=created and not raw)
+
+
+def delete_file_registry(sender, instance, **kwargs):
+    unregister_files(FILE_REGISTRY_TABLE_NAMES[sender], instance.pk)
+
+
+for file_model in FILE_REGISTRY_TABLE_NAMES:
+    post_save.connect(update_file_registry, sender=file_model)
+    post_delete.connect(delete_file_registry, sender=file_model)
+
+
+@receiver(post_init, sender=Participant)
+@receiver(post_init, sender=Analyte)
+@receiver(post_init, sender=Experiment)
+@receiver(post_init, sender=Aligned)
+def snapshot_summary_source(sender, instance, **kwargs):
+    """Remember what a loaded record's summary group is derived from."""
+    instance._summary_source = summary_source(instance)
+
+
+@receiver(pre_save, sender=Participant)
+@receiver(pre_save, sender=Analyte)
+@receiver(pre_save, sender=Experiment)
+@receiver(pre_save, sender=Aligned)
+def stash_summary_source(sender, instance, raw=False, **kwargs):
+    """Keep the summary source a record had before it is updated."""
+    if raw or instance._state.adding:
+        instance._old_summary_source = None
+        return
+    old_source = getattr(instance, "_summary_source", None)
+    if old_source is None:
+        # A field was deferred when the record was loaded
+        old_source = summary_source_from_db(sender, instance.pk)
+    instance._old_summary_source = old_source
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_save, sender=Analyte)
+@receiver(post_save, sender=Experiment)
+@receiver(post_save, sender=Aligned)
+def update_summary_counts(sender, instance, created, raw=False, **kwargs):
+    # Fixture loads are counted by rebuild_summary_counts
+    if raw:
+        return
+    old_source = getattr(instance, "_old_summary_source", None)
+    new_source = summary_source(instance) or summary_source_from_db(sender, instance.pk)
+    instance._summary_source = new_source
+    if created or old_source is None:
+        adjust_summary(summary_key_from_source(sender, new_source), 1)
+    elif old_source != new_source:
+        old_key = summary_key_from_source(sender, old_source)
+        new_key = summary_key_from_source(sender, new_source)
+        if old_key != new_key:
+            adjust_summary(old_key, -1)
+            adjust_summary(new_key, 1)
+            if sender is Participant:
+                move_participant_summary(instance.pk, old_key[1:], new_key[1:])
+
+
+@receiver(post_delete, sender=Participant)
+@receiver(post_delete, sender=Analyte)
+@receiver(post_delete, sender=Experiment)
+@receiver(post_delete, sender=Aligned)
+def delete_summary_counts(sender, instance, **kwargs):
+    adjust_summary(summary_key_from_instance(instance), -1)
+
+
+def log_save(sender, instance, **kwargs):
+    record_change(TRACKED_TABLE_NAMES[sender], [instance.pk], ChangeLogEntry.UPSERT)
+
+
+def log_delete(sender, instance, **kwargs):
+    record_change(TRACKED_TABLE_NAMES[sender], [instance.pk], ChangeLogEntry.DELETE)
+
+
+def log_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    A many-to-many change belongs to the table that declares the field, so the
+    records on that side are logged as upserted.
+    """
+    if not action.startswith("post_"):
+        return
+    owner = model if reverse else type(instance)
+    if owner not in TRACKED_TABLE_NAMES:
+        return
+    if not reverse:
+        record_ids = [instance.pk]
+    else:
+        # pk_set is not sent for a reverse clear, only the generation moves
+        record_ids = pk_set or []
+    record_change(TRACKED_TABLE_NAMES[owner], record_ids, ChangeLogEntry.UPSERT)
+
+
+for tracked_model in TRACKED_TABLES.values():
+    post_save.connect(log_save, sender=tracked_model)
+    post_delete.connect(log_delete, sender=tracked_model)
+    for m2m_field in tracked_model._meta.local_many_to_many:
+        m2m_changed.connect(log_m2m_change, sender=m2m_field.remote_field.through)
@@ -1,16 +1,64 @@
 #!/usr/bin/env python
 # # search/urls.py
 
-from django.urls import path
+from django.urls import path, re_path
 
 from search.apis import (
+    AsyncSummaryCountsAPI,
+    ChangesAPI,
+    FileDuplicatesAPI,
+    FileLookupAPI,
+    FileOwnersAPI,
+    FindingFacetsAPI,
+    FindingsByValueAPI,
+    ManifestReconcileAPI,
+    NearestFindingsAPI,
+    ParticipantAggregateAPI,
+    PedigreeLineageAPI,
+    PedigreeRelativesAPI,
+    PedigreeTriosAPI,
+    RegionSearchAPI,
+    ResponseCacheStatsAPI,
+    SampleLineageAPI,
     SearchTablesAPI,
     DounlaodTablesAPI,
-    GetAllTablesAPI
+    FamilyPedigreeAPI,
+    GetAllTablesAPI,
+    SummaryCountsAPI,
+    TablePageAPI,
+    TextSearchAPI
 )
 
 urlpatterns = [
     path("get_all_tables/", GetAllTablesAPI.as_view(), name="get_all_tables"),
+    path("text/", TextSearchAPI.as_view(), name="text_search"),
+    path("summary/", SummaryCountsAPI.as_view(), name="summary_counts"),
+    path("changes/", ChangesAPI.as_view(), name="changes"),
+    path("region/", RegionSearchAPI.as_view(), name="region_search"),
+    path("region/nearest/", NearestFindingsAPI.as_view(), name="region_nearest"),
+    path("findings/", FindingsByValueAPI.as_view(), name="findings_by_value"),
+    path("findings/facets/", FindingFacetsAPI.as_view(), name="finding_facets"),
+    path("pedigree/trios/", PedigreeTriosAPI.as_view(), name="pedigree_trios"),
+    path("pedigree/family/<str:family_id>/", FamilyPedigreeAPI.as_view(), name="pedigree_family"),
+    path("pedigree/participant/<str:participant_id>/", PedigreeRelativesAPI.as_view(), name="pedigree_relatives"),
+    re_path(
+        r"^pedigree/participant/(?P<participant_id>[^/]+)/(?P<direction>ancestors|descendants)/$",
+        PedigreeLineageAPI.as_view(),
+        name="pedigree_lineage",
+    ),
+    path("files/", FileLookupAPI.as_view(), name="file_lookup"),
+    path("files/owners/", FileOwnersAPI.as_view(), name="file_owners"),
+    path("files/duplicates/", FileDuplicatesAPI.as_view(), name="file_duplicates"),
+    path("files/reconcile/", ManifestReconcileAPI.as_view(), name="file_reconcile"),
+    re_path(
+        r"^lineage/(?P<table_name>[^/]+)/(?P<record_id>[^/]+)/(?P<direction>ancestors|descendants)/$",
+        SampleLineageAPI.as_view(),
+        name="sample_lineage",
+    ),
+    path("cache_stats/", ResponseCacheStatsAPI.as_view(), name="response_cache_stats"),
+    path("async/tables/<str:table_name>/", TablePageAPI.as_view(), name="async_table_page"),
+    path("async/participant/<str:participant_id>/", ParticipantAggregateAPI.as_view(), name="async_participant"),
+    path("async/summary/", AsyncSummaryCountsAPI.as_view(), name="async_summary_counts"),
     # path("get_anvil_tables/", DounlaodTablesAPI.as_view()),
     # path("<str:model_name>/", SearchTablesAPI.as_view(), name="general_search"),
 ]
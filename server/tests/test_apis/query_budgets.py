@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# tests/test_apis/query_budgets.py
+
+"""Declared query budgets for the table API tests
+
+A read of a table runs READ_QUERIES queries however many ids it asks for:
+the write generation of the table, then one SELECT of the rows. A create or
+update runs a fixed number of queries per request, such as the lookup of
+the submitted ids, plus a fixed number for each row it writes. Each test
+module declares these for its table as `(per request, per row)`.
+
+Each budget is checked by sending one row or id, then several, and
+asserting both cost the same once the per-row queries are taken out. The
+budgets raise whatever QUERY_BUDGET_RAISE is set to.
+"""
+
+from django.core.cache import caches
+
+from config.query_budget import query_budget
+
+READ_QUERIES = 2
+
+
+def numbered(row: dict, id_field: str, count: int, **unique) -> list:
+    """
+    Return `count` copies of `row` with their own `id_field` values, and
+    the next of the values listed in `unique` for each other unique field.
+    """
+    return [
+        {**row, id_field: f"{row[id_field]}-{number}", **{field: values[number - 1] for field, values in unique.items()}}
+        for number in range(1, count + 1)
+    ]
+
+
+def stored_copies(model_class, row: dict, id_field: str, count: int, **unique) -> list:
+    """
+    Store `count` copies of the `model_class` record of `row` and return
+    `row` numbered to match them.
+    """
+    rows = numbered(row, id_field, count, **unique)
+    for copy in rows:
+        instance = model_class.objects.get(pk=row[id_field])
+        instance.pk = copy[id_field]
+        for field in unique:
+            setattr(instance, field, copy[field])
+        instance._state.adding = True
+        instance.save()
+    return rows
+
+
+class QueryBudgetMixin:
+    """Query budget assertions for the table API test cases."""
+
+    def assertReadBudget(self, url: str, ids: list):
+        """Read the first of `ids` from `url`, then all of them, uncached."""
+        counts = []
+        for batch in (ids[:1], ids):
+            caches["responses"].clear()
+            with query_budget(max_queries=READ_QUERIES, max_repeats=1, raise_on_exceed=True) as budget:
+                response = self.client.get(f"{url}?ids={','.join(batch)}", format='json')
+            self.assertEqual(response.status_code, 200, response.data)
+            counts.append(len(budget.queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def assertWriteBudget(self, url: str, rows: list, queries: tuple):
+        """Submit the first of `rows` to `url`, then the rest."""
+        per_request, per_row = queries
+        counts = []
+        for batch in (rows[:1], rows[1:]):
+            budget = query_budget(max_queries=per_request + per_row * len(batch), raise_on_exceed=True)
+            with budget:
+                response = self.client.post(url, batch, format='json')
+            self.assertEqual(response.status_code, 200, response.data)
+            counts.append(len(budget.queries) - per_row * len(batch))
+        self.assertEqual(counts[0], counts[1])
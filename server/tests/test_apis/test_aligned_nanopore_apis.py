@@ -4,9 +4,19 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Aligned
+from experiments.models import Aligned, AlignedNanopore
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 13
+UPDATE_QUERIES = 1, 10
+
+# Unique values for the stored copies of a record
+MD5SUMS = [f"{number:032x}" for number in range(1, 4)]
+FILES = [f"gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/copy-{number}.bam" for number in range(1, 4)]
+INDEX_FILES = [f"gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/copy-{number}.bai" for number in range(1, 4)]
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -126,6 +136,7 @@ class CreateAlignedNanoporeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "BAD REQUEST")
         self.assertEqual(response_207.data[1]["request_status"], "CREATED")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(aligned2, 'aligned_nanopore_id', 3), CREATE_QUERIES)
 
 
 class ReadAlignedNanoporeAPITest(APITestCaseWithAuth):
@@ -140,6 +151,10 @@ class ReadAlignedNanoporeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget(
+            '/api/experiments/aligned_nanopore/',
+            ['UCI_GREGoR_test-001-001-0-D-3_NANO_1-Aligned_1', 'UCI_GREGoR_test-004-004-0-D-3_NANO_1-Aligned_1', 'UCI_GREGoR_test-006-006-0-D-3_NANO_1-Aligned_1']
+        )
 
 
 class UpdateAlignedNanoporeAPITest(APITestCaseWithAuth):
@@ -231,6 +246,12 @@ class UpdateAlignedNanoporeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(
+            AlignedNanopore, aligned1, 'aligned_nanopore_id', 3,
+            md5sum=MD5SUMS, aligned_nanopore_file=FILES, aligned_nanopore_index_file=INDEX_FILES
+        )
+        self.assertWriteBudget(url, [{**row, 'analysis_details': 'Realigned with Minimap2-2.24'} for row in rows], UPDATE_QUERIES)
+
 
 class DeleteAlignedNanoporeAPITest(APITestCaseWithAuth):
     def test_delete_nanopore_api(self):
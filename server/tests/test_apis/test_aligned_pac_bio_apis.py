@@ -4,9 +4,19 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Aligned
+from experiments.models import Aligned, AlignedPacBio
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 13
+UPDATE_QUERIES = 1, 8
+
+# Unique values for the stored copies of a record
+MD5SUMS = [f"{number:032x}" for number in range(1, 4)]
+FILES = [f"gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/copy-{number}.bam" for number in range(1, 4)]
+INDEX_FILES = [f"gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/copy-{number}.bai" for number in range(1, 4)]
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -123,6 +133,7 @@ class CreateAlignedPacBioAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "BAD REQUEST")
         self.assertEqual(response_207.data[1]["request_status"], "CREATED")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(aligned2, 'aligned_pac_bio_id', 3), CREATE_QUERIES)
 
 
 class ReadAlignedPacBioAPITest(APITestCaseWithAuth):
@@ -137,6 +148,10 @@ class ReadAlignedPacBioAPITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget(
+            '/api/experiments/aligned_pac_bio/',
+            ['UCI_GREGoR_test-001-001-0-D-2_PB_1-Aligned_1', 'UCI_GREGoR_test-002-001-2-D-2_PB_1-Aligned_1', 'UCI_GREGoR_test-003-001-1-D-2_PB_1-Aligned_1']
+        )
 
 
 class UpdateAlignedPacBioAPITest(APITestCaseWithAuth):
@@ -251,6 +266,12 @@ class UpdateAlignedPacBioAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[2]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(
+            AlignedPacBio, aligned1, 'aligned_pac_bio_id', 3,
+            md5sum=MD5SUMS, aligned_pac_bio_file=FILES, aligned_pac_bio_index_file=INDEX_FILES
+        )
+        self.assertWriteBudget(url, [{**row, 'analysis_details': 'Realigned with pbmm2 1.13'} for row in rows], UPDATE_QUERIES)
+
 
 class DeleteAlignedPacBioAPITest(APITestCaseWithAuth):
     def test_delete_pac_bio_api(self):
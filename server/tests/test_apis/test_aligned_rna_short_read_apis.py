@@ -4,9 +4,19 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Aligned
+from experiments.models import Aligned, AlignedRNAShortRead
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 13
+UPDATE_QUERIES = 1, 11
+
+# Unique values for the stored copies of a record
+MD5SUMS = [f"{number:032x}" for number in range(1, 4)]
+FILES = [f"gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/copy-{number}.bam" for number in range(1, 4)]
+INDEX_FILES = [f"gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/copy-{number}.bai" for number in range(1, 4)]
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -114,6 +124,7 @@ class CreateAlignedRnaShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "BAD REQUEST")
         self.assertEqual(response_207.data[1]["request_status"], "CREATED")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(aligned2, 'aligned_rna_short_read_id', 3), CREATE_QUERIES)
 
 
 class ReadAlignedRnaShortReadAPITest(APITestCaseWithAuth):
@@ -128,6 +139,11 @@ class ReadAlignedRnaShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        rows = stored_copies(
+            AlignedRNAShortRead, {'aligned_rna_short_read_id': 'UCI_GREGoR_test-001-001-0-R-1_RNA_1-Aligned_1'}, 'aligned_rna_short_read_id', 2,
+            md5sum=MD5SUMS, aligned_rna_short_read_file=FILES, aligned_rna_short_read_index_file=INDEX_FILES
+        )
+        self.assertReadBudget('/api/experiments/aligned_rna_short_read/', [row['aligned_rna_short_read_id'] for row in rows])
 
 
 class UpdateRNAShortReadAPITest(APITestCaseWithAuth):
@@ -208,6 +224,12 @@ class UpdateRNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(
+            AlignedRNAShortRead, aligned1, 'aligned_rna_short_read_id', 3,
+            md5sum=MD5SUMS, aligned_rna_short_read_file=FILES, aligned_rna_short_read_index_file=INDEX_FILES
+        )
+        self.assertWriteBudget(url, [{**row, 'alignment_postprocessing': 'Duplicates marked'} for row in rows], UPDATE_QUERIES)
+
 
 class DeleteAlignedRnaShortReadAPITest(APITestCaseWithAuth):
     def test_delete_rna_short_read_api(self):
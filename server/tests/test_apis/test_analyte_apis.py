@@ -4,8 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
+from metadata.models import Analyte
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 3, 6
+UPDATE_QUERIES = 1, 4
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -42,6 +48,7 @@ class CreateAnalyteAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(part1, 'analyte_id', 3), CREATE_QUERIES)
 
 class ReadAnalyteAPITest(APITestCaseWithAuth):
     def test_read_analyte_success(self):
@@ -58,6 +65,7 @@ class ReadAnalyteAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "SUCCESS")
         self.assertEqual(response_207.data[2]["request_status"], "NOT FOUND")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget('/api/metadata/analyte/', ['GREGoR_test-001-001-0-R-1', 'GREGoR_test-001-001-0-R-2'])
 
 class UpdateAnalyteAPITest(APITestCaseWithAuth):
     def test_update_analyte_api(self):
@@ -83,6 +91,9 @@ class UpdateAnalyteAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
 
+        rows = stored_copies(Analyte, part1, 'analyte_id', 3)
+        self.assertWriteBudget(url, [{**row, 'primary_biosample': 'UBERON:0002371'} for row in rows], UPDATE_QUERIES)
+
 class DeleteAnalyteAPITest(APITestCaseWithAuth):
     def test_delete_analyte(self):
         url = "/api/metadata/analyte/delete/?ids=GREGoR_test-001-001-0-R-1"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_async_read_apis.py
+
+import json
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from metadata.models import Participant, Phenotype
+from search.services import rebuild_summary_counts
+
+
+class AsyncAPITestCaseWithAuth(TestCase):
+    fixtures = ['tests/fixtures/test_fixture.json']
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client = AsyncClient()
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        rebuild_summary_counts()
+
+
+class TablePageAPITest(AsyncAPITestCaseWithAuth):
+    async def read(self, response):
+        return json.loads(b"".join([chunk async for chunk in response.streaming_content]))
+
+    async def test_pages_cover_table(self):
+        participant_ids, after = [], None
+        while True:
+            params = {"limit": 4, **({"after": after} if after else {})}
+            response = await self.client.get("/api/search/async/tables/participant/", params, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            page = await self.read(response)
+            self.assertEqual(page["table"], "participant")
+            self.assertLessEqual(len(page["rows"]), 4)
+            participant_ids += [row["participant_id"] for row in page["rows"]]
+            after = page["next"]
+            if after is None:
+                break
+
+        expected = await sync_to_async(list)(
+            Participant.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(participant_ids, expected)
+
+    async def test_many_to_many_fields(self):
+        response = await self.client.get("/api/search/async/tables/participant/", headers=self.headers)
+        rows = (await self.read(response))["rows"]
+        self.assertTrue(all(isinstance(row["reported_race"], list) for row in rows))
+        self.assertTrue(any(row["reported_race"] for row in rows))
+
+    async def test_bad_requests(self):
+        response = await self.client.get("/api/search/async/tables/DNE/", headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.get("/api/search/async/tables/family/", {"limit": "x"}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_requires_authentication(self):
+        response = await AsyncClient().get("/api/search/async/tables/family/")
+        self.assertEqual(response.status_code, 401)
+
+
+class ParticipantAggregateAPITest(AsyncAPITestCaseWithAuth):
+    async def test_aggregate(self):
+        participant_id = "GREGoR_test-001-001-0"
+        response = await self.client.get(f"/api/search/async/participant/{participant_id}/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        aggregate = response.json()
+        self.assertEqual(aggregate["participant"]["participant_id"], participant_id)
+        self.assertEqual(aggregate["family"]["family_id"], aggregate["participant"]["family_id"])
+        phenotypes = await Phenotype.objects.filter(participant_id=participant_id).acount()
+        self.assertEqual(len(aggregate["phenotype"]), phenotypes)
+        self.assertGreater(phenotypes, 0)
+
+    async def test_not_found(self):
+        response = await self.client.get("/api/search/async/participant/DNE/", headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncSummaryCountsAPITest(AsyncAPITestCaseWithAuth):
+    async def test_matches_sync_summary(self):
+        response = await self.client.get("/api/search/async/summary/", {"table_name": "participant"}, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()
+        self.assertTrue(rows)
+        self.assertTrue(all(row["table_name"] == "participant" for row in rows))
@@ -4,8 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
+from metadata.models import Biobank
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 12
+UPDATE_QUERIES = 1, 17
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -99,6 +105,7 @@ class CreateBiobankAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(part1, 'biobank_id', 3), CREATE_QUERIES)
 
 class ReadBiobankAPITest(APITestCaseWithAuth):
     def test_read_biobank_entry(self):
@@ -115,6 +122,7 @@ class ReadBiobankAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "SUCCESS")
         self.assertEqual(response_207.data[2]["request_status"], "NOT FOUND")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget('/api/metadata/biobank/', ['GREGoR_test-001-001-0-R-1', 'GREGoR_test-002-001-2-R-1'])
 
 class UpdateBiobankAPITest(APITestCaseWithAuth):
     def test_update_biobank_entry(self):
@@ -182,6 +190,9 @@ class UpdateBiobankAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
 
+        rows = stored_copies(Biobank, part1, 'biobank_id', 3)
+        self.assertWriteBudget(url, [{**row, 'comments': 'Re-boxed'} for row in rows], UPDATE_QUERIES)
+
 class DeleteBiobankAPITest(APITestCaseWithAuth):
     def test_delete_biobank_entry(self):
         url = "/api/metadata/biobank/delete/?ids=GREGoR_test-002-001-2-R-1"
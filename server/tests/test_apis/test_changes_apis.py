@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_changes_apis.py
+
+import threading
+from unittest import skipIf
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from metadata.models import Family, Phenotype
+from search.models import ChangeLogEntry
+from search.selectors import get_changes, latest_change_sequence
+from search.services import record_change
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+class ChangesAPITest(APITestCaseWithAuth):
+    url = "/api/search/changes/"
+
+    def current_sequence(self):
+        response = self.client.get("/api/search/get_all_tables/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["sequence"]
+
+    def changes(self, since, **params):
+        response = self.client.get(self.url, {"since": since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_no_changes_since_full_load(self):
+        sequence = self.current_sequence()
+        self.assertGreater(sequence, 0)
+        data = self.changes(sequence)
+        self.assertEqual(data["sequence"], sequence)
+        self.assertFalse(data["more"])
+        self.assertEqual(data["upserted"], {})
+        self.assertEqual(data["deleted"], {})
+
+    def test_upserts_collapse_to_current_state(self):
+        sequence = self.current_sequence()
+        family = Family.objects.get(pk="GREGoR_test-001")
+        family.family_history_detail = "first edit"
+        family.save()
+        family.family_history_detail = "second edit"
+        family.save()
+        analyte = {
+            "analyte_id": "GREGoR_test-006-006-0-D-9",
+            "participant_id": "GREGoR_test-006-006-0",
+            "analyte_type": "DNA",
+            "primary_biosample": "UBERON:0000178",
+        }
+        response = self.client.post("/api/metadata/analyte/create/", [analyte], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = self.changes(sequence)
+        self.assertGreater(data["sequence"], sequence)
+        self.assertEqual(list(data["upserted"]), ["families", "analytes"])
+        self.assertEqual(len(data["upserted"]["families"]), 1)
+        self.assertEqual(
+            data["upserted"]["families"][0]["family_history_detail"], "second edit"
+        )
+        self.assertEqual(
+            data["upserted"]["analytes"][0]["analyte_id"], "GREGoR_test-006-006-0-D-9"
+        )
+        self.assertEqual(self.changes(data["sequence"])["upserted"], {})
+
+    def test_deletes_include_cascades(self):
+        sequence = self.current_sequence()
+        phenotype = Phenotype.objects.filter(participant_id="GREGoR_test-006-006-0").first()
+        phenotype.additional_details = "edited before delete"
+        phenotype.save()
+        self.client.delete("/api/metadata/participant/delete/?ids=GREGoR_test-006-006-0")
+
+        data = self.changes(sequence)
+        self.assertEqual(data["deleted"]["participants"], ["GREGoR_test-006-006-0"])
+        self.assertIn(str(phenotype.pk), data["deleted"]["phenotypes"])
+        self.assertIn("GREGoR_test-006-006-0-D-1", data["deleted"]["analytes"])
+        self.assertNotIn("phenotypes", data["upserted"])
+
+    def test_limit_pages_through_log(self):
+        sequence = self.current_sequence()
+        for family_id in ("GREGoR_test-001", "GREGoR_test-004", "GREGoR_test-006"):
+            family = Family.objects.get(pk=family_id)
+            family.save()
+
+        first = self.changes(sequence, limit=2)
+        self.assertTrue(first["more"])
+        self.assertEqual(len(first["upserted"]["families"]), 2)
+        second = self.changes(first["sequence"], limit=2)
+        self.assertFalse(second["more"])
+        self.assertEqual(len(second["upserted"]["families"]), 1)
+
+    def test_invalid_since(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"since": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CommitOrderAPITest(APITestCaseWithAuth):
+    url = "/api/search/changes/"
+
+    def test_entry_committed_out_of_sequence_order(self):
+        sequence = self.client.get("/api/search/get_all_tables/").data["sequence"]
+        # A transaction that inserted its entry first commits last: its
+        # entry has the lower sequence but only becomes visible at the end
+        slow = ChangeLogEntry.objects.create(
+            table_name="family", record_id="GREGoR_test-001", operation=ChangeLogEntry.UPSERT,
+        ).sequence
+        ChangeLogEntry.objects.filter(sequence=slow).delete()
+        Family.objects.get(pk="GREGoR_test-004").save()
+        self.assertGreater(ChangeLogEntry.objects.latest("sequence").sequence, slow)
+        first = self.client.get(self.url, {"since": sequence})
+        self.assertEqual(
+            [family["family_id"] for family in first.data["upserted"]["families"]], ["GREGoR_test-004"]
+        )
+        ChangeLogEntry.objects.create(
+            sequence=slow, table_name="family", record_id="GREGoR_test-001",
+            operation=ChangeLogEntry.UPSERT,
+        )
+
+        response = self.client.get(self.url, {"since": first.data["sequence"]}, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(
+            [family["family_id"] for family in response.data["upserted"]["families"]], ["GREGoR_test-001"]
+        )
+        self.assertGreater(response.data["sequence"], first.data["sequence"])
+
+
+@skipIf(connection.vendor == "sqlite", "SQLite allows one write transaction at a time")
+class InterleavedTransactionsTest(TransactionTestCase):
+    """Two write transactions that commit in the opposite order they logged."""
+
+    def test_late_commit_is_reported(self):
+        logged, release = threading.Event(), threading.Event()
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    record_change("family", ["F-SLOW"], ChangeLogEntry.DELETE)
+                    logged.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        since = latest_change_sequence()
+        thread = threading.Thread(target=slow_writer)
+        thread.start()
+        logged.wait(10)
+        record_change("family", ["F-FAST"], ChangeLogEntry.DELETE)
+        first = get_changes(since)
+        self.assertEqual(first["deleted"], {"families": ["F-FAST"]})
+
+        release.set()
+        thread.join()
+        second = get_changes(first["sequence"])
+        self.assertEqual(second["deleted"], {"families": ["F-SLOW"]})
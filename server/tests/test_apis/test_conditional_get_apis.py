@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_conditional_get_apis.py
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from metadata.models import Family
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+class ConditionalGetAPITest(APITestCaseWithAuth):
+    def test_list_not_modified(self):
+        url = "/api/metadata/family/?ids=GREGoR_test-001"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # Only the generation table is read to answer a revalidation
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_changes_etag(self):
+        url = "/api/metadata/family/?ids=GREGoR_test-001"
+        etag = self.client.get(url)["ETag"]
+        family = Family.objects.get(pk="GREGoR_test-001")
+        family.consanguinity_detail = "first cousins"
+        family.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_other_table_write_keeps_etag(self):
+        url = "/api/experiments/aligned_nanopore/?ids=x"
+        etag = self.client.get(url)["ETag"]
+        Family.objects.create(family_id="GREGoR_test-009")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_all_tables(self):
+        url = "/api/search/get_all_tables/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        self.client.post(
+            "/api/metadata/family/create/",
+            [{"family_id": "GREGoR_test-009", "consanguinity": "Unknown"}],
+            format="json",
+        )
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_200_OK,
+        )
@@ -4,9 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Experiment
+from experiments.models import Experiment, ExperimentDNAShortRead
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 23
+UPDATE_QUERIES = 1, 2
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -88,6 +93,7 @@ class CreateDNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "BAD REQUEST")
         self.assertEqual(response_207.data[1]["request_status"], "CREATED")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(experiment1, 'experiment_dna_short_read_id', 3), CREATE_QUERIES)
 
 
 class ReadDNAShortReadAPITest(APITestCaseWithAuth):
@@ -102,6 +108,10 @@ class ReadDNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget(
+            '/api/experiments/experiment_dna_short_read/',
+            ['UCI_GREGoR_test-001-001-0-D-1_DNA_1', 'UCI_GREGoR_test-002-001-2-D-1_DNA_1', 'UCI_GREGoR_test-003-001-1-D-1_DNA_1']
+        )
 
 
 class UpdateDNAShortReadAPITest(APITestCaseWithAuth):
@@ -148,6 +158,9 @@ class UpdateDNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(ExperimentDNAShortRead, experiment1, 'experiment_dna_short_read_id', 3)
+        self.assertWriteBudget(url, [{**row, 'date_data_generation': '2024-01-15'} for row in rows], UPDATE_QUERIES)
+
 
 class DeleteDNAShortReadAPITest(APITestCaseWithAuth):
     def test_delete_dna_short_read_api(self):
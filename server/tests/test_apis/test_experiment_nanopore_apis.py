@@ -4,9 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Experiment
+from experiments.models import Experiment, ExperimentNanopore
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 23
+UPDATE_QUERIES = 1, 2
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -91,6 +96,7 @@ class CreateNanoporeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(experiment1, 'experiment_nanopore_id', 3), CREATE_QUERIES)
 
 
 class ReadNanoporePITest(APITestCaseWithAuth):
@@ -105,6 +111,10 @@ class ReadNanoporePITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget(
+            '/api/experiments/experiment_nanopore/',
+            ['UCI_GREGoR_test-001-001-0-D-3_NANO_1', 'UCI_GREGoR_test-004-004-0-D-3_NANO_1', 'UCI_GREGoR_test-006-006-0-D-3_NANO_1']
+        )
 
 
 class UpdateNanoporeAPITest(APITestCaseWithAuth):
@@ -153,6 +163,9 @@ class UpdateNanoporeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(ExperimentNanopore, experiment1, 'experiment_nanopore_id', 3)
+        self.assertWriteBudget(url, [{**row, 'date_data_generation': '2024-01-15'} for row in rows], UPDATE_QUERIES)
+
 
 class DeleteNanoporeAPITest(APITestCaseWithAuth):
     def test_delete_nanopore_api(self):
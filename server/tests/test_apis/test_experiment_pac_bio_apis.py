@@ -4,9 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Experiment
+from experiments.models import Experiment, ExperimentPacBio
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 23
+UPDATE_QUERIES = 1, 2
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -130,6 +135,7 @@ class CreatePacBioAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(experiment1, 'experiment_pac_bio_id', 3), CREATE_QUERIES)
 
 
 class ReadPacBioPITest(APITestCaseWithAuth):
@@ -144,6 +150,10 @@ class ReadPacBioPITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget(
+            '/api/experiments/experiment_pac_bio/',
+            ['UCI_GREGoR_test-001-001-0-D-2_PB_1', 'UCI_GREGoR_test-002-001-2-D-2_PB_1', 'UCI_GREGoR_test-003-001-1-D-2_PB_1']
+        )
 
 
 class UpdatePacBioAPITest(APITestCaseWithAuth):
@@ -218,6 +228,9 @@ class UpdatePacBioAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(ExperimentPacBio, experiment1, 'experiment_pac_bio_id', 3)
+        self.assertWriteBudget(url, [{**row, 'date_data_generation': '2024-01-15'} for row in rows], UPDATE_QUERIES)
+
 
 class DeletePacBioAPITest(APITestCaseWithAuth):
     def test_delete_pac_bio_api(self):
@@ -4,9 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from experiments.models import Experiment
+from experiments.models import Experiment, ExperimentRNAShortRead
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 36
+UPDATE_QUERIES = 1, 24
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -136,6 +141,7 @@ class CreateRNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "BAD REQUEST")
         self.assertEqual(response_207.data[1]["request_status"], "CREATED")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(experiment2, 'experiment_rna_short_read_id', 3), CREATE_QUERIES)
 
 
 class ReadRNAShortReadAPITest(APITestCaseWithAuth):
@@ -150,6 +156,10 @@ class ReadRNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_200.status_code, status.HTTP_200_OK)
         self.assertEqual(response_207.status_code, status.HTTP_207_MULTI_STATUS)
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        rows = stored_copies(
+            ExperimentRNAShortRead, {'experiment_rna_short_read_id': 'UCI_GREGoR_test-001-001-0-R-1_RNA_1'}, 'experiment_rna_short_read_id', 2
+        )
+        self.assertReadBudget('/api/experiments/experiment_rna_short_read/', [row['experiment_rna_short_read_id'] for row in rows])
 
 
 class UpdateRNAShortReadAPITest(APITestCaseWithAuth):
@@ -228,6 +238,9 @@ class UpdateRNAShortReadAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.data[0]["request_status"], "BAD REQUEST")
 
+        rows = stored_copies(ExperimentRNAShortRead, experiment1, 'experiment_rna_short_read_id', 3)
+        self.assertWriteBudget(url, [{**row, 'seq_library_prep_kit_method': 'Illumina Stranded Total RNA'} for row in rows], UPDATE_QUERIES)
+
 
 class DeleteRNAShortReadAPITest(APITestCaseWithAuth):
     def test_delete_rna_short_read_api(self):
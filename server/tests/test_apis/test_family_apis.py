@@ -4,8 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
+from metadata.models import Family
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 12
+UPDATE_QUERIES = 1, 10
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -48,6 +54,7 @@ class CreateFamilyAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(part1, 'family_id', 3), CREATE_QUERIES)
 
 
 class ReadFamilyAPITest(APITestCaseWithAuth):
@@ -65,6 +72,7 @@ class ReadFamilyAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "SUCCESS")
         self.assertEqual(response_207.data[2]["request_status"], "NOT FOUND")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget('/api/metadata/family/', ['GREGoR_test-001', 'GREGoR_test-004'])
 
 class UpdateFamilyAPITest(APITestCaseWithAuth):
     def test_update_family_api(self):
@@ -95,6 +103,9 @@ class UpdateFamilyAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
 
+        rows = stored_copies(Family, part1, 'family_id', 3)
+        self.assertWriteBudget(url, [{**row, 'consanguinity_detail': 'Reported by the proband'} for row in rows], UPDATE_QUERIES)
+
 class DeleteFamilyAPITest(APITestCaseWithAuth):
     def test_delete_family_api(self):
         url = "/api/metadata/family/delete/?ids=GREGoR_test-001"
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_file_registry_apis.py
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from experiments.models import AlignedNanopore, AlignedPacBio
+from search.models import FileRegistryEntry
+from search.services import rebuild_file_registry
+
+NANOPORE = "UCI_GREGoR_test-001-001-0-D-3_NANO_1-Aligned_1"
+NANOPORE_BAM = "gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/nanopore/GREGoR_test-001-001-0-D-3.bam"
+NANOPORE_MD5 = "ddc246dee454c5b74837aba8ff44c61e"
+PAC_BIO = "UCI_GREGoR_test-001-001-0-D-2_PB_1-Aligned_1"
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+def owners(rows):
+    return sorted((row["table_name"], row["record_id"], row["field"]) for row in rows)
+
+
+class FileRegistryTest(APITestCaseWithAuth):
+    def entries(self):
+        return sorted(FileRegistryEntry.objects.values_list("path", "md5sum", "table_name", "record_id", "field"))
+
+    def test_rebuild(self):
+        entries = self.entries()
+        counts = rebuild_file_registry(batch_size=3)
+        self.assertEqual(sum(counts.values()), len(entries))
+        self.assertEqual(counts["aligned_nanopore"], 6)
+        self.assertEqual(self.entries(), entries)
+
+    def test_registry_follows_writes(self):
+        aligned = AlignedNanopore.objects.get(pk=NANOPORE)
+        aligned.aligned_nanopore_file = "gs://bucket/renamed.bam"
+        aligned.save()
+        self.assertFalse(FileRegistryEntry.objects.filter(path=NANOPORE_BAM, table_name="aligned_nanopore").exists())
+        entry = FileRegistryEntry.objects.get(path="gs://bucket/renamed.bam")
+        self.assertEqual((entry.md5sum, entry.field), (NANOPORE_MD5, "aligned_nanopore_file"))
+
+        aligned.delete()
+        self.assertFalse(FileRegistryEntry.objects.filter(table_name="aligned_nanopore", record_id=NANOPORE).exists())
+
+
+class FileLookupAPITest(APITestCaseWithAuth):
+    url = "/api/search/files/"
+
+    def test_path_and_md5(self):
+        response = self.client.get(self.url, {"path": NANOPORE_BAM})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            owners(response.data),
+            [
+                ("aligned", f"aligned_nanopore.{NANOPORE}", "aligned_file"),
+                ("aligned_nanopore", NANOPORE, "aligned_nanopore_file"),
+            ],
+        )
+        response = self.client.get(self.url, {"md5sum": NANOPORE_MD5.upper()})
+        self.assertEqual(owners(response.data), [("aligned_nanopore", NANOPORE, "aligned_nanopore_file")])
+
+    def test_requires_path_or_md5(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FileOwnersAPITest(APITestCaseWithAuth):
+    url = "/api/search/files/owners/"
+
+    def test_resolve(self):
+        response = self.client.post(self.url, {"paths": [NANOPORE_BAM, "gs://bucket/none.bam"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data["owners"]), [NANOPORE_BAM])
+        self.assertEqual(len(response.data["owners"][NANOPORE_BAM]), 2)
+        self.assertEqual(response.data["missing"], ["gs://bucket/none.bam"])
+
+    def test_many_paths_as_text(self):
+        paths = [f"gs://bucket/{index}.bam" for index in range(1200)] + [NANOPORE_BAM]
+        response = self.client.post(self.url, "\n".join(paths), content_type="text/plain")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data["owners"]), [NANOPORE_BAM])
+        self.assertEqual(len(response.data["missing"]), 1200)
+
+    def test_bad_request(self):
+        response = self.client.post(self.url, {"paths": NANOPORE_BAM}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FileDuplicatesAPITest(APITestCaseWithAuth):
+    url = "/api/search/files/duplicates/"
+
+    def test_duplicates(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+        aligned = AlignedPacBio.objects.get(pk=PAC_BIO)
+        aligned.aligned_pac_bio_index_file = NANOPORE_BAM
+        aligned.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["path"], NANOPORE_BAM)
+        self.assertEqual(
+            owners(response.data[0]["references"]),
+            [
+                ("aligned_nanopore", NANOPORE, "aligned_nanopore_file"),
+                ("aligned_pac_bio", PAC_BIO, "aligned_pac_bio_index_file"),
+            ],
+        )
+
+    def test_bad_request(self):
+        response = self.client.get(self.url, {"by": "table_name"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
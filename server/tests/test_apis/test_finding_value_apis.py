@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_finding_value_apis.py
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from metadata.models import GeneticFindings
+from search.models import FindingValueEntry
+from search.services import rebuild_finding_values
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+class FindingsByValueAPITest(APITestCaseWithAuth):
+    url = "/api/search/findings/"
+
+    def test_gene_lookup(self):
+        response = self.client.get(self.url, {"gene_of_interest": "cmpk2"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["genetic_findings_id"] for row in response.data],
+            ["2_6849938_GREGoR_test-001-001-0", "2_6865407_GREGoR_test-001-001-0"],
+        )
+
+    def test_combined_filters(self):
+        response = self.client.get(
+            self.url, {"gene_of_interest": "ZSWIM8,CHD1", "condition_inheritance": "De novo"}
+        )
+        self.assertEqual(
+            [row["genetic_findings_id"] for row in response.data],
+            ["10_73792184_GREGoR_test-001-001-0"],
+        )
+        response = self.client.get(self.url, {"gene_of_interest": "DNE"})
+        self.assertEqual(response.data, [])
+
+    def test_requires_filter(self):
+        response = self.client.get(self.url, {"gene": "CMPK2"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_follows_writes(self):
+        finding = GeneticFindings.objects.get(pk="10_73792184_GREGoR_test-001-001-0")
+        finding.gene_of_interest = ["ZSWIM8", "NEWGENE"]
+        finding.save()
+        response = self.client.get(self.url, {"gene_of_interest": "NEWGENE"})
+        self.assertEqual(len(response.data), 1)
+
+        finding.delete()
+        self.assertFalse(FindingValueEntry.objects.filter(record_id=finding.pk).exists())
+
+    def test_rebuild(self):
+        entries = sorted(FindingValueEntry.objects.values_list("record_id", "field", "value"))
+        self.assertEqual(rebuild_finding_values(batch_size=3), GeneticFindings.objects.count())
+        self.assertEqual(sorted(FindingValueEntry.objects.values_list("record_id", "field", "value")), entries)
+
+
+class FindingFacetsAPITest(APITestCaseWithAuth):
+    url = "/api/search/findings/facets/"
+
+    def test_gene_facets(self):
+        response = self.client.get(self.url, {"field": "gene_of_interest"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {"field": "gene_of_interest", "value": "CMPK2", "count": 2})
+        self.assertEqual(
+            sum(facet["count"] for facet in response.data),
+            sum(len(genes or []) for genes in GeneticFindings.objects.values_list("gene_of_interest", flat=True)),
+        )
+
+    def test_filtered_facets(self):
+        response = self.client.get(self.url, {"gene_of_interest": "CMPK2"})
+        facets = {(facet["field"], facet["value"]): facet["count"] for facet in response.data}
+        self.assertEqual(facets[("gene_of_interest", "CMPK2")], 2)
+        self.assertNotIn(("gene_of_interest", "ZSWIM8"), facets)
+        self.assertEqual(response.data[0]["field"], "gene_of_interest")
+
+    def test_invalid_field(self):
+        response = self.client.get(self.url, {"field": "chrom"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -4,8 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
+from metadata.models import GeneticFindings
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 19
+UPDATE_QUERIES = 1, 15
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -144,6 +150,7 @@ class CreateGeneticFindingsAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(part1, 'genetic_findings_id', 3), CREATE_QUERIES)
 
 class ReadGeneticFindingsAPITest(APITestCaseWithAuth):
     def test_read_analyte_success(self):
@@ -160,6 +167,7 @@ class ReadGeneticFindingsAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "SUCCESS")
         self.assertEqual(response_207.data[2]["request_status"], "NOT FOUND")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget('/api/metadata/genetic_findings/', ['10_73792184_GREGoR_test-001-001-0', '11_64660831_GREGoR_test-004-004-0'])
 
 class UpdateGeneticFindingsAPITest(APITestCaseWithAuth):
     def test_update_analyte_api(self):
@@ -253,6 +261,9 @@ class UpdateGeneticFindingsAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
 
+        rows = stored_copies(GeneticFindings, part1, 'genetic_findings_id', 3)
+        self.assertWriteBudget(url, [{**row, 'notes': 'Confirmed by Sanger sequencing'} for row in rows], UPDATE_QUERIES)
+
 class DeleteGeneticFindingsAPITest(APITestCaseWithAuth):
     def test_delete_analyte(self):
         url = "/api/metadata/genetic_findings/delete/?ids=2_6849938_GREGoR_test-001-001-0"
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_lineage_apis.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from experiments.models import AlignedDNAShortRead, ExperimentDNAShortRead
+from metadata.models import Analyte, Biobank
+from search.models import LineageEntry
+from search.selectors import get_sample_lineage
+from search.services import lineage_closure, rebuild_lineage
+
+BIOBANK = "GREGoR_test-001-001-0-D-1"
+ANALYTE = "GREGoR_test-001-001-0-D-1"
+EXPERIMENT = "UCI_GREGoR_test-001-001-0-D-1_DNA_1"
+ALIGNED = "UCI_GREGoR_test-001-001-0-D-1_DNA_1-Aligned_1"
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+def nodes(rows):
+    return [(row["type"], row["id"], row["depth"]) for row in rows]
+
+
+class LineageClosureTest(APITestCaseWithAuth):
+    def closure(self):
+        return sorted(
+            LineageEntry.objects.values_list(
+                "ancestor_type", "ancestor_id", "descendant_type", "descendant_id", "depth"
+            )
+        )
+
+    def test_closure_helper(self):
+        edges = [(("a", "1"), ("b", "1")), (("b", "1"), ("c", "1")), (("a", "2"), ("b", "1"))]
+        self.assertEqual(
+            sorted(lineage_closure(edges)),
+            [
+                ("a", "1", "b", "1", 1),
+                ("a", "1", "c", "1", 2),
+                ("a", "2", "b", "1", 1),
+                ("a", "2", "c", "1", 2),
+                ("b", "1", "c", "1", 1),
+            ],
+        )
+
+    def test_rebuild_matches_incremental(self):
+        closure = self.closure()
+        self.assertIn(("biobank", BIOBANK, "aligned_dna_short_read", ALIGNED, 3), closure)
+        self.assertEqual(rebuild_lineage(batch_size=7), len(closure))
+        self.assertEqual(self.closure(), closure)
+
+    def test_closure_follows_writes(self):
+        analyte = Analyte.objects.get(pk="GREGoR_test-002-001-2-D-1")
+        experiment = ExperimentDNAShortRead.objects.get(pk=EXPERIMENT)
+        experiment.analyte_id = analyte
+        experiment.save()
+        ancestors = nodes(get_sample_lineage("aligned_dna_short_read", ALIGNED, "ancestors"))
+        self.assertIn(("biobank", "GREGoR_test-002-001-2-D-1", 3), ancestors)
+        self.assertNotIn(("biobank", BIOBANK, 3), ancestors)
+
+        biobank = Biobank.objects.get(pk=BIOBANK)
+        biobank.child_analytes.add(analyte)
+        self.assertIn(("aligned_dna_short_read", ALIGNED, 3), nodes(get_sample_lineage("biobank", BIOBANK, "descendants")))
+        analyte.analytes.remove(biobank)
+        self.assertEqual(nodes(get_sample_lineage("biobank", BIOBANK, "descendants")), [("analyte", ANALYTE, 1)])
+
+        AlignedDNAShortRead.objects.get(pk=ALIGNED).delete()
+        self.assertFalse(LineageEntry.objects.filter(descendant_id=ALIGNED).exists())
+        self.assertEqual(rebuild_lineage(), len(self.closure()))
+
+
+class SampleLineageAPITest(APITestCaseWithAuth):
+    def test_ancestors(self):
+        response = self.client.get(f"/api/search/lineage/aligned_dna_short_read/{ALIGNED}/ancestors/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            nodes(response.data),
+            [("experiment_dna_short_read", EXPERIMENT, 1), ("analyte", ANALYTE, 2), ("biobank", BIOBANK, 3)],
+        )
+
+    def test_descendants_and_type_filter(self):
+        url = "/api/search/lineage/biobank/GREGoR_test-001-001-0-X-1/descendants/"
+        response = self.client.get(url)
+        self.assertEqual(
+            nodes(response.data),
+            [("analyte", "GREGoR_test-001-001-0-OG-1", 1), ("analyte", "GREGoR_test-001-001-0-X-1", 1)],
+        )
+        response = self.client.get(f"/api/search/lineage/biobank/{BIOBANK}/descendants/", {"type": "aligned_dna_short_read"})
+        self.assertEqual(nodes(response.data), [("aligned_dna_short_read", ALIGNED, 3)])
+
+    def test_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            get_sample_lineage("biobank", BIOBANK, "descendants")
+            get_sample_lineage("aligned_dna_short_read", ALIGNED, "ancestors")
+        self.assertEqual(len(queries), 2)
+
+    def test_bad_requests(self):
+        response = self.client.get(f"/api/search/lineage/participant/{ALIGNED}/ancestors/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f"/api/search/lineage/biobank/{BIOBANK}/descendants/", {"type": "bam"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/api/search/lineage/biobank/DNE/descendants/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
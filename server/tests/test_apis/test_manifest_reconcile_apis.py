@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_manifest_reconcile_apis.py
+
+import base64
+import tempfile
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from search.selectors import parse_manifest
+
+BUCKET = "gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/"
+NANOPORE_BAM = BUCKET + "bam/nanopore/GREGoR_test-001-001-0-D-3.bam"
+NANOPORE_MD5 = "ddc246dee454c5b74837aba8ff44c61e"
+PAC_BIO_BAM = BUCKET + "bam/pacbio/GREGoR_test-001-001-0-D-2.bam"
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+def gsutil_block(path, size, md5sum):
+    md5_base64 = base64.b64encode(bytes.fromhex(md5sum)).decode()
+    return (
+        f"{path}:\n"
+        f"    Creation time:          Tue, 02 Apr 2024 17:01:55 GMT\n"
+        f"    Content-Length:         {size}\n"
+        f"    Hash (crc32c):          jXWqXA==\n"
+        f"    Hash (md5):             {md5_base64}\n"
+    )
+
+
+class ParseManifestTest(APITestCaseWithAuth):
+    def test_gsutil_listing(self):
+        listing = gsutil_block(NANOPORE_BAM, 10, NANOPORE_MD5) + gsutil_block(PAC_BIO_BAM, 20, "0" * 32)
+        listing += "TOTAL: 2 objects, 30 bytes (30 B)\n"
+        self.assertEqual(
+            list(parse_manifest(listing.splitlines())),
+            [(NANOPORE_BAM, 10, NANOPORE_MD5), (PAC_BIO_BAM, 20, "0" * 32)],
+        )
+
+    def test_flat_listing(self):
+        lines = ["path,size,md5", f"{NANOPORE_BAM},10,{NANOPORE_MD5.upper()}", f"{PAC_BIO_BAM}\t20", b"gs://b/c.txt"]
+        self.assertEqual(
+            list(parse_manifest(lines)),
+            [(NANOPORE_BAM, 10, NANOPORE_MD5), (PAC_BIO_BAM, 20, ""), ("gs://b/c.txt", None, "")],
+        )
+
+    def test_invalid_line(self):
+        with self.assertRaises(ValueError):
+            list(parse_manifest([f"{NANOPORE_BAM} 10 not-a-checksum"]))
+
+
+class ManifestReconcileAPITest(APITestCaseWithAuth):
+    url = "/api/search/files/reconcile/"
+
+    def test_reconcile(self):
+        manifest = (
+            gsutil_block(NANOPORE_BAM, 10, NANOPORE_MD5)
+            + gsutil_block(PAC_BIO_BAM, 20, "0" * 32)
+            + gsutil_block(BUCKET + "stray.bam", 30, "1" * 32)
+        )
+        response = self.client.post(
+            f"{self.url}?table=aligned_nanopore&table=aligned_pac_bio&prefix={BUCKET}",
+            manifest,
+            content_type="text/plain",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["listed"], response.data["referenced"]), (3, 12))
+        self.assertEqual(response.data["orphaned"], [BUCKET + "stray.bam"])
+        self.assertEqual(len(response.data["missing"]), 10)
+        self.assertNotIn(NANOPORE_BAM, [entry["path"] for entry in response.data["missing"]])
+        self.assertEqual(
+            [(entry["path"], entry["manifest_md5sum"]) for entry in response.data["mismatched"]],
+            [(PAC_BIO_BAM, "0" * 32)],
+        )
+
+    def test_file_upload(self):
+        upload = SimpleUploadedFile("manifest.tsv", f"{NANOPORE_BAM}\t10\t{NANOPORE_MD5}\n".encode())
+        response = self.client.post(f"{self.url}?table=aligned_nanopore", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["orphaned"], response.data["mismatched"]), ([], []))
+        self.assertEqual(len(response.data["missing"]), 5)
+
+    def test_bad_requests(self):
+        response = self.client.post(f"{self.url}?table=participant", "", content_type="text/plain")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, f"{NANOPORE_BAM} ten", content_type="text/plain")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".tsv") as manifest:
+            manifest.write(f"{NANOPORE_BAM}\t10\t{'2' * 32}\n")
+            manifest.flush()
+            out = StringIO()
+            call_command("reconcile_manifest", manifest.name, "--table", "aligned_nanopore", stdout=out)
+        self.assertIn("mismatched: 1 files", out.getvalue())
+        self.assertIn(f"mismatched\t{NANOPORE_BAM}\t{NANOPORE_MD5}\t{'2' * 32}", out.getvalue())
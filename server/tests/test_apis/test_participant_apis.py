@@ -4,8 +4,14 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
+from metadata.models import Participant
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
-class APITestCaseWithAuth(APITestCase):
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 15
+UPDATE_QUERIES = 1, 22
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ['tests/fixtures/test_fixture.json']
 
     def setUp(self):
@@ -80,6 +86,7 @@ class CreateParticipantAPITest(APITestCaseWithAuth):
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
+        self.assertWriteBudget(url, numbered(part3, 'participant_id', 3), CREATE_QUERIES)
 
 class ReadParticipantAPITest(APITestCaseWithAuth):
     def test_read_participant(self):
@@ -96,6 +103,7 @@ class ReadParticipantAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "SUCCESS")
         self.assertEqual(response_207.data[2]["request_status"], "NOT FOUND")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget('/api/metadata/participant/', ['GREGoR_test-001-001-0', 'GREGoR_test-002-001-2'])
 
 class UpdateParticipantAPITest(APITestCaseWithAuth):
     def test_update_participant(self):
@@ -143,6 +151,9 @@ class UpdateParticipantAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
 
+        rows = stored_copies(Participant, part1, 'participant_id', 3)
+        self.assertWriteBudget(url, [{**row, 'age_at_last_observation': 21} for row in rows], UPDATE_QUERIES)
+
 class DeleteParticipantAPITest(APITestCaseWithAuth):
     def test_delete_participant(self):
         url = "/api/metadata/participant/delete/?ids=GREGoR_test-001-001-0"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_pedigree_apis.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from metadata.models import Participant, TwinId
+from search.models import PedigreeEdge
+from search.selectors import get_relatives
+from search.services import rebuild_pedigree_edges
+
+PROBAND = "GREGoR_test-001-001-0"
+FATHER = "GREGoR_test-003-001-1"
+MOTHER = "GREGoR_test-002-001-2"
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+class PedigreeEdgeTest(APITestCaseWithAuth):
+    def edges(self):
+        return sorted(PedigreeEdge.objects.values_list("source", "target", "relation"))
+
+    def test_edges_from_fixture(self):
+        self.assertIn((FATHER, PROBAND, "father"), self.edges())
+        self.assertIn((MOTHER, PROBAND, "mother"), self.edges())
+        self.assertFalse(PedigreeEdge.objects.filter(source="0").exists())
+
+    def test_edges_follow_writes(self):
+        participant = Participant.objects.get(pk=FATHER)
+        participant.paternal_id = "GRANDFATHER"
+        participant.save()
+        self.assertIn(("GRANDFATHER", FATHER, "father"), self.edges())
+
+        participant.twin_id.add(TwinId.objects.create(twin_id="TWIN-1"))
+        self.assertIn((FATHER, "TWIN-1", "twin"), self.edges())
+        participant.twin_id.clear()
+        self.assertNotIn((FATHER, "TWIN-1", "twin"), self.edges())
+
+        participant.delete()
+        self.assertNotIn(("GRANDFATHER", FATHER, "father"), self.edges())
+        self.assertIn((FATHER, PROBAND, "father"), self.edges())
+
+    def test_rebuild(self):
+        edges = self.edges()
+        self.assertEqual(rebuild_pedigree_edges(batch_size=2), len(edges))
+        self.assertEqual(self.edges(), edges)
+
+
+class PedigreeRelativesAPITest(APITestCaseWithAuth):
+    def test_trio(self):
+        response = self.client.get(f"/api/search/pedigree/participant/{PROBAND}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["father"]["participant_id"], FATHER)
+        self.assertEqual(response.data["mother"]["sex"], "Female")
+        self.assertTrue(response.data["trio"])
+        self.assertFalse(response.data["quad"])
+
+    def test_siblings_and_query_count(self):
+        sibling = Participant.objects.get(pk="GREGoR_test-006-006-0")
+        sibling.paternal_id, sibling.maternal_id = FATHER, MOTHER
+        sibling.save()
+        with CaptureQueriesContext(connection) as queries:
+            relatives = get_relatives(PROBAND)
+        self.assertEqual(len(queries), 4)
+        self.assertEqual([node["participant_id"] for node in relatives["full_siblings"]], [sibling.pk])
+        self.assertTrue(relatives["quad"])
+
+    def test_duo_and_not_found(self):
+        response = self.client.get("/api/search/pedigree/participant/GREGoR_test-004-004-0/")
+        self.assertIsNone(response.data["father"])
+        self.assertFalse(response.data["trio"])
+        response = self.client.get("/api/search/pedigree/participant/DNE/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PedigreeTriosAPITest(APITestCaseWithAuth):
+    def test_trios(self):
+        response = self.client.get("/api/search/pedigree/trios/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{"family_id": "GREGoR_test-001", "child": PROBAND, "father": FATHER, "mother": MOTHER, "full_siblings": []}],
+        )
+        response = self.client.get("/api/search/pedigree/trios/", {"family_id": "GREGoR_test-004"})
+        self.assertEqual(response.data, [])
+
+
+class PedigreeLineageAPITest(APITestCaseWithAuth):
+    def setUp(self):
+        super().setUp()
+        participant = Participant.objects.get(pk=FATHER)
+        participant.maternal_id = "GRANDMOTHER"
+        participant.save()
+
+    def test_ancestors(self):
+        response = self.client.get(f"/api/search/pedigree/participant/{PROBAND}/ancestors/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["participant_id"], row["relation"], row["of"], row["depth"], row["in_study"]) for row in response.data],
+            [
+                (MOTHER, "mother", PROBAND, 1, True),
+                (FATHER, "father", PROBAND, 1, True),
+                ("GRANDMOTHER", "mother", FATHER, 2, False),
+            ],
+        )
+        response = self.client.get(f"/api/search/pedigree/participant/{PROBAND}/ancestors/", {"max_depth": 1})
+        self.assertEqual(len(response.data), 2)
+
+    def test_descendants(self):
+        response = self.client.get(f"/api/search/pedigree/participant/{MOTHER}/descendants/")
+        self.assertEqual([row["participant_id"] for row in response.data], [PROBAND])
+
+    def test_bad_requests(self):
+        response = self.client.get(f"/api/search/pedigree/participant/{PROBAND}/ancestors/", {"max_depth": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/api/search/pedigree/participant/DNE/descendants/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FamilyPedigreeAPITest(APITestCaseWithAuth):
+    def test_family_graph(self):
+        response = self.client.get("/api/search/pedigree/family/GREGoR_test-001/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [node["participant_id"] for node in response.data["nodes"]],
+            [PROBAND, MOTHER, FATHER],
+        )
+        self.assertEqual(
+            response.data["edges"],
+            [
+                {"source": MOTHER, "target": PROBAND, "relation": "mother"},
+                {"source": FATHER, "target": PROBAND, "relation": "father"},
+            ],
+        )
+
+    def test_not_found(self):
+        response = self.client.get("/api/search/pedigree/family/DNE/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -4,9 +4,15 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
+from metadata.models import Phenotype
+from tests.test_apis.query_budgets import QueryBudgetMixin, numbered, stored_copies
 
+# Queries per request, and per row written
+CREATE_QUERIES = 1, 10
+UPDATE_QUERIES = 1, 10
 
-class APITestCaseWithAuth(APITestCase):
+
+class APITestCaseWithAuth(QueryBudgetMixin, APITestCase):
     fixtures = ["tests/fixtures/test_fixture.json"]
 
     def setUp(self):
@@ -61,6 +67,7 @@ class CreatePhenotypeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[0]["request_status"], "CREATED")
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertWriteBudget(url, numbered(part1, 'phenotype_id', 3), CREATE_QUERIES)
 
 
 class ReadPhenotypeAPITest(APITestCaseWithAuth):
@@ -78,6 +85,7 @@ class ReadPhenotypeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "SUCCESS")
         self.assertEqual(response_207.data[2]["request_status"], "NOT FOUND")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertReadBudget('/api/metadata/phenotype/', ['1.2', '1.3'])
 
 
 class UpdatePhenotypeAPITest(APITestCaseWithAuth):
@@ -115,6 +123,9 @@ class UpdatePhenotypeAPITest(APITestCaseWithAuth):
         self.assertEqual(response_207.data[1]["request_status"], "BAD REQUEST")
         self.assertEqual(response_400.status_code, status.HTTP_400_BAD_REQUEST)
 
+        rows = stored_copies(Phenotype, part1, 'phenotype_id', 3)
+        self.assertWriteBudget(url, [{**row, 'additional_details': 'fine motor delay'} for row in rows], UPDATE_QUERIES)
+
 
 class DeletePhenotypeAPITest(APITestCaseWithAuth):
     def test_delete_phenotype(self):
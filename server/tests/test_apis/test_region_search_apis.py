@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_region_search_apis.py
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from metadata.models import GeneticFindings
+from search.models import RegionIndexEntry
+from search.services import overlapping_bin_ranges, rebuild_region_index, region_bin
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+def finding_ids(result):
+    return [row["genetic_findings_id"] for row in result["genetic_findings"]]
+
+
+class RegionBinTest(APITestCaseWithAuth):
+    def test_bins(self):
+        self.assertEqual(region_bin(0, 1), 585)
+        self.assertEqual(region_bin(0, 1 << 17), 585)
+        self.assertEqual(region_bin(0, (1 << 17) + 1), 73)
+        self.assertEqual(region_bin(0, 1 << 29), 0)
+        with self.assertRaises(ValueError):
+            region_bin(0, (1 << 29) + 1)
+
+    def test_overlapping_bins_contain_interval_bin(self):
+        for start, end in [(0, 1), (6849937, 6849938), (1000000, 9000000), (130000, 140000)]:
+            interval_bin = region_bin(start, end)
+            self.assertTrue(any(first <= interval_bin <= last for first, last in overlapping_bin_ranges(start, end)))
+
+    def test_rebuild(self):
+        self.assertEqual(rebuild_region_index(batch_size=2), GeneticFindings.objects.count())
+        self.assertEqual(RegionIndexEntry.objects.count(), GeneticFindings.objects.count())
+
+
+class RegionSearchAPITest(APITestCaseWithAuth):
+    url = "/api/search/region/"
+
+    def test_overlap(self):
+        response = self.client.get(self.url, {"region": "chr2:6,800,000-6,900,000"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["region"], "2:6800000-6900000")
+        self.assertEqual(
+            finding_ids(response.data[0]),
+            ["2_6849938_GREGoR_test-001-001-0", "2_6865407_GREGoR_test-001-001-0"],
+        )
+
+    def test_region_bounds(self):
+        response = self.client.get(self.url, {"region": ["2:6849938", "2:6849939-6865406", "X"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(finding_ids(response.data[0]), ["2_6849938_GREGoR_test-001-001-0"])
+        self.assertEqual(finding_ids(response.data[1]), [])
+        self.assertEqual(finding_ids(response.data[2]), [])
+
+    def test_bed_upload(self):
+        bed = "track name=regions\n2\t6849937\t6849938\tfirst\n10\t73792183\t73792184\n"
+        response = self.client.post(self.url, bed, content_type="text/plain")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["name"], "first")
+        self.assertEqual(finding_ids(response.data[0]), ["2_6849938_GREGoR_test-001-001-0"])
+        self.assertEqual(finding_ids(response.data[1]), ["10_73792184_GREGoR_test-001-001-0"])
+
+        upload = SimpleUploadedFile("regions.bed", bed.encode())
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_json_regions(self):
+        response = self.client.post(self.url, {"regions": ["chr11:64660831", "5:1-100"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(finding_ids(response.data[0]), ["11_64660831_GREGoR_test-004-004-0"])
+        self.assertEqual(finding_ids(response.data[1]), [])
+
+    def test_bad_requests(self):
+        for region in ["", "2:abc", "2:100-50", ":5"]:
+            response = self.client.get(self.url, {"region": region})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, region)
+        response = self.client.post(self.url, "2\tx\t5\n", content_type="text/plain")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {"regions": "2:1-5"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_follows_writes(self):
+        finding = GeneticFindings.objects.get(pk="2_6849938_GREGoR_test-001-001-0")
+        finding.pos_end = 6870000
+        finding.save()
+        response = self.client.get(self.url, {"region": "2:6869000-6869500"})
+        self.assertEqual(finding_ids(response.data[0]), ["2_6849938_GREGoR_test-001-001-0"])
+
+        self.client.delete("/api/metadata/genetic_findings/delete/?ids=2_6849938_GREGoR_test-001-001-0")
+        self.assertFalse(RegionIndexEntry.objects.filter(record_id="2_6849938_GREGoR_test-001-001-0").exists())
+        response = self.client.get(self.url, {"region": "2:6869000-6869500"})
+        self.assertEqual(finding_ids(response.data[0]), [])
+
+
+class NearestFindingsAPITest(APITestCaseWithAuth):
+    url = "/api/search/region/nearest/"
+
+    def test_nearest(self):
+        response = self.client.get(self.url, {"position": "chr2:6860000", "count": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(hit["distance"], hit["genetic_findings"]["genetic_findings_id"]) for hit in response.data],
+            [(5407, "2_6865407_GREGoR_test-001-001-0"), (10062, "2_6849938_GREGoR_test-001-001-0")],
+        )
+
+    def test_overlapping_position(self):
+        response = self.client.get(self.url, {"position": "2:6849938", "count": 1})
+        self.assertEqual(response.data[0]["distance"], 0)
+
+    def test_bad_requests(self):
+        for params in [{}, {"position": "2:1-10"}, {"position": "2:10", "count": "x"}, {"position": "2:10", "count": 0}]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
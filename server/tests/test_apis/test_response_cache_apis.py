@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_response_cache_apis.py
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from metadata.models import Family
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        caches["responses"].clear()
+
+
+class ResponseCacheAPITest(APITestCaseWithAuth):
+    url = "/api/metadata/family/?ids=GREGoR_test-001"
+
+    def test_hit_serves_cached_data(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        # Only the generation table is read for a cache hit
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.status_code, response.status_code)
+        self.assertEqual(cached.json(), response.json())
+
+    def test_write_invalidates(self):
+        self.client.get(self.url)
+        family = Family.objects.get(pk="GREGoR_test-001")
+        family.consanguinity_detail = "first cousins"
+        family.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.data[0]["data"]["consanguinity_detail"], "first cousins"
+        )
+
+    def test_params_are_part_of_key(self):
+        self.client.get(self.url)
+        response = self.client.get("/api/metadata/family/?ids=GREGoR_test-004")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data[0]["identifier"], "GREGoR_test-004")
+
+    def test_stats(self):
+        before = self.client.get("/api/search/cache_stats/").data
+        self.client.get(self.url)
+        self.client.get(self.url)
+        after = self.client.get("/api/search/cache_stats/").data
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "responses": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "responses-lru-test",
+                "OPTIONS": {"MAX_ENTRIES": 2, "CULL_FREQUENCY": 2},
+            },
+        }
+    )
+    def test_least_recently_used_is_evicted(self):
+        urls = [f"/api/metadata/family/?ids={family_id}" for family_id in (
+            "GREGoR_test-001", "GREGoR_test-004", "GREGoR_test-006"
+        )]
+        self.client.get(urls[0])
+        self.client.get(urls[1])
+        self.assertEqual(self.client.get(urls[0])["X-Cache"], "HIT")
+        self.client.get(urls[2])
+        self.assertEqual(self.client.get(urls[0])["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(urls[1])["X-Cache"], "MISS")
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled(self):
+        self.client.get(self.url)
+        self.assertFalse(self.client.get(self.url).has_header("X-Cache"))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_stateless_auth_apis.py
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from authentication.services import ClaimsUser
+
+User = get_user_model()
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    url = "/api/auth/users/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123",
+            is_staff=True
+        )
+
+    def setUp(self):
+        caches["users"].clear()
+        response = self.client.post(
+            "/api/auth/token/login/",
+            {"username": "testuser", "password": "testpass123"},
+        )
+        self.access = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The users list itself reads auth_user once
+        return [
+            query for query in queries.captured_queries
+            if '"auth_user"."id" =' in query["sql"]
+        ]
+
+    def test_user_loaded_once(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+    def test_deactivated_user_rejected(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get("/api/metadata/family/?ids=GREGoR_test-001")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claims_fall_back_to_user(self):
+        # Tokens issued without the custom claims still resolve is_staff
+        access = RefreshToken.for_user(self.user).access_token
+        principal = ClaimsUser(access)
+        self.assertNotIn("is_staff", access)
+        self.assertTrue(principal.is_staff)
+        self.assertEqual(principal.username, "testuser")
+
+    def test_demoted_user_loses_flags(self):
+        # is_staff and is_superuser come from the User, not the token claims
+        access = AccessToken(self.access)
+        self.assertTrue(access["is_staff"])
+        self.assertTrue(ClaimsUser(access).is_staff)
+        self.user.is_staff = False
+        self.user.save()
+        self.assertTrue(access["is_staff"])
+        self.assertFalse(ClaimsUser(access).is_staff)
+        self.assertFalse(ClaimsUser(access).is_superuser)
+
+    def test_metadata_endpoint_authenticates(self):
+        response = self.client.get("/api/metadata/family/?ids=GREGoR_test-001")
+        self.assertNotEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(STATELESS_JWT_AUTH=False)
+    def test_database_mode(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(len(self.user_queries()), 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_summary_apis.py
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from metadata.models import Analyte, Participant
+from search.services import rebuild_summary_counts, summary_batch
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        rebuild_summary_counts()
+
+
+class SummaryCountsAPITest(APITestCaseWithAuth):
+    url = "/api/search/summary/"
+
+    def counts(self, **filters):
+        response = self.client.get(self.url, filters)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {
+            (row["table_name"], row["affected_status"]): row["count"]
+            for row in response.data
+        }
+
+    def test_rebuilt_counts(self):
+        counts = self.counts(gregor_center="UCI")
+        self.assertEqual(counts[("participant", "Affected")], 4)
+        self.assertEqual(counts[("participant", "Unaffected")], 2)
+        self.assertEqual(counts[("analyte", "Unaffected")], 14)
+        self.assertEqual(counts[("experiment_dna_short_read", "Affected")], 4)
+        self.assertEqual(counts[("aligned_nanopore", "Affected")], 2)
+
+    def test_create_and_delete(self):
+        analyte = {
+            "analyte_id": "GREGoR_test-006-006-0-D-9",
+            "participant_id": "GREGoR_test-006-006-0",
+            "analyte_type": "DNA",
+            "primary_biosample": "UBERON:0000178",
+        }
+        response = self.client.post("/api/metadata/analyte/create/", [analyte], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts()[("analyte", "Unaffected")], 15)
+
+        self.client.delete("/api/metadata/participant/delete/?ids=GREGoR_test-006-006-0")
+        counts = self.counts()
+        self.assertEqual(counts[("participant", "Unaffected")], 1)
+        self.assertEqual(counts[("analyte", "Unaffected")], 4)
+        self.assertNotIn(("experiment_nanopore", "Unaffected"), counts)
+
+    def test_group_change_moves_dependents(self):
+        participant = Participant.objects.get(pk="GREGoR_test-001-001-0")
+        participant.affected_status = "Unaffected"
+        participant.save()
+        counts = self.counts()
+        self.assertEqual(counts[("participant", "Affected")], 3)
+        self.assertEqual(counts[("analyte", "Unaffected")], 21)
+        self.assertEqual(counts[("experiment_rna_short_read", "Unaffected")], 1)
+        self.assertNotIn(("experiment_rna_short_read", "Affected"), counts)
+
+    def test_unchanged_group_is_not_looked_up(self):
+        analyte = Analyte.objects.get(pk="GREGoR_test-006-006-0-D-1")
+        analyte.analyte_type = "RNA"
+        with CaptureQueriesContext(connection) as queries:
+            analyte.save()
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertFalse([statement for statement in sql if statement.startswith("SELECT")], sql)
+        self.assertFalse([statement for statement in sql if "search_summarycount" in statement], sql)
+
+    def test_moved_analyte(self):
+        before = self.counts()
+        analyte = Analyte.objects.get(pk="GREGoR_test-006-006-0-D-1")
+        analyte.participant_id_id = "GREGoR_test-001-001-0"
+        analyte.save()
+        after = self.counts()
+        self.assertEqual(after[("analyte", "Unaffected")], before[("analyte", "Unaffected")] - 1)
+        self.assertEqual(after[("analyte", "Affected")], before[("analyte", "Affected")] + 1)
+
+    def test_summary_batch(self):
+        with summary_batch():
+            Analyte.objects.get(pk="GREGoR_test-006-006-0-D-1").delete()
+            self.assertEqual(self.counts()[("analyte", "Unaffected")], 14)
+        self.assertEqual(self.counts()[("analyte", "Unaffected")], 13)
+
+    def test_summary_batch_rolled_back_savepoint(self):
+        with summary_batch():
+            with self.assertRaises(IntegrityError):
+                with transaction.atomic():
+                    Analyte.objects.get(pk="GREGoR_test-006-006-0-D-1").delete()
+                    raise IntegrityError("rolled back")
+            Analyte.objects.get(pk="GREGoR_test-006-006-0-D-2").delete()
+        self.assertEqual(self.counts()[("analyte", "Unaffected")], 13)
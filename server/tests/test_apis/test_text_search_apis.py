@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_text_search_apis.py
+
+from io import StringIO
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+
+
+class APITestCaseWithAuth(APITestCase):
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+class TextSearchAPITest(APITestCaseWithAuth):
+    url = "/api/search/text/"
+
+    def test_search_hpo_term(self):
+        response = self.client.get(self.url, {"q": "HP:0002194"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        hits = {(hit["table"], hit["pk"]) for hit in response.data}
+        self.assertIn(("phenotype", "1.2"), hits)
+
+    def test_search_gene_symbol(self):
+        response = self.client.get(self.url, {"q": "ZSWIM8", "table": "genetic_findings"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["pk"], "10_73792184_GREGoR_test-001-001-0")
+        self.assertIn("[ZSWIM8]", response.data[0]["snippet"])
+
+    def test_search_family_history(self):
+        response = self.client.get(self.url, {"q": "eczema"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["table"], "family")
+        self.assertEqual(response.data[0]["pk"], "GREGoR_test-001")
+
+    def test_index_follows_writes(self):
+        create_url = "/api/metadata/phenotype/create/"
+        phenotype = {
+            "phenotype_id": "1.10",
+            "participant_id": "GREGoR_test-001-001-0",
+            "term_id": "HP:0001250",
+            "presence": "Present",
+            "ontology": "HPO",
+            "additional_details": "nocturnal seizures",
+            "onset_age_range": "HP:0011463",
+            "additional_modifiers": [],
+            "syndromic": "non-syndromic",
+        }
+        self.client.post(create_url, [phenotype], format="json")
+        response = self.client.get(self.url, {"q": "nocturnal"})
+        self.assertEqual([hit["pk"] for hit in response.data], ["1.10"])
+
+        self.client.delete("/api/metadata/phenotype/delete/?ids=1.10")
+        response = self.client.get(self.url, {"q": "nocturnal"})
+        self.assertEqual(response.data, [])
+
+    def test_rebuild_command(self):
+        call_command("rebuild_text_index", stdout=StringIO())
+        response = self.client.get(self.url, {"q": "HP:0002194"})
+        self.assertIn("1.2", [hit["pk"] for hit in response.data])
+
+    def test_bad_requests(self):
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(self.url, {"q": "x", "table": "participant"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# tests/test_apis/test_token_blacklist_apis.py
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from authentication.services import token_blacklist
+
+User = get_user_model()
+
+
+class TokenBlacklistTests(APITestCase):
+    url = "/api/auth/users/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+
+    def setUp(self):
+        token_blacklist.reset()
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_logout_revokes_access_and_refresh(self):
+        response = self.client.post("/api/auth/token/logout/", {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get("/api/metadata/family/?ids=GREGoR_test-001")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(TOKEN_BLACKLIST_POLL_INTERVAL=60)
+    def test_check_runs_in_memory(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+            self.client.post("/api/auth/token/refresh/", {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            [query for query in queries.captured_queries if "token_blacklist" in query["sql"]]
+        )
+
+    @override_settings(TOKEN_BLACKLIST_POLL_INTERVAL=0)
+    def test_poll_picks_up_other_processes(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        # Blacklisted by another server process, bypassing this process' set
+        access = AccessToken(self.access)
+        outstanding = OutstandingToken.objects.create(
+            jti=access["jti"],
+            token=self.access,
+            expires_at=datetime_from_epoch(access["exp"]),
+        )
+        BlacklistedToken.objects.create(token=outstanding)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(TOKEN_BLACKLIST_POLL_INTERVAL=0)
+    def test_poll_picks_up_late_commits(self):
+        other = RefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(id=100, token=OutstandingToken.objects.get(jti=other["jti"]))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        # A row with a lower id than one already seen, committed by another
+        # process after this one's last poll
+        access = AccessToken(self.access)
+        outstanding = OutstandingToken.objects.create(
+            jti=access["jti"],
+            token=self.access,
+            expires_at=datetime_from_epoch(access["exp"]),
+        )
+        BlacklistedToken.objects.create(id=50, token=outstanding)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_benchmarks.py
+
+from django.test import TestCase
+from config.benchmarks import BenchmarkRunner, compare_results, model_rules
+from config.normalizer import normalize_row
+from config.selectors import TableValidator
+from utilities.synthetic_data import TABLE_KEYS, TABLE_ORDER, SyntheticDataset
+
+
+class SyntheticDatasetTests(TestCase):
+    """Tests for SyntheticDataset."""
+
+    def test_same_seed_same_dataset(self):
+        first = SyntheticDataset(families=5, seed=3).generate()
+        second = SyntheticDataset(families=5, seed=3).generate()
+        other = SyntheticDataset(families=5, seed=4).generate()
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_records_match_schemas(self):
+        choices, required = model_rules()
+        tables = SyntheticDataset(families=20, choices=choices, required=required).generate()
+        validator = TableValidator()
+        for table_name in TABLE_ORDER:
+            self.assertTrue(tables[table_name], table_name)
+            for record in tables[table_name]:
+                validator.validate_json(json_object=normalize_row(table_name, record), table_name=table_name)
+                self.assertEqual(validator.get_validation_results()["errors"], [], table_name)
+                for field, values in choices.get(table_name, {}).items():
+                    if record[field] not in ("NA", []) and not isinstance(record[field], list):
+                        self.assertIn(record[field], values)
+
+    def test_references_resolve(self):
+        tables = SyntheticDataset(families=10).generate()
+        ids = {table_name: {record[TABLE_KEYS[table_name]] for record in tables[table_name]} for table_name in TABLE_ORDER}
+        for participant in tables["participant"]:
+            self.assertIn(participant["family_id"], ids["family"])
+            for parent in (participant["paternal_id"], participant["maternal_id"]):
+                self.assertTrue(parent == "0" or parent in ids["participant"])
+        for table_name in ("phenotype", "analyte", "biobank", "genetic_findings"):
+            for record in tables[table_name]:
+                self.assertIn(record["participant_id"], ids["participant"])
+        for platform in ("dna_short_read", "rna_short_read", "nanopore", "pac_bio"):
+            for record in tables[f"experiment_{platform}"]:
+                self.assertIn(record["analyte_id"], ids["analyte"])
+            for record in tables[f"aligned_{platform}"]:
+                self.assertIn(record[f"experiment_{platform}_id"], ids[f"experiment_{platform}"])
+
+
+class BenchmarkRunnerTests(TestCase):
+    """Tests for BenchmarkRunner."""
+
+    fixtures = ["config/fixtures/initial.json"]
+
+    def test_run(self):
+        results = BenchmarkRunner(families=3, repeat=1).run()
+        self.assertEqual(
+            list(results["scenarios"]),
+            [
+                "bulk_create",
+                "noop_reupload",
+                "bulk_update",
+                "list_by_ids",
+                "get_all_tables",
+                "get_all_tables_cached",
+                "anvil_export",
+            ],
+        )
+        created = results["scenarios"]["bulk_create"]
+        self.assertEqual(created["records"], sum(results["dataset"]["records"].values()))
+        self.assertGreater(created["queries"], 0)
+        # The table generations, the check for unnumbered change log entries
+        # and the latest commit sequence
+        self.assertEqual(results["scenarios"]["get_all_tables_cached"]["queries"], 3)
+
+    def test_compare_results(self):
+        baseline = {"scenarios": {"a": {"median_s": 1.0}, "b": {"median_s": 2.0}}}
+        current = {"scenarios": {"a": {"median_s": 1.1}, "b": {"median_s": 3.0}, "c": {"median_s": 1.0}}}
+        self.assertEqual(
+            compare_results(baseline, current, threshold=1.2),
+            [("a", 1.0, 1.1, 1.1, False), ("b", 2.0, 3.0, 1.5, True)],
+        )
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_bucket_paths.py
+
+import re
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.contrib.auth.models import User
+from config.bucket_paths import (
+    bucket_path_columns,
+    bucket_path_error,
+    bucket_path_errors,
+    validate_many,
+)
+from config.selectors import bucket_path_rejections
+
+SCHEMA_PATTERN = re.compile(r"^(https?|gs|s3):\/\/.+$")
+
+
+class BucketPathTests(TestCase):
+    """Tests for the compiled bucket path validator."""
+
+    valid = [
+        "gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/bam/nanopore/GREGoR_test-001-001-0-D-3.bam",
+        "gs://my.dotted_bucket/dir with space/file.cram",
+        "s3://bucket-name/key/file.bam",
+        "s3://bucket-name",
+        "https://example.com",
+        "http://test.com/path?query=value",
+        "https://user@data.example.org:8443/files/a.bed#part",
+        "http://[::1]/local.bam",
+        # Bucket and host names are not checked beyond the schema rule
+        "gs://UPPER_Bucket/file.bam",
+        "gs://a/file.bam",
+        "s3://-bucket/file.bam",
+        "https://bad_host.com/file",
+    ]
+    invalid = [
+        "",
+        None,
+        42,
+        "just-a-string",
+        "htp:/invalid-url",
+        "ftp://example.com/file.bam",
+        "https://",
+        "gs://bucket/a\nb.bam",
+    ]
+    # Matched by the schema pattern, but without a bucket or host, or with
+    # a line break
+    stricter_than_schema = [
+        "gs:///file.bam",
+        "s3:// bucket/file.bam",
+        "https://?query=value",
+        "gs://bucket/file.bam\n",
+    ]
+
+    def test_validate_many(self):
+        self.assertEqual(validate_many(self.valid), [None] * len(self.valid))
+        errors = validate_many(self.invalid + self.stricter_than_schema)
+        self.assertTrue(all(errors), errors)
+
+    def test_schema_pattern(self):
+        for path in self.valid + self.stricter_than_schema:
+            self.assertTrue(SCHEMA_PATTERN.match(path), repr(path))
+        for path in self.invalid:
+            self.assertFalse(isinstance(path, str) and SCHEMA_PATTERN.match(path), repr(path))
+
+    def test_messages(self):
+        self.assertEqual(bucket_path_error(None), "Invalid URL: URL must be a non-empty string.")
+        self.assertIn("Scheme must be one of", bucket_path_error("ftp://example.com/file.bam"))
+        self.assertIn("Missing gs bucket name", bucket_path_error("gs:///file.bam"))
+        self.assertIn("Missing host", bucket_path_error("https://?query=value"))
+        self.assertIn("Remove the line break", bucket_path_error("gs://bucket/file.bam\n"))
+
+    def test_schema_columns(self):
+        self.assertEqual(
+            bucket_path_columns("aligned_nanopore"), ("aligned_nanopore_file", "aligned_nanopore_index_file")
+        )
+        self.assertEqual(bucket_path_columns("no_such_table"), ())
+
+    def test_bucket_path_errors(self):
+        rows = [
+            {"aligned_nanopore_file": self.valid[0], "aligned_nanopore_index_file": "NA"},
+            {"aligned_nanopore_file": "bam/file.bam", "aligned_nanopore_index_file": None},
+            "not a row",
+        ]
+        self.assertEqual(
+            bucket_path_errors("aligned_nanopore", rows),
+            {1: [{"field": "Aligned_Nanopore_File", "error": "'bam/file.bam' is not a valid URL."}]},
+        )
+        self.assertEqual(bucket_path_errors("aligned_nanopore", {"aligned_nanopore_file": "x"}), {})
+
+    def test_bucket_path_rejections(self):
+        rows = [
+            {"aligned_nanopore_id": "AN-1", "aligned_nanopore_file": self.valid[0]},
+            {"aligned_nanopore_id": "AN-2", "aligned_nanopore_file": "bam/file.bam"},
+        ]
+        self.assertEqual(
+            bucket_path_rejections("aligned_nanopore", rows, "aligned_nanopore_id"),
+            {
+                1: {
+                    "identifier": "AN-2",
+                    "request_status": "BAD REQUEST",
+                    "status_code": 400,
+                    "data": [{"field": "Aligned_Nanopore_File", "error": "'bam/file.bam' is not a valid URL."}],
+                }
+            },
+        )
+
+    def test_bulk_ingest_rejects_invalid_paths(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username="testuser", password="testpassword"))
+        response = client.post(
+            "/api/experiments/aligned_nanopore/create/",
+            [{"aligned_nanopore_id": "NEW-1", "aligned_nanopore_file": "s3:///file.bam"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0]["identifier"], "NEW-1")
+        self.assertEqual(response.data[0]["data"][0]["field"], "Aligned_Nanopore_File")
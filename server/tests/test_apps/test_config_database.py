@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_database.py
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase, override_settings
+from config.database import configure_sqlite
+
+
+def pragma(name: str, conn=connection):
+    with conn.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+class ConfigureSqliteTests(TestCase):
+    """Tests for configure_sqlite."""
+
+    def test_untuned_by_default(self):
+        self.assertEqual(settings.SQLITE_PRAGMAS, {})
+
+    def test_tuned_pragmas_applied(self):
+        # A new connection: synchronous cannot change inside the test transaction
+        conn = connections.create_connection(DEFAULT_DB_ALIAS)
+        self.addCleanup(conn.close)
+        with override_settings(SQLITE_PRAGMAS=settings.SQLITE_TUNED_PRAGMAS):
+            conn.ensure_connection()
+        tuned = settings.SQLITE_TUNED_PRAGMAS
+        self.assertEqual(pragma("synchronous", conn), 1)
+        self.assertEqual(pragma("busy_timeout", conn), tuned["busy_timeout"])
+        self.assertEqual(pragma("cache_size", conn), tuned["cache_size"])
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 1234})
+    def test_pragmas_from_settings(self):
+        configure_sqlite(sender=connection.__class__, connection=connection)
+        self.assertEqual(pragma("busy_timeout"), 1234)
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_untuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout = 10")
+        configure_sqlite(sender=connection.__class__, connection=connection)
+        self.assertEqual(pragma("busy_timeout"), 10)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_ingest_profile.py
+
+import json
+import os
+import tempfile
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from config.ingest_profile import IngestProfile, ingest_record, ingest_record_done, ingest_stage
+from config.selectors import response_constructor
+
+FAMILY = {
+    "family_id": "P-201",
+    "consanguinity": "Unknown",
+    "consanguinity_detail": "NA",
+    "pedigree_file": "NA",
+    "pedigree_file_detail": "NA",
+    "family_history_detail": "NA",
+}
+
+
+class IngestProfileTests(TestCase):
+    """Tests for IngestProfile."""
+
+    def test_stage_accounting(self):
+        with IngestProfile(label="family") as profile:
+            for _ in range(2):
+                ingest_stage("normalize")
+                ingest_stage("schema")
+                ingest_stage("write")
+                ingest_record_done()
+        summary = profile.summary()
+        self.assertEqual(summary["label"], "family")
+        self.assertEqual(summary["records"], 2)
+        self.assertEqual(list(summary["stages"]), ["normalize", "schema", "write", "other"])
+        self.assertEqual(summary["stages"]["write"]["calls"], 2)
+        staged = sum(stage["ms"] for stage in summary["stages"].values())
+        self.assertAlmostEqual(staged, summary["total_ms"], delta=0.1)
+        self.assertIn("2 records", profile.table())
+
+    def test_marks_without_profile(self):
+        ingest_stage("normalize")
+        ingest_record_done()
+        with IngestProfile() as profile:
+            pass
+        self.assertEqual(profile.records, 0)
+        self.assertEqual(list(profile.summary()["stages"]), ["other"])
+
+    def test_records_end_with_the_service(self):
+        @ingest_record
+        def service():
+            ingest_stage("write")
+            return response_constructor("P-201", "SUCCESS", 200)
+
+        with IngestProfile() as profile:
+            service()
+            response_constructor("P-202", "SUCCESS", 200)
+        self.assertEqual(profile.records, 1)
+        self.assertEqual(profile.summary()["stages"]["write"]["calls"], 1)
+
+    def test_pstats_dump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pstats_path = os.path.join(directory, "family.pstats")
+            with IngestProfile(pstats_path=pstats_path):
+                ingest_stage("normalize")
+            self.assertTrue(os.path.getsize(pstats_path))
+
+
+class IngestProfileMiddlewareTests(TestCase):
+    """Tests for IngestProfileMiddleware."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+    url = "/api/metadata/family/create/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(username="testuser", password="testpassword")
+        )
+
+    @override_settings(INGEST_PROFILE="header", INGEST_PROFILE_DIR=None)
+    def test_profiled_with_header(self):
+        with self.assertLogs("ingest_profile", level="INFO") as logs:
+            response = self.client.post(self.url, [FAMILY], format="json", HTTP_X_INGEST_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ingest-schema;dur=", response["Server-Timing"])
+        self.assertIn("ingest-write;dur=", response["Server-Timing"])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["records"], 1)
+        for stage in ("normalize", "schema", "serializer", "write", "response"):
+            self.assertEqual(record["stages"][stage]["calls"], 1, stage)
+
+    @override_settings(INGEST_PROFILE="header")
+    def test_not_profiled_without_header(self):
+        response = self.client.post(self.url, [FAMILY], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(INGEST_PROFILE="off")
+    def test_off(self):
+        response = self.client.post(self.url, [FAMILY], format="json", HTTP_X_INGEST_PROFILE="1")
+        self.assertFalse(response.has_header("Server-Timing"))
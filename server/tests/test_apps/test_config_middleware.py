@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_middleware.py
+
+import json
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from config.middleware import normalize_sql
+
+
+class NormalizeSqlTests(TestCase):
+    """Tests for normalize_sql."""
+
+    def test_parameters_collapse(self):
+        first = normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "n" = 5')
+        second = normalize_sql("SELECT * FROM \"t\" WHERE \"id\" IN (%s) AND \"n\" = 'x'")
+        self.assertEqual(first, 'SELECT * FROM "t" WHERE "id" IN (...) AND "n" = ?')
+        self.assertEqual(second, 'SELECT * FROM "t" WHERE "id" IN (?) AND "n" = ?')
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    """Tests for RequestTimingMiddleware."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+    url = "/api/metadata/family/?ids=GREGoR_test-001,GREGoR_test-004"
+
+    def setUp(self):
+        caches["responses"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(username="testuser", password="testpassword")
+        )
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_header_and_log_line(self):
+        with self.assertLogs("request_timing", level="INFO") as logs:
+            response = self.client.get("/api/search/get_all_tables/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("serializer;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["path"], "/api/search/get_all_tables/")
+        self.assertGreater(record["queries"], 0)
+        self.assertGreater(record["serializer_ms"], 0)
+        self.assertLessEqual(len(record["slowest"]), 5)
+        self.assertNotIn("GREGoR_test", json.dumps(record["slowest"]))
+
+    def queries(self, response) -> int:
+        timing = response["Server-Timing"]
+        return int(timing.split('desc="', 1)[1].split(" queries", 1)[0])
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_asgi_counts_queries(self):
+        access = str(RefreshToken.for_user(User.objects.get(username="testuser")).access_token)
+        with self.assertLogs("request_timing", level="INFO") as logs:
+            wsgi_queries = self.queries(self.client.get("/api/search/summary/"))
+        self.assertGreater(wsgi_queries, 0)
+        self.assertEqual(json.loads(logs.records[0].getMessage())["queries"], wsgi_queries)
+
+        # Under ASGI the view's queries run outside the event loop thread
+        caches["responses"].clear()
+        with self.assertLogs("request_timing", level="INFO") as logs:
+            response = async_to_sync(AsyncClient().get)(
+                "/api/search/summary/", headers={"Authorization": f"Bearer {access}"}
+            )
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["queries"], self.queries(response))
+        # The view's queries plus the token's user and blacklist lookups,
+        # which the force-authenticated client skips
+        self.assertGreaterEqual(record["queries"], wsgi_queries)
+        self.assertTrue(any("search_summarycount" in query["sql"] for query in record["slowest"]))
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SAMPLE_RATE=0.0)
+    def test_not_sampled(self):
+        with self.assertNoLogs("request_timing"):
+            response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_disabled(self):
+        with self.assertNoLogs("request_timing"):
+            response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Server-Timing"))
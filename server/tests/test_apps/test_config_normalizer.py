@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_normalizer.py
+
+from django.test import TestCase
+from config.normalizer import column_converters, normalize_columns, normalize_row
+from config.selectors import TableValidator
+
+
+class NormalizerTests(TestCase):
+    """Tests for the schema-driven row normalizer."""
+
+    def test_normalize_row(self):
+        datum = {
+            "genetic_findings_id": " GF-1 ",
+            "experiment_id": "EXP1 | EXP2",
+            "gene_of_interest": "GENE1",
+            "pos": "100",
+            "pos_end": "100.0",
+            "allele_balance_or_heteroplasmy_percentage": "12.5",
+            "copy_number": "NA",
+            "chrom": "",
+            "ref": None,
+            "condition_inheritance": ["NA"],
+            "notes": "contains | a pipe",
+            "not_in_schema": "kept",
+        }
+        self.assertEqual(
+            normalize_row("genetic_findings", datum),
+            {
+                "genetic_findings_id": "GF-1",
+                "experiment_id": ["EXP1", "EXP2"],
+                "gene_of_interest": ["GENE1"],
+                "pos": 100,
+                "pos_end": 100,
+                "allele_balance_or_heteroplasmy_percentage": 12.5,
+                "notes": "contains | a pipe",
+                "not_in_schema": "kept",
+            },
+        )
+        self.assertEqual(datum["pos"], "100")
+
+    def test_booleans_and_aliases(self):
+        self.assertEqual(
+            normalize_row("experiment_pac_bio", {"was_barcoded": "TRUE", "by_strand": "false", "includes_kinetics": "yes"}),
+            {"was_barcoded": True, "by_strand": False, "includes_kinetics": "yes"},
+        )
+        self.assertEqual(
+            normalize_row("participant", {"reported_race": "Unknown", "reported_ethnicity": "Unknown", "twin_id": "T1|T2"}),
+            {"twin_id": ["T1", "T2"]},
+        )
+        self.assertEqual(normalize_row("participant", {"reported_race": "Asian|White"})["reported_race"], ["Asian", "White"])
+
+    def test_invalid_values_left_for_validation(self):
+        datum = normalize_row("aligned_nanopore", {"mean_coverage": "thirty", "genome_coverage": "2.5"})
+        self.assertEqual(datum, {"mean_coverage": "thirty", "genome_coverage": "2.5"})
+        validator = TableValidator()
+        validator.validate_json(datum, "aligned_nanopore")
+        self.assertIn("['mean_coverage']: 'thirty' is not of type 'number'", validator.errors)
+
+    def test_normalize_columns(self):
+        columns = {
+            "mean_coverage": ["30", "3.5", "NA", "inf"],
+            "methylation_called": ["TRUE", "false", None, [""]],
+        }
+        self.assertEqual(
+            normalize_columns("aligned_nanopore", columns),
+            {"mean_coverage": [30, 3.5, None, "inf"], "methylation_called": [True, False, None, None]},
+        )
+
+    def test_unknown_table(self):
+        self.assertEqual(column_converters("no_such_table"), {})
+        self.assertEqual(normalize_row("no_such_table", {"a": " b ", "c": "NA"}), {"a": "b"})
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_query_budget.py
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from metadata.models import Family
+from config.query_budget import QueryBudgetExceeded, query_budget
+from config.selectors import bulk_retrieve
+
+
+class QueryBudgetTests(TestCase):
+    """Tests for query_budget."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+    family_ids = ["GREGoR_test-001", "GREGoR_test-004", "GREGoR_test-006"]
+
+    def test_repeats_detected(self):
+        with query_budget(raise_on_exceed=False) as budget:
+            for family_id in self.family_ids:
+                Family.objects.get(pk=family_id)
+            Family.objects.count()
+        self.assertEqual(len(budget.queries), 4)
+        self.assertEqual(len(budget.repeated()), 1)
+        self.assertEqual(budget.repeated()[0][1], 3)
+
+    def test_raises_over_budget(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "3x (budget 1)"):
+            with query_budget(max_repeats=1, raise_on_exceed=True):
+                for family_id in self.family_ids:
+                    Family.objects.get(pk=family_id)
+        with self.assertRaisesMessage(QueryBudgetExceeded, "1 queries (budget 0)"):
+            with query_budget(max_queries=0, raise_on_exceed=True):
+                Family.objects.count()
+
+    def test_batched_query_within_budget(self):
+        with query_budget(max_queries=1, max_repeats=1, raise_on_exceed=True):
+            Family.objects.in_bulk(self.family_ids)
+
+    def test_logs_when_not_raising(self):
+        with self.assertLogs("query_budget", level="WARNING") as logs:
+            with query_budget(max_repeats=1, label="lookup", raise_on_exceed=False):
+                for family_id in self.family_ids:
+                    Family.objects.get(pk=family_id)
+        self.assertIn("Query budget exceeded in lookup", logs.output[0])
+
+    def test_decorator(self):
+        @query_budget(max_queries=1, raise_on_exceed=True)
+        def count_families():
+            return Family.objects.count()
+
+        # Each call is checked on its own
+        self.assertEqual(count_families(), 3)
+        self.assertEqual(count_families(), 3)
+
+        @query_budget(max_repeats=1, raise_on_exceed=True)
+        def get_families():
+            return [Family.objects.get(pk=family_id) for family_id in self.family_ids]
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "get_families"):
+            get_families()
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_bulk_retrieve_budget(self):
+        self.assertEqual(len(bulk_retrieve(Family, self.family_ids, "family_id")), 3)
+
+        def in_bulk_by_id(manager, id_list, field_name):
+            return {family_id: manager.get(pk=family_id) for family_id in id_list}
+
+        with mock.patch.object(type(Family.objects), "in_bulk", in_bulk_by_id):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "bulk_retrieve"):
+                bulk_retrieve(Family, self.family_ids, "family_id")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_read_serializers.py
+
+import json
+from django.test import TestCase
+from rest_framework import serializers
+from config.read_serializers import compile_serializer, serialize_queryset
+from metadata.models import Family
+from search.selectors import CHANGE_FEED_TABLES
+from search.services import TRACKED_TABLES
+
+
+class FamilyMethodSerializer(serializers.ModelSerializer):
+    participants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Family
+        fields = "__all__"
+
+    def get_participants(self, family):
+        return family.participant_set.count()
+
+
+class FamilyUpperSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Family
+        fields = "__all__"
+        rename_fields = {"family_id": "FAMILY_ID"}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["FAMILY_ID"] = data.pop("family_id").upper()
+        return data
+
+
+class CompiledSerializerTests(TestCase):
+    """Tests for compile_serializer and serialize_queryset."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def test_matches_drf_output(self):
+        for table_name, (response_key, serializer_class) in CHANGE_FEED_TABLES.items():
+            with self.subTest(table_name):
+                self.assertIsNotNone(compile_serializer(serializer_class))
+                queryset = TRACKED_TABLES[table_name].objects.all()
+                self.assertTrue(queryset.exists())
+                expected = json.dumps(serializer_class(queryset, many=True).data)
+                self.assertEqual(json.dumps(serialize_queryset(serializer_class, queryset)), expected)
+
+    def test_renamed_field(self):
+        serializer_class = CHANGE_FEED_TABLES["experiment_rna_short_read"][1]
+        row = serialize_queryset(serializer_class, TRACKED_TABLES["experiment_rna_short_read"].objects.all())[0]
+        self.assertEqual(list(row)[-1], "5prime3prime_bias")
+        self.assertNotIn("five_prime_three_prime_bias", row)
+
+    def test_filtered_queryset(self):
+        serializer_class = CHANGE_FEED_TABLES["participant"][1]
+        queryset = TRACKED_TABLES["participant"].objects.filter(pk="GREGoR_test-001-001-0")
+        rows = serialize_queryset(serializer_class, queryset)
+        self.assertEqual(rows, serializer_class(queryset, many=True).data)
+        self.assertEqual(len(rows), 1)
+
+    def test_fallback(self):
+        queryset = Family.objects.all()
+        for serializer_class in (FamilyMethodSerializer, FamilyUpperSerializer):
+            self.assertIsNone(compile_serializer(serializer_class))
+            self.assertEqual(
+                serialize_queryset(serializer_class, queryset),
+                serializer_class(queryset, many=True).data,
+            )
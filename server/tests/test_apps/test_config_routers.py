@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_routers.py
+
+import tempfile
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import router
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from metadata.models import Family
+from config.routers import is_pinned, read_from_primary, read_from_replica
+
+FAMILY = {
+    "family_id": "P-301",
+    "consanguinity": "Unknown",
+    "consanguinity_detail": "NA",
+    "pedigree_file": "NA",
+    "pedigree_file_detail": "NA",
+    "family_history_detail": "NA",
+}
+
+
+@override_settings(DATABASE_REPLICA="replica")
+class ReplicaRouterTests(TestCase):
+    """Tests for ReplicaRouter."""
+
+    def test_reads_routed_inside_block(self):
+        self.assertEqual(router.db_for_read(Family), "default")
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Family), "replica")
+            self.assertEqual(router.db_for_write(Family), "default")
+        self.assertEqual(router.db_for_read(Family), "default")
+
+    def test_primary_wins(self):
+        with read_from_primary():
+            with read_from_replica():
+                self.assertEqual(router.db_for_read(Family), "default")
+
+    def test_no_migrations_on_replica(self):
+        self.assertFalse(router.allow_migrate("replica", "metadata"))
+        self.assertTrue(router.allow_migrate("default", "metadata"))
+
+    @override_settings(DATABASE_REPLICA=None)
+    def test_without_replica(self):
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Family), "default")
+
+
+@override_settings(DATABASE_REPLICA="replica")
+class PrimaryPinMiddlewareTests(TestCase):
+    """Tests for PrimaryPinMiddleware."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        caches["pins"].clear()
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_write_pins_user(self):
+        response = self.client.get("/api/metadata/family/?ids=GREGoR_test-001")
+        self.assertFalse(is_pinned(response.wsgi_request))
+
+        response = self.client.post("/api/metadata/family/create/", [FAMILY], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(caches["pins"].get(f"primary_pin:{self.user.pk}"))
+        self.assertTrue(is_pinned(response.wsgi_request))
+
+    def test_rejected_write_does_not_pin(self):
+        response = self.client.post("/api/metadata/family/create/", [{**FAMILY, "consanguinity": ""}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(is_pinned(response.wsgi_request))
+
+    def test_pin_shared_between_processes(self):
+        # Each server process opens its own instance of the shared cache
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+        with tempfile.TemporaryDirectory() as directory:
+            shared = {
+                **settings.CACHES,
+                "pins": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory},
+            }
+            with override_settings(CACHES=shared):
+                writer = caches["pins"]
+                response = client.post("/api/metadata/family/create/", [FAMILY], format="json")
+                self.assertEqual(response.status_code, 200)
+                request = response.wsgi_request
+            with override_settings(CACHES=shared):
+                self.assertIsNot(caches["pins"], writer)
+                self.assertTrue(is_pinned(request))
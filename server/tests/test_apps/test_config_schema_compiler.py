@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_config_schema_compiler.py
+
+import glob
+import json
+import os
+from django.apps import apps
+from django.test import TestCase, override_settings
+from config.schema_compiler import (
+    NotCompilable,
+    compile_schema,
+    compiled_validator,
+    draft7_validator,
+    load_schema,
+    schema_errors,
+)
+from config.benchmarks import validator_throughput
+from config.selectors import TableValidator
+from search.services import TRACKED_TABLE_NAMES
+from utilities.synthetic_data import SyntheticDataset
+
+SCHEMA_TABLES = sorted(
+    os.path.basename(path)[:-5] for path in glob.glob("utilities/json_schemas/v1.7/*.json")
+)
+
+
+def jsonschema_errors(json_object, table_name):
+    return [f"{list(error.path)}: {error.message}" for error in draft7_validator(table_name).iter_errors(json_object)]
+
+
+def mutations(table_name, row):
+    """Yield copies of a row broken in every way the schema can reject."""
+    schema = load_schema(table_name)
+    yield {}
+    yield [row]
+    yield {key: value for key, value in row.items() if key not in schema.get("required", [])[:2]}
+    for field, definition in schema["properties"].items():
+        for value in (None, True, 1, 1.5, 2.0, "NA", "not-a-valid value", [], ["x", 3], {"a": 1}):
+            yield {**row, field: value}
+        if "items" in definition:
+            yield {**row, field: ["ok", None, False, "gs:/bad"]}
+
+
+class SchemaCompilerParityTests(TestCase):
+    """The compiled validators return exactly the errors jsonschema does."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def assertParity(self, json_object, table_name):
+        self.assertEqual(
+            compiled_validator(table_name)(json_object),
+            jsonschema_errors(json_object, table_name),
+            f"{table_name}: {json_object!r}",
+        )
+
+    def test_every_schema_compiles(self):
+        for table_name in SCHEMA_TABLES:
+            self.assertIsNotNone(compiled_validator(table_name), table_name)
+
+    def test_fixture_data(self):
+        with open("tests/fixtures/test_fixture.json") as fixture_file:
+            records = json.load(fixture_file)
+        checked = 0
+        for record in records:
+            model = apps.get_model(record["model"])
+            table_name = TRACKED_TABLE_NAMES.get(model)
+            if table_name is None:
+                continue
+            row = {model._meta.pk.name: record["pk"], **record["fields"]}
+            self.assertParity(row, table_name)
+            for mutation in mutations(table_name, row):
+                self.assertParity(mutation, table_name)
+            checked += 1
+        self.assertEqual(checked, 147)
+
+    def test_synthetic_data(self):
+        for table_name, rows in SyntheticDataset(families=3, seed=1).generate().items():
+            for row in rows:
+                self.assertParity(row, table_name)
+                self.assertParity({key: value for key, value in row.items() if value != "NA"}, table_name)
+
+    def test_not_compilable(self):
+        with self.assertRaises(NotCompilable):
+            compile_schema({"type": "string", "minLength": 1})
+        with self.assertRaises(NotCompilable):
+            compile_schema({"type": "array", "items": [{"type": "string"}]})
+        validate = compile_schema({"type": ["integer", "null"], "x-note": True})
+        self.assertEqual(validate(None), [])
+        self.assertEqual(validate(True), ["[]: True is not of type 'integer', 'null'"])
+
+    def test_table_validator(self):
+        row = {"family_id": "GREGoR_test-001", "consanguinity": "maybe"}
+        for compiled in (True, False):
+            with override_settings(COMPILED_SCHEMA_VALIDATORS=compiled):
+                validator = TableValidator()
+                validator.validate_json(row, "family")
+                self.assertFalse(validator.valid)
+                self.assertEqual(validator.errors, jsonschema_errors(row, "family"))
+                self.assertEqual(schema_errors(row, "family"), validator.errors)
+                validator.validate_json(row, "no_such_table")
+                self.assertEqual(validator.errors, ["Schema file not found for no_such_table."])
+
+    def test_throughput_benchmark(self):
+        results = validator_throughput(SyntheticDataset(families=2).generate(), repeat=1)
+        self.assertEqual(results["compiled"]["records"], results["jsonschema"]["records"])
+        self.assertGreater(results["speedup"], 1)
@@ -7,7 +7,7 @@ from django.test import TestCase
 from rest_framework import status
 from metadata.models import Family
 from config.selectors import (
-    TableValidator, remove_na, multi_value_split, response_status, response_constructor,
+    TableValidator, response_status, response_constructor,
     validate_url, generate_tsv, generate_zip, compare_data, bulk_model_retrieve, bulk_retrieve
 )
 
@@ -60,28 +60,6 @@ class UtilityFunctionTests(TestCase):
     """Tests for utility functions."""
     fixtures = ['tests/fixtures/test_fixture.json']  # Auto-load fixture
 
-    def test_remove_na(self):
-        """Tests that 'NA' values are correctly removed."""
-        test_cases = [
-            ({"key1": "NA", "key2": "valid"}, {"key2": "valid"}),
-            ({"key1": ["NA"], "key2": "something"}, {"key2": "something"}),
-            ({"key1": "test", "key2": "NA"}, {"key1": "test"})
-        ]
-
-        for input_data, expected_output in test_cases:
-            self.assertEqual(remove_na(input_data), expected_output)
-
-    def test_multi_value_split(self):
-        """Tests multi-value splitting."""
-        test_cases = [
-            ({"key1": "value1|value2"}, {"key1": ["value1", "value2"]}),
-            ({"key1": "single"}, {"key1": "single"}),
-            ({"key1": ["existing"]}, {"key1": ["existing"]})
-        ]
-
-        for input_data, expected_output in test_cases:
-            self.assertEqual(multi_value_split(input_data), expected_output)
-
     def test_response_status(self):
         """Tests response status determination logic."""
         test_cases = [
@@ -7,8 +7,8 @@ from experiments.models import (
     AlignedDNAShortRead, AlignedPacBio, AlignedNanopore, AlignedRNAShortRead,
     Experiment, ExperimentNanopore, ExperimentPacBio, ExperimentRNAShortRead,
 )
+from config.normalizer import normalize_row
 from experiments.selectors import (
-    parse_short_read_aligned, parse_pac_bio, parse_nanopore_aligned,
     get_experiment, get_experiment_pac_bio, get_experiment_nanopore,
     get_experiment_rna, get_aligned_dna_short_read, get_aligned_pac_bio,
     get_aligned_nanopore, get_aligned_rna
@@ -32,29 +32,29 @@ class ExperimentSelectorsTest(TestCase):
         self.aligned_nanopore = AlignedNanopore.objects.first()
         self.aligned_rna = AlignedRNAShortRead.objects.first()
 
-    def test_parse_short_read_aligned(self):
+    def test_normalize_short_read_aligned(self):
         data = AlignedDNAShortReadSerializer(self.aligned_dna).data
         data['mean_coverage'] = "30"
         self.assertFalse(isinstance(data["mean_coverage"], int))
-        parsed = parse_short_read_aligned(data)
+        parsed = normalize_row("aligned_dna_short_read", data)
         self.assertTrue(isinstance(parsed["mean_coverage"], int))
 
-    def test_parse_pac_bio(self):
+    def test_normalize_pac_bio(self):
         data = ExperimentPacBioSerializer(self.pac_bio_experiment).data
         data["was_barcoded"] = "true"
         self.assertFalse(isinstance(data["was_barcoded"], bool))
         data["was_barcoded"] = "FALSE"
         self.assertFalse(isinstance(data["was_barcoded"], bool))
-        parsed = parse_pac_bio(data)
+        parsed = normalize_row("experiment_pac_bio", data)
         self.assertTrue(isinstance(parsed["was_barcoded"], bool))
 
-    def test_parse_nanopore_aligned(self):
+    def test_normalize_nanopore_aligned(self):
         data = AlignedNanoporeSerializer(self.aligned_nanopore).data
         data["methylation_called"] = "true"
         self.assertFalse(isinstance(data["methylation_called"], bool))
         data["methylation_called"] = "FALSE"
         self.assertFalse(isinstance(data["methylation_called"], bool))
-        parsed = parse_nanopore_aligned(data)
+        parsed = normalize_row("aligned_nanopore", data)
         self.assertTrue(isinstance(parsed["methylation_called"], bool))
         self.assertFalse(parsed["methylation_called"])
 
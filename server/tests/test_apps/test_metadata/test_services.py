@@ -4,7 +4,8 @@
 import json
 from django.test import TestCase
 from metadata.models import Family, Participant, Phenotype, GeneticFindings, Analyte
-from metadata.selectors import get_analyte, genetic_findings_parser, participant_parser
+from config.normalizer import normalize_row
+from metadata.selectors import get_analyte
 from metadata.services import (
     GeneticFindingsSerializer, AnalyteSerializer, PhenotypeSerializer,
     FamilySerializer, ParticipantInputSerializer, ParticipantOutputSerializer
@@ -47,7 +48,7 @@ class GeneticFindingsModelTest(TestCase):
         self.assertIsNotNone(genetic_finding)
         self.assertTrue(hasattr(genetic_finding, 'genetic_findings_id'))
 
-    def test_genetic_findings_parser(self):
+    def test_normalize_genetic_findings(self):
         test_data = {
             "experiment_id": "EXP1|EXP2",
             "pos": "100",
@@ -56,7 +57,7 @@ class GeneticFindingsModelTest(TestCase):
             "method_of_discovery": "METHOD1|METHOD2",
             "condition_inheritance": "INHERIT1|INHERIT2"
         }
-        parsed_data = genetic_findings_parser(test_data)
+        parsed_data = normalize_row("genetic_findings", test_data)
         
         self.assertIsInstance(parsed_data["experiment_id"], list)
         self.assertEqual(parsed_data["pos"], 100.0)
@@ -89,9 +90,9 @@ class SelectorTests(TestCase):
     def test_get_analyte_not_found(self):
         self.assertIsNone(get_analyte("nonexistent_id"))
 
-    def test_participant_parser(self):
+    def test_normalize_participant(self):
         test_data = {"twin_id": "T1|T2", "age_at_last_observation": "30", "age_at_enrollment": "25"}
-        parsed_data = participant_parser(test_data)
+        parsed_data = normalize_row("participant", test_data)
         self.assertIsInstance(parsed_data["twin_id"], list)
         self.assertEqual(parsed_data["age_at_last_observation"], 30.0)
         self.assertEqual(parsed_data["age_at_enrollment"], 25.0)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# tests/test_apps/test_search_staged_md5.py
+
+import hashlib
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from experiments.models import AlignedNanopore
+from search.models import StagedFileChecksum
+from search.services import hash_files, md5_file, verify_staged_files
+
+BUCKET = "gs://fc-secure-1b1e1ff4-3496-466f-8952-12f034c3c469/"
+NANOPORE = "UCI_GREGoR_test-001-001-0-D-3_NANO_1-Aligned_1"
+
+
+class StagedMd5Tests(TestCase):
+    """Tests for md5_file, hash_files and verify_staged_files."""
+
+    fixtures = ["tests/fixtures/test_fixture.json"]
+
+    def setUp(self):
+        self.staging = tempfile.TemporaryDirectory()
+        self.prefix_map = {BUCKET: self.staging.name}
+        self.good = self.stage("bam/nanopore/GREGoR_test-001-001-0-D-3.bam", b"nanopore reads" * 1000)
+        self.bad = self.stage("bam/nanopore/GREGoR_test-004-004-0-D-3.bam", b"truncated")
+        aligned = AlignedNanopore.objects.get(pk=NANOPORE)
+        aligned.md5sum = hashlib.md5(b"nanopore reads" * 1000).hexdigest()
+        aligned.save()
+
+    def tearDown(self):
+        self.staging.cleanup()
+
+    def stage(self, relative_path, content):
+        local_path = os.path.join(self.staging.name, relative_path)
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, "wb") as staged_file:
+            staged_file.write(content)
+        return local_path
+
+    def test_md5_file_small_buffer(self):
+        expected = hashlib.md5(b"nanopore reads" * 1000).hexdigest()
+        self.assertEqual(md5_file(self.good, buffer_size=7), (self.good, expected))
+        self.assertEqual(hash_files([self.good, self.bad], workers=2)[self.good], expected)
+
+    def test_verify_and_cache(self):
+        report = verify_staged_files(self.prefix_map, workers=2)
+        self.assertEqual((report["verified"], report["hashed"], report["cached"]), (2, 2, 0))
+        self.assertEqual(report["not_staged"], 11)
+        self.assertEqual([entry["local_path"] for entry in report["mismatched"]], [self.bad])
+        self.assertEqual(report["mismatched"][0]["references"][0]["table_name"], "aligned_nanopore")
+        self.assertFalse(StagedFileChecksum.objects.get(local_path=self.bad).matches)
+        self.assertTrue(StagedFileChecksum.objects.get(local_path=self.good).matches)
+
+        report = verify_staged_files(self.prefix_map, workers=2)
+        self.assertEqual((report["hashed"], report["cached"]), (0, 2))
+
+        self.stage("bam/nanopore/GREGoR_test-004-004-0-D-3.bam", b"truncated, then rewritten")
+        report = verify_staged_files(self.prefix_map, workers=1)
+        self.assertEqual((report["hashed"], report["cached"]), (1, 1))
+        report = verify_staged_files(self.prefix_map, tables=["aligned_nanopore"], force=True)
+        self.assertEqual((report["hashed"], report["cached"]), (2, 0))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("verify_staged_md5", "--map", f"{BUCKET}={self.staging.name}", "--workers", "1", stdout=out)
+        self.assertIn("verified: 2 files", out.getvalue())
+        self.assertIn(f"mismatched\t{BUCKET}bam/nanopore/GREGoR_test-004-004-0-D-3.bam", out.getvalue())
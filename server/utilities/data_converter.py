@@ -19,7 +19,9 @@ import sys
 import csv
 import argparse
 import json
-from config.selectors import bulk_model_retrieve
+from config.ingest_profile import IngestProfile
+from config.normalizer import normalize_columns
+from config.selectors import bucket_path_rejections, bulk_model_retrieve
 from metadata.services import create_or_update_metadata
 from metadata.models import (
     Participant,
@@ -31,6 +33,7 @@ from metadata.models import (
 )
 
 from experiments.services import create_or_update_alignment, create_or_update_experiment
+from search.services import summary_batch
 from experiments.models import (
     ExperimentDNAShortRead,
     ExperimentRNAShortRead,
@@ -92,6 +95,27 @@ class TableConverter:
 
         return data_list, entity
 
+    @staticmethod
+    def normalize_table(table_name: str, data_list: list) -> list:
+        """
+        Normalizes a whole sheet column by column (see config/normalizer.py).
+
+        Args:
+            table_name (str): The name of the table the rows are loaded into.
+            data_list (list): The rows read from the file.
+
+        Returns:
+            list: The rows with their values converted and NA values dropped.
+        """
+        header = list(dict.fromkeys(column for row in data_list for column in row))
+        columns = normalize_columns(
+            table_name, {column: [row.get(column) for row in data_list] for column in header}
+        )
+        return [
+            {column: values[index] for column, values in columns.items() if values[index] is not None}
+            for index in range(len(data_list))
+        ]
+
     def process_table(self, table_file: str, table_name: str = None) -> None:
         """
         Converts the table file into a list of JSON objects and for each record
@@ -168,44 +192,52 @@ class TableConverter:
             create_or_update = create_or_update_alignment
 
         results = []
-
-        for record in data_list:
-            identifier = record.get(identifier_field)
-            if not identifier:
-                print(f"No identifier ({identifier_field}) found in record: {record}")
-                continue
-
-            model_instance = model_instances.get(record[identifier_field])
-            # if model_instance:
-            #     result_entry = {
-            #         "identifier": identifier,
-            #         "request_status": "NO CHANGE",
-
-            #         "updates": "NA",
-            #         "validation_fails": "NA"
-            #     }
-            #     results.append(result_entry)
-            # else:
-            response, status = create_or_update(
-                table_name, identifier, model_instance, record
-            )
-            result_entry = {
-                "identifier": identifier,
-                "request_status": (
-                    "NO CHANGE"
-                    if response["request_status"] == "SUCCESS"
-                    else response.get("request_status", "UNKNOWN")
-                ),
-                "updates": (
-                    response["data"].get("updates", [])
-                    if response.get("request_status") == "UPDATED"
-                    else []
-                ),
-                "validation_fails": response["data"],
-            }
-            results.append(result_entry)
-            # if result_entry['request_status'] == "SUCCESS":
-            # import pdb; pdb.set_trace()
+        path_rejections = bucket_path_rejections(table_name, data_list, identifier_field)
+        # The services normalize each row again, which leaves these unchanged
+        data_list = self.normalize_table(table_name, data_list)
+
+        # Summary count changes are written once for the whole table
+        with summary_batch():
+            for index, record in enumerate(data_list):
+                identifier = record.get(identifier_field)
+                if not identifier:
+                    print(f"No identifier ({identifier_field}) found in record: {record}")
+                    continue
+
+                model_instance = model_instances.get(record[identifier_field])
+                # if model_instance:
+                #     result_entry = {
+                #         "identifier": identifier,
+                #         "request_status": "NO CHANGE",
+
+                #         "updates": "NA",
+                #         "validation_fails": "NA"
+                #     }
+                #     results.append(result_entry)
+                # else:
+                if index in path_rejections:
+                    response = path_rejections[index]
+                else:
+                    response, status = create_or_update(
+                        table_name, identifier, model_instance, record
+                    )
+                result_entry = {
+                    "identifier": identifier,
+                    "request_status": (
+                        "NO CHANGE"
+                        if response["request_status"] == "SUCCESS"
+                        else response.get("request_status", "UNKNOWN")
+                    ),
+                    "updates": (
+                        response["data"].get("updates", [])
+                        if response.get("request_status") == "UPDATED"
+                        else []
+                    ),
+                    "validation_fails": response["data"],
+                }
+                results.append(result_entry)
+                # if result_entry['request_status'] == "SUCCESS":
+                # import pdb; pdb.set_trace()
         self.write_results(table_file.split(".")[0], results)
 
     def write_results(self, table_file: str, results: list):
@@ -267,6 +299,18 @@ class TableConverter:
             required=False,
             help="The table name (if not determined from header).",
         )
+        parser.add_argument(
+            "-p",
+            "--profile",
+            nargs="?",
+            const="",
+            default=None,
+            metavar="PSTATS_FILE",
+            help=(
+                "Print the time spent per ingest stage and write cProfile stats to "
+                "PSTATS_FILE (default: the table file name with a .pstats extension)."
+            ),
+        )
 
         if len(sys.argv) <= 1:
             parser.print_help()
@@ -278,8 +322,16 @@ def main():
     """Main function to run the table conversion and submission process."""
     args = TableConverter.usr_args()
     converter = TableConverter()
-    # If the user provided a table name, use it; otherwise let process_table determine it.
-    converter.process_table(args.table, table_name=args.name)
+    if args.profile is None:
+        # If the user provided a table name, use it; otherwise let process_table determine it.
+        converter.process_table(args.table, table_name=args.name)
+        return
+
+    pstats_path = args.profile or os.path.splitext(args.table)[0] + ".pstats"
+    with IngestProfile(label=os.path.basename(args.table), pstats_path=pstats_path) as profile:
+        converter.process_table(args.table, table_name=args.name)
+    print(profile.table())
+    print(f"cProfile stats written to {pstats_path}")
 
 
 if __name__ == "__main__":
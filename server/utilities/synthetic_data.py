@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# utilities/synthetic_data.py
+
+"""Synthetic GREGoR Data
+
+Generates a synthetic GREGoR dataset from the JSON schemas in
+`utilities/json_schemas/<version>`. Each record is built from its table's
+schema: required fields are always filled, optional fields are filled at
+random, enumerations draw from their allowed values, and bucket paths,
+dates, checksums and identifiers are given realistic shapes. Relationships
+between tables follow the shape of real submissions:
+
+    family        one per family
+    participant   a proband and both parents, often a sibling
+    phenotype     several for affected participants, few for unaffected
+    analyte       a DNA analyte per participant, RNA for some probands
+    biobank       a specimen per analyte
+    experiment    DNA short read for each DNA analyte, long read for some,
+                  RNA short read for each RNA analyte
+    aligned       one alignment per experiment
+    genetic_findings  one or two for some probands
+
+The same seed always yields the same dataset.
+
+Usage:
+    python utilities/synthetic_data.py -f 100 -o /tmp/synthetic
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+__version__ = "0.1"
+__status__ = "TEST"
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_schemas")
+
+# Tables in the order their records must be created
+TABLE_ORDER = [
+    "family",
+    "participant",
+    "phenotype",
+    "analyte",
+    "biobank",
+    "experiment_dna_short_read",
+    "aligned_dna_short_read",
+    "experiment_rna_short_read",
+    "aligned_rna_short_read",
+    "experiment_nanopore",
+    "aligned_nanopore",
+    "experiment_pac_bio",
+    "aligned_pac_bio",
+    "genetic_findings",
+]
+
+# Primary key of each table
+TABLE_KEYS = {
+    "family": "family_id",
+    "participant": "participant_id",
+    "phenotype": "phenotype_id",
+    "analyte": "analyte_id",
+    "biobank": "biobank_id",
+    "genetic_findings": "genetic_findings_id",
+    "experiment_dna_short_read": "experiment_dna_short_read_id",
+    "aligned_dna_short_read": "aligned_dna_short_read_id",
+    "experiment_rna_short_read": "experiment_rna_short_read_id",
+    "aligned_rna_short_read": "aligned_rna_short_read_id",
+    "experiment_nanopore": "experiment_nanopore_id",
+    "aligned_nanopore": "aligned_nanopore_id",
+    "experiment_pac_bio": "experiment_pac_bio_id",
+    "aligned_pac_bio": "aligned_pac_bio_id",
+}
+
+# Fields that link records together or hold multi-valued references; the
+# generator sets these itself rather than drawing them from the schema
+RELATION_FIELDS = {
+    "participant": {"paternal_id", "maternal_id", "twin_id", "proband_relationship", "family_id", "pmid_id"},
+    "genetic_findings": {"experiment_id", "additional_family_members_with_variant", "partial_contribution_explained"},
+    "biobank": {"participant_id", "child_analytes", "experiments", "alignments"},
+}
+
+# Fields the schema types as arrays but the server stores as text; left "NA"
+TEXT_ARRAY_FIELDS = {
+    "genetic_findings": {"public_database_other", "public_database_ID_other"},
+}
+
+GENES = ["ZSWIM8", "FBN2", "SCN1A", "KMT2D", "ARID1B", "MECP2", "CHD7", "NSD1", "DYRK1A", "ANKRD11"]
+BASES = "ACGT"
+BUCKET = "gs://fc-secure-00000000-0000-0000-0000-000000000000"
+
+
+def usr_args():
+    """User supplied arguments for functions
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='synthetic_data',
+        usage='%(prog)s [options]')
+
+    # version
+    parser.add_argument(
+        '-v', '--version',
+        action='version',
+        version='%(prog)s ' + __version__)
+
+    parser.add_argument(
+        '-f', '--families',
+        type=int,
+        default=10,
+        help="number of families to generate"
+    )
+    parser.add_argument(
+        '-s', '--seed',
+        type=int,
+        default=0,
+        help="random seed"
+    )
+    parser.add_argument(
+        '--schema-version',
+        default="v1.7",
+        help="JSON schema version"
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help="output directory, one <table>.json file per table"
+    )
+    if len(sys.argv) <= 1:
+        sys.argv.append('--help')
+
+    return parser.parse_args()
+
+
+class SyntheticDataset:
+    """
+    Build a synthetic GREGoR dataset.
+
+    Args:
+        families (int): Number of families to generate.
+        seed (int, optional): Random seed.
+        schema_version (str, optional): Directory under `json_schemas` to
+            read the table schemas from.
+        prefix (str, optional): Prefix of every generated identifier.
+        choices (dict, optional): `{table_name: {field: values}}` limiting an
+            enumeration to the values the server accepts, where its models
+            are stricter than the schema.
+        required (dict, optional): `{table_name: fields}` always filled in
+            addition to the fields the schema requires.
+
+    Example:
+        tables = SyntheticDataset(families=100).generate()
+        tables["participant"][0]["participant_id"]  # 'SYN-0001-1'
+    """
+
+    def __init__(
+        self,
+        families: int,
+        seed: int = 0,
+        schema_version: str = "v1.7",
+        prefix: str = "SYN",
+        choices: dict = None,
+        required: dict = None,
+    ):
+        self.families = families
+        self.seed = seed
+        self.prefix = prefix
+        self.choices = choices or {}
+        self.required = required or {}
+        self.schemas = {}
+        for table_name in TABLE_ORDER:
+            with open(os.path.join(SCHEMA_DIR, schema_version, f"{table_name}.json")) as schema_file:
+                self.schemas[table_name] = json.load(schema_file)
+
+    def generate(self) -> dict:
+        """Return `{table_name: [record, ...]}` in creation order."""
+        self.rng = random.Random(self.seed)
+        self.tables = {table_name: [] for table_name in TABLE_ORDER}
+        for family_number in range(1, self.families + 1):
+            self._family(f"{self.prefix}-{family_number:04d}")
+        return self.tables
+
+    # Families and their members
+
+    def _family(self, family_id: str):
+        self._add("family", family_id, {})
+        project = f"{self.prefix}_project_{self.rng.randint(1, 5)}"
+
+        members = [("1", "Self"), ("2", "Father"), ("3", "Mother")]
+        if self.rng.random() < 0.4:
+            members.append(("4", "Sibling"))
+        for number, relationship in members:
+            participant_id = f"{family_id}-{number}"
+            is_proband = relationship == "Self"
+            affected = is_proband or self.rng.random() < 0.2
+            overrides = {
+                "family_id": family_id,
+                "proband_relationship": relationship,
+                "paternal_id": f"{family_id}-2" if relationship in ("Self", "Sibling") else "0",
+                "maternal_id": f"{family_id}-3" if relationship in ("Self", "Sibling") else "0",
+                "sex": {"Father": "Male", "Mother": "Female"}.get(relationship, self.rng.choice(["Female", "Male"])),
+                "affected_status": "Affected" if affected else "Unaffected",
+                "internal_project_id": [project],
+            }
+            if is_proband and self.rng.random() < 0.1:
+                overrides["pmid_id"] = [str(self.rng.randint(20000000, 39999999))]
+            self._add("participant", participant_id, overrides)
+            self._participant(participant_id, is_proband, affected)
+
+    def _participant(self, participant_id: str, is_proband: bool, affected: bool):
+        count = self.rng.randint(3, 8) if affected else self.rng.randint(0, 1)
+        for number in range(1, count + 1):
+            self._add(
+                "phenotype",
+                f"{participant_id}.{number}",
+                {"participant_id": participant_id, "ontology": "HPO"},
+            )
+
+        analytes = [("D", "DNA")]
+        if is_proband and self.rng.random() < 0.3:
+            analytes.append(("R", "RNA"))
+        experiment_ids = []
+        for code, analyte_type in analytes:
+            analyte_id = f"{participant_id}-{code}-1"
+            self._add(
+                "analyte",
+                analyte_id,
+                {"participant_id": participant_id, "analyte_type": analyte_type},
+            )
+            self._add(
+                "biobank",
+                f"{analyte_id}-B",
+                {"participant_id": participant_id, "child_analytes": [analyte_id]},
+            )
+            if analyte_type == "DNA":
+                experiment_ids.append(self._experiment("dna_short_read", analyte_id))
+                if self.rng.random() < 0.15:
+                    experiment_ids.append(self._experiment(self.rng.choice(["nanopore", "pac_bio"]), analyte_id))
+            else:
+                experiment_ids.append(self._experiment("rna_short_read", analyte_id))
+
+        if is_proband and self.rng.random() < 0.3:
+            for number in range(1, self.rng.randint(1, 2) + 1):
+                self._add(
+                    "genetic_findings",
+                    f"{participant_id}_finding_{number}",
+                    {
+                        "participant_id": participant_id,
+                        "experiment_id": experiment_ids[:1],
+                        "variant_type": ["SNV/INDEL"],
+                        "variant_reference_assembly": "GRCh38",
+                        "gene_known_for_phenotype": self.rng.choice(["Known", "Candidate"]),
+                    },
+                )
+
+    def _experiment(self, platform: str, analyte_id: str) -> str:
+        experiment_table = f"experiment_{platform}"
+        aligned_table = f"aligned_{platform}"
+        experiment_id = f"{analyte_id}_{platform.upper()}_1"
+        aligned_id = f"{experiment_id}-Aligned_1"
+        self._add(
+            experiment_table,
+            experiment_id,
+            {"analyte_id": analyte_id, "experiment_sample_id": experiment_id},
+        )
+        extension = "bam" if platform in ("nanopore", "pac_bio") else "cram"
+        index = "bai" if extension == "bam" else "crai"
+        self._add(
+            aligned_table,
+            aligned_id,
+            {
+                f"{experiment_table}_id": experiment_id,
+                f"{aligned_table}_file": f"{BUCKET}/{extension}/{aligned_id}.{extension}",
+                f"{aligned_table}_index_file": f"{BUCKET}/{extension}/{aligned_id}.{extension}.{index}",
+                "md5sum": hashlib.md5(aligned_id.encode()).hexdigest(),
+                "reference_assembly": "GRCh38",
+            },
+        )
+        return f"{experiment_table}.{experiment_id}"
+
+    # Schema driven records
+
+    def _add(self, table_name: str, identifier: str, overrides: dict):
+        record = self.record(table_name, identifier, overrides)
+        self.tables[table_name].append(record)
+
+    def record(self, table_name: str, identifier: str, overrides: dict = None) -> dict:
+        """
+        Build one record for `table_name` from its schema.
+
+        Every field in the schema is present, as in a submitted sheet.
+        Required fields always have a value and optional fields have one
+        about half the time; the rest are "NA", or empty for arrays.
+        `overrides` replaces generated values.
+        """
+        schema = self.schemas[table_name]
+        required = set(schema.get("required", [])) | set(self.required.get(table_name, ()))
+        skipped = RELATION_FIELDS.get(table_name, set())
+        overrides = dict(overrides or {})
+        overrides[TABLE_KEYS[table_name]] = identifier
+
+        record = {}
+        for field, definition in schema["properties"].items():
+            if field in overrides:
+                record[field] = overrides[field]
+            elif field in TEXT_ARRAY_FIELDS.get(table_name, ()):
+                record[field] = "NA"
+            elif field not in skipped and (field in required or self.rng.random() < 0.5):
+                record[field] = self.value(table_name, identifier, field, definition)
+            else:
+                record[field] = [] if definition.get("type") == "array" else "NA"
+        if table_name == "genetic_findings":
+            self._variant(record)
+        return record
+
+    def value(self, table_name: str, identifier: str, field: str, definition: dict):
+        """Generate a value for one field from its schema definition."""
+        field_type = definition.get("type")
+        if field_type == "array":
+            return [self.value(table_name, identifier, field, definition.get("items", {}))]
+        if "enum" in definition:
+            allowed = self.choices.get(table_name, {}).get(field)
+            values = [value for value in definition["enum"] if allowed is None or value in allowed]
+            return self.rng.choice(values)
+        if field_type == "integer":
+            return self.rng.randint(1, 500)
+        if field_type == "number":
+            return round(self.rng.uniform(0, 100), 2)
+        if field_type == "boolean":
+            return self.rng.random() < 0.5
+        if definition.get("x-is_bucket_path") or "pattern" in definition:
+            return f"{BUCKET}/{table_name}/{identifier}/{field}.txt"
+        if "date" in field:
+            return (date(2020, 1, 1) + timedelta(days=self.rng.randint(0, 1800))).isoformat()
+        if field == "term_id":
+            return f"HP:{self.rng.randint(1, 40000):07d}"
+        if field == "box_position":
+            return f"{self.rng.choice('ABCDEFGHI')}{self.rng.randint(1, 9)}"
+        if field == "md5sum":
+            return hashlib.md5(f"{identifier}.{field}".encode()).hexdigest()
+        return f"{field} {self.rng.randint(1, 999)}"
+
+    def _variant(self, record: dict):
+        """Give a genetic finding a consistent small variant."""
+        record["chrom"] = str(self.rng.randint(1, 22))
+        record["pos"] = self.rng.randint(10000, 200000000)
+        record["ref"] = self.rng.choice(BASES)
+        record["alt"] = self.rng.choice(BASES.replace(record["ref"], ""))
+        record["gene_of_interest"] = [self.rng.choice(GENES)]
+        for field in ("sv_type", "chrom_end", "pos_end", "copy_number"):
+            record[field] = "NA"
+
+
+def main():
+    """Write one JSON file per table."""
+    args = usr_args()
+    tables = SyntheticDataset(
+        families=args.families, seed=args.seed, schema_version=args.schema_version
+    ).generate()
+    os.makedirs(args.output, exist_ok=True)
+    for table_name, records in tables.items():
+        with open(os.path.join(args.output, f"{table_name}.json"), "w") as output_file:
+            json.dump(records, output_file, indent=4)
+        print(f"{table_name}: {len(records)} records")
+
+
+if __name__ == "__main__":
+    main()